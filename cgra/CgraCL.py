@@ -0,0 +1,1052 @@
+"""
+=========================================================================
+CgraCL.py
+=========================================================================
+Cycle-approximate, transaction-level model of CgraRTL. It consumes the
+same IntraCgraPktType streams (CMD_CONFIG, CMD_CONST, CMD_LAUNCH,
+CMD_STORE_REQUEST, CMD_LOAD_REQUEST, etc.) that are fed into
+CgraRTL.recv_from_cpu_pkt, and produces the packets CgraRTL would send
+back via send_to_cpu_pkt (i.e., CMD_COMPLETE and CMD_LOAD_RESPONSE) as
+well as the final data SPM contents.
+
+Unlike the RTL, the model is plain Python (no PyMTL elaboration, no
+signal-level scheduling). Each tile is modeled per cycle with the same
+handshake rules as TileRTL:
+
+ - ctrl memory iterates the ctrl signals in [lower_bound, lower_bound +
+   count_per_iter) and issues CMD_COMPLETE once total_ctrl_count steps
+   are done (or once a RET fires);
+ - routing crossbar, FU and FU crossbar each fire at most once per ctrl
+   step and the ctrl only proceeds once all of them are done;
+ - the tile inports are 2-entry channels with 1-cycle latency;
+ - register banks are written from the routing/FU crossbars as
+   indicated by write_reg_from and read towards FU/routing crossbar as
+   indicated by read_reg_towards;
+ - prologue counts are respected by the FU and both crossbars;
+ - the data SPM serves one read and one write per bank per cycle.
+
+The ctrl ring and the controller are modeled as fixed-latency pipes.
+
+CgraBatchCL configures the model once and replays the configured
+kernel over many data SPM images. It is a convenience of the CL model
+only, i.e., it batches CgraCL instances, not the state of CgraRTL, and
+its cycle counts are as approximate as the ones of CgraCL.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from collections import deque
+from copy import deepcopy
+
+from pymtl3 import *
+from ..lib.cmd_type import *
+from ..lib.opt_type import *
+from ..lib.util.common import *
+from ..lib.util.data_struct_attr import *
+
+#-------------------------------------------------------------------------
+# Operation categories
+#-------------------------------------------------------------------------
+
+# Operations taking two operands from the FU inports.
+kBinaryOpts = {
+  int(OPT_ADD) : lambda a, b : a + b,
+  int(OPT_SUB) : lambda a, b : a - b,
+  int(OPT_MUL) : lambda a, b : a * b,
+  int(OPT_LLS) : lambda a, b : a << b,
+  int(OPT_LRS) : lambda a, b : a >> b,
+  int(OPT_OR)  : lambda a, b : a | b,
+  int(OPT_AND) : lambda a, b : a & b,
+  int(OPT_XOR) : lambda a, b : a ^ b,
+  int(OPT_EQ)  : lambda a, b : int(a == b),
+  int(OPT_NE)  : lambda a, b : int(a != b),
+  int(OPT_LT)  : lambda a, b : int(a < b),
+}
+
+# Operations taking one operand from the FU inport and one from the
+# const queue.
+kBinaryConstOpts = {
+  int(OPT_ADD_CONST) : lambda a, b : a + b,
+  int(OPT_SUB_CONST) : lambda a, b : a - b,
+  int(OPT_MUL_CONST) : lambda a, b : a * b,
+}
+
+# Comparisons with const only respect the predicate of the inport.
+kCompConstOpts = {
+  int(OPT_EQ_CONST) : lambda a, b : int(a == b),
+  int(OPT_NE_CONST) : lambda a, b : int(a != b),
+}
+
+# Operations taking a single operand from the FU inport.
+kUnaryOpts = {
+  int(OPT_INC)     : lambda a, mask : a + 1,
+  int(OPT_PAS)     : lambda a, mask : a,
+  int(OPT_NOT)     : lambda a, mask : int(a == 0),
+  int(OPT_BIT_NOT) : lambda a, mask : ~a & mask,
+}
+
+# Operations that make the const queue proceed once fired.
+kConstConsumingOpts = set(list(kBinaryConstOpts.keys()) +
+                          list(kCompConstOpts.keys()) +
+                          [int(OPT_PHI_CONST), int(OPT_LD_CONST),
+                           int(OPT_ADD_CONST_LD), int(OPT_STR_CONST)])
+
+kOptNah = int(OPT_NAH)
+kOptStart = int(OPT_START)
+
+# Cmds that are consumed by the ctrl memory or the const queue of a tile.
+kTileCmds = set([int(cmd) for cmd in [
+  CMD_CONFIG, CMD_CONFIG_BURST, CMD_CONFIG_BURST_DATA,
+  CMD_CONFIG_PROLOGUE_FU, CMD_CONFIG_PROLOGUE_FU_CROSSBAR,
+  CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR, CMD_CONFIG_TOTAL_CTRL_COUNT,
+  CMD_CONFIG_COUNT_PER_ITER, CMD_CONFIG_CTRL_LOWER_BOUND, CMD_CONST,
+  CMD_LAUNCH, CMD_RESUME, CMD_TERMINATE, CMD_SWAP_CTRL_BANK]])
+
+# Number of entries of the channels sitting on the tile inports.
+kChannelEntries = 2
+
+#-------------------------------------------------------------------------
+# Decoded ctrl signal
+#-------------------------------------------------------------------------
+
+class CtrlSignalCL:
+
+  __slots__ = ('operation', 'fu_in', 'routing_xbar_outport',
+               'fu_xbar_outport', 'write_reg_from', 'write_reg_idx',
+               'read_reg_towards', 'read_reg_idx')
+
+  def __init__(s, ctrl):
+    s.operation = int(ctrl.operation)
+    s.fu_in = [int(x) for x in ctrl.fu_in]
+    s.routing_xbar_outport = [int(x) for x in ctrl.routing_xbar_outport]
+    s.fu_xbar_outport = [int(x) for x in ctrl.fu_xbar_outport]
+    s.write_reg_from = [int(x) for x in ctrl.write_reg_from]
+    s.write_reg_idx = [int(x) for x in ctrl.write_reg_idx]
+    s.read_reg_towards = [int(x) for x in ctrl.read_reg_towards]
+    s.read_reg_idx = [int(x) for x in ctrl.read_reg_idx]
+
+#-------------------------------------------------------------------------
+# Tile model
+#-------------------------------------------------------------------------
+
+class TileCL:
+
+  def __init__(s, tile_id, ctrl_mem_size, num_tile_ports, num_fu_inports,
+               num_fu_outports, num_registers_per_reg_bank, num_ctrl,
+               total_steps):
+
+    s.tile_id = tile_id
+    s.ctrl_mem_size = ctrl_mem_size
+    s.num_tile_ports = num_tile_ports
+    s.num_fu_inports = num_fu_inports
+    s.num_fu_outports = num_fu_outports
+    num_routing_xbar_inports = num_tile_ports + num_fu_inports
+
+    # Packets delivered by the ctrl ring, consumed one per cycle.
+    s.recv_pkts = deque()
+    # Ctrl memory; None indicates OPT_START (i.e., not configured).
+    s.ctrl = [None for _ in range(ctrl_mem_size)]
+    s.started = False
+    s.sent_complete = False
+    s.times = 0
+    s.raddr = 0
+    s.ctrl_count_per_iter = num_ctrl
+    s.ctrl_count_lower_bound = 0
+    s.total_ctrl_steps = total_steps
+    # Next ctrl_addr and remaining beats of the current burst.
+    s.burst_addr = 0
+    s.burst_remaining = 0
+
+    # Prologue counts and the counters of the crossbars.
+    s.prologue_count_fu = [0 for _ in range(ctrl_mem_size)]
+    s.prologue_count_routing_xbar = \
+        [[0 for _ in range(num_routing_xbar_inports)] for _ in range(ctrl_mem_size)]
+    s.prologue_counter_routing_xbar = \
+        [[0 for _ in range(num_routing_xbar_inports)] for _ in range(ctrl_mem_size)]
+    s.prologue_count_fu_xbar = \
+        [[0 for _ in range(num_fu_outports)] for _ in range(ctrl_mem_size)]
+    s.prologue_counter_fu_xbar = \
+        [[0 for _ in range(num_fu_outports)] for _ in range(ctrl_mem_size)]
+
+    # Const queue.
+    s.const_mem = []
+    s.const_rd_cur = 0
+
+    # Channels on the tile inports, the number of entries is snapshotted
+    # at the beginning of each cycle to model the registered enq.rdy.
+    s.in_channel = [deque() for _ in range(num_tile_ports)]
+    s.in_channel_count = [0 for _ in range(num_tile_ports)]
+    # (tile, inport) connected to each outport, None on the boundary.
+    s.out_neighbor = [None for _ in range(num_tile_ports)]
+    s.has_mem_port = False
+
+    # Register cluster.
+    s.regs = [[(0, 0) for _ in range(num_registers_per_reg_bank)]
+              for _ in range(num_fu_inports)]
+
+    # Per ctrl step status.
+    s.element_done = False
+    s.routing_xbar_done = False
+    s.fu_xbar_done = False
+    s.routing_xbar_accepted = [False for _ in range(num_tile_ports + num_fu_inports)]
+    s.fu_xbar_accepted = [False for _ in range(num_tile_ports + num_fu_inports)]
+
+    # FU internal states.
+    s.phi_first = [True for _ in range(ctrl_mem_size)]
+    s.already_grt_once = False
+    s.ret_already_done = [False for _ in range(ctrl_mem_size)]
+    # [ready_cycle, data] of the in-flight load.
+    s.pending_load = None
+    # Payloads returned by RET towards the controller.
+    s.to_ctrl_mem_queue = deque()
+
+    # Statistics.
+    s.fired_count = 0
+    # Cycles the CMD_LAUNCH is consumed and the CMD_COMPLETE is sent.
+    s.launch_cycle = None
+    s.complete_cycle = None
+
+  def is_active(s):
+    return s.started and not s.sent_complete
+
+  def routing_xbar_input(s, ctrl, i):
+    if i < s.num_tile_ports:
+      if s.in_channel[i]:
+        return s.in_channel[i][0]
+      return None
+    bank = i - s.num_tile_ports
+    if ctrl.read_reg_towards[bank] == READ_TOWARDS_ROUTING_XBAR or \
+       ctrl.read_reg_towards[bank] == READ_TOWARDS_BOTH:
+      return s.regs[bank][ctrl.read_reg_idx[bank]]
+    return None
+
+  def line_trace(s):
+    op = OPT_SYMBOL_DICT[OPT_START]
+    if s.ctrl[s.raddr] is not None:
+      op = OPT_SYMBOL_DICT[OpCodeType(s.ctrl[s.raddr].operation)]
+    channels = "|".join([str(list(c)) for c in s.in_channel])
+    return f"[tile {s.tile_id}] raddr: {s.raddr}, times: {s.times}, opt: {op}, in: {channels}"
+
+#-------------------------------------------------------------------------
+# CgraCL
+#-------------------------------------------------------------------------
+
+class CgraCL:
+
+  def __init__(s, IntraCgraPktType, width, height, ctrl_mem_size,
+               data_mem_size_global, data_mem_size_per_bank,
+               num_banks_per_cgra, num_registers_per_reg_bank,
+               num_ctrl, total_steps, mem_access_is_combinational,
+               cgra_topology = MESH, controller2addr_map = None,
+               cgra_id = 0, ctrl_ring_latency = 2):
+
+    # Derives types from IntraCgraPktType.
+    s.IntraCgraPktType = IntraCgraPktType
+    s.CgraPayloadType = IntraCgraPktType.get_field_type(kAttrPayload)
+    s.DataType = s.CgraPayloadType.get_field_type(kAttrData)
+    s.CtrlType = s.CgraPayloadType.get_field_type(kAttrCtrl)
+    s.DataAddrType = s.CgraPayloadType.get_field_type(kAttrDataAddr)
+    data_bitwidth = s.DataType.get_field_type(kAttrPayload).nbits
+    s.payload_mask = (1 << data_bitwidth) - 1
+    s.addr_mask = (1 << s.DataAddrType.nbits) - 1
+
+    ctrl = s.CtrlType()
+    s.num_fu_inports = len(ctrl.fu_in)
+    s.num_tile_ports = len(ctrl.routing_xbar_outport) - s.num_fu_inports
+    s.num_fu_outports = 2
+    s.fu_out_idx_mask = (1 << clog2(s.num_fu_outports)) - 1
+
+    s.width = width
+    s.height = height
+    s.num_tiles = width * height
+    s.ctrl_mem_size = ctrl_mem_size
+    s.data_mem_size_global = data_mem_size_global
+    s.data_mem_size_per_bank = data_mem_size_per_bank
+    s.num_banks_per_cgra = num_banks_per_cgra
+    s.mem_access_is_combinational = mem_access_is_combinational
+    s.ctrl_ring_latency = ctrl_ring_latency
+    s.cgra_id = cgra_id
+    if controller2addr_map is None:
+      controller2addr_map = {cgra_id: [0, data_mem_size_global - 1]}
+    s.address_lower = controller2addr_map[cgra_id][0]
+    s.address_upper = controller2addr_map[cgra_id][1]
+
+    # Components.
+    s.tile = [TileCL(i, ctrl_mem_size, s.num_tile_ports,
+                     s.num_fu_inports, s.num_fu_outports,
+                     num_registers_per_reg_bank, num_ctrl, total_steps)
+              for i in range(s.num_tiles)]
+    s.data_mem = [(0, 0) for _ in range(data_mem_size_global)]
+
+    # Pipes modeling the ctrl ring and controller: (arrival_cycle, ...).
+    s.ring_to_tile = deque()
+    s.to_cpu = deque()
+    s.send_to_cpu_pkts = []
+    # Cycle the last CMD_COMPLETE is sent towards the CPU.
+    s.kernel_complete_cycle = None
+
+    s.cycle = 0
+
+    s.connect_tiles(cgra_topology)
+
+  #-----------------------------------------------------------------------
+  # Elaboration
+  #-----------------------------------------------------------------------
+
+  def connect_tiles(s, cgra_topology):
+    width = s.width
+    height = s.height
+    for i in range(s.num_tiles):
+      col = i % width
+      row = i // width
+      tile = s.tile[i]
+      neighbors = {
+        PORT_INDEX_NORTH : (i + width, PORT_INDEX_SOUTH) if row < height - 1 else None,
+        PORT_INDEX_SOUTH : (i - width, PORT_INDEX_NORTH) if row > 0 else None,
+        PORT_INDEX_WEST  : (i - 1, PORT_INDEX_EAST) if col > 0 else None,
+        PORT_INDEX_EAST  : (i + 1, PORT_INDEX_WEST) if col < width - 1 else None,
+      }
+      if cgra_topology == KING_MESH:
+        neighbors.update({
+          PORT_INDEX_NORTHWEST : (i + width - 1, PORT_INDEX_SOUTHEAST)
+                                 if row < height - 1 and col > 0 else None,
+          PORT_INDEX_NORTHEAST : (i + width + 1, PORT_INDEX_SOUTHWEST)
+                                 if row < height - 1 and col < width - 1 else None,
+          PORT_INDEX_SOUTHEAST : (i - width + 1, PORT_INDEX_NORTHWEST)
+                                 if row > 0 and col < width - 1 else None,
+          PORT_INDEX_SOUTHWEST : (i - width - 1, PORT_INDEX_NORTHEAST)
+                                 if row > 0 and col > 0 else None,
+        })
+      for port in range(s.num_tile_ports):
+        neighbor = neighbors.get(port, None)
+        if neighbor is not None:
+          tile.out_neighbor[port] = (s.tile[neighbor[0]], neighbor[1])
+      # Only the tiles on the left and bottom boundaries access the SPM.
+      tile.has_mem_port = (col == 0) or (row == 0)
+
+  #-----------------------------------------------------------------------
+  # Helpers
+  #-----------------------------------------------------------------------
+
+  def to_data(s, value):
+    return s.DataType(value[0], value[1])
+
+  def from_data(s, data):
+    return (int(data.payload), int(data.predicate))
+
+  def mem_bank_of(s, addr):
+    if s.address_lower <= addr <= s.address_upper:
+      return (addr - s.address_lower) // s.data_mem_size_per_bank
+    # Remote accesses go through the NoC port of the memory controller.
+    return s.num_banks_per_cgra
+
+  def dst_tiles_of(s, pkt):
+    mask = int(pkt.multicast_mask)
+    if mask == 0:
+      return [int(pkt.dst)]
+    return [i for i in range(s.num_tiles) if (mask >> i) & 1]
+
+  def get_data_mem(s):
+    return [s.to_data(value) for value in
+            s.data_mem[s.address_lower : s.address_upper + 1]]
+
+  def set_data_mem(s, addr, data):
+    s.data_mem[addr] = s.from_data(data)
+
+  #-----------------------------------------------------------------------
+  # Controller (CPU side)
+  #-----------------------------------------------------------------------
+
+  def recv_from_cpu_pkt(s, pkt):
+    cmd = int(pkt.payload.cmd)
+    if cmd == CMD_STORE_REQUEST:
+      addr = int(pkt.payload.data_addr)
+      s.data_mem[addr] = s.from_data(pkt.payload.data)
+    elif cmd == CMD_LOAD_REQUEST:
+      addr = int(pkt.payload.data_addr)
+      resp = s.IntraCgraPktType(
+          0, s.num_tiles, s.cgra_id, s.cgra_id, 0, 0, 0, 0, 0, 0,
+          s.CgraPayloadType(CMD_LOAD_RESPONSE, s.to_data(s.data_mem[addr]),
+                            addr, 0, 0))
+      s.to_cpu.append((s.cycle + s.ctrl_ring_latency, resp))
+    elif cmd in kTileCmds:
+      # A multicast packet is forwarded along the ctrl ring from one tile
+      # in its mask to the next (see noc/CtrlPktMulticastRTL.py).
+      for hop, dst in enumerate(s.dst_tiles_of(pkt)):
+        s.ring_to_tile.append((s.cycle + s.ctrl_ring_latency + hop, dst, pkt))
+    else:
+      raise NotImplementedError(
+          f"CgraCL does not support cmd {CMD_SYMBOL_DICT[pkt.payload.cmd]} from CPU")
+
+  #-----------------------------------------------------------------------
+  # Ctrl memory of a tile
+  #-----------------------------------------------------------------------
+
+  def consume_tile_pkt(s, tile):
+    pkt = tile.recv_pkts.popleft()
+    payload = pkt.payload
+    cmd = int(payload.cmd)
+    addr = int(payload.ctrl_addr)
+    data = int(payload.data.payload)
+    if cmd == CMD_CONFIG:
+      tile.ctrl[addr] = CtrlSignalCL(payload.ctrl)
+    elif cmd == CMD_CONFIG_BURST:
+      tile.ctrl[addr] = CtrlSignalCL(payload.ctrl)
+      tile.burst_addr = (addr + 1) % s.ctrl_mem_size
+      tile.burst_remaining = data
+    elif cmd == CMD_CONFIG_BURST_DATA:
+      if tile.burst_remaining > 0:
+        tile.ctrl[tile.burst_addr] = CtrlSignalCL(payload.ctrl)
+        if int(payload.data.predicate):
+          tile.prologue_count_fu[tile.burst_addr] = min(data, PROLOGUE_MAX_COUNT)
+        tile.burst_addr = (tile.burst_addr + 1) % s.ctrl_mem_size
+        tile.burst_remaining -= 1
+    elif cmd == CMD_CONST:
+      if len(tile.const_mem) < s.ctrl_mem_size:
+        tile.const_mem.append(s.from_data(payload.data))
+    elif cmd == CMD_CONFIG_PROLOGUE_FU:
+      tile.prologue_count_fu[addr] = min(data, PROLOGUE_MAX_COUNT)
+    elif cmd == CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR:
+      inport = int(payload.ctrl.routing_xbar_outport[0])
+      if inport > 0:
+        tile.prologue_count_routing_xbar[addr][inport - 1] = min(data, PROLOGUE_MAX_COUNT)
+    elif cmd == CMD_CONFIG_PROLOGUE_FU_CROSSBAR:
+      inport = int(payload.ctrl.fu_xbar_outport[0]) & s.fu_out_idx_mask
+      tile.prologue_count_fu_xbar[addr][inport] = min(data, PROLOGUE_MAX_COUNT)
+    elif cmd == CMD_CONFIG_TOTAL_CTRL_COUNT:
+      tile.total_ctrl_steps = data
+    elif cmd == CMD_CONFIG_COUNT_PER_ITER:
+      tile.ctrl_count_per_iter = data
+    elif cmd == CMD_CONFIG_CTRL_LOWER_BOUND:
+      tile.ctrl_count_lower_bound = data % s.ctrl_mem_size
+      tile.raddr = tile.ctrl_count_lower_bound
+    elif cmd == CMD_LAUNCH or cmd == CMD_RESUME:
+      tile.started = True
+      tile.sent_complete = False
+      if cmd == CMD_LAUNCH:
+        tile.launch_cycle = s.cycle
+        tile.complete_cycle = None
+        s.kernel_complete_cycle = None
+    elif cmd == CMD_TERMINATE:
+      tile.started = False
+      tile.times = 0
+    # The ctrl memory of the model has a single bank, i.e., the
+    # CMD_SWAP_CTRL_BANK is dropped as done by CtrlMemDynamicRTL.
+
+  def send_tile_pkt_to_controller(s, tile):
+    if tile.to_ctrl_mem_queue and not tile.sent_complete:
+      payload = tile.to_ctrl_mem_queue.popleft()
+    elif tile.total_ctrl_steps > 0 and \
+         tile.times == tile.total_ctrl_steps and \
+         not tile.sent_complete:
+      payload = s.CgraPayloadType(CMD_COMPLETE, 0, 0, 0, 0)
+    else:
+      return
+    tile.sent_complete = True
+    if int(payload.cmd) == CMD_COMPLETE and tile.complete_cycle is None:
+      tile.complete_cycle = s.cycle
+    pkt = s.IntraCgraPktType(tile.tile_id, s.num_tiles, s.cgra_id, s.cgra_id,
+                             0, 0, 0, 0, 0, 0, payload)
+    s.to_cpu.append((s.cycle + s.ctrl_ring_latency, pkt))
+
+  #-----------------------------------------------------------------------
+  # One ctrl step of a tile
+  #-----------------------------------------------------------------------
+
+  def tick_tile(s, tile, mem_rd_used, mem_wr_used, channel_pushes,
+                mem_writes):
+    ctrl = tile.ctrl[tile.raddr]
+    if ctrl is None or \
+       (tile.total_ctrl_steps > 0 and tile.times == tile.total_ctrl_steps):
+      return
+
+    addr = tile.raddr
+    num_tile_ports = tile.num_tile_ports
+    num_fu_inports = tile.num_fu_inports
+    operation = kOptNah if tile.prologue_count_fu[addr] != 0 else ctrl.operation
+
+    # Routing crossbar: valid data is sent out only when all the required
+    # inputs are available.
+    routing = ctrl.routing_xbar_outport
+    routing_valid_all = True
+    routing_prologue_ok = True
+    routing_inputs = {}
+    if not tile.routing_xbar_done:
+      for j in range(len(routing)):
+        if routing[j] > 0:
+          i = routing[j] - 1
+          if i not in routing_inputs:
+            routing_inputs[i] = tile.routing_xbar_input(ctrl, i)
+          if routing_inputs[i] is None:
+            routing_valid_all = False
+            if tile.prologue_counter_routing_xbar[addr][i] >= \
+               tile.prologue_count_routing_xbar[addr][i]:
+              routing_prologue_ok = False
+
+    # Data arriving at the FU inports via the register cluster.
+    fu_port_from_routing = [None for _ in range(num_fu_inports)]
+    if not tile.routing_xbar_done and routing_valid_all:
+      for b in range(num_fu_inports):
+        j = num_tile_ports + b
+        if routing[j] > 0 and not tile.routing_xbar_accepted[j]:
+          fu_port_from_routing[b] = routing_inputs[routing[j] - 1]
+
+    operands = [None for _ in range(num_fu_inports)]
+    for b in range(num_fu_inports):
+      if ctrl.read_reg_towards[b] == READ_TOWARDS_FU or \
+         ctrl.read_reg_towards[b] == READ_TOWARDS_BOTH:
+        operands[b] = tile.regs[b][ctrl.read_reg_idx[b]]
+      else:
+        operands[b] = fu_port_from_routing[b]
+
+    # FU: figures out whether all the operands are available and the
+    # value to be sent out.
+    element = None
+    if not tile.element_done:
+      element = s.eval_element(tile, ctrl, operation, operands,
+                               mem_rd_used, mem_wr_used)
+
+    # FU crossbar.
+    fu_routing = ctrl.fu_xbar_outport
+    fu_out = [None for _ in range(tile.num_fu_outports)]
+    if element is not None and element.out is not None:
+      fu_out[0] = element.out
+    fu_xbar_valid_all = True
+    fu_xbar_prologue_ok = True
+    fu_xbar_required = [False for _ in range(tile.num_fu_outports)]
+    fu_xbar_all_accepted = True
+    fu_xbar_fire = False
+    if not tile.fu_xbar_done:
+      for j in range(len(fu_routing)):
+        if fu_routing[j] > 0:
+          i = fu_routing[j] - 1
+          in_prologue = tile.prologue_counter_fu_xbar[addr][i] < \
+                        tile.prologue_count_fu_xbar[addr][i]
+          fu_xbar_required[i] = not in_prologue
+          if fu_out[i] is None:
+            fu_xbar_valid_all = False
+            if not in_prologue:
+              fu_xbar_prologue_ok = False
+          if not tile.fu_xbar_accepted[j] and \
+             not s.outport_rdy(tile, j):
+            fu_xbar_all_accepted = False
+      fu_xbar_fire = fu_xbar_all_accepted and \
+                     (fu_xbar_valid_all or fu_xbar_prologue_ok)
+
+    # FU fires only if its output is accepted by the FU crossbar.
+    element_fire = False
+    if element is not None and element.ready:
+      if element.out is None:
+        element_fire = True
+      else:
+        element_fire = (not tile.fu_xbar_done) and fu_xbar_valid_all and \
+                       fu_xbar_all_accepted and fu_xbar_required[0]
+    element_done_now = (element is not None) and \
+                       (element.done_without_fire or element_fire)
+
+    # Routing crossbar rdy of each outport.
+    routing_fire = False
+    if not tile.routing_xbar_done:
+      routing_all_accepted = True
+      for j in range(len(routing)):
+        if routing[j] > 0 and not tile.routing_xbar_accepted[j]:
+          if j < num_tile_ports:
+            rdy = s.outport_rdy(tile, j)
+          else:
+            b = j - num_tile_ports
+            rdy = tile.element_done or \
+                  (ctrl.write_reg_from[b] == PORT_ROUTING_CROSSBAR and operation == kOptNah) or \
+                  (element_fire and b in element.consumed) or \
+                  (element is not None and element.issued and b in element.consumed)
+          if not rdy:
+            routing_all_accepted = False
+          elif routing_valid_all:
+            # Delivers the data, towards either neighbors or FU/register.
+            tile.routing_xbar_accepted[j] = True
+            if j < num_tile_ports:
+              s.push_to_neighbor(tile, j, routing_inputs[routing[j] - 1],
+                                 channel_pushes)
+      routing_fire = routing_all_accepted and \
+                     (routing_valid_all or routing_prologue_ok)
+
+    # Register writes from the routing crossbar.
+    for b in range(num_fu_inports):
+      if ctrl.write_reg_from[b] == PORT_ROUTING_CROSSBAR and \
+         fu_port_from_routing[b] is not None:
+        tile.regs[b][ctrl.write_reg_idx[b]] = fu_port_from_routing[b]
+
+    # FU crossbar delivers the output.
+    if not tile.fu_xbar_done and fu_xbar_valid_all:
+      for j in range(len(fu_routing)):
+        if fu_routing[j] > 0 and not tile.fu_xbar_accepted[j] and \
+           s.outport_rdy(tile, j):
+          tile.fu_xbar_accepted[j] = True
+          value = fu_out[fu_routing[j] - 1]
+          if j < num_tile_ports:
+            s.push_to_neighbor(tile, j, value, channel_pushes)
+          else:
+            b = j - num_tile_ports
+            if ctrl.write_reg_from[b] == PORT_FU_CROSSBAR:
+              tile.regs[b][ctrl.write_reg_idx[b]] = value
+
+    # Commits the FU side effects.
+    if element is not None:
+      s.commit_element(tile, ctrl, operation, element, element_fire,
+                       mem_wr_used, mem_writes)
+
+    # Dequeues routing crossbar inputs and bumps the prologue counters.
+    if routing_fire:
+      for i in routing_inputs:
+        in_prologue = tile.prologue_counter_routing_xbar[addr][i] < \
+                      tile.prologue_count_routing_xbar[addr][i]
+        if in_prologue:
+          tile.prologue_counter_routing_xbar[addr][i] += 1
+        elif routing_valid_all and i < num_tile_ports:
+          tile.in_channel[i].popleft()
+      tile.routing_xbar_accepted = [False for _ in tile.routing_xbar_accepted]
+    if fu_xbar_fire:
+      for i in range(tile.num_fu_outports):
+        if any(fu_routing[j] == i + 1 for j in range(len(fu_routing))) and \
+           tile.prologue_counter_fu_xbar[addr][i] < tile.prologue_count_fu_xbar[addr][i]:
+          tile.prologue_counter_fu_xbar[addr][i] += 1
+      tile.fu_xbar_accepted = [False for _ in tile.fu_xbar_accepted]
+
+    routing_done = tile.routing_xbar_done or routing_fire
+    fu_xbar_done = tile.fu_xbar_done or fu_xbar_fire
+    element_done = tile.element_done or element_done_now
+
+    if routing_done and fu_xbar_done and element_done:
+      # Ctrl proceeds.
+      tile.fired_count += 1
+      if element_fire and operation in kConstConsumingOpts and tile.const_mem:
+        if tile.const_rd_cur < len(tile.const_mem) - 1:
+          tile.const_rd_cur += 1
+        else:
+          tile.const_rd_cur = 0
+      if tile.total_ctrl_steps == 0 or tile.times < tile.total_ctrl_steps:
+        tile.times += 1
+      if tile.raddr == tile.ctrl_count_lower_bound + tile.ctrl_count_per_iter - 1:
+        tile.raddr = tile.ctrl_count_lower_bound
+      else:
+        tile.raddr = (tile.raddr + 1) % s.ctrl_mem_size
+      if tile.prologue_count_fu[addr] > 0:
+        tile.prologue_count_fu[addr] -= 1
+      tile.element_done = False
+      tile.routing_xbar_done = False
+      tile.fu_xbar_done = False
+    else:
+      tile.element_done = element_done
+      tile.routing_xbar_done = routing_done
+      tile.fu_xbar_done = fu_xbar_done
+
+  def outport_rdy(s, tile, j):
+    if j >= tile.num_tile_ports:
+      # Register cluster always accepts data from the FU crossbar.
+      return True
+    neighbor = tile.out_neighbor[j]
+    if neighbor is None:
+      return False
+    dst_tile, dst_port = neighbor
+    return dst_tile.in_channel_count[dst_port] < kChannelEntries
+
+  def push_to_neighbor(s, tile, j, value, channel_pushes):
+    channel_pushes.append((tile.out_neighbor[j], value))
+
+  #-----------------------------------------------------------------------
+  # FU
+  #-----------------------------------------------------------------------
+
+  def eval_element(s, tile, ctrl, operation, operands, mem_rd_used,
+                   mem_wr_used):
+    result = ElementResultCL()
+    mask = s.payload_mask
+
+    if operation == kOptNah:
+      result.ready = True
+      result.done_without_fire = True
+      return result
+
+    in0 = ctrl.fu_in[0] - 1 if ctrl.fu_in[0] != 0 else 0
+    in1 = ctrl.fu_in[1] - 1 if ctrl.fu_in[1] != 0 else 0
+    a = operands[in0]
+    b = operands[in1]
+    const = None
+    if tile.const_rd_cur < len(tile.const_mem):
+      const = tile.const_mem[tile.const_rd_cur]
+
+    if operation in kBinaryOpts:
+      if a is not None and b is not None:
+        result.ready = True
+        result.consumed = (in0, in1)
+        result.out = (kBinaryOpts[operation](a[0], b[0]) & mask, a[1] & b[1])
+
+    elif operation in kBinaryConstOpts:
+      if a is not None and const is not None:
+        result.ready = True
+        # SUB_CONST also releases the second inport, same as the RTL.
+        result.consumed = (in0, in1) if operation == OPT_SUB_CONST else (in0,)
+        result.out = (kBinaryConstOpts[operation](a[0], const[0]) & mask,
+                      a[1] & const[1])
+
+    elif operation in kCompConstOpts:
+      if a is not None and const is not None:
+        result.ready = True
+        result.consumed = (in0,)
+        result.out = (kCompConstOpts[operation](a[0], const[0]), a[1])
+
+    elif operation in kUnaryOpts:
+      if a is not None:
+        result.ready = True
+        result.consumed = (in0,)
+        result.out = (kUnaryOpts[operation](a[0], mask) & mask, a[1])
+
+    elif operation == OPT_PHI:
+      if a is not None and b is not None:
+        result.ready = True
+        result.consumed = (in0, in1)
+        if a[1]:
+          result.out = (a[0], 1)
+        elif b[1]:
+          result.out = (b[0], 1)
+        else:
+          result.out = (a[0], 0)
+
+    elif operation == OPT_PHI_START:
+      first = tile.phi_first[tile.raddr]
+      if a is not None and (first or b is not None):
+        result.ready = True
+        result.consumed = (in0,) if first else (in0, in1)
+        if first or a[1]:
+          result.out = (a[0], 1)
+        elif b[1]:
+          result.out = (b[0], 1)
+        else:
+          result.out = (a[0], 0)
+
+    elif operation == OPT_PHI_CONST:
+      first = tile.phi_first[tile.raddr]
+      if first and const is not None:
+        result.ready = True
+        result.consumed = (in0,)
+        result.out = const
+      elif not first and a is not None:
+        result.ready = True
+        result.consumed = (in0,)
+        result.out = a
+
+    elif operation == OPT_GRT_PRED:
+      if a is not None and b is not None:
+        result.ready = True
+        result.consumed = (in0, in1)
+        if b[0] != 0:
+          result.out = (a[0], a[1] & b[1])
+        else:
+          result.out = (a[0], 0)
+
+    elif operation == OPT_GRT_ALWAYS:
+      if a is not None:
+        result.ready = True
+        result.consumed = (in0,)
+        result.out = (a[0], 1)
+
+    elif operation == OPT_GRT_ONCE:
+      if a is not None:
+        result.ready = True
+        result.consumed = (in0,)
+        result.out = (a[0], 0 if tile.already_grt_once else 1)
+
+    elif operation == OPT_SEL:
+      in2 = ctrl.fu_in[2] - 1 if ctrl.fu_in[2] != 0 else 0
+      c = operands[in2]
+      if a is not None and b is not None and c is not None:
+        result.ready = True
+        result.consumed = (in0, in1, in2)
+        chosen = b if a[0] == 1 else c
+        result.out = (chosen[0], a[1] & b[1] & c[1])
+
+    elif operation == OPT_LD or operation == OPT_ADD_CONST_LD or \
+         operation == OPT_LD_CONST:
+      s.eval_load(tile, operation, a, in0, const, result, mem_rd_used)
+
+    elif operation == OPT_STR:
+      if a is not None and b is not None and tile.has_mem_port and \
+         s.mem_bank_of(a[0] & s.addr_mask) not in mem_wr_used:
+        result.ready = True
+        result.consumed = (in0, in1)
+        result.store = (a[0] & s.addr_mask, (b[0], a[1] & b[1]))
+
+    elif operation == OPT_STR_CONST:
+      if a is not None and const is not None and tile.has_mem_port and \
+         s.mem_bank_of(const[0] & s.addr_mask) not in mem_wr_used:
+        result.ready = True
+        result.consumed = (in0,)
+        if a[1] and const[1]:
+          result.store = (const[0] & s.addr_mask, (a[0], 1))
+
+    elif operation == OPT_RET or operation == OPT_RET_VOID:
+      if a is not None:
+        already_done = tile.ret_already_done[tile.raddr]
+        if already_done or not a[1] or len(tile.to_ctrl_mem_queue) < kChannelEntries:
+          result.ready = True
+          result.consumed = (in0,)
+          if not already_done and a[1]:
+            data = s.DataType(a[0], a[1]) if operation == OPT_RET else s.DataType()
+            result.ret = s.CgraPayloadType(CMD_COMPLETE, data, 0, 0, 0)
+
+    else:
+      raise NotImplementedError(
+          f"CgraCL does not support operation {OPT_SYMBOL_DICT[OpCodeType(operation)]} "
+          f"(tile {tile.tile_id}, ctrl_addr {tile.raddr})")
+
+    return result
+
+  def eval_load(s, tile, operation, a, in0, const, result, mem_rd_used):
+    # The load is already issued, waiting for the response.
+    if tile.pending_load is not None:
+      ready_cycle, data = tile.pending_load
+      if s.cycle >= ready_cycle:
+        result.ready = True
+        result.out = data
+      return
+
+    if operation == OPT_LD_CONST:
+      if const is None:
+        return
+      raddr = const[0]
+      predicate = const[1]
+    else:
+      if a is None or (operation == OPT_ADD_CONST_LD and const is None):
+        return
+      raddr = a[0] if operation == OPT_LD else a[0] + const[0]
+      predicate = a[1]
+      result.consumed = (in0,)
+      # Address with false predicate does not access the memory, but a
+      # fake data with false predicate is returned to drain the iteration.
+      if predicate == 0:
+        result.ready = True
+        result.out = (0, 0)
+        return
+
+    if not tile.has_mem_port:
+      result.consumed = ()
+      return
+    raddr &= s.addr_mask
+    bank = s.mem_bank_of(raddr)
+    if bank in mem_rd_used:
+      result.consumed = ()
+      return
+    mem_rd_used.add(bank)
+    payload, mem_predicate = s.data_mem[raddr]
+    data = (payload, mem_predicate & predicate if operation == OPT_LD_CONST
+                     else mem_predicate)
+    result.issued = True
+    if s.mem_access_is_combinational:
+      result.ready = True
+      result.out = data
+      result.pending_load = (s.cycle, data)
+    else:
+      result.pending_load = (s.cycle + 1, data)
+
+  def commit_element(s, tile, ctrl, operation, element, element_fire,
+                     mem_wr_used, mem_writes):
+    if element.issued and not element_fire:
+      tile.pending_load = element.pending_load
+    if not element_fire:
+      return
+    tile.pending_load = None
+    if operation == OPT_PHI_CONST or operation == OPT_PHI_START:
+      tile.phi_first[tile.raddr] = False
+    elif operation == OPT_GRT_ONCE:
+      tile.already_grt_once = True
+    if element.store is not None:
+      waddr, value = element.store
+      mem_wr_used.add(s.mem_bank_of(waddr))
+      mem_writes.append((waddr, value))
+    if element.ret is not None:
+      tile.to_ctrl_mem_queue.append(element.ret)
+      tile.ret_already_done[tile.raddr] = True
+
+  #-----------------------------------------------------------------------
+  # Simulation
+  #-----------------------------------------------------------------------
+
+  def tick(s):
+    # Ctrl ring delivery.
+    # The multicast copies are not ordered by arrival across the tiles.
+    pending = deque()
+    for arrival, dst, pkt in s.ring_to_tile:
+      if arrival <= s.cycle:
+        s.tile[dst].recv_pkts.append(pkt)
+      else:
+        pending.append((arrival, dst, pkt))
+    s.ring_to_tile = pending
+
+    # Controller towards CPU.
+    while s.to_cpu and s.to_cpu[0][0] <= s.cycle:
+      pkt = s.to_cpu.popleft()[1]
+      if pkt.payload.cmd == CMD_COMPLETE:
+        s.kernel_complete_cycle = s.cycle
+      s.send_to_cpu_pkts.append(pkt)
+
+    for tile in s.tile:
+      for port in range(tile.num_tile_ports):
+        tile.in_channel_count[port] = len(tile.in_channel[port])
+
+    mem_rd_used = set()
+    mem_wr_used = set()
+    channel_pushes = []
+    mem_writes = []
+    for tile in s.tile:
+      if tile.is_active():
+        s.send_tile_pkt_to_controller(tile)
+        s.tick_tile(tile, mem_rd_used, mem_wr_used, channel_pushes, mem_writes)
+
+    # Registered updates.
+    for (dst_tile, dst_port), value in channel_pushes:
+      dst_tile.in_channel[dst_port].append(value)
+    for waddr, value in mem_writes:
+      s.data_mem[waddr] = value
+    for tile in s.tile:
+      if tile.recv_pkts:
+        s.consume_tile_pkt(tile)
+
+    s.cycle += 1
+
+  def pending(s):
+    return bool(s.ring_to_tile) or bool(s.to_cpu) or \
+           any(tile.recv_pkts for tile in s.tile)
+
+  def sim(s, src_ctrl_pkt, src_query_pkt = [], num_complete = None,
+          max_cycles = 100000):
+    """Feeds the ctrl packets one per cycle, then the query packets once
+    `num_complete` CMD_COMPLETE packets have been sent back (by default
+    one per launched tile), the same way the CgraRTL test harness does.
+    Returns the packets sent towards the CPU."""
+
+    if num_complete is None:
+      num_complete = len(set([dst for pkt in src_ctrl_pkt
+                              if pkt.payload.cmd == CMD_LAUNCH
+                              for dst in s.dst_tiles_of(pkt)]))
+    src_ctrl_pkt = deque(src_ctrl_pkt)
+    src_query_pkt = deque(src_query_pkt)
+    num_queries = len(src_query_pkt)
+
+    def num_sent(cmd):
+      return sum(1 for pkt in s.send_to_cpu_pkts if pkt.payload.cmd == cmd)
+
+    while s.cycle < max_cycles:
+      completed = num_sent(CMD_COMPLETE) >= num_complete
+      if src_ctrl_pkt:
+        s.recv_from_cpu_pkt(src_ctrl_pkt.popleft())
+      elif completed and src_query_pkt:
+        s.recv_from_cpu_pkt(src_query_pkt.popleft())
+      elif completed and num_sent(CMD_LOAD_RESPONSE) >= num_queries and \
+           not s.pending():
+        break
+      s.tick()
+    else:
+      raise RuntimeError(f"CgraCL did not finish within {max_cycles} cycles")
+
+    return s.send_to_cpu_pkts
+
+  def execution_cycles(s):
+    """Cycles from the launch of the last tile till the last tile sends
+    its CMD_COMPLETE, the same as the execution phase reported by the
+    CgraConfigProfiler (lib/util/config_profiler.py) on CgraRTL. Tiles
+    never sending a CMD_COMPLETE (e.g., the ones without OPT_RET in a
+    kernel returning its result) run till the kernel completes."""
+
+    launched = [tile for tile in s.tile if tile.launch_cycle is not None]
+    if not launched:
+      return None
+    end_cycle = s.cycle if s.kernel_complete_cycle is None \
+                else s.kernel_complete_cycle
+    execution_end = max([end_cycle if tile.complete_cycle is None
+                         else tile.complete_cycle for tile in launched])
+    return execution_end - max([tile.launch_cycle for tile in launched])
+
+  def line_trace(s):
+    return "\n".join([tile.line_trace() for tile in s.tile if tile.started])
+
+#-------------------------------------------------------------------------
+# CgraBatchCL
+#-------------------------------------------------------------------------
+
+class CgraBatchCL:
+  """Runs one configured kernel over many data SPM images on the CgraCL
+  model. The tile cmds (ctrl signals, consts, counts, etc.) are fed into
+  the model only once; the configured model is then snapshotted and every
+  image starts from a copy of the snapshot with its SPM preloaded
+  directly, so neither the configuration nor the CMD_STORE_REQUEST stream
+  is re-simulated per image. CMD_LAUNCH/CMD_RESUME are deferred and
+  issued per image."""
+
+  def __init__(s, model, src_ctrl_pkt):
+    s.launch_pkts = []
+    s.default_image = []
+    for pkt in src_ctrl_pkt:
+      cmd = int(pkt.payload.cmd)
+      if cmd == CMD_STORE_REQUEST:
+        s.default_image.append(pkt)
+      elif cmd == CMD_LAUNCH or cmd == CMD_RESUME:
+        s.launch_pkts.append(pkt)
+      else:
+        model.recv_from_cpu_pkt(pkt)
+        model.tick()
+
+    # Drains the ctrl ring so that every tile is configured.
+    while model.pending():
+      model.tick()
+    s.config_cycles = model.cycle
+    s.model = model
+
+  def run_one(s, image, src_query_pkt = [], num_complete = None,
+              max_cycles = 100000):
+    model = deepcopy(s.model)
+    for pkt in image:
+      model.set_data_mem(int(pkt.payload.data_addr), pkt.payload.data)
+    sent_pkts = model.sim(s.launch_pkts, src_query_pkt, num_complete,
+                          s.config_cycles + max_cycles)
+    return BatchResultCL(sent_pkts, model.get_data_mem(),
+                         model.cycle - s.config_cycles,
+                         model.execution_cycles())
+
+  def run(s, images = None, src_query_pkt = [], num_complete = None,
+          max_cycles = 100000):
+    """Simulates each image (a list of CMD_STORE_REQUEST packets, i.e.,
+    the same format as the preload data fed into CgraRTL) and returns one
+    BatchResultCL per image. The store requests found in the original
+    packet stream are used if no image is given."""
+
+    if images is None:
+      images = [s.default_image]
+    return [s.run_one(image, src_query_pkt, num_complete, max_cycles)
+            for image in images]
+
+class BatchResultCL:
+
+  __slots__ = ('send_to_cpu_pkts', 'data_mem', 'cycles', 'execution_cycles')
+
+  def __init__(s, send_to_cpu_pkts, data_mem, cycles, execution_cycles):
+    s.send_to_cpu_pkts = send_to_cpu_pkts
+    s.data_mem = data_mem
+    # Cycles since the configuration, i.e., including the launch and the
+    # queries, and the ones of the execution only (see execution_cycles()).
+    s.cycles = cycles
+    s.execution_cycles = execution_cycles
+
+class ElementResultCL:
+
+  __slots__ = ('ready', 'consumed', 'out', 'store', 'ret', 'issued',
+               'pending_load', 'done_without_fire')
+
+  def __init__(s):
+    s.ready = False
+    s.consumed = ()
+    s.out = None
+    s.store = None
+    s.ret = None
+    s.issued = False
+    s.pending_load = None
+    s.done_without_fire = False
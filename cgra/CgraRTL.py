@@ -34,7 +34,11 @@ class CgraRTL(Component):
                 FunctionUnit, FuList, cgra_topology,
                 controller2addr_map, idTo2d_map,
                 is_multi_cgra = True,
-                has_ctrl_ring = True):
+                has_ctrl_ring = True,
+                bank_mapping = BANK_MAPPING_BLOCK,
+                num_dma_lanes = 0,
+                host_mem_size = 64,
+                num_ctrl_banks = 1):
 
     # Derives all types from CgraPayloadType.
     DataType = CgraPayloadType.get_field_type(kAttrData)
@@ -51,8 +55,10 @@ class CgraRTL(Component):
     CtrlPktType = mk_intra_cgra_pkt(multi_cgra_columns, multi_cgra_rows,
                                     num_tiles, CgraPayloadType)
     
+    # The remote load requests of the DMA lanes are identified after the
+    # ones of the tiles.
     NocPktType = mk_inter_cgra_pkt(multi_cgra_columns, multi_cgra_rows,
-                                   num_tiles, num_rd_tiles,
+                                   num_tiles, num_rd_tiles + num_dma_lanes,
                                    CgraPayloadType)
 
     # Other topology can simply modify the tiles connections, or
@@ -102,7 +108,8 @@ class CgraRTL(Component):
                       total_steps, 4, 2, s.num_mesh_ports,
                       s.num_mesh_ports, num_cgras, s.num_tiles,
                       num_registers_per_reg_bank,
-                      FuList = FuList)
+                      FuList = FuList,
+                      num_ctrl_banks = num_ctrl_banks)
               for i in range(s.num_tiles)]
     s.data_mem = DataMemControllerRTL(NocPktType,
                                       data_mem_size_global,
@@ -114,7 +121,10 @@ class CgraRTL(Component):
                                       multi_cgra_columns,
                                       s.num_tiles,
                                       mem_access_is_combinational,
-                                      idTo2d_map)
+                                      idTo2d_map,
+                                      bank_mapping,
+                                      num_dma_lanes,
+                                      host_mem_size)
     s.controller = ControllerRTL(NocPktType,
                                   multi_cgra_rows, multi_cgra_columns,
                                   s.num_tiles, controller2addr_map, idTo2d_map)
@@ -145,6 +155,22 @@ class CgraRTL(Component):
     s.data_mem.send_to_noc_load_response_pkt //= s.controller.recv_from_tile_load_response_pkt
     s.data_mem.send_to_noc_store_pkt //= s.controller.recv_from_tile_store_request_pkt
 
+    # Connects the DMA of the data memory, whose descriptors from the CPU
+    # are delivered by the controller, with the host memory.
+    if num_dma_lanes > 0:
+      HostAddrType = mk_bits(clog2(host_mem_size))
+      s.to_host_raddr = [SendIfcRTL(HostAddrType) for _ in range(num_dma_lanes)]
+      s.from_host_rdata = [RecvIfcRTL(DataType) for _ in range(num_dma_lanes)]
+      s.to_host_waddr = [SendIfcRTL(HostAddrType) for _ in range(num_dma_lanes)]
+      s.to_host_wdata = [SendIfcRTL(DataType) for _ in range(num_dma_lanes)]
+      s.controller.send_to_mem_dma_pkt //= s.data_mem.recv_from_cpu_dma_pkt
+      s.data_mem.send_to_cpu_dma_pkt //= s.controller.recv_from_mem_dma_pkt
+      for k in range(num_dma_lanes):
+        s.data_mem.to_host_raddr[k] //= s.to_host_raddr[k]
+        s.from_host_rdata[k] //= s.data_mem.from_host_rdata[k]
+        s.data_mem.to_host_waddr[k] //= s.to_host_waddr[k]
+        s.data_mem.to_host_wdata[k] //= s.to_host_wdata[k]
+
     if is_multi_cgra:
       s.recv_from_inter_cgra_noc //= s.controller.recv_from_inter_cgra_noc
       s.send_to_inter_cgra_noc //= s.controller.send_to_inter_cgra_noc
@@ -249,12 +275,15 @@ class CgraRTL(Component):
       if i % width == 0 or i // width == 0:
         s.tile[i].to_mem_raddr   //= s.data_mem.recv_raddr[width + i // width - 1 if i >= width else i % width]
         s.tile[i].from_mem_rdata //= s.data_mem.send_rdata[width + i // width - 1 if i >= width else i % width]
+        s.tile[i].to_mem_raddr_opaque   //= s.data_mem.recv_raddr_opaque[width + i // width - 1 if i >= width else i % width]
+        s.tile[i].from_mem_rdata_opaque //= s.data_mem.send_rdata_opaque[width + i // width - 1 if i >= width else i % width]
         s.tile[i].to_mem_waddr   //= s.data_mem.recv_waddr[width + i // width - 1 if i >= width else i % width]
         s.tile[i].to_mem_wdata   //= s.data_mem.recv_wdata[width + i // width - 1 if i >= width else i % width]
       else:
         s.tile[i].to_mem_raddr.rdy   //= 0
         s.tile[i].from_mem_rdata.val //= 0
         s.tile[i].from_mem_rdata.msg //= DataType(0, 0)
+        s.tile[i].from_mem_rdata_opaque //= 0
         s.tile[i].to_mem_waddr.rdy   //= 0
         s.tile[i].to_mem_wdata.rdy   //= 0
 
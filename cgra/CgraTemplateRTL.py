@@ -23,6 +23,7 @@ from ..fu.single.PhiRTL import PhiRTL
 from ..fu.single.AdderRTL import AdderRTL
 from ..fu.single.ShifterRTL import ShifterRTL
 from ..fu.single.MemUnitRTL import MemUnitRTL
+from ..fu.single.NonBlockingMemUnitRTL import NonBlockingMemUnitRTL
 from ..fu.single.SelRTL import SelRTL
 from ..fu.single.CompRTL import CompRTL
 from ..fu.double.SeqMulAdderRTL import SeqMulAdderRTL
@@ -57,6 +58,7 @@ fu_map = {
   "mem": MemUnitRTL,
   "return": RetRTL,
   "mem_indexed": MemUnitRTL,
+  "mem_nonblocking": NonBlockingMemUnitRTL,
   "alloca": None,
   "shift": ShifterRTL,
 }
@@ -83,12 +85,14 @@ class CgraTemplateRTL(Component):
                 provided_max_per_cgra_rows = None,
                 provided_max_per_cgra_cols = None,
                 provided_max_num_rd_tiles = None,
-                provided_max_num_wr_tiles = None):
+                provided_max_num_wr_tiles = None,
+                TileType = TileRTL):
     """
     provided_max_per_cgra_rows: the row number of the largest cgra in the multi heterogeneous cgra architecture. None for single cgra arch or Homogeneous multi-cgra arch.
     provided_max_per_cgra_cols: the column number of the largest cgra in the multi heterogeneous cgra architecture. None for single cgra arch or Homogeneous multi-cgra arch.
     provided_max_num_rd_tiles: the number of read ports of the largest cgra in the multi heterogeneous cgra architecture. None for single cgra arch or Homogeneous multi-cgra arch.
     provided_max_num_wr_tiles: the number of write ports of the largest cgra in the multi heterogeneous cgra architecture. None for single cgra arch or Homogeneous multi-cgra arch.
+    TileType: the component class of the tiles, e.g., a port-only shell of TileRTL when the tiles are translated separately (see lib/util/split_translation.py).
     """
 
     DataType = CgraPayloadType.get_field_type(kAttrData)
@@ -149,15 +153,16 @@ class CgraTemplateRTL(Component):
       s.send_data_on_boundary_east  = [SendIfcRTL(DataType) for _ in range(max_per_cgra_rows)]
 
     # Components
-    s.tile = [TileRTL(CtrlPktType,
-                      ctrl_mem_size,
-                      data_mem_size_global, num_ctrl,
-                      total_steps, 4, 2, s.num_mesh_ports,
-                      s.num_mesh_ports, num_cgras, s.num_tiles,
-                      num_registers_per_reg_bank,
-                      FuList = map_fu2rtl(TileList[i].getAllValidFuTypes()))
-              for i in range(s.num_tiles)]
+    s.tile = [TileType(CtrlPktType,
+                       ctrl_mem_size,
+                       data_mem_size_global, num_ctrl,
+                       total_steps, 4, 2, s.num_mesh_ports,
+                       s.num_mesh_ports, num_cgras, s.num_tiles,
+                       num_registers_per_reg_bank,
+                       FuList = map_fu2rtl(TileList[i].getAllValidFuTypes()))
+               for i in range(s.num_tiles)]
     # FIXME: Need to enrish data-SPM-related user-controlled parameters, e.g., number of banks.
+    # The bank mapping is configured per CGRA via the dataSPM.
     s.data_mem = DataMemControllerRTL(NocPktType,
                                       data_mem_size_global,
                                       data_mem_size_per_bank,
@@ -168,7 +173,8 @@ class CgraTemplateRTL(Component):
                                       multi_cgra_columns,
                                       max_num_tiles,
                                       mem_access_is_combinational,
-                                      idTo2d_map)
+                                      idTo2d_map,
+                                      dataSPM.getBankMapping())
     s.cgra_id = InPort(CgraIdType)
     s.controller = ControllerRTL(NocPktType,
                                   multi_cgra_rows, multi_cgra_columns,
@@ -242,6 +248,8 @@ class CgraTemplateRTL(Component):
         if not link.disabled:
           s.data_mem.recv_raddr[memPort] //= s.tile[dstTileIndex].to_mem_raddr
           s.data_mem.send_rdata[memPort] //= s.tile[dstTileIndex].from_mem_rdata
+          s.data_mem.recv_raddr_opaque[memPort] //= s.tile[dstTileIndex].to_mem_raddr_opaque
+          s.data_mem.send_rdata_opaque[memPort] //= s.tile[dstTileIndex].from_mem_rdata_opaque
 
         # Grounds the generic routing port since it is unused for memory links when in single-CGRA mode.
         # NOTE `recv_data` is used to receive data between multiple CGRAs.
@@ -367,6 +375,7 @@ class CgraTemplateRTL(Component):
           s.tile[i].to_mem_raddr.rdy   //= 0
           s.tile[i].from_mem_rdata.val //= 0
           s.tile[i].from_mem_rdata.msg //= DataType(0, 0)
+          s.tile[i].from_mem_rdata_opaque //= 0
 
         if not TileList[i].hasToMem():
           s.tile[i].to_mem_waddr.rdy //= 0
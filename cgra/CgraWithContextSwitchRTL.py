@@ -32,7 +32,8 @@ class CgraWithContextSwitchRTL(Component):
                 total_steps, mem_access_is_combinational,
                 FunctionUnit, FuList, cgra_topology,
                 controller2addr_map, idTo2d_map,
-                is_multi_cgra = True):
+                is_multi_cgra = True,
+                num_ctrl_banks = 1):
 
     DataType = CgraPayloadType.get_field_type(kAttrData)
     PredicateType = DataType.get_field_type(kAttrPredicate)
@@ -96,7 +97,8 @@ class CgraWithContextSwitchRTL(Component):
                       total_steps, 4, 2, s.num_mesh_ports,
                       s.num_mesh_ports, num_cgras, s.num_tiles,
                       num_registers_per_reg_bank,
-                      FuList = FuList)
+                      FuList = FuList,
+                      num_ctrl_banks = num_ctrl_banks)
               for i in range(s.num_tiles)]
     s.data_mem = DataMemControllerRTL(NocPktType,
                                       data_mem_size_global,
@@ -243,12 +245,15 @@ class CgraWithContextSwitchRTL(Component):
       if i % width == 0 or i // width == 0:
         s.tile[i].to_mem_raddr   //= s.data_mem.recv_raddr[width + i // width - 1 if i >= width else i % width]
         s.tile[i].from_mem_rdata //= s.data_mem.send_rdata[width + i // width - 1 if i >= width else i % width]
+        s.tile[i].to_mem_raddr_opaque   //= s.data_mem.recv_raddr_opaque[width + i // width - 1 if i >= width else i % width]
+        s.tile[i].from_mem_rdata_opaque //= s.data_mem.send_rdata_opaque[width + i // width - 1 if i >= width else i % width]
         s.tile[i].to_mem_waddr   //= s.data_mem.recv_waddr[width + i // width - 1 if i >= width else i % width]
         s.tile[i].to_mem_wdata   //= s.data_mem.recv_wdata[width + i // width - 1 if i >= width else i % width]
       else:
         s.tile[i].to_mem_raddr.rdy   //= 0
         s.tile[i].from_mem_rdata.val //= 0
         s.tile[i].from_mem_rdata.msg //= DataType(0, 0)
+        s.tile[i].from_mem_rdata_opaque //= 0
         s.tile[i].to_mem_waddr.rdy   //= 0
         s.tile[i].to_mem_wdata.rdy   //= 0
 
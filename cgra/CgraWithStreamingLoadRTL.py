@@ -249,6 +249,8 @@ class CgraWithStreamingLoadRTL(Component):
       if i % width == 0 or i // width == 0:
         s.tile[i].to_mem_raddr   //= s.data_mem.recv_raddr[width + i // width - 1 if i >= width else i % width]
         s.tile[i].from_mem_rdata //= s.data_mem.send_rdata[width + i // width - 1 if i >= width else i % width]
+        # The streaming tiles do not tag their loads.
+        s.data_mem.recv_raddr_opaque[width + i // width - 1 if i >= width else i % width] //= 0
         s.tile[i].to_mem_waddr   //= s.data_mem.recv_waddr[width + i // width - 1 if i >= width else i % width]
         s.tile[i].to_mem_wdata   //= s.data_mem.recv_wdata[width + i // width - 1 if i >= width else i % width]
       else:
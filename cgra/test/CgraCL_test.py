@@ -0,0 +1,201 @@
+"""
+==========================================================================
+CgraCL_test.py
+==========================================================================
+Test cases for the cycle-approximate CgraCL model. The kernels and their
+packet streams are the ones of CgraRTL_fir_test.py, whose CgraRTL
+simulations the model is compared against.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import pytest
+
+from .CgraRTL_fir_test import (CgraPayloadType, CtrlType, DataType,
+                               FuOutType, IntraCgraPktType, TileInType,
+                               cgra_id, controller2addr_map, ctrl_mem_size,
+                               data_mem_size_global, data_mem_size_per_bank,
+                               fu_in_code, mk_fir_return, mk_fir_terminate,
+                               num_banks_per_cgra, num_registers_per_reg_bank,
+                               num_routing_outports, num_tile_outports,
+                               read_reg_towards_code, run_fir,
+                               write_reg_from_code, x_tiles, y_tiles)
+from ..CgraCL import CgraBatchCL, CgraCL
+from ...lib.cmd_type import *
+from ...lib.messages import *
+from ...lib.opt_type import *
+from ...lib.util.common import *
+from ...lib.util.multicast import merge_multicast_pkts
+
+def run_cl(src_ctrl_pkt, src_query_pkt, expected_pkts, kCtrlCountPerIter,
+           kTotalCtrlSteps, mem_access_is_combinational):
+  model = CgraCL(IntraCgraPktType, x_tiles, y_tiles, ctrl_mem_size,
+                 data_mem_size_global, data_mem_size_per_bank,
+                 num_banks_per_cgra, num_registers_per_reg_bank,
+                 kCtrlCountPerIter, kTotalCtrlSteps,
+                 mem_access_is_combinational,
+                 controller2addr_map = controller2addr_map,
+                 cgra_id = cgra_id)
+  num_complete = len([pkt for pkt in expected_pkts
+                      if pkt.payload.cmd == CMD_COMPLETE])
+  sent_pkts = model.sim(src_ctrl_pkt, src_query_pkt, num_complete)
+
+  # Only cmd and data are compared, the same as the CgraRTL test sink.
+  def cmd_data(pkts):
+    return sorted([(int(pkt.payload.cmd), int(pkt.payload.data.payload))
+                   for pkt in pkts])
+  assert cmd_data(sent_pkts) == cmd_data(expected_pkts)
+  return model
+
+@pytest.mark.parametrize('mem_access_is_combinational', [True, False])
+def test_homogeneous_4x4_fir_terminate(mem_access_is_combinational):
+  model = run_cl(*mk_fir_terminate(), mem_access_is_combinational)
+  assert model.get_data_mem()[16].payload == 366
+
+@pytest.mark.parametrize('mem_access_is_combinational', [True, False])
+def test_homogeneous_4x4_fir_return(mem_access_is_combinational):
+  run_cl(*mk_fir_return(), mem_access_is_combinational)
+
+@pytest.mark.parametrize('mem_access_is_combinational', [True, False])
+@pytest.mark.parametrize('mk_kernel', [mk_fir_terminate, mk_fir_return])
+def test_homogeneous_4x4_fir_vs_rtl(cmdline_opts, mk_kernel,
+                                    mem_access_is_combinational):
+  # Both models check their packets sent to the CPU against the expected
+  # ones of the kernel, the cycles of the CL model are approximate.
+  cmdline_opts = dict(cmdline_opts, test_verilog = False, dump_vtb = '')
+  model = run_cl(*mk_kernel(), mem_access_is_combinational)
+  report = run_fir(cmdline_opts, *mk_kernel(), mem_access_is_combinational,
+                   with_config_profiler = True).report()
+  assert abs(model.execution_cycles() - report['execution']) <= 2
+
+def test_unsupported_operation():
+  src_ctrl_pkt, src_query_pkt, expected_pkts, kCtrlCountPerIter, \
+      kTotalCtrlSteps = mk_fir_terminate()
+  # Replaces the first ctrl signal of tile 0 with a vector operation.
+  for pkt in src_ctrl_pkt:
+    if pkt.dst == 0 and pkt.payload.cmd == CMD_CONFIG:
+      pkt.payload.ctrl.operation = OPT_VEC_ADD
+      break
+  with pytest.raises(NotImplementedError):
+    run_cl(src_ctrl_pkt, src_query_pkt, expected_pkts, kCtrlCountPerIter,
+           kTotalCtrlSteps, True)
+
+def mk_fir_images(num_images):
+  # Image k holds (10 + k + addr) at addr, so the expected sum is
+  # 3 + (12 + k) * (14 + k) + (13 + k) * (15 + k).
+  return [[IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_STORE_REQUEST, data = DataType(10 + k + addr, 1), data_addr = addr))
+           for addr in range(data_mem_size_per_bank)]
+          for k in range(num_images)]
+
+def mk_fir_batch(mem_access_is_combinational):
+  src_ctrl_pkt, src_query_pkt, expected_pkts, kCtrlCountPerIter, \
+      kTotalCtrlSteps = mk_fir_terminate()
+  model = CgraCL(IntraCgraPktType, x_tiles, y_tiles, ctrl_mem_size,
+                 data_mem_size_global, data_mem_size_per_bank,
+                 num_banks_per_cgra, num_registers_per_reg_bank,
+                 kCtrlCountPerIter, kTotalCtrlSteps,
+                 mem_access_is_combinational,
+                 controller2addr_map = controller2addr_map,
+                 cgra_id = cgra_id)
+  return CgraBatchCL(model, src_ctrl_pkt)
+
+def test_batch_fir_terminate():
+  src_ctrl_pkt, src_query_pkt, expected_pkts, kCtrlCountPerIter, \
+      kTotalCtrlSteps = mk_fir_terminate()
+  batch = mk_fir_batch(True)
+  images = mk_fir_images(4)
+  results = batch.run(images, src_query_pkt, 6)
+  assert len(results) == len(images)
+  for k, result in enumerate(results):
+    expected = 3 + (12 + k) * (14 + k) + (13 + k) * (15 + k)
+    responses = [pkt for pkt in result.send_to_cpu_pkts
+                 if pkt.payload.cmd == CMD_LOAD_RESPONSE]
+    assert len(responses) == 1
+    assert responses[0].payload.data.payload == expected
+    assert result.data_mem[16].payload == expected
+    assert result.cycles > 0
+
+  # Falls back to the store requests of the original packet stream.
+  result = batch.run(src_query_pkt = src_query_pkt, num_complete = 6)[0]
+  assert result.data_mem[16].payload == 366
+
+@pytest.mark.parametrize('mem_access_is_combinational', [True, False])
+def test_batch_fir_terminate_vs_rtl(cmdline_opts, mem_access_is_combinational):
+  # Each image is also run on CgraRTL from scratch, which checks the
+  # results of the batch and the execution cycles the CL model estimates.
+  cmdline_opts = dict(cmdline_opts, test_verilog = False, dump_vtb = '')
+  src_ctrl_pkt, src_query_pkt, expected_pkts, kCtrlCountPerIter, \
+      kTotalCtrlSteps = mk_fir_terminate()
+  kernel_pkts = [pkt for pkt in src_ctrl_pkt
+                 if pkt.payload.cmd != CMD_STORE_REQUEST]
+  batch = mk_fir_batch(mem_access_is_combinational)
+  images = mk_fir_images(2)
+  results = batch.run(images, src_query_pkt, 6)
+  for image, result in zip(images, results):
+    complete_pkts = [pkt for pkt in result.send_to_cpu_pkts
+                     if pkt.payload.cmd == CMD_COMPLETE]
+    response_pkts = [pkt for pkt in result.send_to_cpu_pkts
+                     if pkt.payload.cmd == CMD_LOAD_RESPONSE]
+    report = run_fir(cmdline_opts, image + kernel_pkts, src_query_pkt,
+                     complete_pkts + response_pkts, kCtrlCountPerIter,
+                     kTotalCtrlSteps, mem_access_is_combinational,
+                     with_config_profiler = True).report()
+    assert abs(result.execution_cycles - report['execution']) <= 2
+
+def mk_homogeneous_copy(tile_ids):
+  """Every tile in `tile_ids` runs the same program, copying address 0
+  into address 1, so that their ctrl packets can be multicast."""
+
+  src_ctrl_pkt = [IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_STORE_REQUEST, data = DataType(7, 1), data_addr = 0))]
+  no_routing = [TileInType(0) for _ in range(num_routing_outports)]
+  no_fu_routing = [FuOutType(0) for _ in range(num_routing_outports)]
+  # The loaded value goes to the register of the first FU inport.
+  fu_routing = [FuOutType(0) for _ in range(num_routing_outports)]
+  fu_routing[num_tile_outports] = FuOutType(1)
+  for tile_id in tile_ids:
+    src_ctrl_pkt.extend([
+        IntraCgraPktType(0, tile_id, payload = CgraPayloadType(CMD_CONST, data = DataType(0, 1))),
+        IntraCgraPktType(0, tile_id, payload = CgraPayloadType(CMD_CONST, data = DataType(1, 1))),
+        IntraCgraPktType(0, tile_id, payload = CgraPayloadType(CMD_CONFIG_COUNT_PER_ITER, data = DataType(2, 1))),
+        IntraCgraPktType(0, tile_id, payload = CgraPayloadType(CMD_CONFIG_TOTAL_CTRL_COUNT, data = DataType(4, 1))),
+        IntraCgraPktType(0, tile_id,
+                         payload = CgraPayloadType(CMD_CONFIG, ctrl_addr = 0,
+                                                   ctrl = CtrlType(OPT_LD_CONST,
+                                                                   fu_in_code,
+                                                                   no_routing,
+                                                                   fu_routing,
+                                                                   write_reg_from = write_reg_from_code))),
+        IntraCgraPktType(0, tile_id,
+                         payload = CgraPayloadType(CMD_CONFIG, ctrl_addr = 1,
+                                                   ctrl = CtrlType(OPT_STR_CONST,
+                                                                   fu_in_code,
+                                                                   no_routing,
+                                                                   no_fu_routing,
+                                                                   read_reg_towards = read_reg_towards_code))),
+        IntraCgraPktType(0, tile_id, payload = CgraPayloadType(CMD_LAUNCH)),
+    ])
+  src_query_pkt = [IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_LOAD_REQUEST, data_addr = 1))]
+  expected_pkts = [IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_COMPLETE))
+                   for _ in tile_ids] + \
+                  [IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_LOAD_RESPONSE, data = DataType(7, 1), data_addr = 1))]
+  return src_ctrl_pkt, src_query_pkt, expected_pkts, 2, 4
+
+def test_multicast_homogeneous_copy():
+  tile_ids = [0, 1, 2, 3]
+  src_ctrl_pkt, src_query_pkt, expected_pkts, kCtrlCountPerIter, \
+      kTotalCtrlSteps = mk_homogeneous_copy(tile_ids)
+  # The store request to tile 0 keeps its program unicast if merged along.
+  merged_pkts = src_ctrl_pkt[:1] + merge_multicast_pkts(src_ctrl_pkt[1:])
+  # Only the store request and one copy of the program are left.
+  assert len(merged_pkts) == 1 + (len(src_ctrl_pkt) - 1) // len(tile_ids)
+  assert all(int(pkt.multicast_mask) == 0b1111 for pkt in merged_pkts[1:])
+
+  unicast = run_cl(src_ctrl_pkt, src_query_pkt, expected_pkts,
+                   kCtrlCountPerIter, kTotalCtrlSteps, True)
+  multicast = run_cl(merged_pkts, src_query_pkt, expected_pkts,
+                     kCtrlCountPerIter, kTotalCtrlSteps, True)
+  assert multicast.get_data_mem() == unicast.get_data_mem()
+  assert multicast.get_data_mem()[1] == DataType(7, 1)
+  # The fewer packets through the controller shorten the configuration.
+  assert multicast.cycle < unicast.cycle
@@ -36,6 +36,8 @@ from ...lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
 from ...lib.messages import *
 from ...lib.opt_type import *
 from ...lib.util.common import *
+from ...lib.util.config_profiler import CgraConfigProfiler
+from ...lib.util.perf_counters import CgraPerfCounters
 
 #-------------------------------------------------------------------------
 # Test harness
@@ -327,7 +329,7 @@ for (int i = 2; i < ?; ++i) {
 // expected sum = 2212 + 3 = 2215 (0x8a7)
 '''
 
-def sim_fir_terminate(cmdline_opts, mem_access_is_combinational):
+def mk_fir_terminate():
 
   src_ctrl_pkt = []
   complete_signal_sink_out = []
@@ -829,6 +831,13 @@ def sim_fir_terminate(cmdline_opts, mem_access_is_combinational):
   complete_signal_sink_out.extend(expected_complete_sink_out_pkg)
   complete_signal_sink_out.extend(expected_mem_sink_out_pkt)
 
+  return (src_ctrl_pkt, src_query_pkt, complete_signal_sink_out,
+          kCtrlCountPerIter, kTotalCtrlSteps)
+
+def run_fir(cmdline_opts, src_ctrl_pkt, src_query_pkt,
+            complete_signal_sink_out, kCtrlCountPerIter, kTotalCtrlSteps,
+            mem_access_is_combinational, with_perf_counters = False,
+            with_config_profiler = False):
   th = TestHarness(DUT, FunctionUnit, FuList,
                    IntraCgraPktType,
                    cgra_id, x_tiles, y_tiles,
@@ -846,9 +855,25 @@ def sim_fir_terminate(cmdline_opts, mem_access_is_combinational):
                        ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                         'ALWCOMBORDER'])
   th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  perf_counters = None
+  if with_perf_counters:
+    perf_counters = CgraPerfCounters(th.dut)
+    perf_counters.attach(th)
+  if with_config_profiler:
+    config_profiler = CgraConfigProfiler(th.dut)
+    config_profiler.attach(th)
   run_sim(th)
+  if with_config_profiler:
+    return config_profiler
+  return perf_counters
 
-def sim_fir_return(cmdline_opts, mem_access_is_combinational):
+def sim_fir_terminate(cmdline_opts, mem_access_is_combinational,
+                      with_perf_counters = False, with_config_profiler = False):
+  return run_fir(cmdline_opts, *mk_fir_terminate(),
+                 mem_access_is_combinational, with_perf_counters,
+                 with_config_profiler)
+
+def mk_fir_return():
   src_ctrl_pkt = []
   complete_signal_sink_out = []
   src_query_pkt = []
@@ -1375,24 +1400,11 @@ def sim_fir_return(cmdline_opts, mem_access_is_combinational):
   complete_signal_sink_out.extend(expected_complete_sink_out_pkg)
   complete_signal_sink_out.extend(expected_mem_sink_out_pkt)
 
-  th = TestHarness(DUT, FunctionUnit, FuList,
-                   IntraCgraPktType,
-                   cgra_id, x_tiles, y_tiles,
-                   ctrl_mem_size, data_mem_size_global,
-                   data_mem_size_per_bank, num_banks_per_cgra,
-                   num_registers_per_reg_bank,
-                   src_ctrl_pkt, kCtrlCountPerIter, kTotalCtrlSteps,
-                   mem_access_is_combinational,
-                   controller2addr_map, idTo2d_map, complete_signal_sink_out,
-                   num_cgra_rows, num_cgra_columns,
-                   src_query_pkt)
+  return (src_ctrl_pkt, src_query_pkt, complete_signal_sink_out,
+          kCtrlCountPerIter, kTotalCtrlSteps)
 
-  th.elaborate()
-  th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
-                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
-                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
-  run_sim(th)
+def sim_fir_return(cmdline_opts, mem_access_is_combinational):
+  run_fir(cmdline_opts, *mk_fir_return(), mem_access_is_combinational)
 
 def sim_fir_vector_terminate(cmdline_opts, mem_access_is_combinational):
 
@@ -2579,6 +2591,36 @@ def test_homogeneous_4x4_fir_combinational_mem_access_terminate(cmdline_opts):
 def test_homogeneous_4x4_fir_multi_cycle_mem_access_terminate(cmdline_opts):
   sim_fir_terminate(cmdline_opts, mem_access_is_combinational = False)
 
+def test_homogeneous_4x4_fir_perf_counters(cmdline_opts):
+  # The counters sample the internal signals of the Python simulation.
+  cmdline_opts = dict(cmdline_opts, test_verilog = False, dump_vtb = '')
+  report = sim_fir_terminate(cmdline_opts, mem_access_is_combinational = True,
+                             with_perf_counters = True).report()
+  assert report['cycles'] > 0
+  fu_fire = {}
+  for tile in report['tiles']:
+    assert tile['ctrl_valid'] == tile['ctrl_fire'] + tile['ctrl_stall']
+    assert tile['ctrl_fire'] <= report['cycles']
+    for name, count in tile['fu_fire'].items():
+      assert count <= tile['fu_busy'][name]
+      fu_fire[name] = fu_fire.get(name, 0) + count
+  # Every executed load reaches one of the memory banks.
+  assert fu_fire['OPT_LD'] > 0
+  assert sum(report['data_mem']['rd_requests']) >= fu_fire['OPT_LD']
+
+def test_homogeneous_4x4_fir_config_profiler(cmdline_opts):
+  cmdline_opts = dict(cmdline_opts, test_verilog = False, dump_vtb = '')
+  report = sim_fir_terminate(cmdline_opts, mem_access_is_combinational = True,
+                             with_config_profiler = True).report()
+  launched = [tile for tile in report['tiles'] if tile['config'] is not None]
+  assert launched
+  for tile in launched:
+    assert sum(tile['config_breakdown'].values()) == tile['config']
+    assert tile['pkts']['CMD_LAUNCH'] == 1
+    assert tile['execution'] > 0
+  assert report['config'] == max(tile['config'] for tile in launched)
+  assert report['execution'] > 0
+
 def test_homogeneous_4x4_fir_combinational_mem_access_return(cmdline_opts):
   sim_fir_return(cmdline_opts, mem_access_is_combinational = True)
 
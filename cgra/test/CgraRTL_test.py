@@ -9,6 +9,8 @@ Author : Cheng Tan
   Date : Dec 22, 2024
 """
 
+from copy import deepcopy
+
 from pymtl3.passes.backends.verilog import (VerilogVerilatorImportPass)
 from pymtl3.stdlib.test_utils import (run_sim,
                                       config_model_with_cmdline_opts)
@@ -25,12 +27,15 @@ from ...fu.single.LogicRTL import LogicRTL
 from ...fu.single.LoopControlRTL import LoopControlRTL
 from ...fu.single.MemUnitRTL import MemUnitRTL
 from ...fu.single.MulRTL import MulRTL
+from ...fu.single.NonBlockingMemUnitRTL import NonBlockingMemUnitRTL
 from ...fu.single.PhiRTL import PhiRTL
 from ...fu.single.RetRTL import RetRTL
 from ...fu.single.SelRTL import SelRTL
 from ...fu.single.ShifterRTL import ShifterRTL
 from ...fu.vector.VectorAdderComboRTL import VectorAdderComboRTL
 from ...fu.vector.VectorMulComboRTL import VectorMulComboRTL
+from ...lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
+from ...lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ...lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
 from ...lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
 from ...lib.messages import *
@@ -38,6 +43,70 @@ from ...lib.opt_type import *
 from ...lib.util.common import *
 
 
+#-------------------------------------------------------------------------
+# Inter-CGRA NoC with the remote memories
+#-------------------------------------------------------------------------
+# Models the NoC of the other CGRAs for a single CGRA: the packets towards
+# the CGRA itself are looped back after one cycle (as the bypass queue of
+# the single-CGRA mode), while the memory requests towards the other CGRAs
+# access `remote_data` (addr -> data), and the load responses (echoing the
+# opaque of the requests) come back after `latency` cycles.
+
+class InterCgraNocMemCL(Component):
+
+  def construct(s, NocPktType, cgra_id, latency, remote_data):
+
+    CgraPayloadType = NocPktType.get_field_type(kAttrPayload)
+
+    # Interfaces
+    s.recv = RecvIfcRTL(NocPktType)
+    s.send = SendIfcRTL(NocPktType)
+
+    # Data
+    s.remote_data = dict(remote_data)
+    # (cycle to send at, pkt).
+    s.pending = []
+    s.cycle = 0
+
+    @update_ff
+    def up_noc():
+      if s.reset:
+        s.pending = []
+        s.cycle = 0
+        s.recv.rdy <<= 0
+        s.send.val <<= 0
+      else:
+        s.cycle += 1
+        if s.send.val & s.send.rdy:
+          s.pending.pop(0)
+
+        if s.recv.val & s.recv.rdy:
+          pkt = deepcopy(s.recv.msg)
+          if pkt.dst == cgra_id:
+            s.pending.append((s.cycle + 1, pkt))
+          elif pkt.payload.cmd == CMD_STORE_REQUEST:
+            s.remote_data[int(pkt.payload.data_addr)] = pkt.payload.data
+          elif pkt.payload.cmd == CMD_LOAD_REQUEST:
+            data = s.remote_data[int(pkt.payload.data_addr)]
+            s.pending.append((s.cycle + latency,
+                              NocPktType(pkt.dst, pkt.src, pkt.dst_x, pkt.dst_y,
+                                         pkt.src_x, pkt.src_y, 0, pkt.src_tile_id,
+                                         pkt.remote_src_port, pkt.opaque, 0,
+                                         CgraPayloadType(CMD_LOAD_RESPONSE, data,
+                                                         pkt.payload.data_addr, 0, 0),
+                                         0)))
+          s.pending.sort(key = lambda x : x[0])
+
+        s.recv.rdy <<= 1
+        if s.pending and s.pending[0][0] <= s.cycle:
+          s.send.val <<= 1
+          s.send.msg <<= s.pending[0][1]
+        else:
+          s.send.val <<= 0
+
+  def line_trace(s):
+    return f'{s.recv}>({len(s.pending)})>{s.send}'
+
 #-------------------------------------------------------------------------
 # Test harness
 #-------------------------------------------------------------------------
@@ -54,7 +123,8 @@ class TestHarness(Component):
                 mem_access_is_combinational,
                 topology, controller2addr_map,
                 idTo2d_map, complete_signal_sink_out,
-                multi_cgra_rows, multi_cgra_columns, src_query_pkt):
+                multi_cgra_rows, multi_cgra_columns, src_query_pkt,
+                remote_data = None, remote_latency = 8):
 
     CgraPayloadType = CtrlPktType.get_field_type(kAttrPayload)
     DataType = CgraPayloadType.get_field_type(kAttrData)
@@ -74,7 +144,7 @@ class TestHarness(Component):
                 mem_access_is_combinational,
                 FunctionUnit, FuList, topology,
                 controller2addr_map, idTo2d_map,
-                is_multi_cgra = False)
+                is_multi_cgra = remote_data is not None)
 
     cmp_fn = lambda a, b : a.payload.data == b.payload.data and a.payload.cmd == b.payload.cmd
     s.complete_signal_sink_out = TestSinkRTL(CtrlPktType, complete_signal_sink_out, cmp_fn = cmp_fn)
@@ -113,6 +183,15 @@ class TestHarness(Component):
            (s.complete_count < complete_count_value):
           s.complete_count <<= s.complete_count + CompleteCountType(1)
 
+    # The other CGRAs are modeled by their memories.
+    if remote_data is not None:
+      NocPktType = mk_inter_cgra_pkt(multi_cgra_columns, multi_cgra_rows,
+                                     s.num_tiles, width + height - 1,
+                                     CgraPayloadType)
+      s.noc = InterCgraNocMemCL(NocPktType, cgra_id, remote_latency, remote_data)
+      s.dut.send_to_inter_cgra_noc //= s.noc.recv
+      s.noc.send //= s.dut.recv_from_inter_cgra_noc
+
     # Connects memory address upper and lower bound for each CGRA.
     s.dut.address_lower //= DataAddrType(controller2addr_map[cgra_id][0])
     s.dut.address_upper //= DataAddrType(controller2addr_map[cgra_id][1])
@@ -242,6 +321,7 @@ def init_param(topology, FuList = [MemUnitRTL, AdderRTL],
   complete_signal_sink_out = []
   ctrl_steps = 0
   src_query_pkt = []
+  remote_data = None
   if test_name == 'default':
       '''
       Each tile performs independent INC, without waiting for data from
@@ -579,6 +659,75 @@ def init_param(topology, FuList = [MemUnitRTL, AdderRTL],
       complete_signal_sink_out.extend(expected_complete_sink_out_pkg)
       complete_signal_sink_out.extend(expected_mem_sink_out_pkt)
 
+  elif test_name == 'non_blocking_loads':
+      '''
+      Tile 0 (with the non-blocking memory unit) loads address 40 (in
+      cgra 1's sram, i.e., remote) into register 7 and then address 4
+      (local) into register 6, and stores the two registers to addresses
+      8 and 9. The local response overtakes the remote one, so it needs to
+      fill the entry it is tagged by rather than the oldest outstanding
+      one. As the load data is delivered one iteration later (i.e.,
+      load_distance of 1), two iterations are executed and the first one
+      stores nothing (predicate 0).
+      '''
+      write_reg_from_code = [b2(0) for _ in range(num_fu_inports)]
+      # 2 indicates the FU xbar port (instead of const queue or routing xbar port).
+      write_reg_from_code[0] = b2(2)
+
+      def mk_ld_const(ctrl_addr, reg_idx):
+        write_reg_idx_code = [RegIdxType(0) for _ in range(num_fu_inports)]
+        write_reg_idx_code[0] = RegIdxType(reg_idx)
+        return IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_CONFIG, ctrl_addr = ctrl_addr,
+                                                                ctrl = CtrlType(OPT_LD_CONST,
+                                                                                [FuInType(0) for _ in range(num_fu_inports)],
+                                                                                routing_xbar_code,
+                                                                                fu_xbar_code,
+                                                                                write_reg_from = write_reg_from_code,
+                                                                                write_reg_idx = write_reg_idx_code)))
+
+      def mk_str_const(ctrl_addr, reg_idx):
+        read_reg_idx_code = [RegIdxType(0) for _ in range(num_fu_inports)]
+        read_reg_idx_code[0] = RegIdxType(reg_idx)
+        return IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_CONFIG, ctrl_addr = ctrl_addr,
+                                                                ctrl = CtrlType(OPT_STR_CONST,
+                                                                                fu_in_code,
+                                                                                routing_xbar_code,
+                                                                                [FuOutType(0) for _ in range(num_routing_outports)],
+                                                                                read_reg_towards = read_reg_towards_code,
+                                                                                read_reg_idx = read_reg_idx_code)))
+
+      remote_data = {40 : DataType(0x40, 1)}
+      src_ctrl_pkt = \
+          [
+           IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_STORE_REQUEST, data = DataType(0x04, 1), data_addr = 4)),
+           # The addresses of the remote load, the local load, and the two stores.
+           IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_CONST, data = DataType(40, 1))),
+           IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_CONST, data = DataType(4, 1))),
+           IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_CONST, data = DataType(8, 1))),
+           IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_CONST, data = DataType(9, 1))),
+           IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_CONFIG_COUNT_PER_ITER, data = DataType(4))),
+           IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_CONFIG_TOTAL_CTRL_COUNT, data = DataType(8))),
+           mk_ld_const(0, 7),
+           mk_ld_const(1, 6),
+           mk_str_const(2, 7),
+           mk_str_const(3, 6),
+           IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_LAUNCH)),
+          ]
+
+      src_query_pkt = \
+          [
+           IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_LOAD_REQUEST, data_addr = 8)),
+           IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_LOAD_REQUEST, data_addr = 9)),
+          ]
+
+      complete_signal_sink_out = \
+          [
+           IntraCgraPktType(payload = CgraPayloadType(CMD_COMPLETE)),
+           IntraCgraPktType(payload = CgraPayloadType(CMD_LOAD_RESPONSE, data = DataType(0x40, 1), data_addr = 8)),
+           IntraCgraPktType(payload = CgraPayloadType(CMD_LOAD_RESPONSE, data = DataType(0x04, 1), data_addr = 9)),
+          ]
+      ctrl_steps = ctrl_mem_size
+
   mem_access_is_combinational = True
   th = TestHarness(DUT, FunctionUnit, FuList,
                    IntraCgraPktType,
@@ -590,7 +739,7 @@ def init_param(topology, FuList = [MemUnitRTL, AdderRTL],
                    mem_access_is_combinational, topology,
                    controller2addr_map, idTo2d_map, complete_signal_sink_out,
                    num_cgra_rows, num_cgra_columns,
-                   src_query_pkt)
+                   src_query_pkt, remote_data)
   return th
 
 def test_homogeneous_2x2(cmdline_opts):
@@ -637,6 +786,21 @@ def test_homogeneous_2x2_ctrl_count_2(cmdline_opts):
   th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
   run_sim(th)
 
+def test_non_blocking_loads_local_and_remote(cmdline_opts):
+  topology = "Mesh"
+  FuList = [AdderRTL,
+            PhiRTL,
+            NonBlockingMemUnitRTL,
+           ]
+  th = init_param(topology, FuList, test_name = 'non_blocking_loads')
+
+  th.elaborate()
+  th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
+                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
+                        'ALWCOMBORDER'])
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  run_sim(th)
+
 def test_heterogeneous_king_mesh_2x2(cmdline_opts):
   topology = "KingMesh"
   th = init_param(topology)
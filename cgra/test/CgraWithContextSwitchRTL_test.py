@@ -36,7 +36,9 @@ from ...lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
 from ...lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
 from ...lib.messages import *
 from ...lib.opt_type import *
+from ...lib.util.burst import pack_burst_config_pkts
 from ...lib.util.common import *
+from ...lib.util.config_profiler import CgraConfigProfiler
 
 #-------------------------------------------------------------------------
 # Test harness
@@ -330,7 +332,9 @@ for (int i = 2; i < ?; ++i) {
 '''
 
 
-def sim_fir_return_two_tasks(cmdline_opts, mem_access_is_combinational):
+def sim_fir_return_two_tasks(cmdline_opts, mem_access_is_combinational,
+                             burst_config = False,
+                             with_config_profiler = False):
   src_ctrl_pkt = []
   complete_signal_sink_out = []
   src_query_pkt = []
@@ -1469,6 +1473,8 @@ def sim_fir_return_two_tasks(cmdline_opts, mem_access_is_combinational):
       src_ctrl_pkt.extend(activation)
   for src_opt in src_opt_pkt:
       src_ctrl_pkt.extend(src_opt)
+  if burst_config:
+    src_ctrl_pkt = pack_burst_config_pkts(src_ctrl_pkt)
 
   complete_signal_sink_out.extend(expected_complete_sink_out_pkg)
   complete_signal_sink_out.extend(expected_mem_sink_out_pkt)
@@ -1490,10 +1496,27 @@ def sim_fir_return_two_tasks(cmdline_opts, mem_access_is_combinational):
                        ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                         'ALWCOMBORDER'])
   th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  if with_config_profiler:
+    config_profiler = CgraConfigProfiler(th.dut)
+    config_profiler.attach(th)
   run_sim(th)
+  if with_config_profiler:
+    return config_profiler
 
 def test_sim_fir_combinational_mem_access_return_two_tasks(cmdline_opts):
   sim_fir_return_two_tasks(cmdline_opts, mem_access_is_combinational = True)
 
 def test_sim_fir_multi_cycle_mem_access_return_two_tasks(cmdline_opts):
   sim_fir_return_two_tasks(cmdline_opts, mem_access_is_combinational = False)
+
+def test_sim_fir_burst_config_two_tasks(cmdline_opts):
+  cmdline_opts = dict(cmdline_opts, test_verilog = False, dump_vtb = '')
+  plain = sim_fir_return_two_tasks(cmdline_opts, True,
+                                   with_config_profiler = True).report()
+  burst = sim_fir_return_two_tasks(cmdline_opts, True, burst_config = True,
+                                   with_config_profiler = True).report()
+  # The FU prologue counts folded into the beats save their packets, the
+  # beats themselves still take one packet per ctrl signal.
+  assert burst['config'] < plain['config']
+  for plain_tile, burst_tile in zip(plain['tiles'], burst['tiles']):
+    assert sum(burst_tile['pkts'].values()) <= sum(plain_tile['pkts'].values())
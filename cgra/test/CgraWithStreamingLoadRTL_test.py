@@ -2,7 +2,7 @@
 ==========================================================================
 CgraWithStreamingLoad_test.py
 ==========================================================================
-Test cases for CGRA with tiles that support streaming LD operation.
+Test cases for CGRA with tiles that support streaming LD/ST operations.
 
 Author : Yufei Yang
   Date : Jan 21, 2026
@@ -23,6 +23,7 @@ from ...fu.single.GrantRTL import GrantRTL
 from ...fu.single.CompRTL import CompRTL
 from ...fu.single.LogicRTL import LogicRTL
 from ...fu.single.StreamingMemUnitRTL import StreamingMemUnitRTL
+from ...fu.single.StreamingStoreUnitRTL import StreamingStoreUnitRTL
 from ...fu.single.MulRTL import MulRTL
 from ...fu.single.PhiRTL import PhiRTL
 from ...fu.single.RetRTL import RetRTL
@@ -35,6 +36,7 @@ from ...lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
 from ...lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
 from ...lib.messages import *
 from ...lib.opt_type import *
+from ...lib.util.common import *
 
 
 #-------------------------------------------------------------------------
@@ -57,7 +59,8 @@ class TestHarness(Component):
                 mem_access_is_combinational,
                 has_ctrl_ring,
                 controller2addr_map, idTo2d_map,
-                multi_cgra_rows, multi_cgra_columns):
+                multi_cgra_rows, multi_cgra_columns,
+                expected_mem = {}):
 
     CgraPayloadType = CtrlPktType.get_field_type(kAttrPayload)
     DataType = CgraPayloadType.get_field_type(kAttrData)
@@ -82,6 +85,9 @@ class TestHarness(Component):
                 has_ctrl_ring = has_ctrl_ring)
 
     s.has_ctrl_ring = has_ctrl_ring
+    # Expected data memory contents (addr -> payload) once done.
+    s.expected_mem = expected_mem
+    s.data_mem_size_per_bank = data_mem_size_per_bank
 
     s.sink_out_south_boundary = TestSinkRTL(DataType, sink_out_south_boundary)
 
@@ -125,7 +131,14 @@ class TestHarness(Component):
   def done(s):
     if not s.has_ctrl_ring:
       return True
-    return (s.src_ctrl_pkt.done() and s.sink_out_south_boundary.done())
+    return (s.src_ctrl_pkt.done() and s.sink_out_south_boundary.done() and
+            all(s.read_mem(addr) == payload
+                for addr, payload in s.expected_mem.items()))
+
+  def read_mem(s, addr):
+    bank = addr // s.data_mem_size_per_bank
+    offset = addr % s.data_mem_size_per_bank
+    return int(s.dut.data_mem.memory_wrapper[bank].memory.regs[offset].payload)
 
   def line_trace(s):
     return s.dut.line_trace()
@@ -139,6 +152,7 @@ FuList = [AdderRTL,
           CompRTL,
           GrantRTL,
           StreamingMemUnitRTL,
+          StreamingStoreUnitRTL,
           SelRTL,
           RetRTL,
           FourIncCmpNotGrantRTL,
@@ -345,3 +359,101 @@ def test_streaming_ld_combinational_mem_access(cmdline_opts):
 
 def test_streaming_ld_non_combinational_mem_access(cmdline_opts):
   sim_streaming_ld(cmdline_opts, mem_access_is_combinational = False, has_ctrl_ring = True)
+
+def mk_routing_code(fu_inports):
+  # Routes the tile inports towards the FU inports, i.e., fu_inports maps
+  # each FU inport index onto its tile inport index.
+  code = [0 for _ in range(num_routing_outports)]
+  for fu_inport, tile_inport in fu_inports.items():
+    code[num_tile_outports + fu_inport] = tile_inport + 1
+  return code
+
+def sim_streaming_st(cmdline_opts, mem_access_is_combinational):
+  # FIR-style kernel y[i] = 3 * x[i] without any address computation:
+  # tile 0 streams x[0:4] towards tile 2, which multiplies them by the
+  # coefficient and forwards the results to tile 1 that streams them into
+  # y[0:4] (i.e., data addr 20 ~ 23).
+  num_elements = 4
+  y_addr = 20
+  coefficient = 3
+  src_ctrl_pkt = []
+  for activation in preload_data:
+    src_ctrl_pkt.extend(activation)
+
+  def config(tile, cmd, value):
+    return IntraCgraPktType(0, tile, payload = CgraPayloadType(cmd, data = DataType(value, 1)))
+
+  def ctrl(tile, addr, opt, routing, fu_xbar):
+    return IntraCgraPktType(0, tile,
+                            payload = CgraPayloadType(CMD_CONFIG, ctrl_addr = addr,
+                                                      ctrl = CtrlType(opt,
+                                                                      fu_in_code,
+                                                                      [TileInType(x) for x in mk_routing_code(routing)],
+                                                                      [FuOutType(x) for x in fu_xbar])))
+
+  # Tile 0: NAH, then a single streaming LD towards north.
+  fu_xbar_north = [0 for _ in range(num_routing_outports)]
+  fu_xbar_north[PORT_INDEX_NORTH] = 1
+  src_ctrl_pkt.extend([
+      config(0, CMD_CONFIG_STREAMING_LD_START_ADDR, 0),
+      config(0, CMD_CONFIG_STREAMING_LD_STRIDE, 1),
+      config(0, CMD_CONFIG_STREAMING_LD_END_ADDR, num_elements - 1),
+      ctrl(0, 0, OPT_NAH, {}, [0 for _ in range(num_routing_outports)]),
+      ctrl(0, 1, OPT_STREAM_LD, {}, fu_xbar_north),
+      config(0, CMD_CONFIG_COUNT_PER_ITER, 2),
+      config(0, CMD_CONFIG_TOTAL_CTRL_COUNT, 2),
+  ])
+
+  # Tile 2: multiplies x[i] (from south) by the coefficient, towards
+  # tile 1 on its south east.
+  fu_xbar_southeast = [0 for _ in range(num_routing_outports)]
+  fu_xbar_southeast[PORT_INDEX_SOUTHEAST] = 1
+  src_ctrl_pkt.extend([
+      IntraCgraPktType(0, 2, payload = CgraPayloadType(CMD_CONST, data = DataType(coefficient, 1))),
+      ctrl(2, 0, OPT_MUL_CONST, {0 : PORT_INDEX_SOUTH}, fu_xbar_southeast),
+      config(2, CMD_CONFIG_COUNT_PER_ITER, 1),
+      config(2, CMD_CONFIG_TOTAL_CTRL_COUNT, num_elements),
+  ])
+
+  # Tile 1: streams the results (from north west) into y.
+  src_ctrl_pkt.extend([
+      config(1, CMD_CONFIG_STREAMING_ST_START_ADDR, y_addr),
+      config(1, CMD_CONFIG_STREAMING_ST_STRIDE, 1),
+      config(1, CMD_CONFIG_STREAMING_ST_END_ADDR, y_addr + num_elements - 1),
+      ctrl(1, 0, OPT_STREAM_ST, {0 : PORT_INDEX_NORTHWEST}, [0 for _ in range(num_routing_outports)]),
+      config(1, CMD_CONFIG_COUNT_PER_ITER, 1),
+      config(1, CMD_CONFIG_TOTAL_CTRL_COUNT, num_elements),
+  ])
+
+  src_ctrl_pkt.extend([IntraCgraPktType(0, tile, payload = CgraPayloadType(CMD_LAUNCH))
+                       for tile in [1, 2, 0]])
+
+  # x[i] is preloaded as 10 + i.
+  expected_mem = {y_addr + i : coefficient * (10 + i) for i in range(num_elements)}
+
+  th = TestHarness(DUT, FunctionUnit, FuList,
+                   IntraCgraPktType,
+                   cgra_id, x_tiles, y_tiles,
+                   ctrl_mem_size, data_mem_size_global,
+                   data_mem_size_per_bank, num_banks_per_cgra,
+                   num_registers_per_reg_bank,
+                   src_ctrl_pkt, [], [], [],
+                   1, 1,
+                   mem_access_is_combinational,
+                   True,
+                   controller2addr_map, idTo2d_map,
+                   num_cgra_rows, num_cgra_columns,
+                   expected_mem = expected_mem)
+
+  th.elaborate()
+  th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
+                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
+                        'ALWCOMBORDER'])
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  run_sim(th)
+
+def test_streaming_st_combinational_mem_access(cmdline_opts):
+  sim_streaming_st(cmdline_opts, mem_access_is_combinational = True)
+
+def test_streaming_st_non_combinational_mem_access(cmdline_opts):
+  sim_streaming_st(cmdline_opts, mem_access_is_combinational = False)
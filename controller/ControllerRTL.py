@@ -75,6 +75,11 @@ class ControllerRTL(Component):
     s.send_to_tile_load_response = SendIfcRTL(InterCgraPktType)
     s.send_to_mem_store_request = SendIfcRTL(InterCgraPktType)
 
+    # DMA descriptor towards the local data memory, and its completion
+    # towards the CPU.
+    s.send_to_mem_dma_pkt = SendIfcRTL(InterCgraPktType)
+    s.recv_from_mem_dma_pkt = RecvIfcRTL(InterCgraPktType)
+
     # Component
     s.recv_from_tile_load_request_pkt_queue = ChannelRTL(InterCgraPktType, latency = 1)
     s.recv_from_tile_load_response_pkt_queue = ChannelRTL(InterCgraPktType, latency = 1)
@@ -146,9 +151,10 @@ class ControllerRTL(Component):
       kFromCpuCtrlAndDataIdx = 3
       kFromInterTileRingIdx = 4
       kFromReduceUnitIdx = 5
+      kFromMemDmaIdx = 6
 
       s.send_to_cpu_pkt_queue.recv.val @= 0
-      s.send_to_cpu_pkt_queue.recv.msg @= IntraCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+      s.send_to_cpu_pkt_queue.recv.msg @= IntraCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
       s.recv_from_ctrl_ring_pkt.rdy @= 0
 
       for i in range(CONTROLLER_CROSSBAR_INPORTS):
@@ -171,7 +177,8 @@ class ControllerRTL(Component):
                                                  0, # remote_src_port, only used for inter-cgra remote load request/response.
                                                  0, # opaque
                                                  0, # vc_id. No need to specify vc_id for self produce-consume pkt thanks to the additional VC buffer.
-                                                 s.recv_from_ctrl_ring_pkt.msg.payload))
+                                                 s.recv_from_ctrl_ring_pkt.msg.payload,
+                                                 0)) # multicast_mask
 
       # For the load request from local tiles.
       s.crossbar.recv[kLoadRequestInportIdx].val @= s.recv_from_tile_load_request_pkt_queue.send.val
@@ -201,6 +208,16 @@ class ControllerRTL(Component):
       s.global_reduce_unit.send.rdy @= s.crossbar.recv[kFromReduceUnitIdx].rdy
       s.crossbar.recv[kFromReduceUnitIdx].msg @= s.global_reduce_unit.send.msg
 
+      # For the DMA completion from local memory, which goes back to the
+      # CGRA connecting to the CPU.
+      s.crossbar.recv[kFromMemDmaIdx].val @= s.recv_from_mem_dma_pkt.val
+      s.recv_from_mem_dma_pkt.rdy @= s.crossbar.recv[kFromMemDmaIdx].rdy
+      s.crossbar.recv[kFromMemDmaIdx].msg @= \
+          ControllerXbarPktType(0, # dst (always 0 to align with the single outport of the crossbar, i.e., NoC)
+                                s.recv_from_mem_dma_pkt.msg)
+      s.crossbar.recv[kFromMemDmaIdx].msg.inter_cgra_pkt.dst_x @= s.idTo2d_x_lut[s.recv_from_mem_dma_pkt.msg.dst]
+      s.crossbar.recv[kFromMemDmaIdx].msg.inter_cgra_pkt.dst_y @= s.idTo2d_y_lut[s.recv_from_mem_dma_pkt.msg.dst]
+
       # For the ctrl and data preloading.
       s.crossbar.recv[kFromCpuCtrlAndDataIdx].val @= \
           s.recv_from_cpu_pkt_queue.send.val
@@ -218,7 +235,8 @@ class ControllerRTL(Component):
                                                  0, # remote_src_port, only used for inter-cgra remote load request/response.
                                                  0, # opaque
                                                  0, # vc_id
-                                                 s.recv_from_cpu_pkt_queue.send.msg.payload))
+                                                 s.recv_from_cpu_pkt_queue.send.msg.payload,
+                                                 s.recv_from_cpu_pkt_queue.send.msg.multicast_mask))
 
       # TODO: For the other cmd types.
 
@@ -230,18 +248,20 @@ class ControllerRTL(Component):
       s.send_to_mem_load_request_queue.recv.val @= 0
       s.send_to_mem_store_request_queue.recv.val @= 0
       s.send_to_tile_load_response_queue.recv.val @= 0
+      s.send_to_mem_dma_pkt.val @= 0
+      s.send_to_mem_dma_pkt.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
-      s.send_to_mem_load_request_queue.recv.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-      s.send_to_mem_store_request_queue.recv.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-      s.send_to_tile_load_response_queue.recv.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+      s.send_to_mem_load_request_queue.recv.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+      s.send_to_mem_store_request_queue.recv.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+      s.send_to_tile_load_response_queue.recv.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
       s.recv_from_inter_cgra_noc.rdy @= 0
       s.send_to_ctrl_ring_pkt.val @= 0
-      s.send_to_ctrl_ring_pkt.msg @= IntraCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+      s.send_to_ctrl_ring_pkt.msg @= IntraCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
       s.global_reduce_unit.recv_count.val @= 0
-      s.global_reduce_unit.recv_count.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+      s.global_reduce_unit.recv_count.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
       s.global_reduce_unit.recv_data.val @= 0
-      s.global_reduce_unit.recv_data.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+      s.global_reduce_unit.recv_data.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
       # For the load request from NoC.
       received_pkt = s.recv_from_inter_cgra_noc.msg
@@ -279,14 +299,24 @@ class ControllerRTL(Component):
                                  s.recv_from_inter_cgra_noc.msg.dst_y, # dst_cgra_y
                                  0, # opaque
                                  0, # vc_id
-                                 s.recv_from_inter_cgra_noc.msg.payload)
+                                 s.recv_from_inter_cgra_noc.msg.payload,
+                                 0) # multicast_mask
 
           else:
             s.recv_from_inter_cgra_noc.rdy @= s.send_to_tile_load_response_queue.recv.rdy
             s.send_to_tile_load_response_queue.recv.msg @= received_pkt
             s.send_to_tile_load_response_queue.recv.val @= 1
 
-        elif s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_COMPLETE:
+        elif (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_DMA_STRIDE) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_DMA_LENGTH) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_DMA_PRELOAD) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_DMA_READBACK):
+          s.recv_from_inter_cgra_noc.rdy @= s.send_to_mem_dma_pkt.rdy
+          s.send_to_mem_dma_pkt.val @= 1
+          s.send_to_mem_dma_pkt.msg @= received_pkt
+
+        elif (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_COMPLETE) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_DMA_COMPLETE):
           s.recv_from_inter_cgra_noc.rdy @= s.send_to_cpu_pkt_queue.recv.rdy
           s.send_to_cpu_pkt_queue.recv.val @= 1
           s.send_to_cpu_pkt_queue.recv.msg @= \
@@ -300,7 +330,8 @@ class ControllerRTL(Component):
                                s.recv_from_inter_cgra_noc.msg.dst_y, # dst_cgra_y
                                0, # opaque
                                0, # vc_id
-                               s.recv_from_inter_cgra_noc.msg.payload)
+                               s.recv_from_inter_cgra_noc.msg.payload,
+                               0) # multicast_mask
 
         # Consume and discard the leaf counter complete signal (loop termination
         # notification from LoopCounter FU) to avoid blocking the NoC.
@@ -318,6 +349,9 @@ class ControllerRTL(Component):
           s.global_reduce_unit.recv_count.msg @= s.recv_from_inter_cgra_noc.msg
 
         elif (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_BURST) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_BURST_DATA) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_SWAP_CTRL_BANK) | \
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU) | \
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU_CROSSBAR) | \
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR) | \
@@ -330,6 +364,9 @@ class ControllerRTL(Component):
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_STREAMING_LD_START_ADDR) | \
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_STREAMING_LD_STRIDE) | \
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_STREAMING_LD_END_ADDR) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_STREAMING_ST_START_ADDR) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_STREAMING_ST_STRIDE) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_STREAMING_ST_END_ADDR) | \
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_PAUSE) | \
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_PRESERVE) | \
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_RESUME) | \
@@ -352,7 +389,8 @@ class ControllerRTL(Component):
                                s.recv_from_inter_cgra_noc.msg.dst_y, # dst_cgra_y
                                0, # opaque
                                0, # vc_id
-                               s.recv_from_inter_cgra_noc.msg.payload)
+                               s.recv_from_inter_cgra_noc.msg.payload,
+                               s.recv_from_inter_cgra_noc.msg.multicast_mask)
 
         # else:
         #   # TODO: Handle other cmd types.
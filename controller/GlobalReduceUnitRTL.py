@@ -46,7 +46,7 @@ class GlobalReduceUnitRTL(Component):
     def set_recv_rdy():
       s.recv_data.rdy @= 0
       s.queue.recv.val @= 0
-      s.queue.recv.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+      s.queue.recv.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
       if s.target_count.payload > s.receiving_count.payload:
         s.recv_data.rdy @= s.queue.recv.rdy
         s.queue.recv.msg @= s.recv_data.msg
@@ -39,7 +39,9 @@ class TestHarness(Component):
                 num_rd_tiles,
                 num_cgra_columns,
                 num_cgra_rows,
-                num_tiles):
+                num_tiles,
+                from_mem_dma_pkts = [],
+                expected_to_mem_dma_pkts = []):
 
     num_cgras = num_cgra_columns * num_cgra_rows
     PktType = mk_inter_cgra_pkt(num_cgra_columns,
@@ -62,6 +64,9 @@ class TestHarness(Component):
     s.sink_to_mem_load_response = TestSinkRTL(PktType, expected_to_mem_load_response, cmp_fn = cmp_fn)
     s.sink_to_mem_store_request = TestSinkRTL(PktType, expected_to_mem_store_request_msgs, cmp_fn = cmp_fn)
 
+    s.src_from_mem_dma = TestSrcRTL(PktType, from_mem_dma_pkts)
+    s.sink_to_mem_dma = TestSinkRTL(PktType, expected_to_mem_dma_pkts)
+
     s.src_from_noc = TestSrcRTL(PktType, from_noc_pkts)
     s.sink_to_noc = TestSinkRTL(PktType, expected_to_noc_pkts)
 
@@ -82,6 +87,9 @@ class TestHarness(Component):
     s.dut.send_to_tile_load_response //= s.sink_to_mem_load_response.recv
     s.dut.send_to_mem_load_request //= s.sink_to_mem_load_request.recv
 
+    s.src_from_mem_dma.send //= s.dut.recv_from_mem_dma_pkt
+    s.dut.send_to_mem_dma_pkt //= s.sink_to_mem_dma.recv
+
     s.src_from_noc.send //= s.dut.recv_from_inter_cgra_noc
     s.dut.send_to_inter_cgra_noc //= s.sink_to_noc.recv
 
@@ -99,6 +107,8 @@ class TestHarness(Component):
            s.sink_to_mem_load_request.done()  and \
            s.sink_to_mem_load_response.done() and \
            s.sink_to_mem_store_request.done() and \
+           s.src_from_mem_dma.done() and \
+           s.sink_to_mem_dma.done() and \
            s.src_from_noc.done() and \
            s.sink_to_noc.done()
 
@@ -283,3 +293,32 @@ def test_simple(cmdline_opts):
   th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
   run_sim(th)
 
+
+def test_dma():
+  # The DMA descriptor from the CPU (via CGRA 2) is delivered to the local
+  # data memory, and its completion goes back to CGRA 2.
+  from_noc_pkts = [
+                     # src  dst src_x src_y dst_x dst_y src_tile  dst_tile opq vc                 cmd
+      InterCgraPktType(2,   0,  0,    0,    0,    0,    num_tiles, 0,    0, 0,  0, CgraPayloadType(CMD_CONFIG_DMA_LENGTH, data = DataType(4, 1))),
+      InterCgraPktType(2,   0,  0,    0,    0,    0,    num_tiles, 0,    0, 0,  0, CgraPayloadType(CMD_DMA_PRELOAD, data = DataType(0, 1), data_addr = 1)),
+  ]
+  from_mem_dma_pkts = [
+      InterCgraPktType(0,   2,  0,    0,    0,    0,    0, num_tiles,    0, 0,  0, CgraPayloadType(CMD_DMA_COMPLETE, data = DataType(4, 1), data_addr = 1)),
+  ]
+  expected_to_noc_pkts = [
+      InterCgraPktType(0,   2,  0,    0,    2,    0,    0, num_tiles,    0, 0,  0, CgraPayloadType(CMD_DMA_COMPLETE, data = DataType(4, 1), data_addr = 1)),
+  ]
+  th = TestHarness(CgraPayloadType,
+                   cgra_id,
+                   [], [], [], [], [], [],
+                   from_noc_pkts,
+                   expected_to_noc_pkts,
+                   controller2addr_map,
+                   idTo2d_map,
+                   num_rd_tiles,
+                   num_cgra_columns,
+                   num_cgra_rows,
+                   num_tiles,
+                   from_mem_dma_pkts,
+                   from_noc_pkts)
+  run_sim(th)
@@ -11,7 +11,9 @@ Author : Cheng Tan
 
 from pymtl3 import *
 from ...fu.single.MemUnitRTL import MemUnitRTL
+from ...fu.single.NonBlockingMemUnitRTL import NonBlockingMemUnitRTL
 from ...fu.single.StreamingMemUnitRTL import StreamingMemUnitRTL
+from ...fu.single.StreamingStoreUnitRTL import StreamingStoreUnitRTL
 from ...fu.single.AdderRTL  import AdderRTL
 from ...fu.single.RetRTL  import RetRTL
 from ...fu.single.NahRTL  import NahRTL
@@ -52,13 +54,16 @@ class FlexibleFuRTL(Component):
     # Serves as the bridge between the RetRTL and the ctrl memory controller.
     s.send_to_ctrl_mem = SendIfcRTL(s.CgraPayloadType)
     s.recv_from_ctrl_mem = RecvIfcRTL(s.CgraPayloadType)
-    # Interfaces for streaming LD.
+    # Interfaces for streaming LD/ST.
     s.recv_pkt_from_controller = RecvIfcRTL(CtrlPktType)
 
     s.to_mem_raddr = [SendIfcRTL(s.AddrType) for _ in range(s.fu_list_size)]
     s.from_mem_rdata = [RecvIfcRTL(s.DataType) for _ in range(s.fu_list_size)]
     s.to_mem_waddr = [SendIfcRTL(s.AddrType) for _ in range(s.fu_list_size)]
     s.to_mem_wdata = [SendIfcRTL(s.DataType) for _ in range(s.fu_list_size)]
+    # Tags of the load requests/responses of the non-blocking memory unit.
+    s.to_mem_raddr_opaque = [OutPort(OpaqueType) for _ in range(s.fu_list_size)]
+    s.from_mem_rdata_opaque = [InPort(OpaqueType) for _ in range(s.fu_list_size)]
     s.clear = [InPort(b1) for _ in range(s.fu_list_size)]
 
     s.prologue_count_inport = InPort(PrologueCountType)
@@ -81,8 +86,20 @@ class FlexibleFuRTL(Component):
       s.to_mem_waddr[i] //= s.fu[i].to_mem_waddr
       s.to_mem_wdata[i] //= s.fu[i].to_mem_wdata
       s.clear[i] //= s.fu[i].clear
-      if FuList[i] == StreamingMemUnitRTL:
-        s.recv_pkt_from_controller //= s.fu[i].recv_from_controller_pkt
+      if FuList[i] == NonBlockingMemUnitRTL:
+        s.to_mem_raddr_opaque[i] //= s.fu[i].to_mem_raddr_opaque
+        s.from_mem_rdata_opaque[i] //= s.fu[i].from_mem_rdata_opaque
+      else:
+        s.to_mem_raddr_opaque[i] //= 0
+
+    # Both streaming units are always ready for their config packets.
+    streaming_fus = [i for i in range(len(FuList))
+                     if FuList[i] in [StreamingMemUnitRTL, StreamingStoreUnitRTL]]
+    for i in streaming_fus:
+      s.fu[i].recv_from_controller_pkt.val //= s.recv_pkt_from_controller.val
+      s.fu[i].recv_from_controller_pkt.msg //= s.recv_pkt_from_controller.msg
+    if streaming_fus:
+      s.recv_pkt_from_controller.rdy //= s.fu[streaming_fus[0]].recv_from_controller_pkt.rdy
     
     @update
     def connect_to_controller():
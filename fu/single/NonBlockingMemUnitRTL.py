@@ -0,0 +1,366 @@
+"""
+==========================================================================
+NonBlockingMemUnitRTL.py
+==========================================================================
+Scratchpad memory access unit for CGRA tiles, whose loads do not wait for
+the memory response (e.g., of a remote SRAM via the controller and the
+inter-CGRA NoC), so the loads of consecutive iterations overlap with the
+memory latency.
+
+A load ctrl issues its request into a table of outstanding loads (tagged
+by the ctrl address) and completes once the data of the same ctrl issued
+`load_distance` activations (i.e., iterations) earlier is delivered, so
+the data is returned in program order, `load_distance` iterations later,
+which the mapping needs to take into account like a loop-carried
+dependence. During the first `load_distance` iterations, data with
+predicate 0 is delivered instead. The table needs at least
+load_distance * (number of load ctrls of the tile) entries.
+
+Each request carries its table entry index as the opaque, which the
+memory echoes in the response, so the responses can arrive out of order
+(e.g., a local load overtaking a remote one).
+
+Stores behave the same as MemUnitRTL.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+from ...lib.basic.val_rdy.ifcs import ValRdySendIfcRTL, ValRdyRecvIfcRTL
+from ...lib.messages import *
+from ...lib.opt_type import *
+
+class NonBlockingMemUnitRTL(Component):
+
+  def construct(s, CtrlPktType, num_inports, num_outports,
+                vector_factor_power = 0, num_outstanding_loads = 4,
+                load_distance = 1):
+
+    # Constant
+    assert(num_outstanding_loads >= 2)
+    assert(2 ** clog2(num_outstanding_loads) == num_outstanding_loads)
+    assert(1 <= load_distance <= num_outstanding_loads)
+    assert(num_outstanding_loads <= 2 ** OpaqueType.nbits)
+    DataType = CtrlPktType.get_field_type(kAttrPayload).get_field_type(kAttrData)
+    AddrType = CtrlPktType.get_field_type(kAttrPayload).get_field_type(kAttrDataAddr)
+    CtrlType = CtrlPktType.get_field_type(kAttrPayload).get_field_type(kAttrCtrl)
+    CtrlAddrType = CtrlPktType.get_field_type(kAttrPayload).get_field_type(kAttrCtrlAddr)
+    s.ctrl_addr_inport = InPort(CtrlAddrType)
+    EntryIdxType = mk_bits(clog2(num_outstanding_loads))
+    CountType = mk_bits(clog2(num_outstanding_loads + 1))
+    FuInType = mk_bits(clog2(num_inports + 1))
+    # 3 indicates at most 7, i.e., 2^7 vectorization factor -> 128
+    VectorFactorPowerType = mk_bits(3)
+    VectorFactorType = mk_bits(8)
+    s.CgraPayloadType = mk_cgra_payload(DataType,
+                                        AddrType,
+                                        CtrlType,
+                                        CtrlAddrType)
+
+    # Interfaces.
+    s.recv_in = [ValRdyRecvIfcRTL(DataType) for _ in range(num_inports)]
+    s.recv_const = ValRdyRecvIfcRTL(DataType)
+    s.recv_opt = ValRdyRecvIfcRTL(CtrlType)
+    s.send_out = [ValRdySendIfcRTL(DataType) for _ in range(num_outports)]
+    s.send_to_ctrl_mem = ValRdySendIfcRTL(s.CgraPayloadType)
+    s.recv_from_ctrl_mem = ValRdyRecvIfcRTL(s.CgraPayloadType)
+
+    # Interfaces to the data sram, need to interface them with
+    # the data memory module in top level.
+    s.to_mem_raddr = ValRdySendIfcRTL(AddrType)
+    s.from_mem_rdata = ValRdyRecvIfcRTL(DataType)
+    s.to_mem_waddr = ValRdySendIfcRTL(AddrType)
+    s.to_mem_wdata = ValRdySendIfcRTL(DataType)
+    # Table entry of the load request/response.
+    s.to_mem_raddr_opaque = OutPort(OpaqueType)
+    s.from_mem_rdata_opaque = InPort(OpaqueType)
+
+    # Flushes the outstanding loads.
+    s.clear = InPort(b1)
+
+    s.in0 = Wire(FuInType)
+    s.in1 = Wire(FuInType)
+
+    idx_nbits = clog2(num_inports)
+    s.in0_idx = Wire(idx_nbits)
+    s.in1_idx = Wire(idx_nbits)
+
+    s.in0_idx //= s.in0[0:idx_nbits]
+    s.in1_idx //= s.in1[0:idx_nbits]
+
+    # Components.
+    s.recv_all_val = Wire(1)
+    s.vector_factor_power = Wire(VectorFactorPowerType)
+    s.vector_factor_counter = Wire(VectorFactorType)
+    s.reached_vector_factor = Wire(1)
+
+    # Table of outstanding loads, in the program order from `head`. An
+    # entry is `returned` once its data arrives (or right away for the
+    # loads skipped due to predicate 0), and is popped once delivered.
+    s.entry_valid = [Wire(b1) for _ in range(num_outstanding_loads)]
+    s.entry_returned = [Wire(b1) for _ in range(num_outstanding_loads)]
+    s.entry_tag = [Wire(CtrlAddrType) for _ in range(num_outstanding_loads)]
+    s.entry_predicate = [Wire(b1) for _ in range(num_outstanding_loads)]
+    s.entry_data = [Wire(DataType) for _ in range(num_outstanding_loads)]
+    s.head = Wire(EntryIdxType)
+    s.tail = Wire(EntryIdxType)
+    s.count = Wire(CountType)
+
+    # The load of the current ctrl.
+    s.is_load = Wire(1)
+    s.ld_addr = Wire(AddrType)
+    s.ld_addr_val = Wire(1)
+    s.ld_skip_mem = Wire(1)
+    s.ld_predicate = Wire(1)
+    # Whether the current ctrl has already issued its load/delivered the
+    # earlier load, which could happen in different cycles.
+    s.issued = Wire(1)
+    s.delivered = Wire(1)
+    s.issue_fire = Wire(1)
+    s.deliver_fire = Wire(1)
+    # Whether the current ctrl delivers an earlier load rather than the
+    # predicate 0 data of the first iterations.
+    s.deliver_due = Wire(1)
+    s.num_pending = Wire(CountType)
+    s.fill_idx = Wire(EntryIdxType)
+
+    # Connections.
+    s.vector_factor_power //= vector_factor_power
+
+    # The request is tagged by the entry it is issued into, and the
+    # response fills the entry it is tagged by.
+    @update
+    def update_opaque():
+      s.to_mem_raddr_opaque @= zext(s.tail, OpaqueType)
+      s.fill_idx @= trunc(s.from_mem_rdata_opaque, EntryIdxType)
+
+    @update
+    def update_table_status():
+      # Outstanding loads of the current ctrl.
+      s.num_pending @= CountType(0)
+      for k in range(num_outstanding_loads):
+        if s.entry_valid[k] & (s.entry_tag[k] == s.ctrl_addr_inport):
+          s.num_pending @= s.num_pending + CountType(1)
+      s.deliver_due @= (s.num_pending - zext(s.issued, CountType)) >= \
+                       CountType(load_distance)
+
+    @update
+    def comb_logic():
+
+      s.recv_all_val @= 0
+      # For pick input register
+      s.in0 @= FuInType(0)
+      s.in1 @= FuInType(0)
+      for i in range(num_inports):
+        s.recv_in[i].rdy @= b1(0)
+      for i in range(num_outports):
+        s.send_out[i].val @= 0
+        s.send_out[i].msg @= DataType()
+
+      s.recv_const.rdy @= 0
+      s.recv_opt.rdy @= 0
+
+      s.send_to_ctrl_mem.val @= 0
+      s.send_to_ctrl_mem.msg @= s.CgraPayloadType(0, 0, 0, 0, 0)
+      s.recv_from_ctrl_mem.rdy @= 0
+
+      if s.recv_opt.val:
+        if s.recv_opt.msg.fu_in[0] != 0:
+          s.in0 @= zext(s.recv_opt.msg.fu_in[0] - 1, FuInType)
+        if s.recv_opt.msg.fu_in[1] != 0:
+          s.in1 @= zext(s.recv_opt.msg.fu_in[1] - 1, FuInType)
+
+      s.to_mem_waddr.val @= 0
+      s.to_mem_waddr.msg @= AddrType()
+      s.to_mem_wdata.val @= 0
+      s.to_mem_wdata.msg @= DataType()
+      s.to_mem_raddr.val @= 0
+      s.to_mem_raddr.msg @= AddrType()
+      # Responses are accepted regardless of the current ctrl.
+      s.from_mem_rdata.rdy @= 1
+
+      s.is_load @= 0
+      s.ld_addr @= AddrType()
+      s.ld_addr_val @= 0
+      s.ld_skip_mem @= 0
+      s.ld_predicate @= 1
+      s.issue_fire @= 0
+      s.deliver_fire @= 0
+
+      if s.recv_opt.val:
+        if s.recv_opt.msg.operation == OPT_LD:
+          s.is_load @= 1
+          s.ld_addr_val @= s.recv_in[s.in0_idx].val
+          s.ld_addr @= AddrType(s.recv_in[s.in0_idx].msg.payload[0:AddrType.nbits])
+          # Do not access memory if the raddr has predicate=0, but still
+          # delivers a fake data with predicate=0 in order.
+          s.ld_skip_mem @= s.recv_in[s.in0_idx].msg.predicate == 0
+
+        # ADD_CONST_LD indicates the address is added on a const, then perform load.
+        elif s.recv_opt.msg.operation == OPT_ADD_CONST_LD:
+          s.is_load @= 1
+          s.ld_addr_val @= s.recv_in[s.in0_idx].val & s.recv_const.val
+          # It is okay to always set recv_const.rdy=1 here, because the const queue
+          # would only proceed once the operation is done executing.
+          s.recv_const.rdy @= 1
+          s.ld_addr @= AddrType(s.recv_in[s.in0_idx].msg.payload[0:AddrType.nbits] +
+                                s.recv_const.msg.payload[0:AddrType.nbits])
+          s.ld_skip_mem @= s.recv_in[s.in0_idx].msg.predicate == 0
+
+        # LD_CONST indicates the address is a const.
+        elif s.recv_opt.msg.operation == OPT_LD_CONST:
+          s.is_load @= 1
+          s.ld_addr_val @= s.recv_const.val
+          s.recv_const.rdy @= 1
+          s.ld_addr @= AddrType(s.recv_const.msg.payload[0:AddrType.nbits])
+          s.ld_predicate @= s.recv_const.msg.predicate
+
+        elif s.recv_opt.msg.operation == OPT_STR:
+          s.recv_all_val @= s.recv_in[s.in0_idx].val & \
+                            s.recv_in[s.in1_idx].val
+          s.recv_in[s.in0_idx].rdy @= s.recv_all_val & s.to_mem_waddr.rdy & s.to_mem_wdata.rdy
+          s.recv_in[s.in1_idx].rdy @= s.recv_all_val & s.to_mem_waddr.rdy & s.to_mem_wdata.rdy
+          s.to_mem_waddr.msg @= AddrType(s.recv_in[s.in0_idx].msg.payload[0:AddrType.nbits])
+          s.to_mem_waddr.val @= s.recv_all_val
+          s.to_mem_wdata.msg @= s.recv_in[s.in1_idx].msg
+          s.to_mem_wdata.msg.predicate @= s.recv_in[s.in0_idx].msg.predicate & \
+                                          s.recv_in[s.in1_idx].msg.predicate & \
+                                          s.reached_vector_factor
+          s.to_mem_wdata.val @= s.recv_all_val
+          s.recv_opt.rdy @= s.recv_all_val & s.to_mem_waddr.rdy & s.to_mem_wdata.rdy
+
+        # STR_CONST indicates the address is a const.
+        elif s.recv_opt.msg.operation == OPT_STR_CONST:
+          s.recv_all_val @= s.recv_in[s.in0_idx].val & s.recv_const.val
+          s.recv_const.rdy @= s.recv_all_val & s.to_mem_waddr.rdy & s.to_mem_wdata.rdy
+          # Only needs one input register to indicate the storing data.
+          s.recv_in[s.in0_idx].rdy @= s.recv_all_val & s.to_mem_waddr.rdy & s.to_mem_wdata.rdy
+          s.to_mem_waddr.msg @= AddrType(s.recv_const.msg.payload[0:AddrType.nbits])
+          s.to_mem_waddr.val @= s.recv_all_val & \
+                                s.recv_in[s.in0_idx].msg.predicate & \
+                                s.recv_const.msg.predicate
+          s.to_mem_wdata.msg @= s.recv_in[s.in0_idx].msg
+          s.to_mem_wdata.msg.predicate @= s.recv_in[s.in0_idx].msg.predicate & \
+                                          s.recv_const.msg.predicate & \
+                                          s.reached_vector_factor
+          s.to_mem_wdata.val @= s.recv_all_val & \
+                                s.recv_in[s.in0_idx].msg.predicate & \
+                                s.recv_const.msg.predicate
+          s.recv_opt.rdy @= s.recv_all_val & s.to_mem_waddr.rdy & s.to_mem_wdata.rdy
+
+        else:
+          s.recv_opt.rdy @= 0
+          s.recv_in[s.in0_idx].rdy @= 0
+          s.recv_in[s.in1_idx].rdy @= 0
+
+      if s.is_load:
+        # Issues the load into the table (and the memory) once per ctrl.
+        s.recv_all_val @= s.ld_addr_val & ~s.issued & \
+                          (s.count < CountType(num_outstanding_loads))
+        s.to_mem_raddr.msg @= s.ld_addr
+        s.to_mem_raddr.val @= s.recv_all_val & ~s.ld_skip_mem
+        s.issue_fire @= s.recv_all_val & (s.ld_skip_mem | s.to_mem_raddr.rdy)
+        if s.recv_opt.msg.operation != OPT_LD_CONST:
+          s.recv_in[s.in0_idx].rdy @= s.issue_fire
+
+        # Delivers the earlier load of the same ctrl in order.
+        if ~s.delivered:
+          if s.deliver_due:
+            s.send_out[0].val @= s.entry_valid[s.head] & s.entry_returned[s.head] & \
+                                 (s.entry_tag[s.head] == s.ctrl_addr_inport)
+            s.send_out[0].msg @= s.entry_data[s.head]
+            s.send_out[0].msg.predicate @= s.entry_data[s.head].predicate & \
+                                           s.entry_predicate[s.head] & \
+                                           s.reached_vector_factor
+          else:
+            s.send_out[0].val @= 1
+            s.send_out[0].msg.predicate @= 0
+        s.deliver_fire @= s.send_out[0].val & s.send_out[0].rdy
+
+        s.recv_opt.rdy @= (s.issued | s.issue_fire) & (s.delivered | s.deliver_fire)
+
+    @update_ff
+    def update_table():
+      if s.reset | s.clear:
+        s.head <<= EntryIdxType(0)
+        s.tail <<= EntryIdxType(0)
+        s.count <<= CountType(0)
+        for k in range(num_outstanding_loads):
+          s.entry_valid[k] <<= 0
+          s.entry_returned[k] <<= 0
+      else:
+        if s.issue_fire:
+          s.entry_valid[s.tail] <<= 1
+          s.entry_returned[s.tail] <<= s.ld_skip_mem
+          s.entry_tag[s.tail] <<= s.ctrl_addr_inport
+          s.entry_predicate[s.tail] <<= s.ld_predicate
+          s.entry_data[s.tail] <<= DataType()
+          s.tail <<= s.tail + EntryIdxType(1)
+
+        # The response of a combinational memory arrives along with its
+        # request, while the ones of the loads flushed by `clear` are
+        # dropped.
+        if s.from_mem_rdata.val & \
+           ((s.entry_valid[s.fill_idx] & ~s.entry_returned[s.fill_idx]) | \
+            (s.issue_fire & (s.fill_idx == s.tail))):
+          s.entry_data[s.fill_idx] <<= s.from_mem_rdata.msg
+          s.entry_returned[s.fill_idx] <<= 1
+
+        if s.deliver_fire & s.deliver_due:
+          s.entry_valid[s.head] <<= 0
+          s.head <<= s.head + EntryIdxType(1)
+
+        if s.issue_fire & ~(s.deliver_fire & s.deliver_due):
+          s.count <<= s.count + CountType(1)
+        elif ~s.issue_fire & s.deliver_fire & s.deliver_due:
+          s.count <<= s.count - CountType(1)
+
+    @update_ff
+    def update_issued_delivered():
+      if s.reset | s.clear:
+        s.issued <<= 0
+        s.delivered <<= 0
+      else:
+        if s.recv_opt.val & s.recv_opt.rdy:
+          s.issued <<= 0
+          s.delivered <<= 0
+        else:
+          if s.issue_fire:
+            s.issued <<= 1
+          if s.deliver_fire:
+            s.delivered <<= 1
+
+    @update
+    def update_reached_vector_factor():
+      s.reached_vector_factor @= 0
+      if s.recv_opt.val & (s.vector_factor_counter + \
+                           (VectorFactorType(1) << zext(s.vector_factor_power, VectorFactorType)) >= \
+                           (VectorFactorType(1) << zext(s.recv_opt.msg.vector_factor_power, VectorFactorType))):
+        s.reached_vector_factor @= 1
+
+    @update_ff
+    def update_vector_factor_counter():
+      if s.reset:
+        s.vector_factor_counter <<= 0
+      else:
+        if s.recv_opt.val:
+          if s.recv_opt.msg.is_last_ctrl & \
+             (s.vector_factor_counter + \
+              (VectorFactorType(1) << zext(s.vector_factor_power, VectorFactorType)) < \
+             (VectorFactorType(1) << zext(s.recv_opt.msg.vector_factor_power, VectorFactorType))):
+            s.vector_factor_counter <<= s.vector_factor_counter + \
+                                        (VectorFactorType(1) << zext(s.vector_factor_power, \
+                                                                     VectorFactorType))
+          elif s.recv_opt.msg.is_last_ctrl & s.reached_vector_factor:
+            s.vector_factor_counter <<= 0
+
+  def line_trace(s):
+    opt_str = " #"
+    if s.recv_opt.val:
+      opt_str = OPT_SYMBOL_DICT[s.recv_opt.msg.operation]
+    out_str = ",".join([str(x.msg) for x in s.send_out])
+    recv_str = ",".join([str(x.msg) for x in s.recv_in])
+    table_str = "|".join([f"{s.entry_tag[k]}:{s.entry_data[k]}" if s.entry_returned[k] else f"{s.entry_tag[k]}:..."
+                          for k in range(len(s.entry_valid)) if s.entry_valid[k]])
+    return f'[recv: {recv_str}] {opt_str} (const: {s.recv_const.msg}) ] = [out: {out_str}] (outstanding: [{table_str}])'
@@ -0,0 +1,268 @@
+"""
+==========================================================================
+StreamingStoreUnitRTL.py
+==========================================================================
+Scratchpad memory streaming store unit for CGRA tiles.
+
+Each OPT_STREAM_ST stores its operand to the next address of the stream
+configured by CMD_CONFIG_STREAMING_ST_START_ADDR/STRIDE/END_ADDR (and
+rewound by CMD_LAUNCH), so no other FU needs to compute the store
+addresses. Operands with predicate=0 are skipped without consuming a
+stream address, and the stores beyond the end address are dropped.
+
+The stores are buffered in a small write buffer that drains towards the
+memory back-to-back, so the ctrl does not wait for the memory port
+unless the buffer is full. The memory port takes one word per cycle, so
+the stores are not combined.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+from ...lib.basic.val_rdy.ifcs import ValRdySendIfcRTL, ValRdyRecvIfcRTL
+from ...lib.cmd_type import *
+from ...lib.messages import *
+from ...lib.opt_type import *
+
+class StreamingStoreUnitRTL(Component):
+
+  def construct(s, CtrlPktType, num_inports, num_outports,
+                vector_factor_power = 0, num_write_buffer_entries = 2):
+
+    # Constant
+    assert(num_write_buffer_entries >= 2)
+    assert(2 ** clog2(num_write_buffer_entries) == num_write_buffer_entries)
+    DataType = CtrlPktType.get_field_type(kAttrPayload).get_field_type(kAttrData)
+    AddrType = CtrlPktType.get_field_type(kAttrPayload).get_field_type(kAttrDataAddr)
+    CtrlType = CtrlPktType.get_field_type(kAttrPayload).get_field_type(kAttrCtrl)
+    CtrlAddrType = CtrlPktType.get_field_type(kAttrPayload).get_field_type(kAttrCtrlAddr)
+    s.ctrl_addr_inport = InPort(CtrlAddrType)
+    EntryIdxType = mk_bits(clog2(num_write_buffer_entries))
+    CountType = mk_bits(clog2(num_write_buffer_entries + 1))
+    FuInType = mk_bits(clog2(num_inports + 1))
+    # 3 indicates at most 7, i.e., 2^7 vectorization factor -> 128
+    VectorFactorPowerType = mk_bits(3)
+    VectorFactorType = mk_bits(8)
+    s.CgraPayloadType = mk_cgra_payload(DataType,
+                                        AddrType,
+                                        CtrlType,
+                                        CtrlAddrType)
+
+    # Interfaces.
+    s.recv_in = [ValRdyRecvIfcRTL(DataType) for _ in range(num_inports)]
+    s.recv_const = ValRdyRecvIfcRTL(DataType)
+    s.recv_opt = ValRdyRecvIfcRTL(CtrlType)
+    s.send_out = [ValRdySendIfcRTL(DataType) for _ in range(num_outports)]
+    s.send_to_ctrl_mem = ValRdySendIfcRTL(s.CgraPayloadType)
+    s.recv_from_ctrl_mem = ValRdyRecvIfcRTL(s.CgraPayloadType)
+    s.recv_from_controller_pkt = ValRdyRecvIfcRTL(CtrlPktType)
+
+    # Interfaces to the data sram, need to interface them with
+    # the data memory module in top level.
+    s.to_mem_raddr = ValRdySendIfcRTL(AddrType)
+    s.from_mem_rdata = ValRdyRecvIfcRTL(DataType)
+    s.to_mem_waddr = ValRdySendIfcRTL(AddrType)
+    s.to_mem_wdata = ValRdySendIfcRTL(DataType)
+
+    # Redundant interface, only used by PhiRTL.
+    s.clear = InPort(b1)
+
+    s.in0 = Wire(FuInType)
+
+    idx_nbits = clog2(num_inports)
+    s.in0_idx = Wire(idx_nbits)
+
+    s.in0_idx //= s.in0[0:idx_nbits]
+
+    # Components.
+    s.recv_all_val = Wire(1)
+    s.vector_factor_power = Wire(VectorFactorPowerType)
+    s.vector_factor_counter = Wire(VectorFactorType)
+    s.reached_vector_factor = Wire(1)
+
+    # Registers for streaming ST.
+    s.streaming_start_waddr = Wire(AddrType)
+    s.streaming_stride = Wire(AddrType)
+    s.streaming_end_waddr = Wire(AddrType)
+    # Indicates the waddr of the next store of the stream.
+    s.single_request_addr = Wire(AddrType)
+    s.streaming_done = Wire(b1)
+
+    # Write buffer, drained from `head` in order.
+    s.entry_addr = [Wire(AddrType) for _ in range(num_write_buffer_entries)]
+    s.entry_data = [Wire(DataType) for _ in range(num_write_buffer_entries)]
+    s.head = Wire(EntryIdxType)
+    s.tail = Wire(EntryIdxType)
+    s.count = Wire(CountType)
+
+    # The store of the current ctrl.
+    s.store_data = Wire(DataType)
+    s.store_skip = Wire(1)
+    s.store_fire = Wire(1)
+    s.drain_fire = Wire(1)
+
+    # Connections.
+    s.vector_factor_power //= vector_factor_power
+
+    @update
+    def comb_logic():
+
+      s.recv_all_val @= 0
+      # For pick input register
+      s.in0 @= FuInType(0)
+      for i in range(num_inports):
+        s.recv_in[i].rdy @= b1(0)
+      for i in range(num_outports):
+        s.send_out[i].val @= 0
+        s.send_out[i].msg @= DataType()
+
+      s.recv_const.rdy @= 0
+      s.recv_opt.rdy @= 0
+
+      s.send_to_ctrl_mem.val @= 0
+      s.send_to_ctrl_mem.msg @= s.CgraPayloadType(0, 0, 0, 0, 0)
+      s.recv_from_ctrl_mem.rdy @= 0
+
+      if s.recv_opt.val:
+        if s.recv_opt.msg.fu_in[0] != 0:
+          s.in0 @= zext(s.recv_opt.msg.fu_in[0] - 1, FuInType)
+
+      # Streaming ST never loads.
+      s.to_mem_raddr.val @= 0
+      s.to_mem_raddr.msg @= AddrType()
+      s.from_mem_rdata.rdy @= 0
+
+      # Drains the oldest buffered store.
+      s.to_mem_waddr.val @= s.count != CountType(0)
+      s.to_mem_waddr.msg @= s.entry_addr[s.head]
+      s.to_mem_wdata.val @= s.count != CountType(0)
+      s.to_mem_wdata.msg @= s.entry_data[s.head]
+      s.drain_fire @= (s.count != CountType(0)) & \
+                      s.to_mem_waddr.rdy & s.to_mem_wdata.rdy
+
+      s.store_data @= s.recv_in[s.in0_idx].msg
+      s.store_data.predicate @= s.recv_in[s.in0_idx].msg.predicate & \
+                                s.reached_vector_factor
+      # Skips the operands with predicate=0 and the ones beyond the stream.
+      s.store_skip @= ~s.recv_in[s.in0_idx].msg.predicate | s.streaming_done
+      s.store_fire @= 0
+
+      if s.recv_opt.val:
+        if s.recv_opt.msg.operation == OPT_STREAM_ST:
+          s.recv_all_val @= s.recv_in[s.in0_idx].val
+          s.store_fire @= s.recv_all_val & \
+                          (s.store_skip | \
+                           (s.count < CountType(num_write_buffer_entries)))
+          s.recv_in[s.in0_idx].rdy @= s.store_fire
+          s.recv_opt.rdy @= s.store_fire
+
+        else:
+          s.recv_opt.rdy @= 0
+          s.recv_in[s.in0_idx].rdy @= 0
+
+    @update_ff
+    def update_write_buffer():
+      if s.reset:
+        s.head <<= EntryIdxType(0)
+        s.tail <<= EntryIdxType(0)
+        s.count <<= CountType(0)
+      else:
+        if s.store_fire & ~s.store_skip:
+          s.entry_addr[s.tail] <<= s.single_request_addr
+          s.entry_data[s.tail] <<= s.store_data
+          s.tail <<= s.tail + EntryIdxType(1)
+
+        if s.drain_fire:
+          s.head <<= s.head + EntryIdxType(1)
+
+        if s.store_fire & ~s.store_skip & ~s.drain_fire:
+          s.count <<= s.count + CountType(1)
+        elif ~(s.store_fire & ~s.store_skip) & s.drain_fire:
+          s.count <<= s.count - CountType(1)
+
+    @update_ff
+    def update_single_request_addr():
+      if s.recv_from_controller_pkt.val & (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_STREAMING_ST_START_ADDR):
+        # (Re)starts the stream once its start addr is configured.
+        s.single_request_addr <<= trunc(s.recv_from_controller_pkt.msg.payload.data.payload, AddrType)
+      elif s.recv_from_controller_pkt.val & (s.recv_from_controller_pkt.msg.payload.cmd == CMD_LAUNCH):
+        # Rewinds the stream for every launch of the kernel.
+        s.single_request_addr <<= s.streaming_start_waddr
+      elif s.store_fire & ~s.store_skip:
+        s.single_request_addr <<= s.single_request_addr + s.streaming_stride
+      else:
+        s.single_request_addr <<= s.single_request_addr
+
+    @update_ff
+    def update_streaming_done():
+      if s.reset:
+        s.streaming_done <<= 0
+      elif s.recv_from_controller_pkt.val & \
+           ((s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_STREAMING_ST_START_ADDR) | \
+            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_LAUNCH)):
+        s.streaming_done <<= 0
+      elif s.store_fire & ~s.store_skip & (s.single_request_addr == s.streaming_end_waddr):
+        # Stream is done once the store to the end addr is accepted.
+        s.streaming_done <<= 1
+      else:
+        s.streaming_done <<= s.streaming_done
+
+    # Updates the streaming ST config registers.
+    @update_ff
+    def update_streaming_start_waddr():
+      if s.recv_from_controller_pkt.val & (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_STREAMING_ST_START_ADDR):
+        s.streaming_start_waddr <<= trunc(s.recv_from_controller_pkt.msg.payload.data.payload, AddrType)
+      else:
+        s.streaming_start_waddr <<= s.streaming_start_waddr
+
+    @update_ff
+    def update_streaming_stride():
+      if s.recv_from_controller_pkt.val & (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_STREAMING_ST_STRIDE):
+        s.streaming_stride <<= trunc(s.recv_from_controller_pkt.msg.payload.data.payload, AddrType)
+      else:
+        s.streaming_stride <<= s.streaming_stride
+
+    @update_ff
+    def update_streaming_end_waddr():
+      if s.recv_from_controller_pkt.val & (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_STREAMING_ST_END_ADDR):
+        s.streaming_end_waddr <<= trunc(s.recv_from_controller_pkt.msg.payload.data.payload, AddrType)
+      else:
+        s.streaming_end_waddr <<= s.streaming_end_waddr
+
+    @update
+    def update_recv_from_controller_pkt_rdy():
+      s.recv_from_controller_pkt.rdy @= 1
+
+    @update
+    def update_reached_vector_factor():
+      s.reached_vector_factor @= 0
+      if s.recv_opt.val & (s.vector_factor_counter + \
+                           (VectorFactorType(1) << zext(s.vector_factor_power, VectorFactorType)) >= \
+                           (VectorFactorType(1) << zext(s.recv_opt.msg.vector_factor_power, VectorFactorType))):
+        s.reached_vector_factor @= 1
+
+    @update_ff
+    def update_vector_factor_counter():
+      if s.reset:
+        s.vector_factor_counter <<= 0
+      else:
+        if s.recv_opt.val:
+          if s.recv_opt.msg.is_last_ctrl & \
+             (s.vector_factor_counter + \
+              (VectorFactorType(1) << zext(s.vector_factor_power, VectorFactorType)) < \
+             (VectorFactorType(1) << zext(s.recv_opt.msg.vector_factor_power, VectorFactorType))):
+            s.vector_factor_counter <<= s.vector_factor_counter + \
+                                        (VectorFactorType(1) << zext(s.vector_factor_power, \
+                                                                     VectorFactorType))
+          elif s.recv_opt.msg.is_last_ctrl & s.reached_vector_factor:
+            s.vector_factor_counter <<= 0
+
+  def line_trace(s):
+    opt_str = " #"
+    if s.recv_opt.val:
+      opt_str = OPT_SYMBOL_DICT[s.recv_opt.msg.operation]
+    recv_str = ",".join([str(x.msg) for x in s.recv_in])
+    buffer_str = "|".join([f"{s.entry_addr[(int(s.head) + k) % len(s.entry_addr)]}:{s.entry_data[(int(s.head) + k) % len(s.entry_addr)]}"
+                           for k in range(int(s.count))])
+    return f'[recv: {recv_str}] {opt_str} (waddr: {s.single_request_addr}, done: {s.streaming_done}) (write_buffer: [{buffer_str}])'
@@ -0,0 +1,176 @@
+"""
+==========================================================================
+NonBlockingMemUnitRTL_test.py
+==========================================================================
+Test cases for the non-blocking memory access unit, against a memory
+with multi-cycle load latency.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+
+from ..NonBlockingMemUnitRTL import NonBlockingMemUnitRTL
+from ....lib.basic.val_rdy.queues import NormalQueueRTL
+from ....lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
+from ....lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
+from ....lib.messages import *
+from ....lib.opt_type import *
+from ....mem.data.DataMemCL import DataMemCL
+
+#-------------------------------------------------------------------------
+# Test harness
+#-------------------------------------------------------------------------
+
+class TestHarness(Component):
+
+  def construct(s, FunctionUnit, IntraCgraPktType, DataType, ConfigType,
+                num_inports, num_outports, data_mem_size, mem_latency,
+                preload_data, num_ctrls, src0_msgs, src1_msgs,
+                src_const_msgs, ctrl_msgs, sink_msgs, load_distance = 1):
+
+    AddrType = mk_bits(clog2(data_mem_size))
+    # The memory echoes the opaque of the read request in the response.
+    RdReqType = mk_bitstruct("RdReq", {'addr' : AddrType,
+                                       'opaque' : OpaqueType})
+    CtrlAddrType = IntraCgraPktType.get_field_type(kAttrPayload).get_field_type(kAttrCtrlAddr)
+
+    s.src_in0 = TestSrcRTL(DataType, src0_msgs)
+    s.src_in1 = TestSrcRTL(DataType, src1_msgs)
+    s.src_const = TestSrcRTL(DataType, src_const_msgs)
+    s.src_opt = TestSrcRTL(ConfigType, ctrl_msgs)
+    s.sink_out = TestSinkRTL(DataType, sink_msgs)
+
+    s.dut = FunctionUnit(IntraCgraPktType, num_inports, num_outports,
+                         load_distance = load_distance)
+    s.data_mem = DataMemCL(DataType, data_mem_size, preload_data = preload_data)
+    # Each queue on the read address path adds one cycle of load latency.
+    s.raddr_queue = [NormalQueueRTL(RdReqType) for _ in range(mem_latency)]
+    # Mimics the ctrl memory iterating over `num_ctrls` ctrls.
+    s.ctrl_addr = Wire(CtrlAddrType)
+
+    s.raddr_queue[0].recv.val //= s.dut.to_mem_raddr.val
+    s.raddr_queue[0].recv.rdy //= s.dut.to_mem_raddr.rdy
+    for i in range(mem_latency - 1):
+      s.raddr_queue[i].send //= s.raddr_queue[i + 1].recv
+    s.data_mem.recv_raddr[0].val //= s.raddr_queue[mem_latency - 1].send.val
+    s.data_mem.recv_raddr[0].rdy //= s.raddr_queue[mem_latency - 1].send.rdy
+    s.dut.from_mem_rdata //= s.data_mem.send_rdata[0]
+    s.dut.to_mem_waddr //= s.data_mem.recv_waddr[0]
+    s.dut.to_mem_wdata //= s.data_mem.recv_wdata[0]
+
+    s.src_in0.send //= s.dut.recv_in[0]
+    s.src_in1.send //= s.dut.recv_in[1]
+    s.src_const.send //= s.dut.recv_const
+    s.src_opt.send //= s.dut.recv_opt
+    s.dut.send_out[0] //= s.sink_out.recv
+    s.dut.ctrl_addr_inport //= s.ctrl_addr
+    s.dut.clear //= 0
+
+    @update
+    def update_raddr():
+      s.raddr_queue[0].recv.msg @= RdReqType(s.dut.to_mem_raddr.msg,
+                                             s.dut.to_mem_raddr_opaque)
+      s.data_mem.recv_raddr[0].msg @= s.raddr_queue[mem_latency - 1].send.msg.addr
+      s.dut.from_mem_rdata_opaque @= s.raddr_queue[mem_latency - 1].send.msg.opaque
+
+    @update_ff
+    def update_ctrl_addr():
+      if s.reset:
+        s.ctrl_addr <<= CtrlAddrType(0)
+      elif s.dut.recv_opt.val & s.dut.recv_opt.rdy:
+        if s.ctrl_addr == CtrlAddrType(num_ctrls - 1):
+          s.ctrl_addr <<= CtrlAddrType(0)
+        else:
+          s.ctrl_addr <<= s.ctrl_addr + CtrlAddrType(1)
+
+  def done(s):
+    return s.src_in0.done() and s.src_in1.done() and \
+           s.src_opt.done() and s.sink_out.done()
+
+  def line_trace(s):
+    return s.data_mem.line_trace() + ' || ' + s.dut.line_trace()
+
+def run_sim(test_harness, max_cycles = 60):
+  test_harness.elaborate()
+  test_harness.apply(DefaultPassGroup())
+  test_harness.sim_reset()
+
+  # Run simulation
+  ncycles = 0
+  print()
+  print("{}:{}".format(ncycles, test_harness.line_trace()))
+  while not test_harness.done() and ncycles < max_cycles:
+    test_harness.sim_tick()
+    ncycles += 1
+    print("{}:{}".format(ncycles, test_harness.line_trace()))
+
+  # Check timeout
+  assert ncycles < max_cycles
+
+  test_harness.sim_tick()
+  test_harness.sim_tick()
+  test_harness.sim_tick()
+  return ncycles
+
+num_inports = 2
+num_outports = 1
+data_mem_size = 16
+ctrl_mem_size = 4
+mem_latency = 3
+DataType = mk_data(16, 1)
+ConfigType = mk_ctrl(num_inports, num_outports)
+DataAddrType = mk_bits(clog2(data_mem_size))
+CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+CgraPayloadType = mk_cgra_payload(DataType, DataAddrType, ConfigType, CtrlAddrType)
+IntraCgraPktType = mk_intra_cgra_pkt(1, 1, 1, CgraPayloadType)
+FuInType = mk_bits(clog2(num_inports + 1))
+pickRegister = [FuInType(x + 1) for x in range(num_inports)]
+preload_data = [DataType(0x10 + i, 1) for i in range(data_mem_size)]
+
+def test_non_blocking_loads():
+  num_iterations = 8
+  src_in0 = [DataType(i, 1) for i in range(num_iterations)]
+  src_opt = [ConfigType(OPT_LD, pickRegister) for _ in range(num_iterations)]
+  # Each load is delivered `mem_latency` iterations later.
+  sink_out = [DataType(0, 0) for _ in range(mem_latency)] + \
+             [DataType(0x10 + i, 1) for i in range(num_iterations - mem_latency)]
+  th = TestHarness(NonBlockingMemUnitRTL, IntraCgraPktType, DataType,
+                   ConfigType, num_inports, num_outports, data_mem_size,
+                   mem_latency, preload_data, 1, src_in0, [], [], src_opt,
+                   sink_out, load_distance = mem_latency)
+  ncycles = run_sim(th)
+  # A blocking unit spends at least `mem_latency` cycles on every load,
+  # while the non-blocking one overlaps the loads of the iterations.
+  assert ncycles < num_iterations * mem_latency
+
+def test_non_blocking_loads_in_program_order():
+  # Two load ctrls per iteration (the second one with predicate 0 in the
+  # second iteration), interleaved in the table.
+  src_in0 = [DataType(1, 1), DataType(2, 1),
+             DataType(3, 1), DataType(4, 0),
+             DataType(5, 1), DataType(6, 1)]
+  src_const = [DataType(0, 1)]
+  src_opt = [ConfigType(OPT_LD, pickRegister) for _ in range(6)]
+  sink_out = [DataType(0, 0), DataType(0, 0),
+              DataType(0x11, 1), DataType(0x12, 1),
+              DataType(0x13, 1), DataType(0, 0)]
+  th = TestHarness(NonBlockingMemUnitRTL, IntraCgraPktType, DataType,
+                   ConfigType, num_inports, num_outports, data_mem_size,
+                   mem_latency, preload_data, 2, src_in0, [], src_const,
+                   src_opt, sink_out)
+  run_sim(th)
+
+def test_non_blocking_store():
+  src_in0 = [DataType(1, 1), DataType(1, 1), DataType(2, 1)]
+  src_in1 = [DataType(9, 1)]
+  src_opt = [ConfigType(OPT_STR, pickRegister),
+             ConfigType(OPT_LD, pickRegister),
+             ConfigType(OPT_LD, pickRegister)]
+  sink_out = [DataType(0, 0), DataType(9, 1)]
+  th = TestHarness(NonBlockingMemUnitRTL, IntraCgraPktType, DataType,
+                   ConfigType, num_inports, num_outports, data_mem_size,
+                   mem_latency, preload_data, 1, src_in0, src_in1, [],
+                   src_opt, sink_out)
+  run_sim(th)
@@ -0,0 +1,161 @@
+"""
+==========================================================================
+StreamingStoreUnitRTL_test.py
+==========================================================================
+Test cases for the streaming store unit.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+
+from ..StreamingStoreUnitRTL import StreamingStoreUnitRTL
+from ....lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
+from ....lib.cmd_type import *
+from ....lib.messages import *
+from ....lib.opt_type import *
+from ....mem.data.DataMemCL import DataMemCL
+
+#-------------------------------------------------------------------------
+# Test harness
+#-------------------------------------------------------------------------
+
+class TestHarness(Component):
+
+  def construct(s, FunctionUnit, CtrlPktType, DataType, CtrlType,
+                num_inports, num_outports, data_mem_size,
+                src_ctrl_msgs, src_in0_msgs, src_opt_msgs,
+                num_write_stall_cycles = 0):
+
+    AddrType = mk_bits(clog2(data_mem_size))
+
+    # Data starts streaming after the stream is configured.
+    s.src_ctrl = TestSrcRTL(CtrlPktType, src_ctrl_msgs)
+    s.src_in0 = TestSrcRTL(DataType, src_in0_msgs,
+                           initial_delay = len(src_ctrl_msgs))
+    s.src_opt = TestSrcRTL(CtrlType, src_opt_msgs)
+
+    s.dut = FunctionUnit(CtrlPktType, num_inports, num_outports)
+    s.data_mem = DataMemCL(DataType, data_mem_size)
+
+    # The memory refuses writes during the first `num_write_stall_cycles`.
+    s.cycle = Wire(32)
+    s.write_en = Wire(1)
+    # Number of writes that reach the memory.
+    s.num_writes = Wire(32)
+
+    s.src_ctrl.send //= s.dut.recv_from_controller_pkt
+    s.src_in0.send //= s.dut.recv_in[0]
+    s.src_opt.send //= s.dut.recv_opt
+    s.dut.to_mem_raddr //= s.data_mem.recv_raddr[0]
+    s.dut.from_mem_rdata //= s.data_mem.send_rdata[0]
+    s.dut.ctrl_addr_inport //= 0
+    s.dut.clear //= 0
+    for i in range(1, num_inports):
+      s.dut.recv_in[i].val //= 0
+      s.dut.recv_in[i].msg //= DataType()
+    s.dut.recv_const.val //= 0
+    s.dut.recv_const.msg //= DataType()
+    s.dut.send_out[0].rdy //= 0
+    s.dut.send_to_ctrl_mem.rdy //= 0
+    s.dut.recv_from_ctrl_mem.val //= 0
+    s.dut.recv_from_ctrl_mem.msg //= s.dut.CgraPayloadType()
+
+    @update
+    def gate_mem_write():
+      s.write_en @= s.cycle >= num_write_stall_cycles
+      s.data_mem.recv_waddr[0].val @= s.dut.to_mem_waddr.val & s.write_en
+      s.data_mem.recv_waddr[0].msg @= s.dut.to_mem_waddr.msg
+      s.data_mem.recv_wdata[0].val @= s.dut.to_mem_wdata.val & s.write_en
+      s.data_mem.recv_wdata[0].msg @= s.dut.to_mem_wdata.msg
+      s.dut.to_mem_waddr.rdy @= s.data_mem.recv_waddr[0].rdy & s.write_en
+      s.dut.to_mem_wdata.rdy @= s.data_mem.recv_wdata[0].rdy & s.write_en
+
+    @update_ff
+    def update_cycle():
+      if s.reset:
+        s.cycle <<= 0
+        s.num_writes <<= 0
+      else:
+        s.cycle <<= s.cycle + 1
+        if s.data_mem.recv_waddr[0].val & s.data_mem.recv_waddr[0].rdy:
+          s.num_writes <<= s.num_writes + 1
+
+  def done(s):
+    return s.src_ctrl.done() and s.src_in0.done() and s.src_opt.done() and \
+           (s.dut.count == 0)
+
+  def line_trace(s):
+    return s.data_mem.line_trace() + ' || ' + s.dut.line_trace()
+
+def run_sim(test_harness, max_cycles = 40):
+  test_harness.elaborate()
+  test_harness.apply(DefaultPassGroup())
+  test_harness.sim_reset()
+
+  # Run simulation
+  ncycles = 0
+  print()
+  print("{}:{}".format(ncycles, test_harness.line_trace()))
+  while not test_harness.done() and ncycles < max_cycles:
+    test_harness.sim_tick()
+    ncycles += 1
+    print("{}:{}".format(ncycles, test_harness.line_trace()))
+
+  # Check timeout
+  assert ncycles < max_cycles
+
+  test_harness.sim_tick()
+  test_harness.sim_tick()
+  test_harness.sim_tick()
+
+num_inports = 2
+num_outports = 1
+data_mem_size = 16
+ctrl_mem_size = 4
+DataType = mk_data(16, 1)
+CtrlType = mk_ctrl(num_inports, num_outports)
+DataAddrType = mk_bits(clog2(data_mem_size))
+CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+CgraPayloadType = mk_cgra_payload(DataType, DataAddrType, CtrlType, CtrlAddrType)
+CtrlPktType = mk_intra_cgra_pkt(1, 1, 1, CgraPayloadType)
+FuInType = mk_bits(clog2(num_inports + 1))
+pickRegister = [FuInType(x + 1) for x in range(num_inports)]
+
+def mk_stream_config(start, stride, end):
+  return [
+    CtrlPktType(0, 0, payload = CgraPayloadType(CMD_CONFIG_STREAMING_ST_START_ADDR, data = DataType(start, 1))),
+    CtrlPktType(0, 0, payload = CgraPayloadType(CMD_CONFIG_STREAMING_ST_STRIDE, data = DataType(stride, 1))),
+    CtrlPktType(0, 0, payload = CgraPayloadType(CMD_CONFIG_STREAMING_ST_END_ADDR, data = DataType(end, 1))),
+  ]
+
+def test_streaming_store():
+  src_ctrl = mk_stream_config(2, 2, 8)
+  # The operand with predicate=0 is skipped, and the last one is beyond
+  # the end addr.
+  src_in0 = [DataType(1, 1), DataType(2, 1), DataType(3, 0),
+             DataType(4, 1), DataType(5, 1), DataType(6, 1)]
+  src_opt = [CtrlType(OPT_STREAM_ST, pickRegister) for _ in src_in0]
+  th = TestHarness(StreamingStoreUnitRTL, CtrlPktType, DataType, CtrlType,
+                   num_inports, num_outports, data_mem_size,
+                   src_ctrl, src_in0, src_opt)
+  run_sim(th)
+  assert [int(th.data_mem.sram[addr].payload) for addr in range(data_mem_size)] == \
+         [0, 0, 1, 0, 2, 0, 4, 0, 5, 0, 0, 0, 0, 0, 0, 0]
+  assert th.num_writes == 4
+
+def test_streaming_store_write_stall():
+  # The write buffer fills up while the memory refuses writes, which
+  # stalls the ctrl until the buffered stores drain in order.
+  src_ctrl = mk_stream_config(3, 1, 15)
+  src_in0 = [DataType(i, 1) for i in range(1, 7)]
+  src_opt = [CtrlType(OPT_STREAM_ST, pickRegister) for _ in src_in0]
+  th = TestHarness(StreamingStoreUnitRTL, CtrlPktType, DataType, CtrlType,
+                   num_inports, num_outports, data_mem_size,
+                   src_ctrl, src_in0, src_opt,
+                   num_write_stall_cycles = 20)
+  run_sim(th)
+  assert [int(th.data_mem.sram[addr].payload) for addr in range(3, 9)] == \
+         [1, 2, 3, 4, 5, 6]
+  assert th.num_writes == 6
@@ -0,0 +1,110 @@
+"""
+========================================================================
+StreamSinkRTL
+========================================================================
+Test sink with RTL interfaces comparing the received messages on the
+fly against the expected ones pulled lazily from any iterable or from a
+binary packet program file (see StreamSourceRTL). Only the last
+`history_size` received messages are kept, for the error message.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from collections import deque
+
+from pymtl3 import *
+from .ifcs import RecvIfcRTL
+from .SinkRTL import PyMTLTestSinkError
+from .StreamSourceRTL import MsgStream
+
+
+#-------------------------------------------------------------------------
+# StreamSinkRTL
+#-------------------------------------------------------------------------
+
+class StreamSinkRTL( Component ):
+
+  def construct( s, Type, msgs, initial_delay=0, interval_delay=0,
+                 cmp_fn=lambda a, b : a == b, history_size=4 ):
+
+    # Interface
+
+    s.recv = RecvIfcRTL( Type )
+
+    # Data
+
+    s.stream  = MsgStream( Type, msgs )
+    s.history = deque( maxlen=history_size )
+
+    s.idx   = 0
+    s.count = 0
+
+    s.error_msg = ''
+
+    s.all_msg_recved = False
+    s.done_flag      = False
+
+    def format_history():
+      return ''.join([ f'\nReceived before : {msg}' for msg in s.history ])
+
+    @update_ff
+    def up_sink():
+      # Raise exception at the start of next cycle so that the errored
+      # line trace gets printed out
+      if s.error_msg:
+        raise PyMTLTestSinkError( s.error_msg )
+
+      # Tick one more cycle after all message is received so that the
+      # exception gets thrown
+      if s.all_msg_recved:
+        s.done_flag = True
+
+      if s.reset:
+        s.stream.restart()
+        s.history.clear()
+        s.all_msg_recved = False
+        s.done_flag      = False
+
+        s.idx   = 0
+        s.count = initial_delay
+        s.recv.rdy <<= s.stream.peek() & (s.count == 0)
+
+      else:
+        if s.stream.done():
+          s.all_msg_recved = True
+
+        if s.recv.val & s.recv.rdy:
+          msg = s.recv.msg
+
+          # Sanity check
+          if not s.stream.peek():
+            s.error_msg = ( 'Test Sink received more msgs than expected!\n'
+                           f'Received : {msg}' )
+
+          # Check correctness
+          elif not cmp_fn( msg, s.stream.head ):
+            s.error_msg = (
+              f'Test sink {s} received WRONG message {s.idx}!\n'
+              f'Expected : { s.stream.head }\n'
+              f'Received : { msg }' + format_history()
+            )
+
+          s.stream.pop()
+          s.history.appendleft( msg.clone() )
+          s.idx += 1
+          s.count = interval_delay
+
+        if s.count > 0:
+          s.count -= 1
+          s.recv.rdy <<= 0
+        else: # s.count == 0
+          s.recv.rdy <<= s.stream.peek()
+
+  def done( s ):
+    return s.done_flag
+
+  # Line trace
+
+  def line_trace( s ):
+    return f"{s.recv}"
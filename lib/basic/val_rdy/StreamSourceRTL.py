@@ -0,0 +1,112 @@
+"""
+========================================================================
+StreamSourceRTL
+========================================================================
+Test source with RTL interfaces pulling its messages lazily from any
+iterable (e.g., a generator) or from a binary packet program file (see
+lib/util/pkt_program.py), so that long streams start right away and
+use constant memory, unlike SourceRTL that deep-copies the whole list.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+from .ifcs import SendIfcRTL
+from ...util.pkt_program import PktProgramReader
+
+
+#-------------------------------------------------------------------------
+# MsgStream
+#-------------------------------------------------------------------------
+# One-message lookahead over an iterable of messages. A path is opened
+# as a packet program whose packets are constructed one at a time.
+
+class MsgStream:
+
+  def __init__( s, Type, msgs ):
+    if isinstance( msgs, str ):
+      msgs = PktProgramReader( msgs, Type )
+    s.msgs = msgs
+    s.it   = None
+    s.restart()
+
+  # Re-iterable objects (lists, packet programs) restart from the first
+  # message, iterators (e.g., generators) carry on where they are, with
+  # the message already pulled.
+
+  def restart( s ):
+    it = iter( s.msgs )
+    if it is not s.it:
+      s.it        = it
+      s.head      = None
+      s.has_head  = False
+      s.exhausted = False
+
+  def peek( s ):
+    if not s.has_head and not s.exhausted:
+      try:
+        s.head     = next( s.it )
+        s.has_head = True
+      except StopIteration:
+        s.exhausted = True
+    return s.has_head
+
+  def pop( s ):
+    s.head     = None
+    s.has_head = False
+
+  def done( s ):
+    return not s.peek()
+
+#-------------------------------------------------------------------------
+# StreamSourceRTL
+#-------------------------------------------------------------------------
+
+class StreamSourceRTL( Component ):
+
+  def construct( s, Type, msgs, initial_delay=0, interval_delay=0 ):
+
+    # Interface
+
+    s.send = SendIfcRTL( Type )
+
+    # Data
+
+    s.stream = MsgStream( Type, msgs )
+
+    s.num_sent = 0
+    s.count    = 0
+
+    @update_ff
+    def up_src():
+      if s.reset:
+        s.stream.restart()
+        s.num_sent = 0
+        s.count    = initial_delay
+        s.send.val <<= 0
+
+      else:
+        if s.send.val & s.send.rdy:
+          s.stream.pop()
+          s.num_sent += 1
+          s.count = interval_delay
+
+        if s.count > 0:
+          s.count -= 1
+          s.send.val <<= 0
+
+        else: # s.count == 0
+          if s.stream.peek():
+            s.send.val <<= 1
+            s.send.msg <<= s.stream.head
+          else:
+            s.send.val <<= 0
+
+  def done( s ):
+    return s.stream.done()
+
+  # Line trace
+
+  def line_trace( s ):
+    return f"{s.send}"
@@ -0,0 +1,93 @@
+"""
+==========================================================================
+StreamSourceSinkRTL_test.py
+==========================================================================
+Test cases for the streaming test source and sink.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import pytest
+
+from pymtl3 import *
+from ..SinkRTL import PyMTLTestSinkError
+from ..StreamSinkRTL import StreamSinkRTL
+from ..StreamSourceRTL import StreamSourceRTL
+from ..queues import NormalQueueRTL
+from ....util.pkt_program import write_pkt_program
+from ....util.test.pkt_program_test import IntraCgraPktType, mk_pkts
+
+#-------------------------------------------------------------------------
+# Test harness
+#-------------------------------------------------------------------------
+
+class TestHarness( Component ):
+
+  def construct( s, MsgType, src_msgs, sink_msgs, src_delay=0, sink_delay=0 ):
+
+    s.src   = StreamSourceRTL( MsgType, src_msgs, interval_delay=src_delay )
+    s.queue = NormalQueueRTL( MsgType, 2 )
+    s.sink  = StreamSinkRTL( MsgType, sink_msgs, interval_delay=sink_delay )
+
+    s.src.send  //= s.queue.recv
+    s.queue.send //= s.sink.recv
+
+  def done( s ):
+    return s.src.done() and s.sink.done()
+
+  def line_trace( s ):
+    return f"{s.src.line_trace()} > {s.sink.line_trace()}"
+
+def run_sim( th, max_cycles=1000 ):
+  th.apply( DefaultPassGroup() )
+  th.sim_reset()
+  ncycles = 0
+  while not th.done() and ncycles < max_cycles:
+    th.sim_tick()
+    ncycles += 1
+  assert ncycles < max_cycles
+  return ncycles
+
+def mk_msgs( num_msgs, pulled ):
+  for i in range( num_msgs ):
+    pulled.append( i )
+    yield Bits16( i )
+
+#-------------------------------------------------------------------------
+# Tests
+#-------------------------------------------------------------------------
+
+@pytest.mark.parametrize( 'src_delay, sink_delay', [ (0, 0), (2, 0), (0, 3) ] )
+def test_generators( src_delay, sink_delay ):
+  pulled = []
+  th = TestHarness( Bits16, mk_msgs( 200, pulled ), mk_msgs( 200, [] ),
+                    src_delay, sink_delay )
+  th.elaborate()
+  # Nothing is pulled before the simulation.
+  assert pulled == []
+  th.apply( DefaultPassGroup() )
+  th.sim_reset()
+  th.sim_tick()
+  assert len( pulled ) <= 2
+  ncycles = 1
+  while not th.done() and ncycles < 2000:
+    th.sim_tick()
+    ncycles += 1
+  assert ncycles < 2000
+  assert th.src.num_sent == th.sink.idx == 200
+
+def test_pkt_program( tmp_path ):
+  path = str( tmp_path / "pkts.bin" )
+  write_pkt_program( path, IntraCgraPktType, mk_pkts(), 2, 2, 16 )
+  th = TestHarness( IntraCgraPktType, path, iter( mk_pkts() ) )
+  run_sim( th )
+  assert th.sink.idx == len( mk_pkts() )
+
+def test_wrong_msg():
+  msgs = [ Bits16( i ) for i in range( 8 ) ]
+  th = TestHarness( Bits16, msgs, msgs[:5] + [ Bits16( 0 ) ] + msgs[6:] )
+  with pytest.raises( PyMTLTestSinkError ) as e:
+    run_sim( th )
+  assert "WRONG message 5" in str( e.value )
+  assert "Received before : 0004" in str( e.value )
@@ -14,7 +14,7 @@ from pymtl3 import *
 
 # Total number of commands that are supported/recognized by controller.
 # Needs to be updated once more commands are added/supported.
-NUM_CMDS = 44
+NUM_CMDS = 55
 
 CMD_LAUNCH                           = 0
 CMD_PAUSE                            = 1
@@ -69,6 +69,25 @@ CMD_LC_ALL_COMPLETE                  = 42  # LC -> Controller: all outer loops c
 # GEP FU Configuration Commands.
 CMD_CONFIG_GEP_STRIDE                = 43  # Controller -> GEP FU: Configures stride for 2D GEP
 
+# Streaming ST FU Configuration Commands.
+CMD_CONFIG_STREAMING_ST_START_ADDR   = 44
+CMD_CONFIG_STREAMING_ST_STRIDE       = 45
+CMD_CONFIG_STREAMING_ST_END_ADDR     = 46
+
+# DMA Commands.
+CMD_CONFIG_DMA_STRIDE                = 47  # CPU -> DMA: Configures the SPM stride of the block
+CMD_CONFIG_DMA_LENGTH                = 48  # CPU -> DMA: Configures the number of words of the block
+CMD_DMA_PRELOAD                      = 49  # CPU -> DMA: Moves the block from host to SPM
+CMD_DMA_READBACK                     = 50  # CPU -> DMA: Moves the block from SPM to host
+CMD_DMA_COMPLETE                     = 51  # DMA -> CPU: The whole block is moved
+
+# Burst Configuration Commands.
+CMD_CONFIG_BURST                     = 52  # Controller -> Tile: Writes the ctrl signal at ctrl_addr and announces the number of the following beats
+CMD_CONFIG_BURST_DATA                = 53  # Controller -> Tile: Writes the ctrl signal (and the FU prologue count if predicated) at the next ctrl_addr of the burst
+
+# Double-Buffered Ctrl Memory Commands.
+CMD_SWAP_CTRL_BANK                   = 54  # Controller -> Tile: Swaps the active and shadow ctrl memory banks at the next iteration boundary
+
 CMD_SYMBOL_DICT = {
   CMD_LAUNCH:                           "(LAUNCH_KERNEL)",
   CMD_PAUSE:                            "(PAUSE_EXECUTION)",
@@ -114,5 +133,16 @@ CMD_SYMBOL_DICT = {
   CMD_LC_CHILD_RESET:                   "(LC_CHILD_RESET)",
   CMD_LC_ALL_COMPLETE:                  "(LC_ALL_COMPLETE)",
   CMD_CONFIG_GEP_STRIDE:                "(CONFIG_GEP_STRIDE)",
+  CMD_CONFIG_STREAMING_ST_START_ADDR:   "(STREAMING_ST_START_ADDR)",
+  CMD_CONFIG_STREAMING_ST_STRIDE:       "(STREAMING_ST_STRIDE)",
+  CMD_CONFIG_STREAMING_ST_END_ADDR:     "(STREAMING_ST_END_ADDR)",
+  CMD_CONFIG_DMA_STRIDE:                "(DMA_STRIDE)",
+  CMD_CONFIG_DMA_LENGTH:                "(DMA_LENGTH)",
+  CMD_DMA_PRELOAD:                      "(DMA_PRELOAD)",
+  CMD_DMA_READBACK:                     "(DMA_READBACK)",
+  CMD_DMA_COMPLETE:                     "(DMA_COMPLETE)",
+  CMD_CONFIG_BURST:                     "(PRELOADING_KERNEL_CONFIG_BURST)",
+  CMD_CONFIG_BURST_DATA:                "(PRELOADING_KERNEL_CONFIG_BURST_DATA)",
+  CMD_SWAP_CTRL_BANK:                   "(SWAP_CTRL_BANK)",
 }
 
@@ -15,6 +15,15 @@ from .cmd_type import *
 from .opt_type import *
 from .util.data_struct_attr import *
 
+#=========================================================================
+# Opaque field
+#=========================================================================
+# Carried by the packets and echoed by the memory in the load responses
+# (via the inter-CGRA NoC for the remote ones), e.g., to tag the loads
+# of the non-blocking memory unit.
+
+OpaqueType = mk_bits(8)
+
 #=========================================================================
 # Generic data message
 #=========================================================================
@@ -243,8 +252,9 @@ def mk_inter_cgra_pkt(num_cgra_columns,
   # An additional router for controller to receive CMD_COMPLETE signal from Ring to CPU.
   TileIdType = mk_bits(clog2(num_tiles + 1))
   RemoteSrcPortType = mk_bits(clog2(num_rd_tiles + 1))
-  opaque_nbits = 8
-  OpqType = mk_bits(opaque_nbits)
+  TileMaskType = mk_bits(num_tiles)
+  opaque_nbits = OpaqueType.nbits
+  OpqType = OpaqueType
   num_vcs = 4
   VcIdType = mk_bits(clog2(num_vcs))
 
@@ -265,6 +275,9 @@ def mk_inter_cgra_pkt(num_cgra_columns,
   field_dict[kAttrOpaque] = OpqType
   field_dict[kAttrVcId] = VcIdType
   field_dict[kAttrPayload] = CgraPayloadType
+  # The tiles (other than dst_tile_id) that also consume the ctrl ring
+  # packet, see mk_intra_cgra_pkt().
+  field_dict[kAttrMulticastMask] = TileMaskType
 
   def str_func(s):
     return f"InterCgraPkt: {s.src}->{s.dst} || " \
@@ -272,6 +285,7 @@ def mk_inter_cgra_pkt(num_cgra_columns,
            f"tileid:{s.src_tile_id}->{s.dst_tile_id} || " \
            f"remote_src_port:{s.remote_src_port} || " \
            f"{s.opaque}:{s.vc_id} || " \
+           f"multicast_mask:{s.multicast_mask} || " \
            f"payload:{s.payload}\n"
 
   return mk_bitstruct(new_name, field_dict,
@@ -294,8 +308,9 @@ def mk_intra_cgra_pkt(num_cgra_columns,
   CgraYType = mk_bits(max(clog2(num_cgra_rows), 1))
   # An additional router for controller to receive CMD_COMPLETE signal from Ring to CPU.
   TileIdType = mk_bits(clog2(num_tiles + 1))
-  opaque_nbits = 8
-  OpqType = mk_bits(opaque_nbits)
+  TileMaskType = mk_bits(num_tiles)
+  opaque_nbits = OpaqueType.nbits
+  OpqType = OpaqueType
   num_vcs = 2
   VcIdType = mk_bits(clog2(num_vcs))
 
@@ -307,6 +322,7 @@ def mk_intra_cgra_pkt(num_cgra_columns,
     return f"IntraCgraPkt: {s.src}->{s.dst} || " \
            f"cgra_id:{s.src_cgra_id}({s.src_cgra_x}, {s.src_cgra_y})->{s.dst_cgra_id}({s.dst_cgra_x}, {s.dst_cgra_y}) || " \
            f"{s.opaque}:{s.vc_id} || " \
+           f"multicast_mask:{s.multicast_mask} || " \
            f"payload:{s.payload}\n"
 
   field_dict = {}
@@ -321,6 +337,11 @@ def mk_intra_cgra_pkt(num_cgra_columns,
   field_dict[kAttrOpaque] = OpqType
   field_dict[kAttrVcId] = VcIdType
   field_dict[kAttrPayload] = CgraPayloadType
+  # Multicast delivery on the ctrl ring: bit i indicates tile i consumes
+  # the packet. The packet is sent to the lowest tile in the mask (i.e.,
+  # dst), which forwards it to the next one in the mask, and so on. 0
+  # indicates a normal unicast packet towards dst.
+  field_dict[kAttrMulticastMask] = TileMaskType
 
   return mk_bitstruct(new_name, field_dict,
     namespace = {'__str__': str_func}
@@ -394,11 +415,12 @@ def mk_mem_access_pkt(DataType,
   CgraIdType = mk_bits(max(1, clog2(num_cgras)))
   TileIdType = mk_bits(clog2(num_tiles + 1))
   RemoteSrcPortType = mk_bits(clog2(num_rd_tiles + 1))
+  TileMaskType = mk_bits(num_tiles)
 
   new_name = f"{prefix}_{number_src}_{number_dst}_{mem_size_global}"
 
   def str_func(s):
-    return f"{s.src}>{s.dst}:(addr){s.addr}.(data){s.data}.(src_cgra){s.src_cgra}.(src_tile){s.src_tile}.(remote_src_port){s.remote_src_port}"
+    return f"{s.src}>{s.dst}:(addr){s.addr}.(data){s.data}.(src_cgra){s.src_cgra}.(src_tile){s.src_tile}.(remote_src_port){s.remote_src_port}.(opaque){s.opaque}"
 
   return mk_bitstruct(new_name, {
       kAttrSrc: SrcType,
@@ -408,6 +430,8 @@ def mk_mem_access_pkt(DataType,
       kAttrSrcCgra: CgraIdType,
       kAttrSrcTile: TileIdType,
       kAttrRemoteSrcPort: RemoteSrcPortType,
+      # Echoed in the response.
+      kAttrOpaque: OpaqueType,
     },
     namespace = {'__str__': str_func}
   )
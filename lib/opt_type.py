@@ -107,6 +107,7 @@ OPT_REM_INCLUSIVE_END            = OpCodeType( 15 )
 
 OPT_LOOP_CONTROL                 = OpCodeType( 83 )
 OPT_STREAM_LD                    = OpCodeType( 88 )
+OPT_STREAM_ST                    = OpCodeType( 92 )
 OPT_LOOP_COUNT                   = OpCodeType( 85 )
 OPT_LOOP_DELIVERY                = OpCodeType( 86 )
 OPT_EXTRACT_PREDICATE            = OpCodeType( 87 )
@@ -204,6 +205,7 @@ OPT_SYMBOL_DICT = {
 
   OPT_LOOP_CONTROL               : "(loop_ctrl)",
   OPT_STREAM_LD                  : "(streaming_ld)",
+  OPT_STREAM_ST                  : "(streaming_st)",
 
   OPT_LOOP_COUNT                 : "(loop_cnt)",
   OPT_LOOP_DELIVERY              : "(loop_deli)",
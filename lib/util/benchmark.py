@@ -0,0 +1,351 @@
+"""
+==========================================================================
+benchmark.py
+==========================================================================
+Cycle/II benchmark suite over the kernels of the functional tests in
+cgra/test and multi_cgra/test.
+
+Each kernel is run through its existing sim/test function, whose
+run_sim() is temporarily replaced by a measuring one (no line trace, so
+the wall time reflects the simulation itself), and records:
+ - cycles: total simulated cycles till the harness is done.
+ - cycles_to_complete: cycle of the last CMD_COMPLETE sent to the CPU.
+ - launch_to_complete: cycles from the first CMD_LAUNCH to the last
+   CMD_COMPLETE, i.e., excluding the configuration.
+ - achieved_ii: median interval between two consecutive issues of the
+   first ctrl (i.e., ctrl address 0) over the active tiles.
+ - wall_time: simulation wall time in seconds.
+ - profile: static profile of the CPU packets, which the cycle estimator
+   is calibrated against (see lib/util/cycle_estimator.py).
+
+Usage:
+
+  % python -m VectorCGRA.lib.util.benchmark --save baseline.json
+  % python -m VectorCGRA.lib.util.benchmark --compare baseline.json --threshold 0.05
+  % python -m VectorCGRA.lib.util.benchmark --filter fir --tag memory=combinational
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import argparse
+import importlib
+import json
+import statistics
+import sys
+import time
+import traceback
+
+from pymtl3 import Component
+from pymtl3.passes import DefaultPassGroup
+from .cycle_estimator import profile_pkts
+from .perf_counters import add_per_cycle_hook
+from ..cmd_type import CMD_COMPLETE, CMD_LAUNCH
+
+# Root package of the repo, e.g., 'VectorCGRA'.
+kRootPackage = __package__.rsplit('.lib.util', 1)[0]
+kDefaultMaxCycles = 10000
+kDefaultCmdlineOpts = {'dump_textwave' : False,
+                       'dump_vcd' : False,
+                       'test_verilog' : False,
+                       'test_yosys_verilog' : False,
+                       'max_cycles' : None,
+                       'dump_vtb' : '',
+                       'on_demand_vcd_portname' : ''}
+# Metrics compared against the baseline, in which larger is worse.
+kCycleMetrics = ['cycles', 'cycles_to_complete', 'launch_to_complete', 'achieved_ii']
+
+class Kernel:
+
+  def __init__(s, name, module, func, kwargs = None, **tags):
+    s.name = name
+    s.module = module
+    s.func = func
+    s.kwargs = kwargs or {}
+    s.tags = tags
+
+def mk_kernels():
+  """Kernels tagged with their memory access, topology, and FU kinds."""
+  fir = 'cgra.test.CgraRTL_fir_test'
+  mesh_multi = 'multi_cgra.test.MeshMultiCgraRTL_test'
+  migration = 'multi_cgra.test.MultiCgraRTL_migration_test'
+  kernels = []
+  for comb, memory in [(True, 'combinational'), (False, 'multi_cycle')]:
+    kernels += [
+      Kernel(f'fir_4x4_terminate_{memory}', fir, 'sim_fir_terminate',
+             {'mem_access_is_combinational' : comb},
+             memory = memory, topology = 'mesh', fu = 'scalar'),
+      Kernel(f'fir_4x4_return_{memory}', fir, 'sim_fir_return',
+             {'mem_access_is_combinational' : comb},
+             memory = memory, topology = 'mesh', fu = 'scalar'),
+    ]
+  kernels += [
+    Kernel('fir_4x4_vector_terminate_combinational', fir, 'sim_fir_vector_terminate',
+           {'mem_access_is_combinational' : True},
+           memory = 'combinational', topology = 'mesh', fu = 'vector'),
+    Kernel('fir_4x4_vector_return_combinational', fir, 'sim_fir_vector_return',
+           {'mem_access_is_combinational' : True},
+           memory = 'combinational', topology = 'mesh', fu = 'vector'),
+    Kernel('fir_2x2_return_combinational', 'cgra.test.CgraRTL_fir_2x2_test',
+           'test_homogeneous_2x2_fir_combinational_mem_access_return',
+           memory = 'combinational', topology = 'mesh', fu = 'scalar'),
+    Kernel('fir_2x2_return_multi_cycle', 'cgra.test.CgraRTL_fir_2x2_test',
+           'test_homogeneous_2x2_fir_non_combinational_mem_access_return',
+           memory = 'multi_cycle', topology = 'mesh', fu = 'scalar'),
+    Kernel('fir_2x2_loop_counter', 'cgra.test.CgraRTL_fir_2x2_loop_counter_test',
+           'test_homogeneous_2x2_fir_with_loop_counter_combinational_mem_access_return',
+           memory = 'combinational', topology = 'mesh', fu = 'scalar'),
+    Kernel('homogeneous_2x2', 'cgra.test.CgraRTL_test', 'test_homogeneous_2x2',
+           memory = 'combinational', topology = 'mesh', fu = 'scalar'),
+    Kernel('heterogeneous_king_mesh_2x2', 'cgra.test.CgraRTL_test',
+           'test_heterogeneous_king_mesh_2x2',
+           memory = 'combinational', topology = 'king_mesh', fu = 'scalar'),
+    Kernel('vector_king_mesh_2x2', 'cgra.test.CgraRTL_test', 'test_vector_king_mesh_2x2',
+           memory = 'combinational', topology = 'king_mesh', fu = 'vector'),
+    Kernel('vector_mesh_4x4', 'cgra.test.CgraRTL_test', 'test_vector_mesh_4x4',
+           memory = 'combinational', topology = 'mesh', fu = 'vector'),
+    Kernel('systolic_3x3', 'cgra.test.CgraRTL_test', 'test_systolic_3x3',
+           memory = 'combinational', topology = 'mesh', fu = 'scalar'),
+    Kernel('streaming_ld_combinational', 'cgra.test.CgraWithStreamingLoadRTL_test',
+           'test_streaming_ld_combinational_mem_access',
+           memory = 'combinational', topology = 'mesh', fu = 'scalar'),
+    Kernel('streaming_ld_multi_cycle', 'cgra.test.CgraWithStreamingLoadRTL_test',
+           'test_streaming_ld_non_combinational_mem_access',
+           memory = 'multi_cycle', topology = 'mesh', fu = 'scalar'),
+    Kernel('multi_homo_2x2_2x2', mesh_multi, 'test_sim_homo_2x2_2x2',
+           memory = 'multi_cycle', topology = 'mesh', fu = 'scalar'),
+    Kernel('multi_systolic_2x2_2x2_combinational', mesh_multi,
+           'test_multi_CGRA_systolic_2x2_2x2',
+           memory = 'combinational', topology = 'mesh', fu = 'scalar'),
+    Kernel('multi_systolic_2x2_2x2_multi_cycle', mesh_multi,
+           'test_multi_CGRA_systolic_2x2_2x2_non_combinational_mem_access',
+           memory = 'multi_cycle', topology = 'mesh', fu = 'scalar'),
+    Kernel('multi_systolic_4x4_2x2', mesh_multi, 'test_multi_CGRA_systolic_4x4_2x2',
+           memory = 'combinational', topology = 'mesh', fu = 'scalar'),
+    Kernel('multi_fir_scalar', mesh_multi, 'test_multi_CGRA_fir_scalar',
+           memory = 'combinational', topology = 'mesh', fu = 'scalar'),
+    Kernel('multi_fir_scalar_2x2_2x2', mesh_multi, 'test_multi_CGRA_fir_scalar_2x2_2x2',
+           memory = 'combinational', topology = 'mesh', fu = 'scalar'),
+    Kernel('multi_fir_vector', mesh_multi, 'test_multi_CGRA_fir_vector',
+           memory = 'combinational', topology = 'mesh', fu = 'vector'),
+    Kernel('multi_fir_vector_global_reduce', mesh_multi,
+           'test_multi_CGRA_fir_vector_global_reduce',
+           memory = 'combinational', topology = 'mesh', fu = 'vector'),
+    Kernel('migration_fir_fused', migration, 'test_multi_CGRA_fir_scalar_fused',
+           memory = 'combinational', topology = 'mesh', fu = 'scalar'),
+    Kernel('migration_fir_migrated', migration, 'test_multi_CGRA_fir_scalar_migrated',
+           memory = 'combinational', topology = 'mesh', fu = 'scalar'),
+    Kernel('migration_fir_dynamic', migration, 'test_multi_CGRA_fir_scalar_dynamic_migration',
+           memory = 'combinational', topology = 'mesh', fu = 'scalar'),
+  ]
+  return kernels
+
+#-------------------------------------------------------------------------
+# Measurement
+#-------------------------------------------------------------------------
+
+def get_achieved_ii(issue_cycles):
+  """Returns the median over the tiles of the median interval between
+  the given issue cycles of each tile, or None without any repetition."""
+  tile_iis = []
+  for cycles in issue_cycles:
+    if len(cycles) >= 2:
+      tile_iis.append(statistics.median([b - a for a, b in zip(cycles, cycles[1:])]))
+  return statistics.median(tile_iis) if tile_iis else None
+
+class KernelMeasurement:
+
+  def __init__(s, th):
+    s.th = th
+    dut = getattr(th, 'dut', None)
+    s.send_to_cpu = getattr(dut, 'send_to_cpu_pkt', None)
+    s.recv_from_cpu = getattr(dut, 'recv_from_cpu_pkt', None)
+    s.tiles = []
+    if isinstance(dut, Component):
+      s.tiles = sorted(dut.get_all_object_filter(
+                           lambda x: isinstance(x, Component) and
+                                     hasattr(x, 'ctrl_mem') and hasattr(x, 'element')),
+                       key = repr)
+    s.issue_cycles = [[] for _ in s.tiles]
+    s.first_launch = None
+    s.last_complete = None
+    s.cpu_pkts = []
+    add_per_cycle_hook(th, s.sample)
+
+  def sample(s):
+    if s.th.reset:
+      return
+    cycle = s.th.sim_cycle_count()
+    recv = s.recv_from_cpu
+    if recv is not None and recv.val & recv.rdy:
+      s.cpu_pkts.append(recv.msg.clone())
+      if s.first_launch is None and recv.msg.payload.cmd == CMD_LAUNCH:
+        s.first_launch = cycle
+    send = s.send_to_cpu
+    if send is not None and send.val & send.rdy and \
+       send.msg.payload.cmd == CMD_COMPLETE:
+      s.last_complete = cycle
+    for i, tile in enumerate(s.tiles):
+      send_ctrl = tile.ctrl_mem.send_ctrl
+      if send_ctrl.val & send_ctrl.rdy and tile.ctrl_mem.ctrl_addr_outport == 0:
+        s.issue_cycles[i].append(cycle)
+
+  def result(s, cycles, wall_time):
+    launch_to_complete = None
+    if s.first_launch is not None and s.last_complete is not None:
+      launch_to_complete = s.last_complete - s.first_launch
+    return {'cycles' : cycles,
+            'cycles_to_complete' : s.last_complete,
+            'launch_to_complete' : launch_to_complete,
+            'achieved_ii' : get_achieved_ii(s.issue_cycles),
+            'wall_time' : wall_time,
+            'profile' : s.get_profile()}
+
+  def get_profile(s):
+    if not s.cpu_pkts or not hasattr(s.cpu_pkts[0], 'payload'):
+      return None
+    # Falls back onto the ctrl memories for the tiles that are not
+    # configured via packets.
+    ctrl_mems = [tile.ctrl_mem for tile in s.tiles]
+    per_iter = [int(m.ctrl_count_per_iter_val) for m in ctrl_mems
+                if hasattr(m, 'ctrl_count_per_iter_val')]
+    steps = [int(m.total_ctrl_steps_val) for m in ctrl_mems
+             if hasattr(m, 'total_ctrl_steps_val')]
+    return profile_pkts(s.cpu_pkts, max(per_iter, default = None),
+                        max(steps, default = None)).to_dict()
+
+def mk_measuring_run_sim(results):
+  """Returns a drop-in run_sim() (of either the PyMTL stdlib or the
+  multi-CGRA tests) appending the measurements into `results`."""
+
+  def run_sim(th, opts_or_max_cycles = None, *args, **kwargs):
+    max_cycles = kDefaultMaxCycles
+    if isinstance(opts_or_max_cycles, int):
+      max_cycles = opts_or_max_cycles
+    elif isinstance(opts_or_max_cycles, dict):
+      max_cycles = opts_or_max_cycles.get('max_cycles') or kDefaultMaxCycles
+    max_cycles = kwargs.get('max_cycles', max_cycles)
+
+    measurement = KernelMeasurement(th)
+    th.apply(DefaultPassGroup(linetrace = False))
+    th.sim_reset()
+    start = time.time()
+    while not th.done() and th.sim_cycle_count() < max_cycles:
+      th.sim_tick()
+    wall_time = time.time() - start
+    assert th.sim_cycle_count() < max_cycles, \
+           f"Simulation does not finish in {max_cycles} cycles."
+    results.append(measurement.result(th.sim_cycle_count(), wall_time))
+    return th.sim_cycle_count()
+
+  return run_sim
+
+def run_kernel(kernel):
+  try:
+    module = importlib.import_module(f"{kRootPackage}.{kernel.module}")
+  except Exception:
+    return {'status' : 'error',
+            'error' : traceback.format_exc().splitlines()[-1]}
+  results = []
+  original_run_sim = module.run_sim
+  module.run_sim = mk_measuring_run_sim(results)
+  try:
+    getattr(module, kernel.func)(dict(kDefaultCmdlineOpts), **kernel.kwargs)
+  except Exception:
+    return {'status' : 'error',
+            'error' : traceback.format_exc().splitlines()[-1]}
+  finally:
+    module.run_sim = original_run_sim
+  if not results:
+    return {'status' : 'error', 'error' : "run_sim() is not called."}
+  # Kernels simulating several harnesses report the sum of cycles and
+  # wall time, and the measurements of the last harness otherwise.
+  result = dict(results[-1], status = 'ok')
+  result['cycles'] = sum(r['cycles'] for r in results)
+  result['wall_time'] = sum(r['wall_time'] for r in results)
+  return result
+
+def run_benchmarks(kernels, log = None):
+  results = {}
+  for kernel in kernels:
+    result = run_kernel(kernel)
+    result['tags'] = kernel.tags
+    results[kernel.name] = result
+    if log is not None:
+      log.write(f"{kernel.name}: {format_result(result)}\n")
+  return results
+
+#-------------------------------------------------------------------------
+# Baseline comparison
+#-------------------------------------------------------------------------
+
+def compare_results(results, baseline, threshold = 0.05, wall_time_threshold = None):
+  """Returns [(kernel, metric, baseline value, value)] of the metrics
+  that get worse by more than the threshold (relatively), and of the
+  kernels that no longer pass. The wall time is only compared with
+  wall_time_threshold given, as it depends on the host."""
+
+  regressions = []
+  for name, base in baseline.items():
+    result = results.get(name)
+    if result is None or base.get('status') != 'ok':
+      continue
+    if result['status'] != 'ok':
+      regressions.append((name, 'status', base['status'], result['status']))
+      continue
+    metrics = [(metric, threshold) for metric in kCycleMetrics]
+    if wall_time_threshold is not None:
+      metrics.append(('wall_time', wall_time_threshold))
+    for metric, limit in metrics:
+      base_value = base.get(metric)
+      value = result.get(metric)
+      if base_value is None or value is None:
+        continue
+      if value > base_value * (1 + limit):
+        regressions.append((name, metric, base_value, value))
+  return regressions
+
+def format_result(result):
+  if result['status'] != 'ok':
+    return f"{result['status']} ({result['error']})"
+  return ", ".join([f"{metric}: {result[metric]}" for metric in kCycleMetrics] +
+                   [f"wall_time: {result['wall_time']:.2f}s"])
+
+def select_kernels(kernels, name_filter = None, tags = None):
+  selected = []
+  for kernel in kernels:
+    if name_filter and name_filter not in kernel.name:
+      continue
+    if tags and any(kernel.tags.get(key) != value for key, value in tags.items()):
+      continue
+    selected.append(kernel)
+  return selected
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description = "Cycle/II benchmarks of the CGRA kernels.")
+  parser.add_argument("--filter", default = None, help = "Only runs the kernels whose name contains it.")
+  parser.add_argument("--tag", action = "append", default = [],
+                      help = "Only runs the kernels with the tag, e.g., memory=combinational.")
+  parser.add_argument("--save", default = None, help = "Writes the results into the baseline file.")
+  parser.add_argument("--compare", default = None, help = "Baseline file to compare against.")
+  parser.add_argument("--threshold", type = float, default = 0.05,
+                      help = "Tolerated relative increase of the cycle metrics.")
+  parser.add_argument("--wall-time-threshold", type = float, default = None,
+                      help = "Tolerated relative increase of the wall time (not compared by default).")
+  args = parser.parse_args()
+
+  tags = dict(tag.split('=', 1) for tag in args.tag)
+  results = run_benchmarks(select_kernels(mk_kernels(), args.filter, tags), sys.stdout)
+
+  if args.save:
+    with open(args.save, 'w') as f:
+      json.dump(results, f, indent = 2, sort_keys = True)
+
+  if args.compare:
+    with open(args.compare) as f:
+      baseline = json.load(f)
+    regressions = compare_results(results, baseline, args.threshold,
+                                  args.wall_time_threshold)
+    for name, metric, base_value, value in regressions:
+      print(f"REGRESSION {name}.{metric}: {base_value} -> {value}")
+    sys.exit(1 if regressions else 0)
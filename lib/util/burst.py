@@ -0,0 +1,107 @@
+"""
+==========================================================================
+burst.py
+==========================================================================
+Packs the per-entry CMD_CONFIG packets of a tile into burst ones, i.e.,
+a CMD_CONFIG_BURST header writing the first entry and announcing the
+number of beats, followed by the CMD_CONFIG_BURST_DATA beats that are
+written into the next entries of the ctrl memory (see CtrlMemDynamicRTL).
+
+As the beats carry no ctrl_addr, the data field of each beat is free to
+carry the FU prologue count of its entry, so the CMD_CONFIG_PROLOGUE_FU
+packets following the burst are folded into the beats. A beat is still a
+full packet carrying a single ctrl signal (the payload has room for one
+only), i.e., the folded prologue packets are all a burst saves, e.g., 2
+of the 97 config cycles of the two-task FIR in
+cgra/test/CgraWithContextSwitchRTL_test.py.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from ..cmd_type import *
+from .data_struct_attr import *
+
+# Commands after which the ctrl memory starts/stops iterating (or swaps
+# its banks), the FU prologue counts are never folded across them.
+kBurstFenceCmds = {CMD_LAUNCH, CMD_RESUME, CMD_TERMINATE, CMD_SWAP_CTRL_BANK}
+
+def _tile_of(pkt):
+  return (int(pkt.dst_cgra_id), int(pkt.dst), int(pkt.multicast_mask))
+
+def _find_bursts(pkts, min_beats):
+  # Returns the bursts as lists of the indices of the CMD_CONFIG packets
+  # targeting consecutive ctrl_addrs, which are the consecutive packets
+  # of the same tile.
+  bursts = []
+  open_burst = {}
+  for idx, pkt in enumerate(pkts):
+    tile = _tile_of(pkt)
+    burst = open_burst.pop(tile, None)
+    if int(pkt.payload.cmd) != CMD_CONFIG:
+      if burst is not None:
+        bursts.append(burst)
+      continue
+    if burst is not None and \
+       int(pkt.payload.ctrl_addr) == \
+       int(pkts[burst[-1]].payload.ctrl_addr) + 1:
+      burst.append(idx)
+    else:
+      if burst is not None:
+        bursts.append(burst)
+      burst = [idx]
+    open_burst[tile] = burst
+  bursts.extend(open_burst.values())
+  return [burst for burst in bursts if len(burst) >= min_beats]
+
+def pack_burst_config_pkts(pkts, min_beats = 2):
+  """Returns the packets (in issue order) with each run of at least
+  `min_beats` CMD_CONFIG packets of a tile replaced by a burst."""
+
+  pkts = list(pkts)
+  if not pkts:
+    return pkts
+  PayloadType = type(pkts[0].payload)
+  CmdType = PayloadType.get_field_type(kAttrCmd)
+  DataType = PayloadType.get_field_type(kAttrData)
+  CtrlAddrType = PayloadType.get_field_type(kAttrCtrlAddr)
+
+  headers = {}
+  beats = {}
+  for burst in _find_bursts(pkts, min_beats):
+    header = pkts[burst[0]].clone()
+    header.payload.cmd = CmdType(CMD_CONFIG_BURST)
+    header.payload.data = DataType(len(burst) - 1, 1)
+    headers[burst[0]] = header
+    for idx in burst[1:]:
+      beat = pkts[idx].clone()
+      beat.payload.cmd = CmdType(CMD_CONFIG_BURST_DATA)
+      beat.payload.ctrl_addr = CtrlAddrType(0)
+      # Not predicated, i.e., the FU prologue count is kept.
+      beat.payload.data = DataType(0, 0)
+      beats[idx] = beat
+
+  # Folds each CMD_CONFIG_PROLOGUE_FU into the latest beat of the same
+  # entry, as long as no other write of the count sits in between.
+  merged = []
+  foldable_beats = {}
+  for idx, pkt in enumerate(pkts):
+    tile = _tile_of(pkt)
+    cmd = int(pkt.payload.cmd)
+    entry_beats = foldable_beats.setdefault(tile, {})
+    if idx in headers:
+      merged.append(headers[idx])
+      continue
+    if idx in beats:
+      merged.append(beats[idx])
+      entry_beats[int(pkt.payload.ctrl_addr)] = beats[idx]
+      continue
+    if cmd == CMD_CONFIG_PROLOGUE_FU:
+      beat = entry_beats.pop(int(pkt.payload.ctrl_addr), None)
+      if beat is not None:
+        beat.payload.data = DataType(int(pkt.payload.data.payload), 1)
+        continue
+    elif cmd in kBurstFenceCmds:
+      entry_beats.clear()
+    merged.append(pkt)
+  return merged
@@ -1,10 +1,18 @@
+from ..common import BANK_MAPPING_BLOCK
+
+
 class DataSPM:
-    def __init__(s, numOfReadPorts, numOfWritePorts):
+    def __init__(s, numOfReadPorts, numOfWritePorts, bankMapping = BANK_MAPPING_BLOCK):
         s.numOfReadPorts = numOfReadPorts
         s.numOfWritePorts = numOfWritePorts
+        # One of the BANK_MAPPING_* in lib/util/common.py.
+        s.bankMapping = bankMapping
 
     def getNumOfValidReadPorts(s):
         return s.numOfReadPorts
 
     def getNumOfValidWritePorts(s):
         return s.numOfWritePorts
+
+    def getBankMapping(s):
+        return s.bankMapping
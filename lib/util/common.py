@@ -47,12 +47,12 @@ MAX_CTRL_COUNT = 1024
 PROLOGUE_MAX_COUNT = 7
 
 # Constant for number of inports on the controller xbar towards NoC.
-# Crossbar with 6 inports (load and store requests towards remote
+# Crossbar with 7 inports (load and store requests towards remote
 # memory, load response from local memory, ctrl&data packet from cpu,
-# command signal from inter-tile, i.e., intra-cgra -- ring, and
-# global reduce unit) and 1 outport (only allow one request be sent
-# out per cycle).
-CONTROLLER_CROSSBAR_INPORTS = 6
+# command signal from inter-tile, i.e., intra-cgra -- ring, global
+# reduce unit, and DMA completion from local memory) and 1 outport
+# (only allow one request be sent out per cycle).
+CONTROLLER_CROSSBAR_INPORTS = 7
 
 GLOBAL_REDUCE_MAX_COUNT = 4
 
@@ -65,3 +65,18 @@ READ_TOWARDS_NOTHING      = 0
 READ_TOWARDS_FU           = 1
 READ_TOWARDS_ROUTING_XBAR = 2
 READ_TOWARDS_BOTH         = 3
+
+# Bank selection of the data memory, i.e., how the local addresses are
+# interleaved across the banks of a CGRA:
+# - block:  consecutive per-bank-size chunks go to the same bank.
+# - cyclic: consecutive words go to consecutive banks.
+# - xor:    cyclic with the bank index XORed by the in-bank row, so
+#           strides of multiple banks are spread as well.
+BANK_MAPPING_BLOCK  = 0
+BANK_MAPPING_CYCLIC = 1
+BANK_MAPPING_XOR    = 2
+BANK_MAPPINGS = {
+  "block" : BANK_MAPPING_BLOCK,
+  "cyclic": BANK_MAPPING_CYCLIC,
+  "xor"   : BANK_MAPPING_XOR,
+}
@@ -0,0 +1,198 @@
+"""
+==========================================================================
+config_profiler.py
+==========================================================================
+Opt-in profiler attributing the cycles of a kernel launch on CgraRTL to
+its phases, i.e., the delivery of the configuration (CMD_CONST,
+CMD_CONFIG, prologue, CMD_CONFIG_COUNT_PER_ITER, etc.) before the
+CMD_LAUNCH, the execution, and the return of the CMD_COMPLETE.
+
+Like the performance counters (see perf_counters.py), the packets are
+timestamped by sampling the ports of the controller and of the tiles on
+the ctrl ring at every clock edge, so nothing is added into the RTL:
+
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  profiler = CgraConfigProfiler(th.dut)
+  profiler.attach(th)
+  run_sim(th)
+  print(profiler.format_report())
+
+A packet is injected once the controller sends it onto the ctrl ring,
+and accepted once its target tile (each tile in the mask of a multicast
+one) receives it from the ring. The packets of a tile are delivered in
+order, so the acceptances are matched with the injections per tile.
+
+Per tile (cycles counted from the end of the reset):
+ - config: cycles till the CMD_LAUNCH is accepted. config_breakdown
+   attributes them to the commands, each accepted packet is charged the
+   cycles since the previous one of the tile was accepted, i.e., the
+   breakdown sums up to config.
+ - execution: cycles from the CMD_LAUNCH till the tile sends its
+   CMD_COMPLETE (or till the kernel completes if it never does).
+ - teardown: cycles from the CMD_COMPLETE of the tile till it is sent
+   to the CPU by the controller.
+ - pkts/ring_latency: per command, the accepted packets and their mean
+   injection-to-acceptance cycles.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import json
+
+from .perf_counters import add_per_cycle_hook
+from .. import cmd_type
+from ..cmd_type import CMD_COMPLETE, CMD_LAUNCH
+
+# Maps command values to their names, e.g., 3 -> 'CMD_CONFIG'.
+kCmdNames = {}
+for name, value in vars(cmd_type).items():
+  if name.startswith("CMD_") and isinstance(value, int):
+    kCmdNames.setdefault(value, name)
+
+def get_cmd_name(cmd):
+  return kCmdNames.get(int(cmd), f"CMD_{int(cmd)}")
+
+def _fires(ifc):
+  return ifc.val & ifc.rdy
+
+class TileConfigProfile:
+
+  def __init__(s, tile_id):
+    s.tile_id = tile_id
+    # (cycle, cmd) of the injected packets not accepted yet.
+    s.in_flight = []
+    s.last_accept = 0
+    s.launch = None
+    s.complete = None
+    s.cpu_complete = None
+    s.config_breakdown = {}
+    s.pkts = {}
+    s.ring_latency = {}
+
+  def inject(s, cycle, cmd):
+    s.in_flight.append((cycle, cmd))
+
+  def accept(s, cycle, cmd):
+    name = get_cmd_name(cmd)
+    if s.in_flight:
+      inject_cycle, _ = s.in_flight.pop(0)
+      s.ring_latency[name] = s.ring_latency.get(name, 0) + cycle - inject_cycle
+    s.pkts[name] = s.pkts.get(name, 0) + 1
+    if s.launch is None:
+      s.config_breakdown[name] = \
+          s.config_breakdown.get(name, 0) + cycle - s.last_accept
+      s.last_accept = cycle
+      if cmd == CMD_LAUNCH:
+        s.launch = cycle
+
+  def report(s, end_cycle):
+    execution = teardown = None
+    if s.launch is not None:
+      execution_end = s.complete
+      if execution_end is None:
+        execution_end = end_cycle
+      execution = execution_end - s.launch
+      if s.complete is not None and s.cpu_complete is not None:
+        teardown = s.cpu_complete - s.complete
+    return {
+      'config' : s.launch,
+      'execution' : execution,
+      'teardown' : teardown,
+      'config_breakdown' : dict(sorted(s.config_breakdown.items())),
+      'pkts' : dict(sorted(s.pkts.items())),
+      'ring_latency' : {name : latency / s.pkts[name]
+                        for name, latency in sorted(s.ring_latency.items())},
+    }
+
+class CgraConfigProfiler:
+
+  def __init__(s, cgra):
+    if not hasattr(cgra, 'tile') or not hasattr(cgra, 'controller'):
+      raise ValueError(f"{cgra!r} does not expose its tiles and controller, "
+                       f"note that the profiler is not available once it is "
+                       f"imported.")
+    s.cgra = cgra
+    s.cycles = 0
+    s.kernel_complete = None
+    s.tiles = [TileConfigProfile(i) for i in range(len(cgra.tile))]
+
+  def attach(s, top):
+    """Samples the ports at every clock edge of the simulation of `top`
+    (see CgraPerfCounters.attach() for when to call it)."""
+    add_per_cycle_hook(top, s.sample)
+
+  def sample(s):
+    if s.cgra.reset:
+      return
+    cycle = s.cycles
+    s.cycles += 1
+    controller = s.cgra.controller
+    num_tiles = len(s.tiles)
+
+    inject = controller.send_to_ctrl_ring_pkt
+    if _fires(inject):
+      pkt = inject.msg
+      mask = int(pkt.multicast_mask)
+      if mask == 0 and int(pkt.dst) < num_tiles:
+        mask = 1 << int(pkt.dst)
+      for tile in s.tiles:
+        if (mask >> tile.tile_id) & 1:
+          tile.inject(cycle, int(pkt.payload.cmd))
+
+    for tile, tile_rtl in zip(s.tiles, s.cgra.tile):
+      recv = tile_rtl.recv_from_controller_pkt
+      if _fires(recv):
+        tile.accept(cycle, int(recv.msg.payload.cmd))
+      send = tile_rtl.send_to_controller_pkt
+      if _fires(send) & (send.msg.payload.cmd == CMD_COMPLETE) & \
+         (send.msg.src == tile.tile_id) & (tile.complete is None):
+        tile.complete = cycle
+
+    send = controller.send_to_cpu_pkt
+    if _fires(send) & (send.msg.payload.cmd == CMD_COMPLETE) & \
+       (send.msg.src_cgra_id == controller.cgra_id):
+      src = int(send.msg.src)
+      if src < num_tiles and s.tiles[src].cpu_complete is None:
+        s.tiles[src].cpu_complete = cycle
+      s.kernel_complete = cycle
+
+  def report(s):
+    end_cycle = s.kernel_complete if s.kernel_complete is not None \
+                else s.cycles
+    tiles = [tile.report(end_cycle) for tile in s.tiles]
+    launched = [tile for tile in tiles if tile['config'] is not None]
+    # The kernel starts once its last tile is launched.
+    config = max([tile['config'] for tile in launched], default = None)
+    execution = teardown = None
+    if config is not None:
+      execution_end = max(tile['config'] + tile['execution'] for tile in launched)
+      execution = execution_end - config
+      teardown = max(end_cycle - execution_end, 0)
+    return {
+      'cycles' : s.cycles,
+      'config' : config,
+      'execution' : execution,
+      'teardown' : teardown,
+      'tiles' : tiles,
+    }
+
+  def dump_json(s, path):
+    with open(path, 'w') as f:
+      json.dump(s.report(), f, indent = 2)
+
+  def format_report(s):
+    report = s.report()
+    lines = [f"cycles: {report['cycles']}, config: {report['config']}, "
+             f"execution: {report['execution']}, teardown: {report['teardown']}",
+             f"{'tile':>4} {'config':>7} {'exec':>7} {'teardn':>7}  config_breakdown"]
+    def fmt(value):
+      return '-' if value is None else value
+    for i, tile in enumerate(report['tiles']):
+      if not tile['pkts']:
+        continue
+      breakdown = ", ".join([f"{name[4:]}:{cycles}"
+                             for name, cycles in tile['config_breakdown'].items()])
+      lines.append(f"{i:>4} {fmt(tile['config']):>7} {fmt(tile['execution']):>7} "
+                   f"{fmt(tile['teardown']):>7}  {breakdown}")
+    return "\n".join(lines)
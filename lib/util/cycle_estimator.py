@@ -0,0 +1,347 @@
+"""
+==========================================================================
+cycle_estimator.py
+==========================================================================
+Analytical cycle-count estimator of the kernels, which predicts the
+cycles of a kernel from its packets (or its compiled YAML) in
+milliseconds, e.g., to sit inside a DSE loop instead of the RTL
+simulation:
+
+ - config: the packets before the last CMD_LAUNCH are issued by the CPU
+   one after another and travel through the ctrl ring.
+ - steady: each tile issues total_ctrl_steps ctrls (including the NAH
+   ones during the prologue), the memory accesses stall the tiles
+   when the memory access is not combinational, and the prologue delays
+   the first iteration.
+ - drain: the CMD_COMPLETE travels back through the ctrl ring to the
+   CPU, plus a fixed launch/complete overhead.
+
+The per-component constants of the model can be calibrated against the
+RTL simulation of the kernels in lib/util/benchmark.py:
+
+  % python -m VectorCGRA.lib.util.cycle_estimator --calibrate constants.json
+  % python -m VectorCGRA.lib.util.cycle_estimator --yaml kernel.yaml --ii 4 \\
+      --loop-times 10 --constants constants.json
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import argparse
+import json
+import math
+import sys
+
+import yaml
+
+from ..cmd_type import *
+from ..opt_type import *
+
+# Operations accessing the data memory.
+kMemOpts = {int(opt) for opt in [OPT_LD, OPT_STR, OPT_LD_CONST,
+                                 OPT_STR_CONST, OPT_ADD_CONST_LD]}
+# Opcodes of the compiled YAML accessing the data memory.
+kMemOpcodes = {'LD', 'LDD', 'LOAD', 'ST', 'STD', 'STORE'}
+
+# libyaml-backed parser if available.
+kYamlLoader = yaml.CSafeLoader if yaml.__with_libyaml__ else yaml.SafeLoader
+
+kPrologueCmds = {CMD_CONFIG_PROLOGUE_FU, CMD_CONFIG_PROLOGUE_FU_CROSSBAR,
+                 CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR}
+
+# Constants of the model, all in cycles:
+#  - pkt: per packet issued before the last CMD_LAUNCH.
+#  - ring: per hop of the ctrl ring, counted for both config and drain.
+#  - step: per ctrl step of the slowest tile.
+#  - mem: per memory access of an iteration (all tiles), only for the
+#    non-combinational memory access.
+#  - prologue: per prologue iteration.
+#  - fixed: launch/complete overhead.
+kDefaultConstants = {
+  'pkt'      : 1.0,
+  'ring'     : 1.0,
+  'step'     : 1.0,
+  'mem'      : 1.0,
+  'prologue' : 0.0,
+  'fixed'    : 4.0,
+}
+
+#-------------------------------------------------------------------------
+# Kernel profile
+#-------------------------------------------------------------------------
+
+class KernelProfile:
+  """Static features of a kernel, which are all the estimator needs."""
+
+  def __init__(s, num_tiles = 0, num_config_pkts = 0, ii = 1,
+               total_ctrl_steps = 0, mem_ops_per_iter = 0, max_prologue = 0):
+    s.num_tiles = num_tiles
+    s.num_config_pkts = num_config_pkts
+    s.ii = ii
+    s.total_ctrl_steps = total_ctrl_steps
+    s.mem_ops_per_iter = mem_ops_per_iter
+    s.max_prologue = max_prologue
+
+  @property
+  def num_iters(s):
+    return math.ceil(s.total_ctrl_steps / max(s.ii, 1))
+
+  def to_dict(s):
+    return dict(vars(s))
+
+  @staticmethod
+  def from_dict(d):
+    return KernelProfile(**d)
+
+  def __eq__(s, other):
+    return isinstance(other, KernelProfile) and vars(s) == vars(other)
+
+  def __repr__(s):
+    return f"KernelProfile({s.to_dict()})"
+
+def _pkt_tiles(pkt):
+  # Tiles consuming the packet, i.e., all the ones in the multicast mask.
+  mask = int(getattr(pkt, 'multicast_mask', 0))
+  cgra_id = int(pkt.dst_cgra_id)
+  if mask == 0:
+    return [(cgra_id, int(pkt.dst))]
+  return [(cgra_id, i) for i in range(mask.bit_length()) if (mask >> i) & 1]
+
+def profile_pkts(pkts, ctrl_count_per_iter = None, total_ctrl_steps = None):
+  """Profiles the CPU packets of a kernel. The ctrl_count_per_iter and
+  total_ctrl_steps are the values of the ctrl memories for the tiles
+  not configuring them via packets."""
+
+  pkts = list(pkts)
+  launches = [i for i, pkt in enumerate(pkts) if int(pkt.payload.cmd) == CMD_LAUNCH]
+  num_config_pkts = launches[-1] + 1 if launches else len(pkts)
+
+  ctrls = {}
+  iis = {}
+  steps = {}
+  max_prologue = 0
+  bursts = {}
+  for pkt in pkts[:num_config_pkts]:
+    cmd = int(pkt.payload.cmd)
+    data = int(pkt.payload.data.payload)
+    for tile in _pkt_tiles(pkt):
+      tile_ctrls = ctrls.setdefault(tile, {})
+      addr = int(pkt.payload.ctrl_addr)
+      if cmd == CMD_CONFIG_BURST_DATA:
+        addr = bursts.get(tile, 0)
+      if cmd in (CMD_CONFIG, CMD_CONFIG_BURST, CMD_CONFIG_BURST_DATA):
+        tile_ctrls[addr] = int(pkt.payload.ctrl.operation)
+        bursts[tile] = addr + 1
+      elif cmd == CMD_CONFIG_COUNT_PER_ITER:
+        iis[tile] = data
+      elif cmd == CMD_CONFIG_TOTAL_CTRL_COUNT:
+        steps[tile] = data
+      elif cmd in kPrologueCmds:
+        max_prologue = max(max_prologue, data)
+
+  tiles = [tile for tile, tile_ctrls in ctrls.items() if tile_ctrls]
+  tile_iis = [iis.get(tile, ctrl_count_per_iter or len(ctrls[tile])) for tile in tiles]
+  tile_steps = [steps.get(tile, total_ctrl_steps or 0) for tile in tiles]
+  mem_ops = sum(len([opt for opt in ctrls[tile].values() if opt in kMemOpts])
+                for tile in tiles)
+  return KernelProfile(num_tiles = len(tiles),
+                       num_config_pkts = num_config_pkts,
+                       ii = max(tile_iis, default = 1),
+                       total_ctrl_steps = max(tile_steps, default = 0),
+                       mem_ops_per_iter = mem_ops,
+                       max_prologue = max_prologue)
+
+def profile_yaml(path, ii, loop_times):
+  """Profiles the compiled YAML of ScriptFactory without generating the
+  packets, the number of packets is approximated by one CMD_CONFIG per
+  entry, the consts, the prologue of the instructions beyond the first
+  iteration, and the per-tile pre-configuration and launch."""
+
+  with open(path) as f:
+    cores = yaml.load(f, Loader = kYamlLoader)['array_config']['cores']
+  num_config_pkts = 0
+  mem_ops = 0
+  max_prologue = 0
+  for core in cores:
+    instructions = core['entries'][0]['instructions']
+    num_config_pkts += ii + 3
+    for instruction in instructions:
+      for operation in instruction['operations']:
+        if operation['opcode'] in kMemOpcodes:
+          mem_ops += 1
+        for operand in operation.get('src_operands', []):
+          if str(operand['operand']).lstrip('#').lstrip('-').isdigit():
+            num_config_pkts += 1
+      if instruction['timestep'] >= ii:
+        num_config_pkts += 1
+        max_prologue = max(max_prologue, instruction['timestep'] // ii)
+  return KernelProfile(num_tiles = len(cores),
+                       num_config_pkts = num_config_pkts,
+                       ii = ii,
+                       total_ctrl_steps = loop_times,
+                       mem_ops_per_iter = mem_ops,
+                       max_prologue = max_prologue)
+
+#-------------------------------------------------------------------------
+# Model
+#-------------------------------------------------------------------------
+
+class CycleEstimate:
+
+  def __init__(s, config, steady, drain):
+    s.config = config
+    s.steady = steady
+    s.drain = drain
+
+  @property
+  def total(s):
+    return s.config + s.steady + s.drain
+
+  def to_dict(s):
+    return {'config' : s.config, 'steady' : s.steady,
+            'drain' : s.drain, 'total' : s.total}
+
+  def __repr__(s):
+    return f"CycleEstimate({s.to_dict()})"
+
+def get_ring_latency(num_tiles):
+  # Average hops on the bidirectional ctrl ring of the tiles and the
+  # controller.
+  return (num_tiles + 1) // 2 + 1
+
+def get_features(profile, mem_access_is_combinational = True,
+                 ring_latency = None):
+  """Returns {constant: (config, steady, drain) coefficients}, i.e., the
+  estimate is linear in the constants of the model."""
+
+  if ring_latency is None:
+    ring_latency = get_ring_latency(profile.num_tiles)
+  mem = 0 if mem_access_is_combinational else \
+        profile.mem_ops_per_iter * profile.num_iters
+  return {
+    'pkt'      : (profile.num_config_pkts, 0, 0),
+    'ring'     : (ring_latency, 0, ring_latency),
+    'step'     : (0, profile.total_ctrl_steps, 0),
+    'mem'      : (0, mem, 0),
+    'prologue' : (0, profile.max_prologue * profile.ii, 0),
+    'fixed'    : (0, 0, 1),
+  }
+
+class CycleModel:
+
+  def __init__(s, constants = None):
+    s.constants = dict(kDefaultConstants)
+    if constants:
+      s.constants.update(constants)
+
+  def estimate(s, profile, mem_access_is_combinational = True,
+               ring_latency = None):
+    features = get_features(profile, mem_access_is_combinational, ring_latency)
+    config, steady, drain = [
+        sum(s.constants[name] * coeffs[i] for name, coeffs in features.items())
+        for i in range(3)]
+    return CycleEstimate(config, steady, drain)
+
+  def save(s, path):
+    with open(path, 'w') as f:
+      json.dump(s.constants, f, indent = 2, sort_keys = True)
+
+  @staticmethod
+  def load(path):
+    with open(path) as f:
+      return CycleModel(json.load(f))
+
+#-------------------------------------------------------------------------
+# Calibration
+#-------------------------------------------------------------------------
+
+def _solve(a, b):
+  # Gaussian elimination with partial pivoting.
+  n = len(b)
+  m = [list(row) + [v] for row, v in zip(a, b)]
+  for col in range(n):
+    pivot = max(range(col, n), key = lambda r: abs(m[r][col]))
+    m[col], m[pivot] = m[pivot], m[col]
+    for row in range(col + 1, n):
+      factor = m[row][col] / m[col][col]
+      for k in range(col, n + 1):
+        m[row][k] -= factor * m[col][k]
+  x = [0.0] * n
+  for row in range(n - 1, -1, -1):
+    x[row] = (m[row][n] - sum(m[row][k] * x[k] for k in range(row + 1, n))) / m[row][row]
+  return x
+
+def calibrate(samples, model = None, regularization = 1.0):
+  """Fits the constants against the measured cycles, samples are
+  [(features, measured total cycles)]. The fit is regularized towards
+  the current constants, so the constants not covered by the samples
+  (e.g., mem without any multi-cycle kernel) are kept, and constrained
+  to be non-negative."""
+
+  model = model or CycleModel()
+  names = sorted(model.constants)
+  rows = [[sum(features[name]) for name in names] for features, _ in samples]
+  targets = [measured for _, measured in samples]
+  # (X^T X + lambda I) c = X^T y + lambda c0
+  a = [[sum(row[i] * row[j] for row in rows) + (regularization if i == j else 0)
+        for j in range(len(names))] for i in range(len(names))]
+  b = [sum(row[i] * y for row, y in zip(rows, targets)) +
+       regularization * model.constants[name] for i, name in enumerate(names)]
+  constants = _solve(a, b)
+  return CycleModel({name: max(value, 0.0) for name, value in zip(names, constants)})
+
+def get_error(model, samples):
+  """Mean absolute relative error of the model over the samples."""
+  if not samples:
+    return 0.0
+  errors = []
+  for features, measured in samples:
+    estimate = sum(model.constants[name] * sum(coeffs)
+                   for name, coeffs in features.items())
+    errors.append(abs(estimate - measured) / max(measured, 1))
+  return sum(errors) / len(errors)
+
+def mk_samples(results, ring_latency = None):
+  """Samples out of the benchmark results (see lib/util/benchmark.py),
+  the ones without profile or completion are skipped."""
+  samples = []
+  for result in results.values():
+    if result.get('status') != 'ok' or not result.get('profile') or \
+       result.get('cycles_to_complete') is None:
+      continue
+    profile = KernelProfile.from_dict(result['profile'])
+    comb = result.get('tags', {}).get('memory', 'combinational') == 'combinational'
+    samples.append((get_features(profile, comb, ring_latency),
+                    result['cycles_to_complete']))
+  return samples
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description = "Analytical cycle estimator of the CGRA kernels.")
+  parser.add_argument("--calibrate", default = None,
+                      help = "Fits the constants against the benchmark kernels and writes them.")
+  parser.add_argument("--filter", default = None, help = "Only calibrates against the kernels whose name contains it.")
+  parser.add_argument("--constants", default = None, help = "Calibrated constants to estimate with.")
+  parser.add_argument("--yaml", default = None, help = "Compiled YAML of the kernel to estimate.")
+  parser.add_argument("--ii", type = int, default = 4)
+  parser.add_argument("--loop-times", type = int, default = 10)
+  parser.add_argument("--multi-cycle-mem", action = "store_true",
+                      help = "Non-combinational memory access.")
+  parser.add_argument("--ring-latency", type = int, default = None)
+  args = parser.parse_args()
+
+  model = CycleModel.load(args.constants) if args.constants else CycleModel()
+
+  if args.calibrate:
+    from .benchmark import mk_kernels, run_benchmarks, select_kernels
+    results = run_benchmarks(select_kernels(mk_kernels(), args.filter), sys.stdout)
+    samples = mk_samples(results, args.ring_latency)
+    calibrated = calibrate(samples, model)
+    sys.stdout.write(f"{len(samples)} kernels, error: {get_error(model, samples):.1%} -> "
+                     f"{get_error(calibrated, samples):.1%}\n")
+    calibrated.save(args.calibrate)
+    model = calibrated
+
+  if args.yaml:
+    profile = profile_yaml(args.yaml, args.ii, args.loop_times)
+    estimate = model.estimate(profile, not args.multi_cycle_mem, args.ring_latency)
+    sys.stdout.write(f"{profile}\n{estimate}\n")
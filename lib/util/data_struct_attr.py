@@ -38,4 +38,5 @@ kAttrSrcCgraX = 'src_cgra_x'
 kAttrSrcCgraY = 'src_cgra_y'
 kAttrDstCgraX = 'dst_cgra_x'
 kAttrDstCgraY = 'dst_cgra_y'
+kAttrMulticastMask = 'multicast_mask'
 kAttrAddr = 'addr'
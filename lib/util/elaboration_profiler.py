@@ -0,0 +1,294 @@
+"""
+==========================================================================
+elaboration_profiler.py
+==========================================================================
+Opt-in profiler of the elaboration, attributing the wall time and the
+memory spent in construct() to the component classes and instances, so
+that the speedups of the elaboration go where they pay off:
+
+  profiler = ElaborationProfiler()
+  with profiler:
+    th.elaborate()
+  print(profiler.format_report())
+  profiler.dump_folded("elab.folded")  # flamegraph.pl elab.folded > elab.svg
+
+While enabled, Component._construct() and the bitstruct type creation
+(behind mk_bitstruct() and @bitstruct, e.g., mk_ctrl(), mk_cgra_payload()
+and mk_intra_cgra_pkt()) are wrapped. A child is constructed within the
+construct() of its parent, so each instance records:
+ - time/memory: inclusive wall time and net allocated bytes (through
+   tracemalloc, which slows the elaboration down, see `trace_memory`).
+ - self_time/self_memory: the same excluding the children.
+ - signals/upblks: signals (including the ones of its interfaces) and
+   update blocks it declares.
+ - bitstructs: bitstruct types it builds, of which new_bitstructs are
+   not deduplicated by PyMTL (the other ones are rebuilt for nothing).
+
+A test function can also be profiled without simulating it:
+
+  % python -m VectorCGRA.lib.util.elaboration_profiler \
+      cgra.test.CgraRTL_test test_homogeneous_2x2 --folded elab.folded
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import argparse
+import importlib
+import json
+import time
+import tracemalloc
+
+from pymtl3 import Component
+from pymtl3.datatypes import bitstructs
+from pymtl3.dsl.Connectable import Interface, Signal
+from .benchmark import kDefaultCmdlineOpts, kRootPackage
+
+def count_signals(obj):
+  if isinstance(obj, list):
+    return sum([count_signals(x) for x in obj])
+  if isinstance(obj, Signal):
+    return 1
+  if isinstance(obj, Interface):
+    return sum([count_signals(x) for name, x in vars(obj).items()
+                if not name.startswith('_')])
+  return 0
+
+class InstanceProfile:
+
+  def __init__(s, path, type_name, parent):
+    s.path = path
+    s.type = type_name
+    s.parent = parent
+    s.children = []
+    s.time = 0.0
+    s.memory = 0
+    s.signals = 0
+    s.upblks = 0
+    s.bitstructs = 0
+    s.new_bitstructs = 0
+    s.bitstruct_time = 0.0
+    if parent is not None:
+      parent.children.append(s)
+
+  @property
+  def self_time(s):
+    return s.time - sum([child.time for child in s.children])
+
+  @property
+  def self_memory(s):
+    return s.memory - sum([child.memory for child in s.children])
+
+  def get_stack(s, by_path = False):
+    stack = []
+    instance = s
+    while instance is not None:
+      stack.append(instance.path.rsplit('.', 1)[-1] if by_path else instance.type)
+      instance = instance.parent
+    return stack[::-1]
+
+  def report(s):
+    return {
+      'path' : s.path,
+      'type' : s.type,
+      'time' : s.time,
+      'self_time' : s.self_time,
+      'memory' : s.memory,
+      'self_memory' : s.self_memory,
+      'signals' : s.signals,
+      'upblks' : s.upblks,
+      'bitstructs' : s.bitstructs,
+      'new_bitstructs' : s.new_bitstructs,
+      'bitstruct_time' : s.bitstruct_time,
+    }
+
+class ElaborationProfiler:
+
+  def __init__(s, trace_memory = True):
+    s.trace_memory = trace_memory
+    s.instances = []
+    s.stack = []
+    # Bitstruct name -> number of times it is built.
+    s.bitstruct_types = {}
+    s.original_construct = None
+    s.original_process_class = None
+    s.started_tracemalloc = False
+
+  def _get_memory(s):
+    return tracemalloc.get_traced_memory()[0] if s.trace_memory else 0
+
+  def __enter__(s):
+    if s.original_construct is not None:
+      raise RuntimeError("The elaboration profiler is already enabled.")
+    s.original_construct = original_construct = Component._construct
+    s.original_process_class = original_process_class = bitstructs._process_class
+    if s.trace_memory and not tracemalloc.is_tracing():
+      tracemalloc.start()
+      s.started_tracemalloc = True
+
+    def _construct(m):
+      if m._dsl.constructed:
+        return original_construct(m)
+      parent = s.stack[-1] if s.stack else None
+      instance = InstanceProfile(m._dsl.full_name, type(m).__name__, parent)
+      s.instances.append(instance)
+      s.stack.append(instance)
+      memory = s._get_memory()
+      start = time.perf_counter()
+      try:
+        original_construct(m)
+      finally:
+        instance.time = time.perf_counter() - start
+        instance.memory = s._get_memory() - memory
+        s.stack.pop()
+      instance.signals = sum([count_signals(obj) for name, obj in vars(m).items()
+                              if not name.startswith('_')])
+      instance.upblks = len(m._dsl.upblks)
+
+    def _process_class(cls, *args, **kwargs):
+      start = time.perf_counter()
+      result = original_process_class(cls, *args, **kwargs)
+      s.bitstruct_types[cls.__name__] = s.bitstruct_types.get(cls.__name__, 0) + 1
+      if s.stack:
+        instance = s.stack[-1]
+        instance.bitstructs += 1
+        instance.new_bitstructs += int(result is cls)
+        instance.bitstruct_time += time.perf_counter() - start
+      return result
+
+    Component._construct = _construct
+    bitstructs._process_class = _process_class
+    return s
+
+  def __exit__(s, *exc_info):
+    Component._construct = s.original_construct
+    bitstructs._process_class = s.original_process_class
+    s.original_construct = None
+    s.original_process_class = None
+    if s.started_tracemalloc:
+      tracemalloc.stop()
+      s.started_tracemalloc = False
+    s.stack = []
+
+  def get_roots(s):
+    return [instance for instance in s.instances if instance.parent is None]
+
+  def get_classes(s):
+    classes = {}
+    for instance in s.instances:
+      stats = classes.setdefault(instance.type, {
+        'type' : instance.type, 'instances' : 0, 'time' : 0.0,
+        'self_time' : 0.0, 'memory' : 0, 'self_memory' : 0, 'signals' : 0,
+        'upblks' : 0, 'bitstructs' : 0, 'new_bitstructs' : 0,
+        'bitstruct_time' : 0.0})
+      stats['instances'] += 1
+      # The inclusive metrics of the instances nested in another one of
+      # the same class are already counted.
+      if instance.type not in instance.get_stack()[:-1]:
+        stats['time'] += instance.time
+        stats['memory'] += instance.memory
+      stats['self_time'] += instance.self_time
+      stats['self_memory'] += instance.self_memory
+      for key in ['signals', 'upblks', 'bitstructs', 'new_bitstructs',
+                  'bitstruct_time']:
+        stats[key] += getattr(instance, key)
+    return sorted(classes.values(), key = lambda stats: -stats['self_time'])
+
+  def report(s):
+    roots = s.get_roots()
+    instances = [instance.report() for instance in s.instances]
+    return {
+      'time' : sum([root.time for root in roots]),
+      'memory' : sum([root.memory for root in roots]),
+      'num_instances' : len(instances),
+      'signals' : sum([instance['signals'] for instance in instances]),
+      'upblks' : sum([instance['upblks'] for instance in instances]),
+      'bitstructs' : sum([instance['bitstructs'] for instance in instances]),
+      'new_bitstructs' : sum([instance['new_bitstructs'] for instance in instances]),
+      'classes' : s.get_classes(),
+      'instances' : sorted(instances, key = lambda instance: -instance['self_time']),
+      'bitstruct_types' : dict(sorted(s.bitstruct_types.items(),
+                                      key = lambda item: (-item[1], item[0]))),
+    }
+
+  def dump_json(s, path):
+    with open(path, 'w') as f:
+      json.dump(s.report(), f, indent = 2)
+
+  def get_folded(s, by_path = False, metric = 'time'):
+    """Returns the self time (in us) or self memory (in bytes) of the
+    instances as folded stacks (one 'frame;frame;... value' per line), of
+    the component classes or of the instance names if `by_path`."""
+
+    weights = {}
+    for instance in s.instances:
+      if metric == 'time':
+        weight = int(instance.self_time * 1e6)
+      else:
+        weight = instance.self_memory
+      stack = ";".join(instance.get_stack(by_path))
+      weights[stack] = weights.get(stack, 0) + max(weight, 0)
+    return [f"{stack} {weight}" for stack, weight in sorted(weights.items())
+            if weight > 0]
+
+  def dump_folded(s, path, by_path = False, metric = 'time'):
+    with open(path, 'w') as f:
+      f.write("".join([f"{line}\n" for line in s.get_folded(by_path, metric)]))
+
+  def format_report(s, num_rows = 20):
+    report = s.report()
+    lines = [f"elaboration: {report['time']:.2f}s, "
+             f"{report['memory'] / 2**20:.1f}MB, "
+             f"instances: {report['num_instances']}, "
+             f"signals: {report['signals']}, upblks: {report['upblks']}, "
+             f"bitstructs: {report['bitstructs']} "
+             f"({report['new_bitstructs']} new)",
+             f"{'class':<32} {'inst':>5} {'self(s)':>8} {'incl(s)':>8} "
+             f"{'self(MB)':>8} {'signals':>8} {'upblks':>6} {'bitstructs':>10}"]
+    for stats in report['classes'][:num_rows]:
+      lines.append(f"{stats['type']:<32} {stats['instances']:>5} "
+                   f"{stats['self_time']:>8.3f} {stats['time']:>8.3f} "
+                   f"{stats['self_memory'] / 2**20:>8.1f} {stats['signals']:>8} "
+                   f"{stats['upblks']:>6} {stats['bitstructs']:>10}")
+    return "\n".join(lines)
+
+#-------------------------------------------------------------------------
+# Profiling a test function
+#-------------------------------------------------------------------------
+
+def profile_test(module_name, func_name, profiler):
+  """Runs the test function `func_name` of the test module (relative to
+  the root package, e.g., 'cgra.test.CgraRTL_test') with its run_sim()
+  skipped, i.e., only elaborating its harness, under `profiler`."""
+
+  module = importlib.import_module(f"{kRootPackage}.{module_name}")
+  original_run_sim = module.run_sim
+  module.run_sim = lambda *args, **kwargs: None
+  try:
+    with profiler:
+      getattr(module, func_name)(dict(kDefaultCmdlineOpts))
+  finally:
+    module.run_sim = original_run_sim
+  return profiler
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description = "Elaboration profile of a test.")
+  parser.add_argument("module", help = "Test module, e.g., cgra.test.CgraRTL_test.")
+  parser.add_argument("func", help = "Test function, e.g., test_homogeneous_2x2.")
+  parser.add_argument("--no-memory", action = "store_true",
+                      help = "Does not trace the memory (faster).")
+  parser.add_argument("--rows", type = int, default = 20, help = "Classes shown in the report.")
+  parser.add_argument("--json", default = None, help = "Writes the full report into the file.")
+  parser.add_argument("--folded", default = None,
+                      help = "Writes the folded stacks of the self time for flamegraph.pl.")
+  parser.add_argument("--by-path", action = "store_true",
+                      help = "Uses the instance names rather than the classes as frames.")
+  args = parser.parse_args()
+
+  profiler = profile_test(args.module, args.func,
+                          ElaborationProfiler(trace_memory = not args.no_memory))
+  print(profiler.format_report(args.rows))
+  if args.json:
+    profiler.dump_json(args.json)
+  if args.folded:
+    profiler.dump_folded(args.folded, args.by_path)
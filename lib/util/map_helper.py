@@ -16,6 +16,7 @@ from ...fu.single.CompRTL import CompRTL
 from ...fu.single.LogicRTL import LogicRTL
 from ...fu.single.MulRTL import MulRTL
 from ...fu.single.MemUnitRTL import MemUnitRTL
+from ...fu.single.NonBlockingMemUnitRTL import NonBlockingMemUnitRTL
 from ...fu.single.PhiRTL import PhiRTL
 from ...fu.single.RetRTL import RetRTL
 from ...fu.single.SelRTL import SelRTL
@@ -35,7 +36,8 @@ unit_map = { "Adder"           : AdderRTL,
              "Logic"           : LogicRTL,
              "Shifter"         : ShifterRTL,
              "Selecter"        : SelRTL,
-             "MemUnit"         : MemUnitRTL }
+             "MemUnit"         : MemUnitRTL,
+             "NonBlockingMemUnit" : NonBlockingMemUnitRTL }
 
 opt_map  = { "OPT_START"       : OPT_START,
              "OPT_NAH"         : OPT_NAH,
@@ -0,0 +1,107 @@
+"""
+==========================================================================
+multicast.py
+==========================================================================
+Merges the identical per-tile ctrl packets into multicast ones (see
+mk_intra_cgra_pkt() and noc/CtrlPktMulticastRTL.py), so that systolic and
+homogeneous kernels only push one copy of the configuration through the
+controller.
+
+A multicast packet reaches the tiles in its mask one after another along
+the ctrl ring, while a unicast one goes to its tile directly, so the two
+could overtake each other. To keep the packets of each tile in order,
+only the tiles with identical packet sequences (i.e., identical programs)
+are merged, all of their packets then go through the same path.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from ..cmd_type import *
+from .data_struct_attr import *
+
+# Commands consumed by the tiles that can be multicast on the ctrl ring.
+kMulticastCmds = {
+  CMD_CONFIG,
+  CMD_CONFIG_BURST,
+  CMD_CONFIG_BURST_DATA,
+  CMD_SWAP_CTRL_BANK,
+  CMD_CONFIG_PROLOGUE_FU,
+  CMD_CONFIG_PROLOGUE_FU_CROSSBAR,
+  CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR,
+  CMD_CONFIG_TOTAL_CTRL_COUNT,
+  CMD_CONFIG_COUNT_PER_ITER,
+  CMD_CONFIG_CTRL_LOWER_BOUND,
+  CMD_CONST,
+  CMD_LAUNCH,
+  CMD_CONFIG_STREAMING_LD_START_ADDR,
+  CMD_CONFIG_STREAMING_LD_STRIDE,
+  CMD_CONFIG_STREAMING_LD_END_ADDR,
+  CMD_CONFIG_STREAMING_ST_START_ADDR,
+  CMD_CONFIG_STREAMING_ST_STRIDE,
+  CMD_CONFIG_STREAMING_ST_END_ADDR,
+  CMD_CONFIG_LOOP_LOWER,
+  CMD_CONFIG_LOOP_UPPER,
+  CMD_CONFIG_LOOP_STEP,
+}
+
+def _content_key(pkt):
+  # Everything but the destination tile, i.e., the dst CGRA is kept.
+  key = pkt.clone()
+  key.dst = type(pkt.dst)(0)
+  key.multicast_mask = type(pkt.multicast_mask)(0)
+  return str(key)
+
+def merge_multicast_pkts(pkts):
+  """Returns the packets (in issue order) with the identical per-tile
+  packet sequences merged into multicast packets, which are issued at
+  the positions of the lowest tile of each group."""
+
+  pkts = list(pkts)
+  if not pkts:
+    return pkts
+  PktType = type(pkts[0])
+  MaskType = PktType.get_field_type(kAttrMulticastMask)
+  num_tiles = MaskType.nbits
+
+  # Collects the packet sequence of each tile.
+  tile_keys = {}
+  for pkt in pkts:
+    tile = (int(pkt.dst_cgra_id), int(pkt.dst))
+    tile_keys.setdefault(tile, []).append(
+        None if int(pkt.dst) >= num_tiles or \
+                int(pkt.payload.cmd) not in kMulticastCmds or \
+                int(pkt.multicast_mask) != 0
+        else _content_key(pkt))
+
+  # Groups the tiles with identical sequences, the ones carrying any
+  # packet that cannot be multicast stay unicast.
+  groups = {}
+  for tile, keys in tile_keys.items():
+    if None in keys:
+      continue
+    groups.setdefault((tile[0], tuple(keys)), []).append(tile[1])
+
+  leader_mask = {}
+  merged_tiles = set()
+  for (cgra_id, _), tile_ids in groups.items():
+    if len(tile_ids) < 2:
+      continue
+    mask = 0
+    for tile_id in tile_ids:
+      mask |= 1 << tile_id
+      merged_tiles.add((cgra_id, tile_id))
+    leader_mask[(cgra_id, min(tile_ids))] = mask
+
+  merged = []
+  for pkt in pkts:
+    tile = (int(pkt.dst_cgra_id), int(pkt.dst))
+    if tile in leader_mask:
+      pkt = pkt.clone()
+      pkt.multicast_mask = MaskType(leader_mask[tile])
+    elif tile in merged_tiles:
+      # Covered by the multicast packet of the group.
+      continue
+    merged.append(pkt)
+  return merged
+
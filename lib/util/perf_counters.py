@@ -0,0 +1,267 @@
+"""
+==========================================================================
+perf_counters.py
+==========================================================================
+Opt-in performance counters of CgraRTL (and of the other CGRAs built
+from TileRTL and DataMemControllerRTL) for the Python simulation.
+
+The counters are collected by sampling the (already settled) signals of
+the tiles and the data memory at every clock edge, so nothing is added
+into the components, i.e., the generated Verilog stays the same and no
+overhead is introduced unless the counters are attached:
+
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  counters = CgraPerfCounters(th.dut)
+  counters.attach(th)
+  run_sim(th)
+  print(counters.format_report())
+
+Per tile:
+ - ctrl_valid/ctrl_fire/ctrl_stall: cycles with send_ctrl valid, fired,
+   or valid but blocked. stall_{element, routing_crossbar, fu_crossbar}
+   break the blocked cycles down by the sub-module not being ready.
+ - fu_busy/fu_fire: per opcode, cycles the opcode is presented to the
+   FU, and the number of times it is executed.
+ - {routing, fu}_xbar_backpressure: per outport, cycles with valid data
+   not accepted by the receiver. {routing, fu}_xbar_conflicts: cycles in
+   which a multicast is accepted by some outports but blocked by others.
+ - reg_reads/reg_writes: per register bank, reads of the fired ctrls and
+   cycles the register file is written.
+
+Data memory:
+ - {rd, wr}_requests/{rd, wr}_conflicts: per bank, valid requests and
+   requests that collide with another one on the same bank.
+ - {rd, wr}_stalls: per tile port, cycles with a request not accepted.
+
+Note that the internal signals are only visible in the Python simulation
+(i.e., not when the CGRA is imported via --test-verilog).
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import json
+
+from pymtl3 import Bits
+from pymtl3.passes.backends.verilog import VerilogTBGenPass
+from .. import opt_type
+
+# Maps opcode values to their names, e.g., 3 -> 'OPT_ADD'.
+kOptNames = {}
+for name, value in vars(opt_type).items():
+  if name.startswith("OPT_") and isinstance(value, Bits):
+    kOptNames.setdefault(int(value), name)
+
+def get_opt_name(opt):
+  return kOptNames.get(int(opt), f"OPT_{int(opt)}")
+
+def add_per_cycle_hook(top, hook):
+  """Makes the simulator of `top` call `hook()` at every clock edge. The
+  hooks are invoked by PrepareSimPass before the sequential update
+  blocks, i.e., on the values being latched in that cycle."""
+  if top.has_metadata(VerilogTBGenPass.vtbgen_hooks):
+    top.get_metadata(VerilogTBGenPass.vtbgen_hooks).append(hook)
+  else:
+    top.set_metadata(VerilogTBGenPass.vtbgen_hooks, [hook])
+
+class TilePerfCounters:
+
+  def __init__(s, tile):
+    s.tile = tile
+    s.ctrl_valid = 0
+    s.ctrl_fire = 0
+    s.ctrl_stall = 0
+    s.stall_element = 0
+    s.stall_routing_crossbar = 0
+    s.stall_fu_crossbar = 0
+    s.fu_busy = {}
+    s.fu_fire = {}
+    s.routing_xbar_backpressure = [0] * len(tile.routing_crossbar.send_data)
+    s.fu_xbar_backpressure = [0] * len(tile.fu_crossbar.send_data)
+    s.routing_xbar_conflicts = 0
+    s.fu_xbar_conflicts = 0
+    num_reg_banks = len(tile.register_cluster.reg_bank)
+    s.reg_reads = [0] * num_reg_banks
+    s.reg_writes = [0] * num_reg_banks
+
+  @staticmethod
+  def sample_xbar(xbar, backpressure):
+    """Updates the per-outport backpressure and returns whether the
+    outports of the current ctrl conflict with each other."""
+    blocked = False
+    accepted = int(xbar.send_accepted) != 0
+    for i, send in enumerate(xbar.send_data):
+      if send.val:
+        if send.rdy:
+          accepted = True
+        else:
+          backpressure[i] += 1
+          blocked = True
+    return blocked & accepted
+
+  def sample(s):
+    tile = s.tile
+    send_ctrl = tile.ctrl_mem.send_ctrl
+    if send_ctrl.val:
+      s.ctrl_valid += 1
+      if send_ctrl.rdy:
+        s.ctrl_fire += 1
+        ctrl = send_ctrl.msg
+        for i, read_towards in enumerate(ctrl.read_reg_towards):
+          if read_towards:
+            s.reg_reads[i] += 1
+      else:
+        s.ctrl_stall += 1
+        if tile.element.recv_opt.val & ~tile.element.recv_opt.rdy:
+          s.stall_element += 1
+        if tile.routing_crossbar.recv_opt.val & ~tile.routing_crossbar.recv_opt.rdy:
+          s.stall_routing_crossbar += 1
+        if tile.fu_crossbar.recv_opt.val & ~tile.fu_crossbar.recv_opt.rdy:
+          s.stall_fu_crossbar += 1
+
+    recv_opt = tile.element.recv_opt
+    if recv_opt.val:
+      name = get_opt_name(recv_opt.msg.operation)
+      s.fu_busy[name] = s.fu_busy.get(name, 0) + 1
+      if recv_opt.rdy:
+        s.fu_fire[name] = s.fu_fire.get(name, 0) + 1
+
+    if tile.routing_crossbar.recv_opt.val:
+      s.routing_xbar_conflicts += \
+          s.sample_xbar(tile.routing_crossbar, s.routing_xbar_backpressure)
+    if tile.fu_crossbar.recv_opt.val:
+      s.fu_xbar_conflicts += \
+          s.sample_xbar(tile.fu_crossbar, s.fu_xbar_backpressure)
+
+    for i, reg_bank in enumerate(tile.register_cluster.reg_bank):
+      if reg_bank.reg_file.wen[0]:
+        s.reg_writes[i] += 1
+
+  def report(s):
+    return {
+      'ctrl_valid' : s.ctrl_valid,
+      'ctrl_fire' : s.ctrl_fire,
+      'ctrl_stall' : s.ctrl_stall,
+      'stall_element' : s.stall_element,
+      'stall_routing_crossbar' : s.stall_routing_crossbar,
+      'stall_fu_crossbar' : s.stall_fu_crossbar,
+      'fu_busy' : dict(sorted(s.fu_busy.items())),
+      'fu_fire' : dict(sorted(s.fu_fire.items())),
+      'routing_xbar_backpressure' : list(s.routing_xbar_backpressure),
+      'fu_xbar_backpressure' : list(s.fu_xbar_backpressure),
+      'routing_xbar_conflicts' : s.routing_xbar_conflicts,
+      'fu_xbar_conflicts' : s.fu_xbar_conflicts,
+      'reg_reads' : list(s.reg_reads),
+      'reg_writes' : list(s.reg_writes),
+    }
+
+class DataMemPerfCounters:
+
+  def __init__(s, data_mem):
+    s.data_mem = data_mem
+    s.num_banks = data_mem.num_banks_per_cgra
+    # The additional slot counts the requests towards the NoC.
+    s.rd_requests = [0] * (s.num_banks + 1)
+    s.wr_requests = [0] * (s.num_banks + 1)
+    s.rd_conflicts = [0] * s.num_banks
+    s.wr_conflicts = [0] * s.num_banks
+    s.rd_stalls = [0] * data_mem.num_rd_tiles
+    s.wr_stalls = [0] * data_mem.num_wr_tiles
+
+  def sample_xbar(s, xbar, pkts, requests, conflicts):
+    targeted = [0] * (s.num_banks + 1)
+    for i, recv in enumerate(xbar.recv):
+      if recv.val:
+        targeted[int(pkts[i].dst)] += 1
+    for bank, count in enumerate(targeted):
+      requests[bank] += count
+      if bank < s.num_banks and count > 1:
+        conflicts[bank] += count - 1
+
+  def sample(s):
+    data_mem = s.data_mem
+    s.sample_xbar(data_mem.read_crossbar, data_mem.rd_pkt,
+                  s.rd_requests, s.rd_conflicts)
+    s.sample_xbar(data_mem.write_crossbar, data_mem.wr_pkt,
+                  s.wr_requests, s.wr_conflicts)
+    for i, recv in enumerate(data_mem.recv_raddr):
+      if recv.val & ~recv.rdy:
+        s.rd_stalls[i] += 1
+    for i, recv in enumerate(data_mem.recv_waddr):
+      if recv.val & ~recv.rdy:
+        s.wr_stalls[i] += 1
+
+  def report(s):
+    return {
+      'rd_requests' : s.rd_requests[:s.num_banks],
+      'wr_requests' : s.wr_requests[:s.num_banks],
+      'rd_requests_to_noc' : s.rd_requests[s.num_banks],
+      'wr_requests_to_noc' : s.wr_requests[s.num_banks],
+      'rd_conflicts' : list(s.rd_conflicts),
+      'wr_conflicts' : list(s.wr_conflicts),
+      'rd_stalls' : list(s.rd_stalls),
+      'wr_stalls' : list(s.wr_stalls),
+    }
+
+class CgraPerfCounters:
+
+  def __init__(s, cgra):
+    if not hasattr(cgra, 'tile'):
+      raise ValueError(f"{cgra!r} does not expose its tiles, note that the "
+                       f"counters are not available once it is imported.")
+    s.cgra = cgra
+    s.cycles = 0
+    s.tiles = [TilePerfCounters(tile) for tile in cgra.tile]
+    s.data_mem = DataMemPerfCounters(cgra.data_mem) \
+                 if hasattr(cgra, 'data_mem') else None
+
+  def attach(s, top):
+    """Samples the counters at every clock edge of the simulation of
+    `top`. Must be called after the translation/import passes (e.g.,
+    config_model_with_cmdline_opts()) and before the simulator is created
+    (e.g., run_sim())."""
+    add_per_cycle_hook(top, s.sample)
+
+  def sample(s):
+    if s.cgra.reset:
+      return
+    s.cycles += 1
+    for tile in s.tiles:
+      tile.sample()
+    if s.data_mem is not None:
+      s.data_mem.sample()
+
+  def report(s):
+    return {
+      'cycles' : s.cycles,
+      'tiles' : [tile.report() for tile in s.tiles],
+      'data_mem' : s.data_mem.report() if s.data_mem is not None else None,
+    }
+
+  def dump_json(s, path):
+    with open(path, 'w') as f:
+      json.dump(s.report(), f, indent = 2)
+
+  def format_report(s):
+    report = s.report()
+    cycles = max(report['cycles'], 1)
+    lines = [f"cycles: {report['cycles']}",
+             f"{'tile':>4} {'util':>6} {'fire':>6} {'stall':>6} {'elem':>6} "
+             f"{'rxbar':>6} {'fxbar':>6} {'confl':>6} {'reg_rd':>6} "
+             f"{'reg_wr':>6}  fu_fire"]
+    for i, tile in enumerate(report['tiles']):
+      fu_fire = ", ".join([f"{name[4:]}:{count}"
+                           for name, count in tile['fu_fire'].items()])
+      lines.append(
+          f"{i:>4} {tile['ctrl_fire'] / cycles:>6.1%} {tile['ctrl_fire']:>6} "
+          f"{tile['ctrl_stall']:>6} {tile['stall_element']:>6} "
+          f"{tile['stall_routing_crossbar']:>6} {tile['stall_fu_crossbar']:>6} "
+          f"{tile['routing_xbar_conflicts'] + tile['fu_xbar_conflicts']:>6} "
+          f"{sum(tile['reg_reads']):>6} {sum(tile['reg_writes']):>6}  {fu_fire}")
+    data_mem = report['data_mem']
+    if data_mem is not None:
+      lines.append(f"data_mem rd_requests: {data_mem['rd_requests']}, "
+                   f"rd_conflicts: {data_mem['rd_conflicts']}, "
+                   f"wr_requests: {data_mem['wr_requests']}, "
+                   f"wr_conflicts: {data_mem['wr_conflicts']}")
+    return "\n".join(lines)
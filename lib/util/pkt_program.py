@@ -0,0 +1,230 @@
+"""
+==========================================================================
+pkt_program.py
+==========================================================================
+Compact binary container of the CGRA packet streams (i.e., the programs
+fed into recv_from_cpu_pkt), so that they no longer need to be embedded
+as lists of bitstruct objects in the test files.
+
+File layout (little-endian):
+
+  +---------------------------------------------------------------+
+  | magic "CGRAPKT\\0" | version | header_nbytes | pkt_nbits |      |
+  | word_nbytes | num_pkts | num_cgra_columns | num_cgra_rows |    |
+  | num_tiles | layout_nbytes                                      |
+  +---------------------------------------------------------------+
+  | layout: JSON of the packet type name and of every leaf field   |
+  |         [path, lsb, nbits], padded to 8 bytes                  |
+  +---------------------------------------------------------------+
+  | num_pkts records of word_nbytes bytes, each is the bit-exact   |
+  | packed packet (i.e., pkt.to_bits()) in little-endian           |
+  +---------------------------------------------------------------+
+
+The reader memory-maps the file: records are exposed as zero-copy
+memoryviews, and single fields (e.g., payload.cmd) can be extracted by
+shifting/masking the packed word without constructing the bitstruct.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import json
+import mmap
+import struct
+
+from pymtl3 import Bits
+from pymtl3.datatypes.bitstructs import is_bitstruct_class
+
+kPktProgramMagic = b"CGRAPKT\x00"
+kPktProgramVersion = 1
+# magic, version, header_nbytes, pkt_nbits, word_nbytes, num_pkts,
+# num_cgra_columns, num_cgra_rows, num_tiles, layout_nbytes.
+kPktProgramHeader = struct.Struct("<8sHHIIQHHII")
+
+def get_field_layout(PktType):
+  """Returns [(path, lsb, nbits)] of all the leaf fields of PktType, from
+  the most significant one, e.g., ('payload.ctrl.fu_in[0]', 80, 3)."""
+
+  layout = []
+  def traverse(FieldType, path, msb):
+    if is_bitstruct_class(FieldType):
+      for name, SubType in FieldType.__bitstruct_fields__.items():
+        msb = traverse(SubType, f"{path}.{name}" if path else name, msb)
+      return msb
+    if isinstance(FieldType, list):
+      # The last element of a list field is packed at the MSB.
+      for i in reversed(range(len(FieldType))):
+        msb = traverse(FieldType[i], f"{path}[{i}]", msb)
+      return msb
+    layout.append((path, msb - FieldType.nbits, FieldType.nbits))
+    return msb - FieldType.nbits
+
+  assert traverse(PktType, "", PktType.nbits) == 0
+  return layout
+
+#-------------------------------------------------------------------------
+# Writer
+#-------------------------------------------------------------------------
+
+class PktProgramWriter:
+  """Streams packets into a program file, the packet count in the header
+  is patched once the writer is closed."""
+
+  def __init__(s, path, PktType, num_cgra_columns, num_cgra_rows, num_tiles):
+    s.PktType = PktType
+    s.pkt_nbits = PktType.nbits
+    s.word_nbytes = (s.pkt_nbits + 7) // 8
+    s.num_cgra_columns = num_cgra_columns
+    s.num_cgra_rows = num_cgra_rows
+    s.num_tiles = num_tiles
+    s.num_pkts = 0
+
+    layout = json.dumps({'type' : PktType.__name__,
+                         'fields' : get_field_layout(PktType)}).encode()
+    layout += b"\x00" * (-(kPktProgramHeader.size + len(layout)) % 8)
+    s.layout = layout
+    s.header_nbytes = kPktProgramHeader.size + len(layout)
+
+    s.file = open(path, 'wb')
+    s.write_header()
+    s.file.write(layout)
+
+  def write_header(s):
+    s.file.write(kPktProgramHeader.pack(
+        kPktProgramMagic, kPktProgramVersion, s.header_nbytes, s.pkt_nbits,
+        s.word_nbytes, s.num_pkts, s.num_cgra_columns, s.num_cgra_rows,
+        s.num_tiles, len(s.layout)))
+
+  def write(s, pkt):
+    # Fields assigned with mismatched types after construction (e.g., a
+    # narrower Bits) shrink to_bits() without changing pkt.nbits.
+    bits = pkt.to_bits()
+    if bits.nbits != s.pkt_nbits:
+      raise ValueError(f"Packet of {bits.nbits} bits is written into a program "
+                       f"of {s.pkt_nbits}-bit packets.")
+    s.file.write(int(bits).to_bytes(s.word_nbytes, 'little'))
+    s.num_pkts += 1
+
+  def write_all(s, pkts):
+    for pkt in pkts:
+      s.write(pkt)
+
+  def close(s):
+    if s.file.closed:
+      return
+    s.file.seek(0)
+    s.write_header()
+    s.file.close()
+
+  def __enter__(s):
+    return s
+
+  def __exit__(s, *args):
+    s.close()
+
+def write_pkt_program(path, PktType, pkts, num_cgra_columns, num_cgra_rows,
+                      num_tiles):
+  """Writes the packets into `path` and returns the number of packets."""
+  with PktProgramWriter(path, PktType, num_cgra_columns, num_cgra_rows,
+                        num_tiles) as writer:
+    writer.write_all(pkts)
+  return writer.num_pkts
+
+#-------------------------------------------------------------------------
+# Reader
+#-------------------------------------------------------------------------
+
+class PktProgramReader:
+
+  def __init__(s, path, PktType = None):
+    s.PktType = PktType
+    s.file = open(path, 'rb')
+    s.mm = mmap.mmap(s.file.fileno(), 0, access = mmap.ACCESS_READ)
+    s.view = memoryview(s.mm)
+
+    if len(s.mm) < kPktProgramHeader.size:
+      s.close()
+      raise ValueError(f"{path} is not a CGRA packet program.")
+    magic, s.version, s.header_nbytes, s.pkt_nbits, s.word_nbytes, \
+        s.num_pkts, s.num_cgra_columns, s.num_cgra_rows, s.num_tiles, \
+        layout_nbytes = kPktProgramHeader.unpack_from(s.mm, 0)
+    if magic != kPktProgramMagic:
+      s.close()
+      raise ValueError(f"{path} is not a CGRA packet program.")
+    if s.version > kPktProgramVersion:
+      s.close()
+      raise ValueError(f"{path} has version {s.version}, only version "
+                       f"{kPktProgramVersion} and below are supported.")
+    if s.header_nbytes + s.num_pkts * s.word_nbytes > len(s.mm):
+      s.close()
+      raise ValueError(f"{path} is truncated.")
+
+    layout = bytes(s.view[kPktProgramHeader.size :
+                          kPktProgramHeader.size + layout_nbytes])
+    layout = json.loads(layout.rstrip(b"\x00"))
+    s.type_name = layout['type']
+    s.fields = {path : (lsb, nbits) for path, lsb, nbits in layout['fields']}
+
+    if PktType is not None and \
+       (PktType.nbits != s.pkt_nbits or
+        [tuple(field) for field in layout['fields']] != get_field_layout(PktType)):
+      s.close()
+      raise ValueError(f"The layout of {PktType.__name__} does not match "
+                       f"the one ({s.type_name}) stored in {path}.")
+
+  def __len__(s):
+    return s.num_pkts
+
+  def raw(s, i):
+    """Zero-copy view of the packed bytes of the i-th packet."""
+    if not 0 <= i < s.num_pkts:
+      raise IndexError(i)
+    offset = s.header_nbytes + i * s.word_nbytes
+    return s.view[offset : offset + s.word_nbytes]
+
+  def word(s, i):
+    return int.from_bytes(s.raw(i), 'little')
+
+  def field(s, i, path):
+    """Extracts a leaf field (e.g., 'payload.cmd') of the i-th packet."""
+    lsb, nbits = s.fields[path]
+    return (s.word(i) >> lsb) & ((1 << nbits) - 1)
+
+  def iter_words(s):
+    for i in range(s.num_pkts):
+      yield s.word(i)
+
+  def pkt(s, i):
+    if s.PktType is None:
+      raise ValueError("PktType is required to construct the packets.")
+    return s.PktType.from_bits(Bits(s.pkt_nbits, s.word(i)))
+
+  def __getitem__(s, i):
+    return s.pkt(i)
+
+  def __iter__(s):
+    for i in range(s.num_pkts):
+      yield s.pkt(i)
+
+  def write_hex(s, path):
+    """Dumps one packet per line in hex, e.g., for $readmemh in the
+    SystemVerilog testbenches."""
+    num_digits = (s.pkt_nbits + 3) // 4
+    with open(path, 'w') as f:
+      for word in s.iter_words():
+        f.write(f"{word:0{num_digits}x}\n")
+
+  def close(s):
+    if getattr(s, 'view', None) is not None:
+      s.view.release()
+      s.view = None
+    if getattr(s, 'mm', None) is not None:
+      s.mm.close()
+      s.mm = None
+    s.file.close()
+
+  def __enter__(s):
+    return s
+
+  def __exit__(s, *args):
+    s.close()
@@ -0,0 +1,368 @@
+"""
+==========================================================================
+split_translation.py
+==========================================================================
+Translates a design into Verilog one distinct module at a time, e.g.,
+the MeshMultiCgraTemplateRTL with its CgraTemplateRTLs and TileRTLs,
+whose monolithic translation keeps the RTLIR of every instance in
+memory and easily runs out of it (see
+multi_cgra/test/arch_multi_hetero_cgra_override.yaml):
+
+  translator = SplitVerilogTranslator({CgraTemplateRTL : 'CgraType',
+                                       TileRTL : 'TileType'})
+  translator.translate(MeshMultiCgraTemplateRTL, args, kwargs, out_dir)
+  print(translator.format_report())
+
+The keys are the component classes translated separately, the values
+the construct() kwarg through which their parents take the class. Each
+distinct parameterization (keyed by the structure of its construct()
+args, see get_param_string()) is elaborated alone, with its own split
+children replaced by port-only shells, and translated in a forked
+process (in place if fork is not available) into <module>.v. The parents
+are then translated with the shells, so the peak memory scales with the
+largest distinct module rather than with the number of tiles.
+
+Every definition (module or struct) is emitted once, i.e., a file only
+holds the definitions not emitted by the files translated before it
+(the children come first). <top>.f lists the files in that order, and
+<top>__pickled.v concatenates them into a self-contained design.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import gc
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import re
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pymtl3 import Component, InPort, Interface, OutPort
+from pymtl3.passes.backends.verilog import VerilogTranslationPass
+from .translation_cache import get_param_string
+
+kBlockRe = re.compile(r"^// PyMTL (BitStruct|Component|VerilogPlaceholder) "
+                      r"(\S+) Definition$", re.MULTILINE)
+kModuleRe = re.compile(r"^module (\S+)", re.MULTILINE)
+
+def get_module_key(cls, args, kwargs):
+  hasher = hashlib.sha256()
+  hasher.update(f"{cls.__module__}.{cls.__qualname__}\n".encode())
+  hasher.update(get_param_string(list(args)).encode())
+  hasher.update(get_param_string(dict(kwargs)).encode())
+  return hasher.hexdigest()
+
+def get_peak_rss_mb():
+  # ru_maxrss is in KB on Linux.
+  return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+#-------------------------------------------------------------------------
+# Shells
+#-------------------------------------------------------------------------
+
+class MissingModuleError(Exception):
+  """Raised by a shell whose parameterization has not been translated
+  yet, i.e., whose ports are unknown."""
+
+  def __init__(s, cls, key, args, kwargs):
+    super().__init__(f"{cls.__name__} {key[:16]} is not translated yet")
+    s.cls = cls
+    s.key = key
+    s.args = args
+    s.kwargs = kwargs
+
+def _is_port(obj):
+  if isinstance(obj, list):
+    return len(obj) > 0 and all([_is_port(x) for x in obj])
+  return isinstance(obj, (InPort, OutPort, Interface))
+
+def _get_port_spec(obj):
+  if isinstance(obj, list):
+    return [_get_port_spec(x) for x in obj]
+  return (type(obj), obj._dsl.args, obj._dsl.kwargs)
+
+def _mk_port(spec):
+  if isinstance(spec, list):
+    return [_mk_port(x) for x in spec]
+  Type, args, kwargs = spec
+  return Type(*args, **kwargs)
+
+def _get_outports(obj):
+  if isinstance(obj, list):
+    return sum([_get_outports(x) for x in obj], [])
+  if isinstance(obj, Interface):
+    return sum([_get_outports(x) for name, x in sorted(vars(obj).items())
+                if not name.startswith('_') and _is_port(x)], [])
+  return [obj] if isinstance(obj, OutPort) else []
+
+def get_ports(m):
+  """Returns the (name, spec) of the ports and interfaces of `m`, from
+  which a shell recreates them."""
+
+  return [(name, _get_port_spec(obj)) for name, obj in sorted(vars(m).items())
+          if not name.startswith('_') and name not in ['clk', 'reset'] and
+          _is_port(obj)]
+
+def mk_shell(cls, ports):
+  """Returns a component class taking the same construct() args as `cls`
+  but only declaring the ports, which are looked up in `ports` (a dict
+  from the module keys to the result of get_ports())."""
+
+  def construct(s, *args, **kwargs):
+    key = get_module_key(cls, args, kwargs)
+    if key not in ports:
+      raise MissingModuleError(cls, key, args, kwargs)
+    for name, spec in ports[key]:
+      setattr(s, name, _mk_port(spec))
+      # Ties the outports off, the definition of the shell is dropped.
+      for port in _get_outports(getattr(s, name)):
+        port //= port.get_type()()
+    s._split_translation_key = key
+
+  # The translation reflects on the signature to name the parameters.
+  construct.__signature__ = inspect.signature(cls.construct)
+  return type(f"{cls.__name__}Shell", (Component,), {'construct' : construct})
+
+def get_shells(m):
+  shells = []
+  for child in m.get_child_components(repr):
+    if hasattr(child, '_split_translation_key'):
+      shells.append(child)
+    else:
+      shells.extend(get_shells(child))
+  return shells
+
+#-------------------------------------------------------------------------
+# Translated files
+#-------------------------------------------------------------------------
+
+def split_definitions(src):
+  """Returns the (kind, class name, module/struct name, text) of the
+  definitions in a translated file."""
+
+  matches = list(kBlockRe.finditer(src))
+  definitions = []
+  for i, match in enumerate(matches):
+    end = matches[i + 1].start() if i + 1 < len(matches) else len(src)
+    text = src[match.start():end].rstrip() + "\n"
+    kind, name = match.group(1), match.group(2)
+    module = kModuleRe.search(text)
+    definitions.append((kind, name, module.group(1) if module else name, text))
+  return definitions
+
+#-------------------------------------------------------------------------
+# Translation in a forked process
+#-------------------------------------------------------------------------
+
+# The component translated by the forked worker.
+_worker_module = None
+
+def _can_fork():
+  return 'fork' in multiprocessing.get_all_start_methods()
+
+def _translate(m, work_dir):
+  start = time.perf_counter()
+  cwd = os.getcwd()
+  os.chdir(work_dir)
+  try:
+    m.set_metadata(VerilogTranslationPass.enable, True)
+    m.apply(VerilogTranslationPass())
+    filename = os.path.join(work_dir, m.get_metadata(
+        VerilogTranslationPass.translated_filename))
+  finally:
+    os.chdir(cwd)
+  return filename, time.perf_counter() - start, get_peak_rss_mb()
+
+def _translate_in_worker(work_dir):
+  return _translate(_worker_module, work_dir)
+
+#-------------------------------------------------------------------------
+# SplitVerilogTranslator
+#-------------------------------------------------------------------------
+
+class SplitVerilogTranslator:
+
+  def __init__(s, split_types, use_fork = True):
+    s.split_types = dict(split_types)
+    s.use_fork = use_fork and _can_fork()
+    # Module key -> ports, shared by all the shells.
+    s.ports = {}
+    s.shells = {cls : mk_shell(cls, s.ports) for cls in s.split_types}
+    s.modules = {}
+    s.emitted = {}
+    s.files = []
+
+  def get_shell_kwargs(s, cls):
+    # The construct() kwargs of `cls` taking a split class.
+    params = inspect.signature(cls.construct).parameters
+    return {kwarg : s.shells[split_cls]
+            for split_cls, kwarg in s.split_types.items() if kwarg in params}
+
+  def elaborate(s, cls, args, kwargs):
+    """Elaborates `cls` with its split children replaced by shells, after
+    translating the parameterizations of the children not seen yet."""
+
+    kwargs = dict(kwargs, **s.get_shell_kwargs(cls))
+    while True:
+      start = time.perf_counter()
+      m = cls(*args, **kwargs)
+      try:
+        m.elaborate()
+        return m, time.perf_counter() - start
+      except MissingModuleError as e:
+        del m
+        s.translate_module(e.cls, e.key, e.args, e.kwargs)
+
+  def translate_module(s, cls, key, args, kwargs, is_top = False):
+    m, elaboration_time = s.elaborate(cls, args, kwargs)
+    name = f"{cls.__name__}__{key[:16]}" if not is_top else cls.__name__
+    m.set_metadata(VerilogTranslationPass.explicit_module_name, name)
+    children = {}
+    for shell in get_shells(m):
+      child = s.modules[shell._split_translation_key]
+      shell.set_metadata(VerilogTranslationPass.explicit_module_name,
+                         child['name'])
+      children[child['key']] = children.get(child['key'], 0) + 1
+    if not is_top:
+      s.ports[key] = get_ports(m)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+      if s.use_fork:
+        # Only the worker holds the RTLIR, which is gone once it exits.
+        global _worker_module
+        _worker_module = m
+        try:
+          with ProcessPoolExecutor(1, multiprocessing.get_context('fork')) \
+               as executor:
+            filename, translation_time, peak_rss = \
+                executor.submit(_translate_in_worker, work_dir).result()
+        finally:
+          _worker_module = None
+      else:
+        filename, translation_time, peak_rss = _translate(m, work_dir)
+      with open(filename) as f:
+        src = f.read()
+    del m
+    gc.collect()
+
+    s.modules[key] = {
+      'key' : key,
+      'name' : name,
+      'type' : cls.__name__,
+      'file' : s.emit(name, src),
+      'children' : children,
+      'elaboration_time' : elaboration_time,
+      'translation_time' : translation_time,
+      'peak_rss_mb' : peak_rss,
+    }
+    return s.modules[key]
+
+  def emit(s, name, src):
+    """Writes the definitions of `src` not emitted yet into <name>.v,
+    skipping the ones of the shells."""
+
+    shell_names = set([shell.__name__ for shell in s.shells.values()])
+    structs = []
+    modules = []
+    for kind, cls_name, def_name, text in split_definitions(src):
+      if kind == 'Component' and cls_name in shell_names:
+        continue
+      # Same as the monolithic translation, the first definition of a name
+      # wins (the later ones may only differ in e.g. the names of the
+      # lambda blocks, which embed the path of the instance).
+      if (kind, def_name) in s.emitted:
+        continue
+      s.emitted[(kind, def_name)] = text
+      (structs if kind == 'BitStruct' else modules).append(text)
+
+    filename = os.path.join(s.out_dir, f"{name}.v")
+    with open(filename, 'w') as f:
+      f.write(f"//{'-' * 73}\n// {name}.v\n//{'-' * 73}\n"
+              f"// This file is generated by SplitVerilogTranslator, the "
+              f"definitions of\n// the modules it instantiates precede it "
+              f"in the file list.\n\n")
+      f.write("\n".join(structs + modules))
+    s.files.append(filename)
+    return filename
+
+  def translate(s, cls, args = (), kwargs = {}, out_dir = "."):
+    """Translates the design `cls(*args, **kwargs)` into `out_dir` and
+    returns the report."""
+
+    s.out_dir = out_dir
+    os.makedirs(out_dir, exist_ok = True)
+    s.modules.clear()
+    s.ports.clear()
+    s.emitted.clear()
+    s.files = []
+    start = time.perf_counter()
+    top = s.translate_module(cls, get_module_key(cls, args, kwargs),
+                             args, kwargs, is_top = True)
+
+    s.filelist = os.path.join(out_dir, f"{top['name']}.f")
+    with open(s.filelist, 'w') as f:
+      f.write("".join([f"{os.path.basename(name)}\n" for name in s.files]))
+    s.pickled = os.path.join(out_dir, f"{top['name']}__pickled.v")
+    with open(s.pickled, 'w') as f:
+      for name in s.files:
+        with open(name) as src:
+          f.write(src.read() + "\n")
+    s.top = top
+    s.total_time = time.perf_counter() - start
+    return s.report()
+
+  def get_instances(s, key, count = 1, instances = None):
+    # Number of instances of each module in the whole design.
+    instances = {} if instances is None else instances
+    instances[key] = instances.get(key, 0) + count
+    for child, n in s.modules[key]['children'].items():
+      s.get_instances(child, count * n, instances)
+    return instances
+
+  def report(s):
+    instances = s.get_instances(s.top['key'])
+    modules = [{
+      'name' : module['name'],
+      'type' : module['type'],
+      'instances' : instances[module['key']],
+      'file' : os.path.basename(module['file']),
+      'elaboration_time' : module['elaboration_time'],
+      'translation_time' : module['translation_time'],
+      'peak_rss_mb' : module['peak_rss_mb'],
+    } for module in s.modules.values()]
+    return {
+      'top' : s.top['name'],
+      'num_modules' : len(modules),
+      'num_instances' : sum([module['instances'] for module in modules]),
+      'filelist' : os.path.basename(s.filelist),
+      'pickled' : os.path.basename(s.pickled),
+      'total_time' : s.total_time,
+      'peak_rss_mb' : max([get_peak_rss_mb()] +
+                          [module['peak_rss_mb'] for module in modules]),
+      'modules' : modules,
+    }
+
+  def dump_json(s, path):
+    with open(path, 'w') as f:
+      json.dump(s.report(), f, indent = 2)
+
+  def format_report(s):
+    report = s.report()
+    lines = [f"top: {report['top']}, modules: {report['num_modules']}, "
+             f"instances: {report['num_instances']}, "
+             f"time: {report['total_time']:.1f}s, "
+             f"peak rss: {report['peak_rss_mb']:.0f}MB",
+             f"{'module':<40} {'inst':>5} {'elab(s)':>8} {'trans(s)':>9} "
+             f"{'rss(MB)':>8}"]
+    for module in report['modules']:
+      lines.append(f"{module['name']:<40} {module['instances']:>5} "
+                   f"{module['elaboration_time']:>8.2f} "
+                   f"{module['translation_time']:>9.2f} "
+                   f"{module['peak_rss_mb']:>8.0f}")
+    return "\n".join(lines)
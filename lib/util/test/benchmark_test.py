@@ -0,0 +1,145 @@
+"""
+==========================================================================
+benchmark_test.py
+==========================================================================
+Test cases for the cycle/II benchmark suite, measured on a toy CGRA that
+forwards the CPU packets and issues its ctrls back-to-back.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+from pymtl3.stdlib.test_utils import run_sim
+from ..benchmark import (Kernel, compare_results, get_achieved_ii,
+                         mk_kernels, run_kernel, select_kernels)
+from ...basic.val_rdy.ifcs import RecvIfcRTL, SendIfcRTL
+from ...basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
+from ...basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
+from ...cmd_type import *
+from ...messages import *
+
+kCtrlMemSize = 4
+
+DataType = mk_data(32, 1)
+CtrlType = mk_ctrl(2, 2)
+CtrlAddrType = mk_bits(clog2(kCtrlMemSize))
+CgraPayloadType = mk_cgra_payload(DataType, mk_bits(4), CtrlType, CtrlAddrType)
+IntraCgraPktType = mk_intra_cgra_pkt(1, 1, 4, CgraPayloadType)
+
+class ToyCtrlMem(Component):
+
+  def construct(s):
+    s.send_ctrl = SendIfcRTL(CtrlType)
+    s.ctrl_addr_outport = OutPort(CtrlAddrType)
+
+    @update
+    def update_send_ctrl():
+      s.send_ctrl.val @= 1
+      s.send_ctrl.msg @= CtrlType()
+
+    # Wraps around the ctrl memory after issuing its last ctrl.
+    @update_ff
+    def update_ctrl_addr():
+      if s.reset:
+        s.ctrl_addr_outport <<= 0
+      elif s.send_ctrl.val & s.send_ctrl.rdy:
+        s.ctrl_addr_outport <<= s.ctrl_addr_outport + 1
+
+class ToyElement(Component):
+
+  def construct(s):
+    s.recv_opt = RecvIfcRTL(CtrlType)
+    s.recv_opt.rdy //= 1
+
+class ToyTile(Component):
+
+  def construct(s):
+    s.ctrl_mem = ToyCtrlMem()
+    s.element = ToyElement()
+    s.ctrl_mem.send_ctrl //= s.element.recv_opt
+
+class ToyCgra(Component):
+
+  def construct(s):
+    s.recv_from_cpu_pkt = RecvIfcRTL(IntraCgraPktType)
+    s.send_to_cpu_pkt = SendIfcRTL(IntraCgraPktType)
+    s.tile = [ToyTile() for _ in range(2)]
+    s.recv_from_cpu_pkt //= s.send_to_cpu_pkt
+
+class TestHarness(Component):
+
+  def construct(s, pkts):
+    s.src_pkt = TestSrcRTL(IntraCgraPktType, pkts)
+    s.sink_pkt = TestSinkRTL(IntraCgraPktType, pkts)
+    s.dut = ToyCgra()
+    s.src_pkt.send //= s.dut.recv_from_cpu_pkt
+    s.dut.send_to_cpu_pkt //= s.sink_pkt.recv
+
+  def done(s):
+    return s.src_pkt.done() and s.sink_pkt.done()
+
+def sim_toy(cmdline_opts, num_pending_pkts):
+  pkts = [IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_LAUNCH))] + \
+         [IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_CONST))
+          for _ in range(num_pending_pkts)] + \
+         [IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_COMPLETE))]
+  th = TestHarness(pkts)
+  th.elaborate()
+  run_sim(th)
+
+def sim_toy_failure(cmdline_opts):
+  raise ValueError("Kernel fails.")
+
+def test_run_kernel():
+  module = __name__.split('.lib.util.', 1)[1]
+  result = run_kernel(Kernel('toy', f"lib.util.{module}", 'sim_toy',
+                             {'num_pending_pkts' : 5}))
+  assert result['status'] == 'ok'
+  # The packets pass through the toy CGRA one per cycle.
+  assert result['launch_to_complete'] == 6
+  assert result['cycles_to_complete'] <= result['cycles']
+  assert result['achieved_ii'] == kCtrlMemSize
+  # Only the packets up to the CMD_LAUNCH configure the CGRA.
+  assert result['profile']['num_config_pkts'] == 1
+  # The original run_sim() is restored.
+  assert globals()['run_sim'] is run_sim
+
+  result = run_kernel(Kernel('toy_failure', f"lib.util.{module}", 'sim_toy_failure'))
+  assert result['status'] == 'error'
+  assert result['error'] == "ValueError: Kernel fails."
+
+def test_achieved_ii():
+  assert get_achieved_ii([[]]) is None
+  assert get_achieved_ii([[3], [4, 6, 8, 12]]) == 2
+  assert get_achieved_ii([[1, 4, 7], [2, 4, 6], [0, 5, 10]]) == 3
+
+def test_compare_results():
+  baseline = {
+    'fir' : {'status' : 'ok', 'cycles' : 100, 'cycles_to_complete' : 90,
+             'launch_to_complete' : 60, 'achieved_ii' : 4, 'wall_time' : 1.0},
+    'systolic' : {'status' : 'ok', 'cycles' : 50, 'cycles_to_complete' : None,
+                  'launch_to_complete' : None, 'achieved_ii' : 1, 'wall_time' : 1.0},
+    'broken' : {'status' : 'error', 'error' : 'AssertionError'},
+  }
+  results = {
+    'fir' : {'status' : 'ok', 'cycles' : 104, 'cycles_to_complete' : 95,
+             'launch_to_complete' : 60, 'achieved_ii' : 5, 'wall_time' : 3.0},
+    'systolic' : {'status' : 'error', 'error' : 'AssertionError'},
+    'broken' : {'status' : 'error', 'error' : 'AssertionError'},
+  }
+  assert compare_results(results, baseline, threshold = 0.05) == [
+    ('fir', 'cycles_to_complete', 90, 95),
+    ('fir', 'achieved_ii', 4, 5),
+    ('systolic', 'status', 'ok', 'error'),
+  ]
+  assert ('fir', 'wall_time', 1.0, 3.0) in \
+         compare_results(results, baseline, threshold = 0.5, wall_time_threshold = 1.0)
+
+def test_select_kernels():
+  kernels = mk_kernels()
+  assert len({kernel.name for kernel in kernels}) == len(kernels)
+  selected = select_kernels(kernels, 'fir', {'memory' : 'multi_cycle'})
+  assert selected
+  assert all('fir' in kernel.name and kernel.tags['memory'] == 'multi_cycle'
+             for kernel in selected)
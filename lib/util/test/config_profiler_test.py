@@ -0,0 +1,168 @@
+"""
+==========================================================================
+config_profiler_test.py
+==========================================================================
+Test cases for the configuration-time profiler, measured on a toy CGRA
+whose ctrl ring delays each packet by one cycle and whose tiles complete
+a fixed number of cycles after being launched.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import json
+
+from pymtl3 import *
+from pymtl3.stdlib.test_utils import run_sim
+from ..config_profiler import CgraConfigProfiler, get_cmd_name
+from ...basic.val_rdy.ifcs import RecvIfcRTL, SendIfcRTL
+from ...basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
+from ...basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
+from ...cmd_type import *
+from ...messages import *
+
+kNumTiles = 2
+kExecCycles = 5
+
+DataType = mk_data(32, 1)
+CtrlType = mk_ctrl(2, 2)
+CgraPayloadType = mk_cgra_payload(DataType, mk_bits(4), CtrlType, mk_bits(2))
+IntraCgraPktType = mk_intra_cgra_pkt(1, 1, kNumTiles, CgraPayloadType)
+
+def mk_pkt(src, dst, cmd):
+  return IntraCgraPktType(src, dst, payload = CgraPayloadType(cmd))
+
+class ToyController(Component):
+
+  def construct(s):
+    s.cgra_id = InPort(mk_bits(1))
+    s.recv_from_cpu_pkt = RecvIfcRTL(IntraCgraPktType)
+    s.send_to_ctrl_ring_pkt = SendIfcRTL(IntraCgraPktType)
+    s.recv_from_ctrl_ring_pkt = RecvIfcRTL(IntraCgraPktType)
+    s.send_to_cpu_pkt = SendIfcRTL(IntraCgraPktType)
+    s.recv_from_cpu_pkt //= s.send_to_ctrl_ring_pkt
+    s.recv_from_ctrl_ring_pkt //= s.send_to_cpu_pkt
+
+class ToyTile(Component):
+
+  def construct(s, tile_id, exec_cycles):
+    s.recv_from_controller_pkt = RecvIfcRTL(IntraCgraPktType)
+    s.send_to_controller_pkt = SendIfcRTL(IntraCgraPktType)
+    s.launched = Wire(1)
+    s.sent = Wire(1)
+    s.count = Wire(8)
+    complete_pkt = mk_pkt(tile_id, kNumTiles, CMD_COMPLETE)
+
+    s.recv_from_controller_pkt.rdy //= 1
+
+    @update
+    def update_send():
+      s.send_to_controller_pkt.val @= s.launched & ~s.sent & (s.count == exec_cycles)
+      s.send_to_controller_pkt.msg @= complete_pkt
+
+    @update_ff
+    def update_launch():
+      if s.reset:
+        s.launched <<= 0
+        s.sent <<= 0
+        s.count <<= 0
+      else:
+        if s.recv_from_controller_pkt.val & \
+           (s.recv_from_controller_pkt.msg.payload.cmd == CMD_LAUNCH):
+          s.launched <<= 1
+        elif s.launched & (s.count < exec_cycles):
+          s.count <<= s.count + 1
+        if s.send_to_controller_pkt.val & s.send_to_controller_pkt.rdy:
+          s.sent <<= 1
+
+class ToyCgra(Component):
+
+  def construct(s):
+    s.recv_from_cpu_pkt = RecvIfcRTL(IntraCgraPktType)
+    s.send_to_cpu_pkt = SendIfcRTL(IntraCgraPktType)
+    s.controller = ToyController()
+    # The ctrl ring is a register, as the tiles are always ready.
+    s.ring_val = Wire(1)
+    s.ring_msg = Wire(IntraCgraPktType)
+    s.tile = [ToyTile(i, kExecCycles + 2 * i) for i in range(kNumTiles)]
+
+    s.controller.cgra_id //= 0
+    s.recv_from_cpu_pkt //= s.controller.recv_from_cpu_pkt
+    s.controller.send_to_cpu_pkt //= s.send_to_cpu_pkt
+    s.controller.send_to_ctrl_ring_pkt.rdy //= 1
+
+    @update_ff
+    def update_ring_reg():
+      if s.reset:
+        s.ring_val <<= 0
+      else:
+        s.ring_val <<= s.controller.send_to_ctrl_ring_pkt.val
+      s.ring_msg <<= s.controller.send_to_ctrl_ring_pkt.msg
+
+    @update
+    def update_ring():
+      for i in range(kNumTiles):
+        s.tile[i].recv_from_controller_pkt.val @= \
+            s.ring_val & (s.ring_msg.dst == i)
+        s.tile[i].recv_from_controller_pkt.msg @= s.ring_msg
+      # The tiles never complete in the same cycle.
+      s.controller.recv_from_ctrl_ring_pkt.val @= 0
+      s.controller.recv_from_ctrl_ring_pkt.msg @= s.tile[0].send_to_controller_pkt.msg
+      for i in range(kNumTiles):
+        s.tile[i].send_to_controller_pkt.rdy @= s.controller.recv_from_ctrl_ring_pkt.rdy
+        if s.tile[i].send_to_controller_pkt.val:
+          s.controller.recv_from_ctrl_ring_pkt.val @= 1
+          s.controller.recv_from_ctrl_ring_pkt.msg @= s.tile[i].send_to_controller_pkt.msg
+
+class TestHarness(Component):
+
+  def construct(s, src_pkts, sink_pkts):
+    s.src_pkt = TestSrcRTL(IntraCgraPktType, src_pkts)
+    s.sink_pkt = TestSinkRTL(IntraCgraPktType, sink_pkts)
+    s.dut = ToyCgra()
+    s.src_pkt.send //= s.dut.recv_from_cpu_pkt
+    s.dut.send_to_cpu_pkt //= s.sink_pkt.recv
+
+  def done(s):
+    return s.src_pkt.done() and s.sink_pkt.done()
+
+def test_config_profiler(tmp_path):
+  src_pkts = [mk_pkt(0, 0, CMD_CONST),
+              mk_pkt(0, 0, CMD_CONFIG),
+              mk_pkt(0, 1, CMD_CONFIG),
+              mk_pkt(0, 0, CMD_CONFIG),
+              mk_pkt(0, 0, CMD_LAUNCH),
+              mk_pkt(0, 1, CMD_LAUNCH)]
+  sink_pkts = [mk_pkt(i, kNumTiles, CMD_COMPLETE) for i in range(kNumTiles)]
+  th = TestHarness(src_pkts, sink_pkts)
+  th.elaborate()
+  profiler = CgraConfigProfiler(th.dut)
+  profiler.attach(th)
+  run_sim(th)
+
+  report = profiler.report()
+  tile0, tile1 = report['tiles']
+  # One packet per cycle, each taking a cycle on the ring.
+  assert tile0['pkts'] == {'CMD_CONFIG' : 2, 'CMD_CONST' : 1, 'CMD_LAUNCH' : 1}
+  assert set(tile0['ring_latency'].values()) == {1}
+  assert sum(tile0['config_breakdown'].values()) == tile0['config']
+  assert tile1['config'] == tile0['config'] + 1
+  # The gap behind the packets of tile 0 is charged to the CMD_LAUNCH.
+  assert tile1['config_breakdown']['CMD_LAUNCH'] == 3
+  assert tile0['execution'] == kExecCycles + 1
+  assert tile1['execution'] == kExecCycles + 2 + 1
+  assert tile0['teardown'] == tile1['teardown'] == 0
+  assert report['config'] == tile1['config']
+  assert report['execution'] == tile1['execution']
+  assert report['teardown'] == 0
+
+  path = str(tmp_path / "profile.json")
+  profiler.dump_json(path)
+  with open(path) as f:
+    assert json.load(f) == report
+  assert "CONFIG:" in profiler.format_report()
+
+def test_cmd_name():
+  assert get_cmd_name(CMD_CONFIG_COUNT_PER_ITER) == 'CMD_CONFIG_COUNT_PER_ITER'
+  assert get_cmd_name(b6(CMD_LAUNCH)) == 'CMD_LAUNCH'
+  assert get_cmd_name(63) == 'CMD_63'
@@ -0,0 +1,100 @@
+"""
+==========================================================================
+cycle_estimator_test.py
+==========================================================================
+Test cases for the analytical cycle estimator.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import os
+
+from pymtl3 import *
+from ..cycle_estimator import (CycleModel, KernelProfile, calibrate,
+                               get_error, get_features, mk_samples,
+                               profile_pkts, profile_yaml)
+from ...cmd_type import *
+from ...messages import *
+from ...opt_type import *
+
+kYamlPath = os.path.join(os.path.dirname(__file__), "..", "..", "..",
+                         "validation", "test", "fir_acceptance_test.yaml")
+
+DataType = mk_data(32, 1)
+CtrlType = mk_ctrl(2, 2)
+CgraPayloadType = mk_cgra_payload(DataType, mk_bits(4), CtrlType, mk_bits(2))
+IntraCgraPktType = mk_intra_cgra_pkt(1, 1, 4, CgraPayloadType)
+
+def mk_pkt(dst, cmd, opt = OPT_NAH, ctrl_addr = 0, data = 0, multicast_mask = 0):
+  return IntraCgraPktType(0, dst,
+                          payload = CgraPayloadType(cmd, data = DataType(data, 1),
+                                                    ctrl = CtrlType(opt),
+                                                    ctrl_addr = ctrl_addr),
+                          multicast_mask = multicast_mask)
+
+def test_profile_pkts():
+  pkts = [mk_pkt(0, CMD_CONFIG, OPT_LD, 0),
+          mk_pkt(0, CMD_CONFIG, OPT_ADD, 1),
+          mk_pkt(0, CMD_CONFIG_COUNT_PER_ITER, data = 2),
+          mk_pkt(0, CMD_CONFIG_TOTAL_CTRL_COUNT, data = 8),
+          mk_pkt(0, CMD_CONFIG_PROLOGUE_FU, ctrl_addr = 1, data = 2),
+          # Tiles 1 and 3 get the same program via a burst.
+          mk_pkt(1, CMD_CONFIG_BURST, OPT_STR, 0, data = 2, multicast_mask = 0b1010),
+          mk_pkt(1, CMD_CONFIG_BURST_DATA, OPT_LD, multicast_mask = 0b1010),
+          mk_pkt(1, CMD_CONFIG_BURST_DATA, OPT_ADD, multicast_mask = 0b1010),
+          mk_pkt(0, CMD_LAUNCH),
+          mk_pkt(1, CMD_LAUNCH, multicast_mask = 0b1010),
+          # Not part of the configuration.
+          mk_pkt(0, CMD_TERMINATE)]
+  assert profile_pkts(pkts, total_ctrl_steps = 12) == \
+         KernelProfile(num_tiles = 3, num_config_pkts = 10, ii = 3,
+                       total_ctrl_steps = 12, mem_ops_per_iter = 5,
+                       max_prologue = 2)
+
+def test_estimate():
+  profile = KernelProfile(num_tiles = 4, num_config_pkts = 20, ii = 4,
+                          total_ctrl_steps = 40, mem_ops_per_iter = 2,
+                          max_prologue = 1)
+  model = CycleModel({'prologue' : 1.0})
+  estimate = model.estimate(profile, ring_latency = 3)
+  assert estimate.config == 20 + 3
+  assert estimate.steady == 40 + 4
+  assert estimate.drain == 3 + 4
+  # Each iteration stalls on the two memory accesses.
+  assert model.estimate(profile, False, 3).steady == 40 + 4 + 2 * 10
+
+def test_calibrate():
+  truth = CycleModel({'pkt' : 2.0, 'ring' : 1.5, 'step' : 1.0,
+                      'mem' : 3.0, 'prologue' : 0.5, 'fixed' : 6.0})
+  samples = []
+  for i in range(12):
+    profile = KernelProfile(num_tiles = 4 + i % 3 * 4, num_config_pkts = 10 + 7 * i,
+                            ii = 2 + i % 4, total_ctrl_steps = 20 + 13 * (i % 5),
+                            mem_ops_per_iter = i % 3, max_prologue = i % 2)
+    features = get_features(profile, i % 2 == 0)
+    samples.append((features, truth.estimate(profile, i % 2 == 0).total))
+  calibrated = calibrate(samples, regularization = 1e-6)
+  assert get_error(CycleModel(), samples) > 0.1
+  assert get_error(calibrated, samples) < 0.01
+
+def test_mk_samples():
+  profile = KernelProfile(num_tiles = 4, num_config_pkts = 20, ii = 4,
+                          total_ctrl_steps = 40)
+  results = {
+    'fir' : {'status' : 'ok', 'cycles_to_complete' : 90,
+             'profile' : profile.to_dict(), 'tags' : {'memory' : 'multi_cycle'}},
+    'no_complete' : {'status' : 'ok', 'cycles_to_complete' : None,
+                     'profile' : profile.to_dict()},
+    'broken' : {'status' : 'error', 'error' : 'AssertionError'},
+  }
+  assert mk_samples(results) == [(get_features(profile, False), 90)]
+
+def test_profile_yaml():
+  profile = profile_yaml(kYamlPath, 4, 10)
+  assert profile.num_tiles == 6
+  assert profile.ii == 4
+  assert profile.total_ctrl_steps == 10
+  assert profile.mem_ops_per_iter == 2
+  assert profile.max_prologue == 1
+  assert CycleModel().estimate(profile).total > profile.total_ctrl_steps
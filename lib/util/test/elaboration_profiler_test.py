@@ -0,0 +1,99 @@
+"""
+==========================================================================
+elaboration_profiler_test.py
+==========================================================================
+Test cases for the elaboration profiler, on a toy hierarchy whose leaves
+rebuild the same bitstruct type in their construct().
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import json
+
+from pymtl3 import *
+from ..elaboration_profiler import ElaborationProfiler
+from ...basic.val_rdy.ifcs import RecvIfcRTL, SendIfcRTL
+
+def mk_msg():
+  return mk_bitstruct("ProfilerTestMsg", {'data' : Bits8, 'tag' : Bits2})
+
+class Leaf(Component):
+
+  def construct(s):
+    MsgType = mk_msg()
+    s.recv = RecvIfcRTL(MsgType)
+    s.send = SendIfcRTL(MsgType)
+    s.count = OutPort(8)
+    s.recv //= s.send
+
+    @update_ff
+    def update_count():
+      s.count <<= s.count + 1
+
+class Top(Component):
+
+  def construct(s, num_leaves):
+    s.recv = RecvIfcRTL(mk_msg())
+    s.send = SendIfcRTL(mk_msg())
+    s.leaf = [Leaf() for _ in range(num_leaves)]
+    s.out = OutPort(8)
+    s.recv //= s.leaf[0].recv
+    for i in range(1, num_leaves):
+      s.leaf[i - 1].send //= s.leaf[i].recv
+    s.leaf[-1].send //= s.send
+    s.out //= s.leaf[0].count
+
+def test_elaboration_profiler(tmp_path):
+  original_construct = Component._construct
+  profiler = ElaborationProfiler()
+  with profiler:
+    top = Top(3)
+    top.elaborate()
+  assert Component._construct is original_construct
+
+  report = profiler.report()
+  assert report['num_instances'] == 4
+  classes = {stats['type'] : stats for stats in report['classes']}
+  assert classes['Leaf']['instances'] == 3
+  # The same type is built over and over, but is only new the first time
+  # (if no other test built it before).
+  assert classes['Leaf']['bitstructs'] == 3
+  assert classes['Top']['bitstructs'] == 2
+  assert report['new_bitstructs'] <= 1
+  assert report['bitstruct_types']['ProfilerTestMsg'] == 5
+  # clk, reset, recv (val, rdy, msg), send (val, rdy, msg), count.
+  assert classes['Leaf']['signals'] == 3 * 9
+  assert classes['Leaf']['upblks'] == 3
+  assert classes['Top']['signals'] == 9
+
+  top_profile, = [instance for instance in report['instances']
+                  if instance['path'] == 's']
+  assert top_profile['time'] == report['time']
+  assert top_profile['time'] >= top_profile['self_time'] + classes['Leaf']['time'] - 1e-9
+  assert sorted([instance['path'] for instance in report['instances']]) == \
+         ['s', 's.leaf[0]', 's.leaf[1]', 's.leaf[2]']
+
+  folded = profiler.get_folded()
+  assert all([line.rsplit(' ', 1)[0] in ['Top', 'Top;Leaf'] for line in folded])
+  path = str(tmp_path / "elab.folded")
+  profiler.dump_folded(path, by_path = True)
+  with open(path) as f:
+    for line in f:
+      stack, weight = line.rsplit(' ', 1)
+      assert stack.split(';')[0] == 's' and int(weight) > 0
+  profiler.dump_json(str(tmp_path / "elab.json"))
+  with open(tmp_path / "elab.json") as f:
+    assert json.load(f)['num_instances'] == 4
+  assert "Leaf" in profiler.format_report()
+
+def test_elaboration_profiler_restores_on_error():
+  original_construct = Component._construct
+  profiler = ElaborationProfiler(trace_memory = False)
+  try:
+    with profiler:
+      Top(0).elaborate()
+  except IndexError:
+    pass
+  assert Component._construct is original_construct
+  assert profiler.report()['memory'] == 0
@@ -0,0 +1,109 @@
+"""
+==========================================================================
+pkt_program_test.py
+==========================================================================
+Test cases for the binary CGRA packet program format.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import pytest
+
+from pymtl3 import *
+from ..pkt_program import (PktProgramReader, PktProgramWriter,
+                           get_field_layout, write_pkt_program)
+from ...cmd_type import *
+from ...messages import *
+from ...opt_type import *
+
+num_cgra_columns = 2
+num_cgra_rows = 2
+num_tiles = 16
+num_fu_inports = 4
+num_fu_outports = 2
+num_tile_ports = 4
+num_registers_per_reg_bank = 16
+DataType = mk_data(32, 1)
+DataAddrType = mk_bits(7)
+CtrlAddrType = mk_bits(3)
+TileInType = mk_bits(clog2(num_tile_ports + num_fu_inports + 1))
+FuInType = mk_bits(clog2(num_fu_inports + 1))
+FuOutType = mk_bits(clog2(num_fu_outports + 1))
+CtrlType = mk_ctrl(num_fu_inports, num_fu_outports, num_tile_ports,
+                   num_tile_ports, num_registers_per_reg_bank)
+CgraPayloadType = mk_cgra_payload(DataType, DataAddrType, CtrlType, CtrlAddrType)
+IntraCgraPktType = mk_intra_cgra_pkt(num_cgra_columns, num_cgra_rows,
+                                     num_tiles, CgraPayloadType)
+
+def mk_pkts():
+  return [
+      IntraCgraPktType(0, 3, payload = CgraPayloadType(CMD_STORE_REQUEST, data = DataType(10, 1), data_addr = 5)),
+      IntraCgraPktType(0, 3, payload = CgraPayloadType(CMD_CONST, data = DataType(0xdeadbeef, 1))),
+      IntraCgraPktType(0, 15, 1, 2,
+                       payload = CgraPayloadType(CMD_CONFIG, ctrl_addr = 4,
+                                                 ctrl = CtrlType(OPT_ADD,
+                                                                 [FuInType(4), FuInType(3), FuInType(2), FuInType(1)],
+                                                                 [TileInType(1), TileInType(0), TileInType(0), TileInType(0),
+                                                                  TileInType(1), TileInType(2), TileInType(0), TileInType(0)],
+                                                                 [FuOutType(0), FuOutType(0), FuOutType(1), FuOutType(0),
+                                                                  FuOutType(0), FuOutType(0), FuOutType(0), FuOutType(0)]))),
+      IntraCgraPktType(0, 15, payload = CgraPayloadType(CMD_LAUNCH)),
+  ]
+
+def test_field_layout():
+  layout = get_field_layout(IntraCgraPktType)
+  assert sum(nbits for _, _, nbits in layout) == IntraCgraPktType.nbits
+  pkt = mk_pkts()[2]
+  word = int(pkt.to_bits())
+  for path, lsb, nbits in layout:
+    assert (word >> lsb) & ((1 << nbits) - 1) == int(eval(f"pkt.{path}"))
+
+def test_round_trip(tmp_path):
+  path = str(tmp_path / "program.bin")
+  pkts = mk_pkts()
+  assert write_pkt_program(path, IntraCgraPktType, pkts, num_cgra_columns,
+                           num_cgra_rows, num_tiles) == len(pkts)
+
+  with PktProgramReader(path, IntraCgraPktType) as reader:
+    assert len(reader) == len(pkts)
+    assert (reader.num_cgra_columns, reader.num_cgra_rows, reader.num_tiles) == \
+           (num_cgra_columns, num_cgra_rows, num_tiles)
+    assert list(reader) == pkts
+    assert reader[2] == pkts[2]
+    # Fields are extracted without constructing the packets.
+    assert [reader.field(i, 'payload.cmd') for i in range(len(reader))] == \
+           [int(pkt.payload.cmd) for pkt in pkts]
+    assert reader.field(1, 'payload.data.payload') == 0xdeadbeef
+    assert reader.field(2, 'payload.ctrl.fu_in[0]') == 4
+    assert bytes(reader.raw(3)) == int(pkts[3].to_bits()).to_bytes(reader.word_nbytes, 'little')
+
+    hex_path = str(tmp_path / "program.hex")
+    reader.write_hex(hex_path)
+  with open(hex_path) as f:
+    assert [Bits(IntraCgraPktType.nbits, int(line, 16)) for line in f] == \
+           [pkt.to_bits() for pkt in pkts]
+
+def test_streaming_writer(tmp_path):
+  path = str(tmp_path / "program.bin")
+  with PktProgramWriter(path, IntraCgraPktType, num_cgra_columns,
+                        num_cgra_rows, num_tiles) as writer:
+    for pkt in mk_pkts() * 100:
+      writer.write(pkt)
+  with PktProgramReader(path) as reader:
+    assert len(reader) == 400
+    assert reader.type_name == IntraCgraPktType.__name__
+    with pytest.raises(ValueError):
+      reader.pkt(0)
+
+def test_mismatched_type(tmp_path):
+  path = str(tmp_path / "program.bin")
+  write_pkt_program(path, IntraCgraPktType, mk_pkts(), num_cgra_columns,
+                    num_cgra_rows, num_tiles)
+  OtherPktType = mk_intra_cgra_pkt(1, 1, 4, CgraPayloadType)
+  with pytest.raises(ValueError):
+    PktProgramReader(path, OtherPktType)
+  with open(path, 'r+b') as f:
+    f.write(b"NOTAPKT\x00")
+  with pytest.raises(ValueError):
+    PktProgramReader(path)
@@ -0,0 +1,88 @@
+"""
+==========================================================================
+testbench_generator_test.py
+==========================================================================
+Test cases for the testbench generator of the packet programs.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import pytest
+
+from pymtl3 import *
+from ..pkt_program import PktProgramReader, get_field_layout
+from ..testbench_generator import (PktTestbenchGenerator, generate_testbench,
+                                   get_cmp_mask)
+from .pkt_program_test import (CgraPayloadType, DataType, IntraCgraPktType,
+                               mk_pkts)
+from ...cmd_type import *
+
+def mk_sink_pkts():
+  return [IntraCgraPktType(payload = CgraPayloadType(CMD_COMPLETE))
+          for _ in range(3)] + \
+         [IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_LOAD_RESPONSE,
+                                                           DataType(7, 1)))]
+
+def test_cmp_mask():
+  fields = {path : (lsb, nbits) for path, lsb, nbits
+            in get_field_layout(IntraCgraPktType)}
+  nbits = IntraCgraPktType.nbits
+  assert get_cmp_mask(fields, nbits) == (1 << nbits) - 1
+  lsb, cmd_nbits = fields['payload.cmd']
+  assert get_cmp_mask(fields, nbits, ['payload.cmd']) == \
+         ((1 << cmd_nbits) - 1) << lsb
+  # A prefix covers all the leaves of the bitstruct/list field.
+  data_mask = get_cmp_mask(fields, nbits, ['payload.data'])
+  assert bin(data_mask).count('1') == DataType.nbits
+  assert get_cmp_mask(fields, nbits, ['payload.ctrl.fu_in']) == \
+         get_cmp_mask(fields, nbits, [f'payload.ctrl.fu_in[{i}]'
+                                      for i in range(4)])
+  with pytest.raises(ValueError):
+    get_cmp_mask(fields, nbits, ['payload.dat'])
+
+def test_cpp_testbench(tmp_path):
+  path = generate_testbench(str(tmp_path), "Top", IntraCgraPktType, mk_pkts(),
+                            [], mk_sink_pkts(),
+                            cmp_fields = ['payload.data', 'payload.cmd'])
+  assert path == str(tmp_path / "Top_tb.cpp")
+  with open(path) as f:
+    src = f.read()
+  assert '#include "VTop.h"' in src
+  assert f"kPktNbits = {IntraCgraPktType.nbits};" in src
+  assert "kNumWords = 7;" in src
+  assert f"kCmdComplete = {CMD_COMPLETE};" in src
+  assert str(tmp_path / "Top_ctrl.bin") in src
+  # The ports wider than 64 bits are accessed word by word.
+  assert "top->recv_from_cpu_pkt__msg[w] = pkt[w];" in src
+  assert "pkt[w] = top->send_to_cpu_pkt__msg[w];" in src
+  with PktProgramReader(str(tmp_path / "Top_ctrl.bin"), IntraCgraPktType) as reader:
+    assert list(reader) == mk_pkts()
+  with PktProgramReader(str(tmp_path / "Top_query.bin")) as reader:
+    assert len(reader) == 0
+
+def test_sv_testbench(tmp_path):
+  generate_testbench(str(tmp_path), "Top", IntraCgraPktType, mk_pkts(),
+                     mk_pkts()[:1], mk_sink_pkts())
+  generator = PktTestbenchGenerator("Kernel", str(tmp_path / "Top_ctrl.bin"),
+                                    str(tmp_path / "Top_query.bin"),
+                                    str(tmp_path / "Top_sink.bin"),
+                                    cmp_fields = ['payload.cmd'],
+                                    max_cycles = 500)
+  assert generator.num_pkts == {'ctrl' : len(mk_pkts()), 'query' : 1, 'sink' : 4}
+  assert generator.num_complete_pkts == 3
+  path = generator.write(str(tmp_path / "sv"), 'sv')
+  with open(path) as f:
+    src = f.read()
+  assert "module Kernel_tb;" in src
+  assert "  Kernel dut\n" in src
+  assert "kNumCompletePkts = 3;" in src
+  assert "kMaxCycles = 500;" in src
+  assert f"kCmpMask = {IntraCgraPktType.nbits}'h{generator.cmp_mask:x};" in src
+  hex_path = str(tmp_path / "sv" / "Kernel_tb_sink.hex")
+  assert f'$readmemh("{hex_path}", sink_pkts, 0, kNumSinkPkts - 1);' in src
+  with open(hex_path) as f:
+    words = [int(line, 16) for line in f]
+  assert words == [int(pkt.to_bits()) for pkt in mk_sink_pkts()]
+  with pytest.raises(ValueError):
+    generator.write(str(tmp_path), 'vhdl')
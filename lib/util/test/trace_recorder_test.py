@@ -0,0 +1,97 @@
+"""
+==========================================================================
+trace_recorder_test.py
+==========================================================================
+Test cases for the binary trace recorder and its offline viewer.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import io
+
+from pymtl3 import *
+from ..trace_recorder import TraceRecorder, read_trace
+from ..trace_viewer import filter_events, parse_opcode, view_trace
+from ...basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
+from ...basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
+from ...messages import *
+from ...opt_type import *
+
+DataType = mk_data(32, 1)
+CtrlType = mk_ctrl(2, 2)
+
+class TestHarness(Component):
+
+  def construct(s, ctrl_msgs, data_msgs):
+    s.src_ctrl = TestSrcRTL(CtrlType, ctrl_msgs)
+    s.sink_ctrl = TestSinkRTL(CtrlType, ctrl_msgs, interval_delay = 1)
+    s.src_data = TestSrcRTL(DataType, data_msgs)
+    s.sink_data = TestSinkRTL(DataType, data_msgs)
+
+    s.src_ctrl.send //= s.sink_ctrl.recv
+    s.src_data.send //= s.sink_data.recv
+
+  def done(s):
+    return s.src_ctrl.done() and s.src_data.done()
+
+def run_recorded(path, ctrl_msgs, data_msgs, buffer_nbytes = 1 << 22):
+  th = TestHarness(ctrl_msgs, data_msgs)
+  th.elaborate()
+  ports = [(0, 'ctrl', th.src_ctrl.send), (1, 'recv_data[0]', th.src_data.send)]
+  with TraceRecorder(path, ports, buffer_nbytes) as recorder:
+    recorder.attach(th)
+    th.apply(DefaultPassGroup())
+    th.sim_reset()
+    while not th.done():
+      th.sim_tick()
+    th.sim_tick()
+  return recorder.num_events
+
+def mk_msgs():
+  ctrl_msgs = [CtrlType(OPT_ADD), CtrlType(OPT_MUL), CtrlType(OPT_ADD)]
+  data_msgs = [DataType(i, i % 2) for i in range(6)]
+  return ctrl_msgs, data_msgs
+
+def test_record_and_read(tmp_path):
+  path = str(tmp_path / "trace.bin")
+  ctrl_msgs, data_msgs = mk_msgs()
+  # A tiny buffer makes the recorder flush many times.
+  num_events = run_recorded(path, ctrl_msgs, data_msgs, buffer_nbytes = 64)
+
+  ports, events = read_trace(path)
+  assert [port['name'] for port in ports] == ['ctrl', 'recv_data[0]']
+  events = list(events)
+  assert len(events) == num_events
+  assert [event.cycle for event in events] == sorted(event.cycle for event in events)
+
+  fired_ctrls = [event for event in events if event.tile == 0 and event.rdy]
+  assert [event.field('operation') for event in fired_ctrls] == \
+         [int(msg.operation) for msg in ctrl_msgs]
+  # The sink of the ctrl only accepts every other cycle.
+  assert any(not event.rdy for event in events if event.tile == 0)
+
+  fired_data = [event for event in events if event.tile == 1 and event.rdy]
+  assert [(event.field('payload'), event.field('predicate')) for event in fired_data] == \
+         [(int(msg.payload), int(msg.predicate)) for msg in data_msgs]
+
+def test_filters(tmp_path):
+  path = str(tmp_path / "trace.bin")
+  ctrl_msgs, data_msgs = mk_msgs()
+  run_recorded(path, ctrl_msgs, data_msgs)
+
+  _, events = read_trace(path)
+  events = list(events)
+  first_cycle = events[0].cycle
+  window = list(filter_events(iter(events), cycles = (first_cycle, first_cycle + 1)))
+  assert window and all(first_cycle <= event.cycle <= first_cycle + 1 for event in window)
+  assert all(event.tile == 1 for event in filter_events(iter(events), tiles = [1]))
+
+  muls = list(filter_events(iter(events), opcodes = [parse_opcode("MUL")]))
+  assert muls and all(event.tile == 0 and event.field('operation') == OPT_MUL
+                      for event in muls)
+
+  out = io.StringIO()
+  view_trace(path, tiles = [0], opcodes = [parse_opcode("OPT_ADD")], out = out)
+  lines = out.getvalue().splitlines()
+  assert lines and all("tile[0].ctrl" in line and "OPT_ADD" in line for line in lines)
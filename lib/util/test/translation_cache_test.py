@@ -0,0 +1,97 @@
+"""
+==========================================================================
+translation_cache_test.py
+==========================================================================
+Test cases for the on-disk Verilog translation cache.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import importlib
+import os
+import sys
+
+from pymtl3 import *
+from pymtl3.passes.backends.verilog import VerilogTranslationPass
+from .. import translation_cache
+from ..translation_cache import (CachedVerilogTranslationPass,
+                                 get_cache_key, get_source_files,
+                                 kCacheDirEnvVar)
+from ...messages import *
+from ....fu.single.CompRTL import CompRTL
+
+def mk_pkt_type(data_bitwidth = 32):
+  DataType = mk_data(data_bitwidth, 1)
+  CtrlType = mk_ctrl(2, 2)
+  CgraPayloadType = mk_cgra_payload(DataType, mk_bits(3), CtrlType, mk_bits(3))
+  return mk_intra_cgra_pkt(1, 1, 1, CgraPayloadType)
+
+def mk_dut(data_bitwidth = 32):
+  dut = CompRTL(mk_pkt_type(data_bitwidth), 2, 2)
+  dut.elaborate()
+  dut.set_metadata(VerilogTranslationPass.enable, True)
+  return dut
+
+def test_cache_key():
+  # Structurally identical types created separately share the same key.
+  assert get_cache_key(mk_dut()) == get_cache_key(mk_dut())
+  assert get_cache_key(mk_dut()) != get_cache_key(mk_dut(16))
+
+def test_source_files():
+  files = get_source_files(mk_dut())
+  lib_dir = os.path.dirname(os.path.dirname(os.path.dirname(
+                os.path.abspath(__file__))))
+  # The constant modules imported by CompRTL, directly or via messages.py.
+  for name in ['opt_type.py', 'messages.py', 'cmd_type.py']:
+    assert os.path.join(lib_dir, name) in files
+
+def test_cache_key_with_constant(tmp_path, monkeypatch):
+  # A component whose output is a constant of an imported module.
+  pkg_dir = tmp_path / "const_pkg"
+  pkg_dir.mkdir()
+  (pkg_dir / "__init__.py").write_text("")
+  (pkg_dir / "consts.py").write_text("kValue = 3\n")
+  (pkg_dir / "comp.py").write_text(
+      "from pymtl3 import *\n"
+      "from .consts import *\n"
+      "class ConstComp(Component):\n"
+      "  def construct(s):\n"
+      "    s.out = OutPort(Bits8)\n"
+      "    s.out //= kValue\n")
+  monkeypatch.syspath_prepend(str(tmp_path))
+  monkeypatch.setattr(translation_cache, 'kPackageRoot', str(tmp_path))
+  try:
+    comp = importlib.import_module("const_pkg.comp")
+    def mk_const_dut():
+      dut = comp.ConstComp()
+      dut.elaborate()
+      return dut
+    key = get_cache_key(mk_const_dut())
+    assert get_cache_key(mk_const_dut()) == key
+    # Changing the constant, but not the component, misses the cache.
+    (pkg_dir / "consts.py").write_text("kValue = 4\n")
+    assert get_cache_key(mk_const_dut()) != key
+  finally:
+    for name in ["const_pkg", "const_pkg.consts", "const_pkg.comp"]:
+      sys.modules.pop(name, None)
+
+def test_translation_restored_from_cache(tmp_path, monkeypatch):
+  monkeypatch.setenv(kCacheDirEnvVar, str(tmp_path / "cache"))
+  monkeypatch.chdir(tmp_path)
+
+  dut = mk_dut()
+  dut.apply(CachedVerilogTranslationPass())
+  assert dut.get_metadata(VerilogTranslationPass.translator) is not None
+  filename = dut.get_metadata(VerilogTranslationPass.translated_filename)
+  with open(filename) as fd:
+    src = fd.read()
+  os.remove(filename)
+
+  # The second translation is served by the cache.
+  dut = mk_dut()
+  dut.apply(CachedVerilogTranslationPass())
+  assert dut.get_metadata(VerilogTranslationPass.translator) is None
+  assert dut.get_metadata(VerilogTranslationPass.translated_filename) == filename
+  with open(filename) as fd:
+    assert fd.read() == src
@@ -0,0 +1,97 @@
+"""
+==========================================================================
+waveform_test.py
+==========================================================================
+Test cases for the selective waveform capture.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+from ..waveform import (WaveformCapture, get_component,
+                        trigger_on_backpressure, trigger_on_cmd)
+from ...basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
+from ...basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
+from ...cmd_type import *
+from ...messages import *
+
+DataType = mk_data(32, 1)
+CtrlType = mk_ctrl(2, 2)
+CgraPayloadType = mk_cgra_payload(DataType, mk_bits(3), CtrlType, mk_bits(3))
+PktType = mk_intra_cgra_pkt(1, 1, 4, CgraPayloadType)
+
+class TestHarness(Component):
+
+  def construct(s, pkts, data_msgs):
+    s.src_pkt = [TestSrcRTL(PktType, pkts) for _ in range(2)]
+    s.sink_pkt = [TestSinkRTL(PktType, pkts) for _ in range(2)]
+    s.src_data = TestSrcRTL(DataType, data_msgs)
+    s.sink_data = TestSinkRTL(DataType, data_msgs, interval_delay = 2)
+
+    for i in range(2):
+      s.src_pkt[i].send //= s.sink_pkt[i].recv
+    s.src_data.send //= s.sink_data.recv
+
+  def done(s):
+    return all(src.done() for src in s.src_pkt) and s.src_data.done()
+
+def mk_msgs():
+  pkts = [PktType(0, 1, payload = CgraPayloadType(CMD_CONFIG)),
+          PktType(0, 1, payload = CgraPayloadType(CMD_LAUNCH)),
+          PktType(1, 0, payload = CgraPayloadType(CMD_COMPLETE))]
+  data_msgs = [DataType(i, 1) for i in range(4)]
+  return pkts, data_msgs
+
+def run_captured(path, component_paths, **kwargs):
+  th = TestHarness(*mk_msgs())
+  th.elaborate()
+  trigger = kwargs.pop('trigger', None)
+  with WaveformCapture(path, th, component_paths,
+                       trigger = trigger(th) if trigger else None,
+                       **kwargs) as capture:
+    capture.attach()
+    th.apply(DefaultPassGroup())
+    th.sim_reset()
+    while not th.done():
+      th.sim_tick()
+    th.sim_tick()
+  with open(path) as f:
+    return f.read()
+
+def get_timestamps(vcd):
+  return [int(line[1:]) // 10 for line in vcd.splitlines()
+          if line.startswith('#') and int(line[1:]) % 10 == 0]
+
+def test_get_component():
+  th = TestHarness(*mk_msgs())
+  th.elaborate()
+  assert get_component(th, 'src_pkt[1].send') is th.src_pkt[1].send
+
+def test_selected_components(tmp_path):
+  vcd = run_captured(str(tmp_path / "wave.vcd"), ['src_pkt[1]', 'sink_data.recv.rdy'])
+  header = vcd.split("$enddefinitions")[0]
+  assert "$scope module src_pkt__1 $end" in header
+  assert f"$var wire {PktType.nbits} " in header
+  assert "$scope module src_pkt__0 $end" not in header
+  # Only the selected signal of the sink.
+  assert header.count("$var wire") == 1 + 5 + 1
+
+def test_cycle_window(tmp_path):
+  vcd = run_captured(str(tmp_path / "wave.vcd"), ['src_data'],
+                     start_cycle = 4, num_cycles = 3)
+  assert get_timestamps(vcd) == [4, 5, 6]
+
+def test_trigger(tmp_path):
+  # The first CMD_COMPLETE is accepted right after the other two packets.
+  trigger = lambda th: trigger_on_cmd(th, 'src_pkt[0].send', CMD_COMPLETE)
+  vcd = run_captured(str(tmp_path / "wave.vcd"), ['src_pkt[0]'],
+                     trigger = trigger, pre_trigger_cycles = 2, num_cycles = 1)
+  timestamps = get_timestamps(vcd)
+  assert len(timestamps) == 3
+  assert timestamps == list(range(timestamps[0], timestamps[0] + 3))
+
+  trigger = lambda th: trigger_on_backpressure(th, 'src_data.send')
+  vcd = run_captured(str(tmp_path / "wave.vcd"), ['src_data'],
+                     trigger = trigger, num_cycles = 2)
+  assert len(get_timestamps(vcd)) == 2
@@ -0,0 +1,572 @@
+"""
+==========================================================================
+testbench_generator.py
+==========================================================================
+Generates standalone testbenches of the translated top module from the
+packet programs (see pkt_program.py) of a test, i.e., what the PyMTL
+test harnesses of the multi-CGRA tests do in Python:
+ - src_ctrl_pkt is fed into recv_from_cpu_pkt;
+ - src_query_pkt is fed once the ctrl packets are all accepted and the
+   expected number of CMD_COMPLETE packets has come out;
+ - send_to_cpu_pkt is checked in order against expected_sink_out_pkt,
+   only on the fields in `cmp_fields` (all the fields by default).
+
+Two flavors are available:
+ - 'cpp': a Verilator C++ main loading the packet programs at run time,
+   so that long kernels run at native speed, and other programs of the
+   same packet layout run without rebuilding.
+ - 'sv': a SystemVerilog testbench loading the programs dumped in hex
+   with $readmemh, replacing the hand-written ones of
+   multi_cgra/test/sv_test.
+
+Both report the cycle at which the ctrl packets are all accepted, the
+one at which the kernel completes, and the total cycle count:
+
+  th = initialize_test_harness(...)
+  generate_testbench("build", "MeshMultiCgraRTL__explicit_systolic",
+                     IntraCgraPktType, src_ctrl_pkt, src_query_pkt,
+                     expected_sink_out_pkt,
+                     cmp_fields = ['payload.data', 'payload.cmd'])
+
+  % verilator --cc --exe --build -O3 -Wno-fatal \
+      --top-module MeshMultiCgraRTL__explicit_systolic \
+      MeshMultiCgraRTL__explicit_systolic.v \
+      MeshMultiCgraRTL__explicit_systolic_tb.cpp
+  % obj_dir/VMeshMultiCgraRTL__explicit_systolic
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import argparse
+import os
+from string import Template
+
+from .pkt_program import (PktProgramReader, kPktProgramHeader,
+                          write_pkt_program)
+from ..cmd_type import CMD_COMPLETE
+
+kTestbenchLangs = ['cpp', 'sv']
+kCmdField = 'payload.cmd'
+kNumResetCycles = 2
+
+#-------------------------------------------------------------------------
+# Templates
+#-------------------------------------------------------------------------
+
+kCppTemplate = Template("""\
+// ${tb_name}.cpp: generated by lib/util/testbench_generator.py.
+//
+// Feeds the packet programs into ${top}.${recv}, checks
+// ${top}.${send} against the expected packets and reports the cycles.
+//
+//   % verilator --cc --exe --build -O3 -Wno-fatal --top-module ${top}
+//       <translated verilog> ${tb_name}.cpp
+//   % obj_dir/V${top} [ctrl.bin [query.bin [sink.bin]]]
+
+#include <cstdint>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
+#include <iterator>
+#include <memory>
+#include <vector>
+
+#include "verilated.h"
+#include "V${top}.h"
+
+static const int kPktNbits = ${pkt_nbits};
+static const int kNumWords = ${num_words};
+static const uint64_t kMaxCycles = ${max_cycles}ULL;
+static const int kNumResetCycles = ${num_reset_cycles};
+// Location of ${cmd_field} counting the CMD_COMPLETE packets.
+static const int kCmdLsb = ${cmd_lsb};
+static const int kCmdNbits = ${cmd_nbits};
+static const uint64_t kCmdComplete = ${cmd_complete};
+// Bits of the packets compared by the sink, least significant word first.
+static const uint32_t kCmpMask[kNumWords] = { ${cmp_mask} };
+
+struct PktProgram {
+  uint64_t num_pkts = 0;
+  std::vector<uint32_t> words;
+
+  const uint32_t* pkt(uint64_t i) const { return &words[i * kNumWords]; }
+};
+
+static uint64_t get_le(const unsigned char* bytes, int nbytes) {
+  uint64_t value = 0;
+  for (int i = nbytes - 1; i >= 0; --i)
+    value = (value << 8) | bytes[i];
+  return value;
+}
+
+// Loads a program written by PktProgramWriter (see pkt_program.py).
+static bool load_program(const char* path, PktProgram& program) {
+  std::ifstream f(path, std::ios::binary);
+  if (!f) {
+    fprintf(stderr, "Cannot open %s.\\n", path);
+    return false;
+  }
+  std::vector<unsigned char> buf((std::istreambuf_iterator<char>(f)),
+                                 std::istreambuf_iterator<char>());
+  if (buf.size() < ${header_size} || memcmp(buf.data(), "CGRAPKT", 8) != 0) {
+    fprintf(stderr, "%s is not a CGRA packet program.\\n", path);
+    return false;
+  }
+  uint64_t header_nbytes = get_le(&buf[10], 2);
+  uint64_t pkt_nbits = get_le(&buf[12], 4);
+  uint64_t word_nbytes = get_le(&buf[16], 4);
+  uint64_t num_pkts = get_le(&buf[20], 8);
+  if (pkt_nbits != kPktNbits) {
+    fprintf(stderr, "%s has %llu-bit packets, %d-bit ones are expected.\\n",
+            path, (unsigned long long)pkt_nbits, kPktNbits);
+    return false;
+  }
+  if (header_nbytes + num_pkts * word_nbytes > buf.size()) {
+    fprintf(stderr, "%s is truncated.\\n", path);
+    return false;
+  }
+  program.num_pkts = num_pkts;
+  program.words.assign(num_pkts * kNumWords, 0);
+  for (uint64_t i = 0; i < num_pkts; ++i) {
+    const unsigned char* record = &buf[header_nbytes + i * word_nbytes];
+    for (uint64_t b = 0; b < word_nbytes; ++b)
+      program.words[i * kNumWords + b / 4] |= uint32_t(record[b]) << (8 * (b % 4));
+  }
+  return true;
+}
+
+static uint64_t get_field(const uint32_t* pkt, int lsb, int nbits) {
+  uint64_t value = 0;
+  for (int i = 0; i < nbits; ++i)
+    value |= uint64_t((pkt[(lsb + i) / 32] >> ((lsb + i) % 32)) & 1) << i;
+  return value;
+}
+
+static bool is_match(const uint32_t* actual, const uint32_t* expected) {
+  for (int w = 0; w < kNumWords; ++w)
+    if ((actual[w] ^ expected[w]) & kCmpMask[w])
+      return false;
+  return true;
+}
+
+static void print_pkt(const char* name, const uint32_t* pkt) {
+  printf("%s : ${pkt_nbits}'h", name);
+  for (int w = kNumWords - 1; w >= 0; --w)
+    printf("%08x", pkt[w]);
+  printf("\\n");
+}
+
+static void drive_msg(V${top}* top, const uint32_t* pkt) {
+${drive_msg}
+}
+
+static void sample_msg(V${top}* top, uint32_t* pkt) {
+${sample_msg}
+}
+
+static void tick(VerilatedContext* contextp, V${top}* top) {
+  top->clk = 1;
+  top->eval();
+  contextp->timeInc(1);
+  top->clk = 0;
+  top->eval();
+  contextp->timeInc(1);
+}
+
+int main(int argc, char** argv) {
+  const char* paths[3] = { "${ctrl_path}", "${query_path}", "${sink_path}" };
+  for (int i = 1; i < argc && i <= 3; ++i)
+    if (argv[i][0] != '+')
+      paths[i - 1] = argv[i];
+  PktProgram ctrl, query, sink;
+  if (!load_program(paths[0], ctrl) || !load_program(paths[1], query) ||
+      !load_program(paths[2], sink))
+    return 2;
+  uint64_t num_complete = 0;
+  for (uint64_t i = 0; kCmdNbits > 0 && i < sink.num_pkts; ++i)
+    num_complete += get_field(sink.pkt(i), kCmdLsb, kCmdNbits) == kCmdComplete;
+
+  std::unique_ptr<VerilatedContext> contextp(new VerilatedContext);
+  contextp->commandArgs(argc, argv);
+  std::unique_ptr<V${top}> top(new V${top}(contextp.get()));
+
+  top->clk = 0;
+  top->reset = 1;
+  top->${recv}__val = 0;
+  top->${send}__rdy = 0;
+  top->eval();
+  for (int i = 0; i < kNumResetCycles; ++i)
+    tick(contextp.get(), top.get());
+  top->reset = 0;
+
+  uint64_t ctrl_idx = 0, query_idx = 0, sink_idx = 0, complete_count = 0;
+  uint64_t cycle = 0, ctrl_cycle = 0, complete_cycle = 0;
+  bool failed = false;
+  uint32_t msg[kNumWords];
+  while (!failed && cycle < kMaxCycles &&
+         (ctrl_idx < ctrl.num_pkts || query_idx < query.num_pkts ||
+          sink_idx < sink.num_pkts)) {
+    // The queries wait for the kernel completion, as in the test harness.
+    bool issue_query = ctrl_idx == ctrl.num_pkts && complete_count >= num_complete;
+    PktProgram& src = issue_query ? query : ctrl;
+    uint64_t& src_idx = issue_query ? query_idx : ctrl_idx;
+    top->${recv}__val = src_idx < src.num_pkts;
+    if (src_idx < src.num_pkts)
+      drive_msg(top.get(), src.pkt(src_idx));
+    top->${send}__rdy = sink_idx < sink.num_pkts;
+    top->eval();
+
+    bool recv_fire = top->${recv}__val && top->${recv}__rdy;
+    bool send_fire = top->${send}__val && top->${send}__rdy;
+    if (send_fire) {
+      sample_msg(top.get(), msg);
+      if (!is_match(msg, sink.pkt(sink_idx))) {
+        printf("Sink received WRONG packet %llu at cycle %llu!\\n",
+               (unsigned long long)sink_idx, (unsigned long long)cycle);
+        print_pkt("Expected", sink.pkt(sink_idx));
+        print_pkt("Received", msg);
+        failed = true;
+      }
+      ++sink_idx;
+      if (complete_count < num_complete && ++complete_count == num_complete)
+        complete_cycle = cycle + 1;
+    }
+    if (recv_fire && ++src_idx == src.num_pkts && !issue_query)
+      ctrl_cycle = cycle + 1;
+
+    tick(contextp.get(), top.get());
+    ++cycle;
+  }
+  top->final();
+
+  if (!failed && cycle >= kMaxCycles) {
+    printf("TIMEOUT after %llu cycles (ctrl %llu/%llu, query %llu/%llu, sink %llu/%llu).\\n",
+           (unsigned long long)cycle,
+           (unsigned long long)ctrl_idx, (unsigned long long)ctrl.num_pkts,
+           (unsigned long long)query_idx, (unsigned long long)query.num_pkts,
+           (unsigned long long)sink_idx, (unsigned long long)sink.num_pkts);
+    failed = true;
+  }
+  printf("ctrl: %llu cycles, complete: %llu cycles, total: %llu cycles\\n",
+         (unsigned long long)ctrl_cycle, (unsigned long long)complete_cycle,
+         (unsigned long long)cycle);
+  printf(failed ? "TEST FAILED\\n" : "TEST PASSED\\n");
+  return failed ? 1 : 0;
+}
+""")
+
+kSvTemplate = Template("""\
+// ${tb_name}.sv: generated by lib/util/testbench_generator.py.
+//
+// Feeds the packet programs into ${top}.${recv}, checks
+// ${top}.${send} against the expected packets and reports the cycles.
+//
+//   % verilator --binary --timing -Wno-fatal --top-module ${tb_name}
+//       <translated verilog> ${tb_name}.sv
+//   % obj_dir/V${tb_name}
+
+`timescale 1ns/1ps
+
+module ${tb_name};
+
+  localparam int kPktNbits = ${pkt_nbits};
+  localparam longint kNumCtrlPkts = ${num_ctrl_pkts};
+  localparam longint kNumQueryPkts = ${num_query_pkts};
+  localparam longint kNumSinkPkts = ${num_sink_pkts};
+  localparam longint kNumCompletePkts = ${num_complete_pkts};
+  localparam longint kMaxCycles = ${max_cycles};
+  localparam int kNumResetCycles = ${num_reset_cycles};
+  // Bits of the packets compared by the sink.
+  localparam logic [kPktNbits-1:0] kCmpMask = ${pkt_nbits}'h${cmp_mask};
+
+  logic clk;
+  logic reset;
+
+  logic [kPktNbits-1:0] ${recv}__msg;
+  logic ${recv}__rdy;
+  logic ${recv}__val;
+
+  logic [kPktNbits-1:0] ${send}__msg;
+  logic ${send}__rdy;
+  logic ${send}__val;
+
+  // One more entry than packets to not declare empty arrays.
+  logic [kPktNbits-1:0] ctrl_pkts [0:kNumCtrlPkts];
+  logic [kPktNbits-1:0] query_pkts [0:kNumQueryPkts];
+  logic [kPktNbits-1:0] sink_pkts [0:kNumSinkPkts];
+
+  ${top} dut
+  (
+    .clk(clk),
+    .reset(reset),
+    .${recv}__msg(${recv}__msg),
+    .${recv}__rdy(${recv}__rdy),
+    .${recv}__val(${recv}__val),
+    .${send}__msg(${send}__msg),
+    .${send}__rdy(${send}__rdy),
+    .${send}__val(${send}__val)
+  );
+
+  always #5 clk = ~clk;
+
+  longint ctrl_idx, query_idx, sink_idx, complete_count;
+  longint cycle, ctrl_cycle, complete_cycle;
+  logic issue_query, recv_fire, send_fire, failed;
+
+  initial
+  begin
+    if (kNumCtrlPkts > 0) $$readmemh("${ctrl_hex}", ctrl_pkts, 0, kNumCtrlPkts - 1);
+    if (kNumQueryPkts > 0) $$readmemh("${query_hex}", query_pkts, 0, kNumQueryPkts - 1);
+    if (kNumSinkPkts > 0) $$readmemh("${sink_hex}", sink_pkts, 0, kNumSinkPkts - 1);
+
+    clk = 1'b0;
+    reset = 1'b1;
+    ${recv}__val = 1'b0;
+    ${recv}__msg = '0;
+    ${send}__rdy = 1'b0;
+    ctrl_idx = 0;
+    query_idx = 0;
+    sink_idx = 0;
+    complete_count = 0;
+    cycle = 0;
+    ctrl_cycle = 0;
+    complete_cycle = 0;
+    failed = 1'b0;
+
+    repeat (kNumResetCycles) @(posedge clk);
+    #1 reset = 1'b0;
+
+    // Inputs are driven right after a rising edge and the handshakes are
+    // sampled right before the next one.
+    while (!failed && cycle < kMaxCycles &&
+           (ctrl_idx < kNumCtrlPkts || query_idx < kNumQueryPkts ||
+            sink_idx < kNumSinkPkts))
+    begin
+      // The queries wait for the kernel completion, as in the test harness.
+      issue_query = (ctrl_idx == kNumCtrlPkts) && (complete_count >= kNumCompletePkts);
+      if (issue_query)
+      begin
+        ${recv}__val = query_idx < kNumQueryPkts;
+        ${recv}__msg = query_pkts[query_idx];
+      end
+      else
+      begin
+        ${recv}__val = ctrl_idx < kNumCtrlPkts;
+        ${recv}__msg = ctrl_pkts[ctrl_idx];
+      end
+      ${send}__rdy = sink_idx < kNumSinkPkts;
+
+      #3;
+      recv_fire = ${recv}__val && ${recv}__rdy;
+      send_fire = ${send}__val && ${send}__rdy;
+      if (send_fire)
+      begin
+        if ((${send}__msg & kCmpMask) !== (sink_pkts[sink_idx] & kCmpMask))
+        begin
+          $$display("Sink received WRONG packet %0d at cycle %0d!", sink_idx, cycle);
+          $$display("Expected : %h", sink_pkts[sink_idx]);
+          $$display("Received : %h", ${send}__msg);
+          failed = 1'b1;
+        end
+        sink_idx = sink_idx + 1;
+        if (complete_count < kNumCompletePkts)
+        begin
+          complete_count = complete_count + 1;
+          if (complete_count == kNumCompletePkts) complete_cycle = cycle + 1;
+        end
+      end
+      if (recv_fire)
+      begin
+        if (issue_query) query_idx = query_idx + 1;
+        else
+        begin
+          ctrl_idx = ctrl_idx + 1;
+          if (ctrl_idx == kNumCtrlPkts) ctrl_cycle = cycle + 1;
+        end
+      end
+
+      @(posedge clk);
+      #1 cycle = cycle + 1;
+    end
+
+    if (!failed && cycle >= kMaxCycles)
+    begin
+      $$display("TIMEOUT after %0d cycles (ctrl %0d/%0d, query %0d/%0d, sink %0d/%0d).",
+                cycle, ctrl_idx, kNumCtrlPkts, query_idx, kNumQueryPkts,
+                sink_idx, kNumSinkPkts);
+      failed = 1'b1;
+    end
+    $$display("ctrl: %0d cycles, complete: %0d cycles, total: %0d cycles",
+              ctrl_cycle, complete_cycle, cycle);
+    if (failed) $$display("TEST FAILED");
+    else        $$display("TEST PASSED");
+    $$finish;
+  end
+
+endmodule
+""")
+
+#-------------------------------------------------------------------------
+# Generator
+#-------------------------------------------------------------------------
+
+def get_cmp_mask(fields, pkt_nbits, cmp_fields = None):
+  """Returns the mask of the bits of the leaf fields ({path : (lsb,
+  nbits)}) under the `cmp_fields` paths, e.g., 'payload.data' covers
+  'payload.data.payload' and 'payload.data.predicate'."""
+
+  if cmp_fields is None:
+    return (1 << pkt_nbits) - 1
+  mask = 0
+  for cmp_field in cmp_fields:
+    paths = [path for path in fields
+             if path == cmp_field or path.startswith(cmp_field + '.') or
+                path.startswith(cmp_field + '[')]
+    if not paths:
+      raise ValueError(f"The packets have no field {cmp_field}.")
+    for path in paths:
+      lsb, nbits = fields[path]
+      mask |= ((1 << nbits) - 1) << lsb
+  return mask
+
+class PktTestbenchGenerator:
+  """Generates the testbench of `top_module` from three packet program
+  files of the same layout (the ctrl, query and expected sink packets)."""
+
+  def __init__(s, top_module, ctrl_path, query_path, sink_path,
+               cmp_fields = None, max_cycles = 10000,
+               recv_ifc = 'recv_from_cpu_pkt', send_ifc = 'send_to_cpu_pkt'):
+    s.top_module = top_module
+    s.paths = {'ctrl' : ctrl_path, 'query' : query_path, 'sink' : sink_path}
+    s.max_cycles = max_cycles
+    s.recv_ifc = recv_ifc
+    s.send_ifc = send_ifc
+    s.num_pkts = {}
+
+    fields = None
+    for name, path in s.paths.items():
+      with PktProgramReader(path) as reader:
+        if fields is None:
+          fields = reader.fields
+          s.pkt_nbits = reader.pkt_nbits
+        elif reader.fields != fields:
+          raise ValueError(f"The packet layout of {path} does not match the "
+                           f"one of {s.paths['ctrl']}.")
+        s.num_pkts[name] = len(reader)
+        if name == 'sink':
+          s.num_complete_pkts = \
+              sum([reader.field(i, kCmdField) == CMD_COMPLETE
+                   for i in range(len(reader))]) if kCmdField in fields else 0
+    s.fields = fields
+    s.cmd_lsb, s.cmd_nbits = fields.get(kCmdField, (0, 0))
+    s.cmp_mask = get_cmp_mask(fields, s.pkt_nbits, cmp_fields)
+    s.num_words = (s.pkt_nbits + 31) // 32
+
+  def get_tb_name(s):
+    return f"{s.top_module}_tb"
+
+  def gen_msg_access(s):
+    """Returns the C++ bodies driving/sampling the msg of the interfaces,
+    given how Verilator maps the port of kPktNbits bits."""
+
+    recv = f"top->{s.recv_ifc}__msg"
+    send = f"top->{s.send_ifc}__msg"
+    if s.pkt_nbits <= 32:
+      return f"  {recv} = pkt[0];", f"  pkt[0] = {send};"
+    if s.pkt_nbits <= 64:
+      return (f"  {recv} = uint64_t(pkt[0]) | (uint64_t(pkt[1]) << 32);",
+              f"  pkt[0] = uint32_t({send});\n"
+              f"  pkt[1] = uint32_t({send} >> 32);")
+    # Wider ports are arrays of 32-bit words, least significant first.
+    return (f"  for (int w = 0; w < kNumWords; ++w)\n    {recv}[w] = pkt[w];",
+            f"  for (int w = 0; w < kNumWords; ++w)\n    pkt[w] = {send}[w];")
+
+  def gen_cpp(s, program_paths = None):
+    program_paths = program_paths or s.paths
+    drive_msg, sample_msg = s.gen_msg_access()
+    cmp_mask = ", ".join([f"0x{(s.cmp_mask >> (32 * w)) & 0xffffffff:08x}"
+                          for w in range(s.num_words)])
+    return kCppTemplate.substitute(
+        tb_name = s.get_tb_name(), top = s.top_module,
+        recv = s.recv_ifc, send = s.send_ifc,
+        pkt_nbits = s.pkt_nbits, num_words = s.num_words,
+        max_cycles = s.max_cycles, num_reset_cycles = kNumResetCycles,
+        cmd_field = kCmdField, cmd_lsb = s.cmd_lsb, cmd_nbits = s.cmd_nbits,
+        cmd_complete = CMD_COMPLETE, cmp_mask = cmp_mask,
+        header_size = kPktProgramHeader.size, drive_msg = drive_msg, sample_msg = sample_msg,
+        ctrl_path = program_paths['ctrl'], query_path = program_paths['query'],
+        sink_path = program_paths['sink'])
+
+  def gen_sv(s, hex_paths):
+    return kSvTemplate.substitute(
+        tb_name = s.get_tb_name(), top = s.top_module,
+        recv = s.recv_ifc, send = s.send_ifc, pkt_nbits = s.pkt_nbits,
+        num_ctrl_pkts = s.num_pkts['ctrl'], num_query_pkts = s.num_pkts['query'],
+        num_sink_pkts = s.num_pkts['sink'],
+        num_complete_pkts = s.num_complete_pkts, max_cycles = s.max_cycles,
+        num_reset_cycles = kNumResetCycles, cmp_mask = f"{s.cmp_mask:x}",
+        ctrl_hex = hex_paths['ctrl'], query_hex = hex_paths['query'],
+        sink_hex = hex_paths['sink'])
+
+  def write(s, out_dir, lang = 'cpp'):
+    """Writes the testbench (and the hex dumps of the programs for the
+    SystemVerilog one) into `out_dir`, returns the testbench path."""
+
+    if lang not in kTestbenchLangs:
+      raise ValueError(f"Unknown testbench language {lang}, "
+                       f"expects one of {kTestbenchLangs}.")
+    os.makedirs(out_dir, exist_ok = True)
+    # The programs are referred to by absolute paths, so that the
+    # testbench runs from any (e.g., the Verilator obj_dir) directory.
+    program_paths = {name : os.path.abspath(path) for name, path in s.paths.items()}
+    if lang == 'cpp':
+      src = s.gen_cpp(program_paths)
+    else:
+      hex_paths = {}
+      for name, path in program_paths.items():
+        hex_paths[name] = os.path.abspath(
+            os.path.join(out_dir, f"{s.get_tb_name()}_{name}.hex"))
+        with PktProgramReader(path) as reader:
+          reader.write_hex(hex_paths[name])
+      src = s.gen_sv(hex_paths)
+
+    tb_path = os.path.join(out_dir, f"{s.get_tb_name()}.{lang}")
+    with open(tb_path, 'w') as f:
+      f.write(src)
+    return tb_path
+
+def generate_testbench(out_dir, top_module, PktType, src_ctrl_pkt,
+                       src_query_pkt, expected_sink_out_pkt, lang = 'cpp',
+                       cmp_fields = None, max_cycles = 10000,
+                       num_cgra_columns = 0, num_cgra_rows = 0, num_tiles = 0):
+  """Writes the packets of a test as programs into `out_dir` and generates
+  the testbench of `top_module` over them, returns the testbench path."""
+
+  os.makedirs(out_dir, exist_ok = True)
+  paths = {}
+  for name, pkts in [('ctrl', src_ctrl_pkt), ('query', src_query_pkt),
+                     ('sink', expected_sink_out_pkt)]:
+    paths[name] = os.path.join(out_dir, f"{top_module}_{name}.bin")
+    write_pkt_program(paths[name], PktType, pkts, num_cgra_columns,
+                      num_cgra_rows, num_tiles)
+  generator = PktTestbenchGenerator(top_module, paths['ctrl'], paths['query'],
+                                    paths['sink'], cmp_fields, max_cycles)
+  return generator.write(out_dir, lang)
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description = "Testbench of packet programs.")
+  parser.add_argument("top", help = "Translated top module name.")
+  parser.add_argument("ctrl", help = "Program of the ctrl packets.")
+  parser.add_argument("query", help = "Program of the query packets.")
+  parser.add_argument("sink", help = "Program of the expected sink packets.")
+  parser.add_argument("--lang", choices = kTestbenchLangs, default = 'cpp')
+  parser.add_argument("--cmp-fields", nargs = '*', default = None,
+                      help = "Fields compared by the sink, e.g., payload.data payload.cmd.")
+  parser.add_argument("--max-cycles", type = int, default = 10000)
+  parser.add_argument("--out-dir", default = ".")
+  args = parser.parse_args()
+
+  generator = PktTestbenchGenerator(args.top, args.ctrl, args.query, args.sink,
+                                    args.cmp_fields, args.max_cycles)
+  print(generator.write(args.out_dir, args.lang))
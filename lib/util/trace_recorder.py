@@ -0,0 +1,200 @@
+"""
+==========================================================================
+trace_recorder.py
+==========================================================================
+Binary event trace of the val/rdy ports of a simulated CGRA, as a cheap
+alternative of printing line_trace() every cycle on long runs.
+
+At every clock edge, each recorded port with val asserted produces an
+event (cycle, port id, val/rdy, packed msg bits). The events are packed
+into a preallocated buffer that is flushed into the trace file once it
+is full, so no string is formatted during the simulation. The trace is
+decoded offline by trace_viewer.py.
+
+File layout (little-endian):
+
+  magic "CGRATRC\\0" | version (u16) | reserved (u16) | table_nbytes (u32)
+  port table: JSON of [{tile, name, type, nbits, fields}], where fields
+              is the [path, lsb, nbits] of every leaf field of the msg
+  events:     cycle (u32) | port id (u16) | val/rdy (u8) | msg bytes,
+              the number of msg bytes is derived from the port nbits
+
+Usage (disable the line trace to skip its string formatting):
+
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  with TraceRecorder("trace.bin", get_cgra_trace_ports(th.dut)) as recorder:
+    recorder.attach(th)
+    run_sim(th, print_line_trace = False)
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import json
+import struct
+
+from pymtl3.datatypes.bitstructs import is_bitstruct_class
+from .perf_counters import add_per_cycle_hook
+from .pkt_program import get_field_layout
+
+kTraceMagic = b"CGRATRC\x00"
+kTraceVersion = 1
+kTraceHeader = struct.Struct("<8sHHI")
+kTraceEvent = struct.Struct("<IHB")
+# Tile id of the ports on the CGRA boundary rather than on a tile.
+kTraceCgraTileId = -1
+kTraceValBit = 1
+kTraceRdyBit = 2
+kTraceReadChunkNbytes = 1 << 20
+
+def get_cgra_trace_ports(cgra, tiles = None):
+  """Returns [(tile_id, name, ifc)] of the handshake ports of the CGRA
+  boundary and of the given tiles (all by default)."""
+
+  ports = []
+  for name in ['recv_from_cpu_pkt', 'send_to_cpu_pkt']:
+    if hasattr(cgra, name):
+      ports.append((kTraceCgraTileId, name, getattr(cgra, name)))
+
+  tiles = range(len(cgra.tile)) if tiles is None else tiles
+  for tile_id in tiles:
+    tile = cgra.tile[tile_id]
+    ports.append((tile_id, 'ctrl', tile.ctrl_mem.send_ctrl))
+    ports.append((tile_id, 'recv_from_controller_pkt', tile.recv_from_controller_pkt))
+    for i, ifc in enumerate(tile.recv_data):
+      ports.append((tile_id, f'recv_data[{i}]', ifc))
+    for i, ifc in enumerate(tile.send_data):
+      ports.append((tile_id, f'send_data[{i}]', ifc))
+    for name in ['to_mem_raddr', 'from_mem_rdata', 'to_mem_waddr', 'to_mem_wdata']:
+      ports.append((tile_id, name, getattr(tile, name)))
+  return ports
+
+class TraceRecorder:
+
+  def __init__(s, path, ports, buffer_nbytes = 1 << 22):
+    s.file = open(path, 'wb')
+    s.top = None
+    s.ports = []
+    table = []
+    for port_id, (tile_id, name, ifc) in enumerate(ports):
+      # The signals are not replaced by their values before the simulator
+      # is created.
+      MsgType = ifc.msg._dsl.Type if hasattr(ifc.msg, '_dsl') else type(ifc.msg)
+      nbytes = (MsgType.nbits + 7) // 8
+      table.append({'tile' : tile_id,
+                    'name' : name,
+                    'type' : MsgType.__name__,
+                    'nbits' : MsgType.nbits,
+                    'fields' : get_field_layout(MsgType)})
+      s.ports.append((port_id, ifc, nbytes, is_bitstruct_class(MsgType)))
+    table = json.dumps(table).encode()
+    s.file.write(kTraceHeader.pack(kTraceMagic, kTraceVersion, 0, len(table)))
+    s.file.write(table)
+
+    max_event_nbytes = kTraceEvent.size + max([nbytes for _, _, nbytes, _ in s.ports] + [0])
+    s.buffer = bytearray(max(buffer_nbytes, max_event_nbytes))
+    # Flushes the buffer once it cannot hold one more event.
+    s.flush_threshold = len(s.buffer) - max_event_nbytes
+    s.offset = 0
+    s.num_events = 0
+
+  def attach(s, top):
+    """Records the ports at every clock edge of the simulation of `top`
+    (see CgraPerfCounters.attach() for when to call it)."""
+    s.top = top
+    add_per_cycle_hook(top, s.sample)
+
+  def sample(s):
+    if s.top.reset:
+      return
+    cycle = s.top.sim_cycle_count()
+    buffer = s.buffer
+    for port_id, ifc, nbytes, is_struct in s.ports:
+      if ifc.val:
+        if s.offset > s.flush_threshold:
+          s.flush()
+        offset = s.offset
+        kTraceEvent.pack_into(buffer, offset, cycle, port_id,
+                              kTraceValBit | (kTraceRdyBit if ifc.rdy else 0))
+        offset += kTraceEvent.size
+        msg = ifc.msg.to_bits() if is_struct else ifc.msg
+        buffer[offset : offset + nbytes] = int(msg).to_bytes(nbytes, 'little')
+        s.offset = offset + nbytes
+        s.num_events += 1
+
+  def flush(s):
+    s.file.write(memoryview(s.buffer)[:s.offset])
+    s.offset = 0
+
+  def close(s):
+    if s.file.closed:
+      return
+    s.flush()
+    s.file.close()
+
+  def __enter__(s):
+    return s
+
+  def __exit__(s, *args):
+    s.close()
+
+class TraceEvent:
+
+  def __init__(s, cycle, port, val, rdy, bits):
+    s.cycle = cycle
+    s.port = port
+    s.val = val
+    s.rdy = rdy
+    s.bits = bits
+
+  @property
+  def tile(s):
+    return s.port['tile']
+
+  def field(s, path):
+    """Extracts a leaf field (e.g., 'payload.cmd') of the msg, raises
+    KeyError if the msg does not have it."""
+    lsb, nbits = s.port['field_map'][path]
+    return (s.bits >> lsb) & ((1 << nbits) - 1)
+
+def read_trace(path):
+  """Returns the port table and a generator of the TraceEvents of the
+  trace file. A trailing partially written event (e.g., of a crashed
+  run) is dropped."""
+
+  f = open(path, 'rb')
+  magic, version, _, table_nbytes = kTraceHeader.unpack(f.read(kTraceHeader.size))
+  if magic != kTraceMagic:
+    f.close()
+    raise ValueError(f"{path} is not a CGRA trace.")
+  if version > kTraceVersion:
+    f.close()
+    raise ValueError(f"{path} has version {version}, only version "
+                     f"{kTraceVersion} and below are supported.")
+  ports = json.loads(f.read(table_nbytes))
+  for port in ports:
+    port['nbytes'] = (port['nbits'] + 7) // 8
+    port['field_map'] = {path : (lsb, nbits) for path, lsb, nbits in port['fields']}
+
+  def events():
+    with f:
+      data = b""
+      offset = 0
+      while True:
+        chunk = f.read(kTraceReadChunkNbytes)
+        if not chunk:
+          return
+        data = data[offset:] + chunk
+        offset = 0
+        while offset + kTraceEvent.size <= len(data):
+          cycle, port_id, flags = kTraceEvent.unpack_from(data, offset)
+          port = ports[port_id]
+          end = offset + kTraceEvent.size + port['nbytes']
+          if end > len(data):
+            break
+          bits = int.from_bytes(data[offset + kTraceEvent.size : end], 'little')
+          offset = end
+          yield TraceEvent(cycle, port, bool(flags & kTraceValBit),
+                           bool(flags & kTraceRdyBit), bits)
+
+  return ports, events()
@@ -0,0 +1,109 @@
+"""
+==========================================================================
+trace_viewer.py
+==========================================================================
+Offline viewer of the binary traces recorded by TraceRecorder, which
+reconstructs a human-readable trace, optionally filtered by tile, cycle
+range, and opcode (i.e., only the cycles in which a tile executes one of
+the given opcodes are shown for that tile).
+
+Usage:
+
+  % python -m VectorCGRA.lib.util.trace_viewer trace.bin --tiles 0,5 \
+        --cycles 100:200 --opcodes ADD,LD
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import argparse
+import itertools
+import sys
+
+from .perf_counters import get_opt_name, kOptNames
+from .trace_recorder import kTraceCgraTileId, read_trace
+
+def parse_opcode(opcode):
+  """Accepts 'OPT_ADD', 'ADD', or the numeric value of the opcode."""
+  if opcode.isdigit():
+    return int(opcode)
+  name = opcode.upper()
+  if not name.startswith("OPT_"):
+    name = "OPT_" + name
+  for value, opt_name in kOptNames.items():
+    if opt_name == name:
+      return value
+  raise ValueError(f"Unknown opcode {opcode}.")
+
+def parse_cycles(cycles):
+  """Parses 'lo:hi' (both inclusive, either can be omitted) or 'cycle'."""
+  if ':' not in cycles:
+    return int(cycles), int(cycles)
+  lo, hi = cycles.split(':')
+  return int(lo) if lo else 0, int(hi) if hi else None
+
+def format_msg(event):
+  fields = event.port['fields']
+  if len(fields) == 1 and fields[0][0] == "":
+    return f"{event.bits:#x}"
+  items = []
+  for path, lsb, nbits in fields:
+    value = (event.bits >> lsb) & ((1 << nbits) - 1)
+    if path.endswith('operation'):
+      items.append(f"{path}={get_opt_name(value)}")
+    elif value:
+      items.append(f"{path}={value:#x}")
+  return "{" + ", ".join(items) + "}"
+
+def format_event(event):
+  port = event.port
+  host = "cgra" if port['tile'] == kTraceCgraTileId else f"tile[{port['tile']}]"
+  handshake = "fire " if event.rdy else "stall"
+  return f"{event.cycle:>6}: {host}.{port['name']} {handshake} {format_msg(event)}"
+
+def filter_events(events, tiles = None, cycles = None, opcodes = None):
+  """Yields the events of the given tiles within the (inclusive) cycle
+  range; with opcodes given, only keeps the events of a tile in the
+  cycles its ctrl carries one of the opcodes."""
+
+  lo, hi = cycles if cycles is not None else (0, None)
+  tiles = set(tiles) if tiles is not None else None
+  opcodes = set(opcodes) if opcodes is not None else None
+
+  for cycle, cycle_events in itertools.groupby(events, lambda event: event.cycle):
+    if cycle < lo:
+      continue
+    if hi is not None and cycle > hi:
+      return
+    cycle_events = [event for event in cycle_events
+                    if tiles is None or event.tile in tiles]
+    if opcodes is not None:
+      # The events are grouped by cycle, so the ctrl of the same cycle
+      # decides which tiles are kept.
+      matched_tiles = {event.tile for event in cycle_events
+                       if event.port['name'] == 'ctrl' and
+                          event.field('operation') in opcodes}
+      cycle_events = [event for event in cycle_events
+                      if event.tile in matched_tiles]
+    yield from cycle_events
+
+def view_trace(path, tiles = None, cycles = None, opcodes = None, out = sys.stdout):
+  _, events = read_trace(path)
+  for event in filter_events(events, tiles, cycles, opcodes):
+    out.write(format_event(event) + "\n")
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description = "Views the binary CGRA trace.")
+  parser.add_argument("trace", help = "Trace file recorded by TraceRecorder.")
+  parser.add_argument("--tiles", default = None,
+                      help = "Comma-separated tile ids (-1 for the CGRA boundary).")
+  parser.add_argument("--cycles", default = None,
+                      help = "Cycle range lo:hi (inclusive), or a single cycle.")
+  parser.add_argument("--opcodes", default = None,
+                      help = "Comma-separated opcodes, e.g., ADD,OPT_LD.")
+  args = parser.parse_args()
+
+  view_trace(args.trace,
+             [int(tile) for tile in args.tiles.split(',')] if args.tiles else None,
+             parse_cycles(args.cycles) if args.cycles else None,
+             [parse_opcode(opcode) for opcode in args.opcodes.split(',')] if args.opcodes else None)
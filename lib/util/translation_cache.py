@@ -0,0 +1,320 @@
+"""
+==========================================================================
+translation_cache.py
+==========================================================================
+Content-addressed on-disk cache of the translated Verilog and of the
+Verilator-built artifacts (obj_dir, C/Python wrappers, shared library)
+of the components marked to be translated/imported.
+
+The key of a cache entry is a hash of the construct() parameters of the
+component (with types/bitstructs canonicalized to their structure), the
+source files of every component class in its hierarchy together with the
+package modules they (transitively) import, e.g., the constants of
+lib/opt_type.py or lib/cmd_type.py, and the PyMTL version. A hit
+restores the cached files into the working directory, so the
+VerilogTranslationPass skips the translation and the Verilator import
+pass finds its own cache up-to-date and skips the build.
+
+The cache lives in $VECTORCGRA_TRANSLATION_CACHE, or in
+~/.cache/vectorcgra/translation by default.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import ast
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import shutil
+import sys
+import tempfile
+from importlib.metadata import version
+from operator import attrgetter
+
+from pymtl3 import Bits, Component
+from pymtl3.datatypes.bitstructs import is_bitstruct_class
+from pymtl3.passes.backends.verilog import (VerilogPlaceholderPass,
+                                            VerilogTranslationImportPass,
+                                            VerilogTranslationPass,
+                                            VerilogVerilatorImportPass)
+from pymtl3.passes.backends.verilog.util.utility import verilog_cmp
+from pymtl3.passes.tracing import PrintTextWavePass
+from pymtl3.stdlib.test_utils import config_model_with_cmdline_opts
+
+kCacheDirEnvVar = "VECTORCGRA_TRANSLATION_CACHE"
+kDefaultCacheDir = os.path.join("~", ".cache", "vectorcgra", "translation")
+kMetaFileName = "meta.json"
+# Only the imports within the package are followed, the rest (e.g., PyMTL)
+# is covered by the version.
+kPackageRoot = os.path.dirname(os.path.dirname(os.path.dirname(
+                   os.path.abspath(__file__))))
+
+def get_cache_dir():
+  return os.path.expanduser(os.environ.get(kCacheDirEnvVar, kDefaultCacheDir))
+
+#-------------------------------------------------------------------------
+# Cache key
+#-------------------------------------------------------------------------
+
+def get_param_string(obj):
+  """Returns a string identifying `obj` by its structure rather than by
+  its identity, so that e.g. two structurally identical bitstruct types
+  created by different mk_*() calls lead to the same string."""
+
+  if isinstance(obj, type):
+    if is_bitstruct_class(obj):
+      fields = ",".join([f"{name}:{get_param_string(field_type)}"
+                         for name, field_type in obj.__bitstruct_fields__.items()])
+      return f"{obj.__name__}{{{fields}}}"
+    if issubclass(obj, Bits):
+      return f"Bits{obj.nbits}"
+    return f"{obj.__module__}.{obj.__qualname__}"
+  if isinstance(obj, (list, tuple)):
+    return "[" + ",".join([get_param_string(x) for x in obj]) + "]"
+  if isinstance(obj, dict):
+    return "{" + ",".join([f"{get_param_string(k)}:{get_param_string(v)}"
+                           for k, v in sorted(obj.items(), key = repr)]) + "}"
+  if isinstance(obj, (set, frozenset)):
+    return "{" + ",".join(sorted([get_param_string(x) for x in obj])) + "}"
+  if isinstance(obj, Bits):
+    return f"Bits{obj.nbits}({int(obj)})"
+  if hasattr(obj, '__dict__') and not callable(obj):
+    # Plain parameter objects, e.g., the Tile/Link/DataSPM of the arch
+    # parser, are identified by their attributes instead of their address.
+    return f"{type(obj).__qualname__}{get_param_string(vars(obj))}"
+  return repr(obj)
+
+def is_package_module(module):
+  path = getattr(module, '__file__', None)
+  if not path or not path.endswith('.py'):
+    return False
+  return os.path.commonpath([os.path.abspath(path), kPackageRoot]) == \
+         kPackageRoot
+
+def get_imported_modules(module):
+  """Returns the already loaded modules imported by the source of
+  `module`, which are the ones it has been executed with."""
+
+  with open(module.__file__, 'rb') as fd:
+    tree = ast.parse(fd.read())
+  names = []
+  for node in ast.walk(tree):
+    if isinstance(node, ast.Import):
+      names.extend([alias.name for alias in node.names])
+    elif isinstance(node, ast.ImportFrom):
+      try:
+        name = importlib.util.resolve_name(
+                   '.' * node.level + (node.module or ''), module.__package__)
+      except (ImportError, ValueError):
+        continue
+      names.append(name)
+      # `from . import x` may import the submodule x.
+      names.extend([f"{name}.{alias.name}" for alias in node.names])
+  return [sys.modules[name] for name in names if name in sys.modules]
+
+def get_source_files(m):
+  """Collects the source files of all the component classes (including
+  their base classes) instantiated in the hierarchy rooted at `m`, and of
+  the package modules they import, whose constants are baked into the
+  translated Verilog as well."""
+
+  classes = set()
+  def traverse(c):
+    classes.add(type(c))
+    for child in c.get_child_components(repr):
+      traverse(child)
+  traverse(m)
+
+  files = set()
+  modules = []
+  for cls in classes:
+    for base in inspect.getmro(cls):
+      if base is Component or not issubclass(base, Component):
+        continue
+      try:
+        files.add(os.path.abspath(inspect.getsourcefile(base)))
+      except TypeError:
+        pass
+      modules.append(sys.modules.get(base.__module__))
+
+  visited = set()
+  while modules:
+    module = modules.pop()
+    if module is None or module.__name__ in visited or \
+       not is_package_module(module):
+      continue
+    visited.add(module.__name__)
+    files.add(os.path.abspath(module.__file__))
+    modules.extend(get_imported_modules(module))
+  return sorted(files)
+
+def get_cache_key(m):
+  hasher = hashlib.sha256()
+  hasher.update(f"pymtl3-{version('pymtl3')}\n".encode())
+  hasher.update(f"{type(m).__module__}.{type(m).__qualname__}\n".encode())
+  hasher.update(get_param_string(list(m._dsl.args)).encode())
+  hasher.update(get_param_string(dict(m._dsl.kwargs)).encode())
+  for path in get_source_files(m):
+    with open(path, 'rb') as fd:
+      hasher.update(hashlib.sha256(fd.read()).digest())
+  return hasher.hexdigest()
+
+#-------------------------------------------------------------------------
+# Cache entries
+#-------------------------------------------------------------------------
+
+def get_verilator_artifacts(top_module):
+  return [f'obj_dir_{top_module}',
+          f'{top_module}_v.cpp',
+          f'{top_module}_v.py',
+          f'lib{top_module}_v.so',
+          f'pymtl_import_config_{top_module}.json']
+
+def copy_path(src, dst):
+  if os.path.isdir(src):
+    shutil.copytree(src, dst, dirs_exist_ok = True)
+  else:
+    shutil.copy2(src, dst)
+
+def load_entry(key):
+  entry_dir = os.path.join(get_cache_dir(), key)
+  meta_file = os.path.join(entry_dir, kMetaFileName)
+  if not os.path.exists(meta_file):
+    return None
+  with open(meta_file) as fd:
+    meta = json.load(fd)
+  meta['dir'] = entry_dir
+  return meta
+
+def store_entry(key, translated_filename, top_module, paths):
+  """Atomically (re)creates the cache entry of `key` holding `paths`."""
+
+  cache_dir = get_cache_dir()
+  os.makedirs(cache_dir, exist_ok = True)
+  tmp_dir = tempfile.mkdtemp(dir = cache_dir, prefix = f".{key}.")
+  for path in paths:
+    if os.path.exists(path):
+      copy_path(path, os.path.join(tmp_dir, os.path.basename(path)))
+  meta = {'translated_filename' : os.path.basename(translated_filename),
+          'translated_top_module' : top_module,
+          'files' : sorted(os.listdir(tmp_dir))}
+  with open(os.path.join(tmp_dir, kMetaFileName), 'w') as fd:
+    json.dump(meta, fd, indent = 2)
+
+  entry_dir = os.path.join(cache_dir, key)
+  if os.path.exists(entry_dir):
+    shutil.rmtree(entry_dir, ignore_errors = True)
+  try:
+    os.rename(tmp_dir, entry_dir)
+  except OSError:
+    # Another process has stored the same entry in the meantime.
+    shutil.rmtree(tmp_dir, ignore_errors = True)
+
+def restore_entry(meta):
+  """Copies the cached files into the working directory and returns
+  whether the previously existing translation result is left intact."""
+
+  translated_filename = meta['translated_filename']
+  cached_file = os.path.join(meta['dir'], translated_filename)
+  is_same = os.path.exists(translated_filename) and \
+            verilog_cmp(cached_file, translated_filename)
+  for name in meta['files']:
+    copy_path(os.path.join(meta['dir'], name), name)
+  # The Verilator artifacts are restored together with the translated
+  # file, so the import pass can reuse them as well.
+  return is_same or any(name.startswith('obj_dir_') for name in meta['files'])
+
+#-------------------------------------------------------------------------
+# Passes
+#-------------------------------------------------------------------------
+
+class CachedVerilogTranslationPass(VerilogTranslationPass):
+  """Drop-in replacement of VerilogTranslationPass that restores the
+  translation result from the cache whenever possible."""
+
+  def traverse_hierarchy(s, m):
+    c = s.__class__
+
+    if m.has_metadata(c.enable) and m.get_metadata(c.enable):
+      key = get_cache_key(m)
+      meta = load_entry(key)
+      if meta is not None:
+        is_same = restore_entry(meta)
+        m.set_metadata(c.is_same,               is_same)
+        m.set_metadata(c.translator,            None)
+        m.set_metadata(c.translated,            True)
+        m.set_metadata(c.translated_filename,   meta['translated_filename'])
+        m.set_metadata(c.translated_top_module, meta['translated_top_module'])
+      else:
+        super().traverse_hierarchy(m)
+        store_entry(key, m.get_metadata(c.translated_filename),
+                    m.get_metadata(c.translated_top_module),
+                    [m.get_metadata(c.translated_filename)])
+      m._translation_cache_key = key
+
+    else:
+      for child in m.get_child_components(repr):
+        s.traverse_hierarchy(child)
+
+class CachedVerilogVerilatorImportPass(VerilogVerilatorImportPass):
+  """Stores the Verilator-built artifacts into the cache entry created by
+  the CachedVerilogTranslationPass once the component is imported."""
+
+  @staticmethod
+  def get_translation_pass():
+    return CachedVerilogTranslationPass
+
+  def get_imported_object(s, m):
+    imp = super().get_imported_object(m)
+    key = getattr(m, '_translation_cache_key', None)
+    meta = load_entry(key) if key is not None else None
+    if meta is not None and \
+       not any(name.startswith('obj_dir_') for name in meta['files']):
+      top_module = meta['translated_top_module']
+      store_entry(key, meta['translated_filename'], top_module,
+                  [meta['translated_filename']] +
+                  get_verilator_artifacts(top_module))
+    return imp
+
+class CachedVerilogTranslationImportPass(VerilogTranslationImportPass):
+
+  @staticmethod
+  def get_translation_pass():
+    return CachedVerilogTranslationPass
+
+  @staticmethod
+  def get_import_pass():
+    return CachedVerilogVerilatorImportPass
+
+#-------------------------------------------------------------------------
+# Test helper
+#-------------------------------------------------------------------------
+
+def config_model_with_translation_cache(top, cmdline_opts, duts):
+  """Same as config_model_with_cmdline_opts() of the PyMTL stdlib, but
+  translates/imports the duts through the cache when --test-verilog is
+  given. Other options (Yosys, VCD dumping, etc.) fall back to the
+  stdlib helper."""
+
+  test_verilog = cmdline_opts.get('test_verilog', False)
+  if not test_verilog or cmdline_opts.get('test_yosys_verilog', False) or \
+     cmdline_opts.get('dump_vcd', False) or \
+     cmdline_opts.get('dump_vtb', False) or \
+     cmdline_opts.get('on_demand_vcd_portname', ""):
+    return config_model_with_cmdline_opts(top, cmdline_opts, duts)
+
+  top.elaborate()
+  dut_objs = [attrgetter(dut)(top) for dut in duts] if duts else [top]
+  for dut in dut_objs:
+    dut.set_metadata(VerilogTranslationImportPass.enable, True)
+    dut.set_metadata(VerilogVerilatorImportPass.vl_xinit, test_verilog)
+  top.apply(VerilogPlaceholderPass())
+  top = CachedVerilogTranslationImportPass()(top)
+
+  if cmdline_opts.get('dump_textwave', False):
+    top.set_metadata(PrintTextWavePass.enable, True)
+
+  return top
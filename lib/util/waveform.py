@@ -0,0 +1,191 @@
+"""
+==========================================================================
+waveform.py
+==========================================================================
+Selective waveform capture: only the signals of the given components
+(e.g., 'dut.cgra[1].tile[5].routing_crossbar') are dumped into a VCD
+file, within a cycle window or around a trigger condition (e.g., the
+first CMD_COMPLETE sent to the CPU, or the first backpressure on a
+port). Unlike --dump-vcd, which dumps the whole fabric every cycle, the
+capture overhead is proportional to the observed signals only.
+
+Usage:
+
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  with WaveformCapture("hang.vcd", th, ['dut.cgra[1].tile[5].routing_crossbar'],
+                       trigger = trigger_on_backpressure(th, 'dut.cgra[1].tile[5].send_data[0]'),
+                       pre_trigger_cycles = 20, num_cycles = 50) as capture:
+    capture.attach()
+    run_sim(th)
+
+The VCD can be converted into FST by `vcd2fst` from GTKWave if needed.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import re
+from collections import deque
+
+from pymtl3.datatypes.bitstructs import is_bitstruct_class
+from pymtl3.dsl.Connectable import Signal
+from .perf_counters import add_per_cycle_hook
+
+kVcdIdChars = [chr(c) for c in range(33, 127)]
+
+def get_component(top, path):
+  """Resolves a path like 'dut.cgra[1].tile[5]' relative to `top`."""
+  obj = top
+  for name, index in re.findall(r"(\w+)|\[(\d+)\]", path):
+    obj = getattr(obj, name) if name else obj[int(index)]
+  return obj
+
+def get_vcd_id(i):
+  vcd_id = ""
+  while True:
+    vcd_id += kVcdIdChars[i % len(kVcdIdChars)]
+    i //= len(kVcdIdChars)
+    if i == 0:
+      return vcd_id
+
+#-------------------------------------------------------------------------
+# Triggers
+#-------------------------------------------------------------------------
+
+def trigger_on_cmd(top, ifc_path, cmd):
+  """Fires on the first packet of `cmd` (e.g., CMD_COMPLETE) passing
+  through the val/rdy interface at `ifc_path`."""
+  ifc = get_component(top, ifc_path)
+  return lambda: bool(ifc.val & ifc.rdy) and ifc.msg.payload.cmd == cmd
+
+def trigger_on_backpressure(top, ifc_path):
+  """Fires on the first cycle with valid data blocked on `ifc_path`."""
+  ifc = get_component(top, ifc_path)
+  return lambda: bool(ifc.val & ~ifc.rdy)
+
+#-------------------------------------------------------------------------
+# WaveformCapture
+#-------------------------------------------------------------------------
+
+class WaveformCapture:
+
+  def __init__(s, path, top, component_paths, start_cycle = 0,
+               num_cycles = None, trigger = None, pre_trigger_cycles = 0):
+    """Captures `num_cycles` cycles (till the end of simulation if None)
+    from `start_cycle`, or from the cycle `trigger()` first returns True
+    (including `pre_trigger_cycles` cycles before it)."""
+
+    s.top = top
+    s.start_cycle = start_cycle
+    s.num_cycles = num_cycles
+    s.trigger = trigger
+    s.triggered_cycle = None
+    s.history = deque(maxlen = pre_trigger_cycles)
+    s.num_captured = 0
+    s.prev_values = None
+
+    signals = set()
+    for component_path in component_paths:
+      component = get_component(top, component_path)
+      # Single signals (e.g., 'dut.tile[0].send_data[0].val') can be
+      # selected as well.
+      if isinstance(component, Signal):
+        signals.add(component)
+        continue
+      signals |= component.get_all_object_filter(
+          lambda x: isinstance(x, Signal) and x.is_top_level_signal())
+    s.signals = sorted(signals, key = repr)
+
+    # Generates a sampling function over the selected signals only.
+    reads = []
+    for signal in s.signals:
+      if is_bitstruct_class(signal._dsl.Type):
+        reads.append(f"int({signal!r}.to_bits())")
+      else:
+        reads.append(f"int({signal!r})")
+    src = f"def sample_values(s):\n  return ({', '.join(reads)},)\n"
+    namespace = {}
+    exec(compile(src, "<waveform>", "exec"), namespace)
+    s.sample_values = namespace['sample_values']
+
+    s.file = open(path, 'w')
+    s.write_header()
+
+  def write_header(s):
+    f = s.file
+    f.write("$timescale 1ns $end\n")
+    # Builds the scope tree out of the signal names, e.g., s.dut.tile[0].x
+    # goes to the scopes dut -> tile__0.
+    tree = {}
+    for i, signal in enumerate(s.signals):
+      names = [name.replace('[', '__').replace(']', '')
+               for name in repr(signal).split('.')[1:]]
+      node = tree
+      for name in names[:-1]:
+        node = node.setdefault(name, {})
+      node[names[-1]] = (get_vcd_id(i + 1), signal._dsl.Type.nbits)
+
+    def write_scope(name, node):
+      f.write(f"$scope module {name} $end\n")
+      for key, value in node.items():
+        if isinstance(value, dict):
+          write_scope(key, value)
+        else:
+          vcd_id, nbits = value
+          f.write(f"$var wire {nbits} {vcd_id} {key} $end\n")
+      f.write("$upscope $end\n")
+
+    f.write("$scope module top $end\n")
+    f.write(f"$var wire 1 {get_vcd_id(0)} clk $end\n")
+    for key, value in tree.items():
+      write_scope(key, value)
+    f.write("$upscope $end\n")
+    f.write("$enddefinitions $end\n")
+
+  def attach(s):
+    add_per_cycle_hook(s.top, s.sample)
+
+  def is_capturing(s, cycle):
+    if s.trigger is None:
+      return cycle >= s.start_cycle
+    if s.triggered_cycle is None and s.trigger():
+      s.triggered_cycle = cycle
+    return s.triggered_cycle is not None
+
+  def sample(s):
+    if s.num_cycles is not None and s.num_captured >= s.num_cycles:
+      return
+    cycle = s.top.sim_cycle_count()
+    if not s.is_capturing(cycle):
+      if s.history.maxlen:
+        s.history.append((cycle, s.sample_values(s.top)))
+      return
+    while s.history:
+      s.write_values(*s.history.popleft())
+    s.write_values(cycle, s.sample_values(s.top))
+    s.num_captured += 1
+
+  def write_values(s, cycle, values):
+    f = s.file
+    f.write(f"#{cycle * 10}\n1{get_vcd_id(0)}\n")
+    prev_values = s.prev_values
+    for i, value in enumerate(values):
+      if prev_values is None or prev_values[i] != value:
+        nbits = s.signals[i]._dsl.Type.nbits
+        vcd_id = get_vcd_id(i + 1)
+        if nbits == 1:
+          f.write(f"{value}{vcd_id}\n")
+        else:
+          f.write(f"b{value:b} {vcd_id}\n")
+    f.write(f"#{cycle * 10 + 5}\n0{get_vcd_id(0)}\n")
+    s.prev_values = values
+
+  def close(s):
+    if not s.file.closed:
+      s.file.close()
+
+  def __enter__(s):
+    return s
+
+  def __exit__(s, *args):
+    s.close()
@@ -5,6 +5,20 @@ CtrlMemDynamicRTL.py
 Control memory with dynamic reconfigurability (e.g., receiving control
 signals, halt/terminate signals) for each CGRA tile.
 
+With num_ctrl_banks = 2, the ctrl memory is double-buffered: while the
+kernel in the active bank is iterating, the config packets (ctrl signals,
+prologue counts, ctrl count per iteration, total ctrl steps and ctrl
+lower bound) go into the shadow bank, and CMD_SWAP_CTRL_BANK swaps the
+banks once the kernel in the active bank is completed (or right away if
+it is not launched yet), so the next kernel starts iterating without
+another CMD_LAUNCH. The swap waits for the completion rather than an
+iteration boundary, as the tiles receive the command over the ring at
+different times, i.e., the whole fabric finishes the current kernel
+before any tile starts the next one. The packets behind
+CMD_SWAP_CTRL_BANK wait till the swap is done. The swap is signaled on
+swap_outport, so that the tile clears the per-kernel state (crossbar
+prologue counters, FU states) indexed by ctrl_addr only.
+
 Author : Cheng Tan
   Date : Dec 20, 2024
 """
@@ -26,7 +40,7 @@ class CtrlMemDynamicRTL(Component):
                 ctrl_mem_size, num_fu_inports, num_fu_outports,
                 num_tile_inports, num_tile_outports, num_cgras,
                 num_tiles, ctrl_count_per_iter = 4,
-                total_ctrl_steps = 4):
+                total_ctrl_steps = 4, num_ctrl_banks = 1):
 
     CgraPayloadType = IntraCgraPktType.get_field_type(kAttrPayload)
     CtrlType = CgraPayloadType.get_field_type(kAttrCtrl)
@@ -36,6 +50,7 @@ class CtrlMemDynamicRTL(Component):
     # signals is 4 and they need to repeat 5 times, then the total
     # number of steps should be 4 * 5 = 20.
     # assert( ctrl_mem_size <= total_ctrl_steps )
+    assert num_ctrl_banks in [1, 2]
 
     # Constants.
     CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
@@ -47,6 +62,12 @@ class CtrlMemDynamicRTL(Component):
     TileInPortType = mk_bits(clog2(num_routing_xbar_inports))
     FuOutPortType = mk_bits(clog2(num_fu_outports))
     num_routing_outports = num_tile_outports + num_fu_inports
+    # The entries of the banks are stacked in the register file.
+    num_ctrl_entries = ctrl_mem_size * num_ctrl_banks
+    CtrlIdxType = mk_bits(clog2(num_ctrl_entries))
+    bank_offset = ctrl_mem_size if num_ctrl_banks > 1 else 0
+    kLastCtrlAddr = CtrlAddrType(ctrl_mem_size - 1)
+    kDoubleBuffered = b1(num_ctrl_banks > 1)
 
     # Interfaces.
     # Stores ctrl signals into the control memory/registers.
@@ -63,9 +84,11 @@ class CtrlMemDynamicRTL(Component):
     s.cgra_id = InPort(mk_bits(max(1, clog2(num_cgras))))
     s.tile_id = InPort(mk_bits(clog2(num_tiles + 1)))
     s.ctrl_addr_outport = OutPort(CtrlAddrType)
+    # Pulses when the banks are swapped.
+    s.swap_outport = OutPort(b1)
 
     # Components.
-    s.reg_file = RegisterFile(CtrlType, ctrl_mem_size, 1, 1)
+    s.reg_file = RegisterFile(CtrlType, num_ctrl_entries, 1, 1)
     s.recv_pkt_from_controller_queue = NormalQueueRTL(IntraCgraPktType)
     s.recv_from_element_queue = NormalQueueRTL(CgraPayloadType)
     s.times = Wire(TimeType)
@@ -75,22 +98,82 @@ class CtrlMemDynamicRTL(Component):
     s.ctrl_count_lower_bound = Wire(CtrlAddrType)
     s.ctrl_count_upper_bound = Wire(UpperBoundType)
     s.total_ctrl_steps_val = Wire(TimeType)
-
-    s.prologue_count_reg_fu = [Wire(PrologueCountType) for _ in range(ctrl_mem_size)]
+    # The ctrl_addr written by the next beat of the burst and the number
+    # of beats that are not received yet. The header (CMD_CONFIG_BURST)
+    # writes its own ctrl signal like CMD_CONFIG.
+    s.burst_addr = Wire(CtrlAddrType)
+    s.burst_remaining = Wire(UpperBoundType)
+    s.recv_burst_data = Wire(b1)
+    # The address of the current ctrl signal in the active bank, and
+    # the bank written by the config packets.
+    s.ctrl_addr = Wire(CtrlAddrType)
+    s.active_bank = Wire(b1)
+    s.config_bank = Wire(b1)
+    s.config_idx = Wire(CtrlIdxType)
+    s.burst_idx = Wire(CtrlIdxType)
+    s.swap = Wire(b1)
+    # The ctrl count per iteration, ctrl lower bound and total ctrl steps
+    # of the kernel in the shadow bank.
+    s.shadow_ctrl_count_per_iter_val = Wire(PCType)
+    s.shadow_ctrl_count_lower_bound = Wire(CtrlAddrType)
+    s.shadow_total_ctrl_steps_val = Wire(TimeType)
+
+    s.prologue_count_reg_fu = [Wire(PrologueCountType) for _ in range(num_ctrl_entries)]
     s.prologue_count_outport_fu = OutPort(PrologueCountType)
+    # The prologue counts of the crossbar inports at the current ctrl
+    # address, the crossbars keep their own per-address counters.
     s.prologue_count_outport_fu_crossbar = \
-        [[OutPort(PrologueCountType) for _ in range(num_fu_outports)] for _ in range(ctrl_mem_size)]
+        [OutPort(PrologueCountType) for _ in range(num_fu_outports)]
     s.prologue_count_outport_routing_crossbar = \
-        [[OutPort(PrologueCountType) for _ in range(num_routing_xbar_inports)] for _ in range(ctrl_mem_size)]
+        [OutPort(PrologueCountType) for _ in range(num_routing_xbar_inports)]
 
     s.prologue_count_reg_fu_crossbar = \
-        [[Wire(PrologueCountType) for _ in range(num_fu_outports)] for _ in range(ctrl_mem_size)]
+        [[Wire(PrologueCountType) for _ in range(num_fu_outports)] for _ in range(num_ctrl_entries)]
     s.prologue_count_reg_routing_crossbar = \
-        [[Wire(PrologueCountType) for _ in range(num_routing_xbar_inports)] for _ in range(ctrl_mem_size)]
+        [[Wire(PrologueCountType) for _ in range(num_routing_xbar_inports)] for _ in range(num_ctrl_entries)]
 
     # Connections.
     s.recv_pkt_from_controller //= s.recv_pkt_from_controller_queue.recv
     s.recv_from_element //= s.recv_from_element_queue.recv
+    s.swap_outport //= s.swap
+
+    @update
+    def update_ctrl_idx():
+      # The config packets go into the shadow bank while the kernel in
+      # the active bank is iterating.
+      s.config_bank @= s.active_bank ^ (s.start_iterate_ctrl & kDoubleBuffered)
+      s.reg_file.raddr[0] @= zext(s.ctrl_addr, CtrlIdxType)
+      s.config_idx @= zext(s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr, CtrlIdxType)
+      s.burst_idx @= zext(s.burst_addr, CtrlIdxType)
+      if s.active_bank:
+        s.reg_file.raddr[0] @= zext(s.ctrl_addr, CtrlIdxType) + CtrlIdxType(bank_offset)
+      if s.config_bank:
+        s.config_idx @= zext(s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr, CtrlIdxType) + CtrlIdxType(bank_offset)
+        s.burst_idx @= zext(s.burst_addr, CtrlIdxType) + CtrlIdxType(bank_offset)
+
+    @update
+    def update_swap():
+      # Swaps the banks once the active kernel is completed, i.e., no
+      # ctrl signal is issued in the swapping cycle.
+      s.swap @= 0
+      if kDoubleBuffered & s.recv_pkt_from_controller_queue.send.val & \
+         (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_SWAP_CTRL_BANK):
+        if ~s.start_iterate_ctrl | s.sent_complete:
+          s.swap @= 1
+
+    @update_ff
+    def update_active_bank():
+      if s.reset:
+        s.active_bank <<= 0
+      elif s.swap:
+        s.active_bank <<= ~s.active_bank
+
+    @update
+    def update_recv_burst_data():
+      # The beats beyond the announced count are dropped.
+      s.recv_burst_data @= s.recv_pkt_from_controller_queue.send.val & \
+                           (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_BURST_DATA) & \
+                           (s.burst_remaining != UpperBoundType(0))
 
     @update
     def update_msg():
@@ -98,7 +181,7 @@ class CtrlMemDynamicRTL(Component):
       s.send_to_element.msg @= CgraPayloadType(0, 0, 0, 0, 0)
       s.send_to_element.val @= 0
       s.reg_file.wen[0] @= 0
-      s.reg_file.waddr[0] @= s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr
+      s.reg_file.waddr[0] @= s.config_idx
       # Initializes the fields of the control signal.
       s.reg_file.wdata[0].operation @= 0
       for i in range(num_fu_inports):
@@ -113,9 +196,16 @@ class CtrlMemDynamicRTL(Component):
       s.reg_file.wdata[0].vector_factor_power @= s.recv_pkt_from_controller_queue.send.msg.payload.ctrl.vector_factor_power
       s.reg_file.wdata[0].is_last_ctrl @= 0
 
-      if s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG):
+      if (s.recv_pkt_from_controller_queue.send.val & \
+          ((s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG) | \
+           (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_BURST))) | \
+         s.recv_burst_data:
         s.reg_file.wen[0] @= 1
-        s.reg_file.waddr[0] @= s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr
+        # The beats of a burst carry no ctrl_addr.
+        if s.recv_burst_data:
+          s.reg_file.waddr[0] @= s.burst_idx
+        else:
+          s.reg_file.waddr[0] @= s.config_idx
         # Fills the fields of the control signal.
         s.reg_file.wdata[0].operation @= s.recv_pkt_from_controller_queue.send.msg.payload.ctrl.operation
         for i in range(num_fu_inports):
@@ -141,6 +231,8 @@ class CtrlMemDynamicRTL(Component):
         s.send_to_element.val @= 1
 
       if (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG) | \
+         (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_BURST) | \
+         (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_BURST_DATA) | \
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU) | \
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU_CROSSBAR) | \
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR) | \
@@ -157,6 +249,9 @@ class CtrlMemDynamicRTL(Component):
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_STREAMING_LD_START_ADDR) | \
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_STREAMING_LD_STRIDE) | \
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_STREAMING_LD_END_ADDR) | \
+         (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_STREAMING_ST_START_ADDR) | \
+         (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_STREAMING_ST_STRIDE) | \
+         (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_STREAMING_ST_END_ADDR) | \
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_GLOBAL_REDUCE_MUL_RESPONSE) | \
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_LOOP_LOWER) | \
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_LOOP_UPPER) | \
@@ -164,24 +259,28 @@ class CtrlMemDynamicRTL(Component):
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_UPDATE_COUNTER_SHADOW_VALUE) | \
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_RESET_LEAF_COUNTER):
         s.recv_pkt_from_controller_queue.send.rdy @= 1
+      # Stays in the queue till the banks are swapped. Dropped if the
+      # ctrl memory is not double-buffered.
+      if s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_SWAP_CTRL_BANK:
+        s.recv_pkt_from_controller_queue.send.rdy @= s.swap | ~kDoubleBuffered
       # TODO: Extend for the other commands. Maybe another queue to
       # handle complicated actions.
       # else:
 
     @update
     def update_ctrl_addr_outport():
-      s.ctrl_addr_outport @= s.reg_file.raddr[0]
+      s.ctrl_addr_outport @= s.ctrl_addr
 
     @update
     def update_send_pkt_to_controller():
       s.send_pkt_to_controller.val @= 0
-      s.send_pkt_to_controller.msg @= IntraCgraPktType(0, num_tiles, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_COMPLETE, 0, 0, 0, 0))
+      s.send_pkt_to_controller.msg @= IntraCgraPktType(0, num_tiles, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_COMPLETE, 0, 0, 0, 0), 0)
       s.recv_from_element_queue.send.rdy @= 0
       if s.start_iterate_ctrl == b1(1):
         if s.recv_from_element_queue.send.val & (~s.sent_complete):
           s.send_pkt_to_controller.msg @= \
               IntraCgraPktType(zext(s.tile_id, IntraPktTileIdType), num_tiles, 0, 0, 0, 0, 0, 0, 0, 0,
-                               s.recv_from_element_queue.send.msg)
+                               s.recv_from_element_queue.send.msg, 0)
           s.send_pkt_to_controller.val @= 1
           s.recv_from_element_queue.send.rdy @= s.send_pkt_to_controller.rdy
         elif ((s.total_ctrl_steps_val > 0) & (s.times == s.total_ctrl_steps_val)) | \
@@ -189,7 +288,7 @@ class CtrlMemDynamicRTL(Component):
           # Sends COMPLETE signal to Controller when the last ctrl signal is done.
           if ~s.sent_complete & (s.total_ctrl_steps_val > 0) & (s.times == s.total_ctrl_steps_val) & s.start_iterate_ctrl:
             s.send_pkt_to_controller.msg @= \
-                IntraCgraPktType(zext(s.tile_id, IntraPktTileIdType), num_tiles, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_COMPLETE, 0, 0, 0, 0))
+                IntraCgraPktType(zext(s.tile_id, IntraPktTileIdType), num_tiles, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_COMPLETE, 0, 0, 0, 0), 0)
             s.send_pkt_to_controller.val @= 1
 
     @update
@@ -253,22 +352,31 @@ class CtrlMemDynamicRTL(Component):
         elif s.recv_pkt_from_controller_queue.send.val & ( (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_LAUNCH) | \
                 (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_RESUME) ):
           s.sent_complete <<= 0
+        # The next kernel keeps iterating after the swap.
+        elif s.swap:
+          s.sent_complete <<= 0
 
     @update_ff
     def update_raddr_and_fu_prologue():
       if s.reset:
         s.times <<= 0
-        s.reg_file.raddr[0] <<= 0
-        for i in range(ctrl_mem_size):
+        s.ctrl_addr <<= 0
+        for i in range(num_ctrl_entries):
           s.prologue_count_reg_fu[i] <<= 0
-      elif s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_CTRL_LOWER_BOUND):
-        s.reg_file.raddr[0] <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, CtrlAddrType)
+      elif s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_CTRL_LOWER_BOUND) & \
+           (s.config_bank == s.active_bank):
+        s.ctrl_addr <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, CtrlAddrType)
       elif s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_TERMINATE):
         s.times <<= TimeType(0)
       else:
         if s.recv_pkt_from_controller_queue.send.val & \
            (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU):
-          s.prologue_count_reg_fu[s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr] <<= \
+          s.prologue_count_reg_fu[s.config_idx] <<= \
+              trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PrologueCountType)
+        # A beat of a burst can also carry the FU prologue count of its
+        # entry, which is indicated by the predicate of the data.
+        elif s.recv_burst_data & s.recv_pkt_from_controller_queue.send.msg.payload.data.predicate:
+          s.prologue_count_reg_fu[s.burst_idx] <<= \
               trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PrologueCountType)
 
         if s.start_iterate_ctrl == b1(1):
@@ -279,28 +387,32 @@ class CtrlMemDynamicRTL(Component):
 
           # Reads the next ctrl signal only when the current one is done.
           if s.send_ctrl.rdy & s.send_ctrl.val:
-            if zext(s.reg_file.raddr[0], UpperBoundType) == s.ctrl_count_upper_bound - UpperBoundType(1):
-              s.reg_file.raddr[0] <<= s.ctrl_count_lower_bound
+            if zext(s.ctrl_addr, UpperBoundType) == s.ctrl_count_upper_bound - UpperBoundType(1):
+              s.ctrl_addr <<= s.ctrl_count_lower_bound
             else:
-              s.reg_file.raddr[0] <<= s.reg_file.raddr[0] + CtrlAddrType(1)
+              s.ctrl_addr <<= s.ctrl_addr + CtrlAddrType(1)
             if s.prologue_count_reg_fu[s.reg_file.raddr[0]] > 0:
               s.prologue_count_reg_fu[s.reg_file.raddr[0]] <<= s.prologue_count_reg_fu[s.reg_file.raddr[0]] - 1
 
+        # The next kernel starts from its first ctrl signal.
+        if s.swap:
+          s.times <<= TimeType(0)
+          s.ctrl_addr <<= s.shadow_ctrl_count_lower_bound
+
     @update
     def update_prologue_outport():
       s.prologue_count_outport_fu @= s.prologue_count_reg_fu[s.reg_file.raddr[0]]
-      for addr in range(ctrl_mem_size):
-        for i in range(num_routing_xbar_inports):
-          s.prologue_count_outport_routing_crossbar[addr][i] @= \
-              s.prologue_count_reg_routing_crossbar[addr][i]
-        for i in range(num_fu_outports):
-          s.prologue_count_outport_fu_crossbar[addr][i] @= \
-              s.prologue_count_reg_fu_crossbar[addr][i]
+      for i in range(num_routing_xbar_inports):
+        s.prologue_count_outport_routing_crossbar[i] @= \
+            s.prologue_count_reg_routing_crossbar[s.reg_file.raddr[0]][i]
+      for i in range(num_fu_outports):
+        s.prologue_count_outport_fu_crossbar[i] @= \
+            s.prologue_count_reg_fu_crossbar[s.reg_file.raddr[0]][i]
 
     @update_ff
     def update_prologue_reg():
       if s.reset:
-        for addr in range(ctrl_mem_size):
+        for addr in range(num_ctrl_entries):
           for i in range(num_routing_xbar_inports):
             s.prologue_count_reg_routing_crossbar[addr][i] <<= 0
           for i in range(num_fu_outports):
@@ -311,25 +423,57 @@ class CtrlMemDynamicRTL(Component):
           temp_routing_crossbar_in = s.recv_pkt_from_controller_queue.send.msg.payload.ctrl.routing_xbar_outport[0]
           # Subtract 1 to convert from TileInType(1-8) to array index (0-7), consistent with normal crossbar routing
           if temp_routing_crossbar_in > 0:
-            s.prologue_count_reg_routing_crossbar[s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr][trunc(temp_routing_crossbar_in - 1, TileInPortType)] <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PrologueCountType)
+            s.prologue_count_reg_routing_crossbar[s.config_idx][trunc(temp_routing_crossbar_in - 1, TileInPortType)] <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PrologueCountType)
         elif s.recv_pkt_from_controller_queue.send.val & \
            (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU_CROSSBAR):
           temp_fu_crossbar_in = s.recv_pkt_from_controller_queue.send.msg.payload.ctrl.fu_xbar_outport[0]
-          s.prologue_count_reg_fu_crossbar[s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr][trunc(temp_fu_crossbar_in, FuOutPortType)] <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PrologueCountType)
+          s.prologue_count_reg_fu_crossbar[s.config_idx][trunc(temp_fu_crossbar_in, FuOutPortType)] <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PrologueCountType)
+
+    @update_ff
+    def update_burst():
+      if s.reset:
+        s.burst_addr <<= CtrlAddrType(0)
+        s.burst_remaining <<= UpperBoundType(0)
+      # The beats wrap around at the end of the ctrl memory, whose size
+      # is not necessarily a power of two.
+      elif s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_BURST):
+        if s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr == kLastCtrlAddr:
+          s.burst_addr <<= CtrlAddrType(0)
+        else:
+          s.burst_addr <<= s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr + CtrlAddrType(1)
+        s.burst_remaining <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, UpperBoundType)
+      elif s.recv_burst_data:
+        if s.burst_addr == kLastCtrlAddr:
+          s.burst_addr <<= CtrlAddrType(0)
+        else:
+          s.burst_addr <<= s.burst_addr + CtrlAddrType(1)
+        s.burst_remaining <<= s.burst_remaining - UpperBoundType(1)
 
     @update_ff
     def update_ctrl_count_per_iter():
       if s.reset:
         s.ctrl_count_per_iter_val <<= PCType(ctrl_count_per_iter)
+        s.shadow_ctrl_count_per_iter_val <<= PCType(ctrl_count_per_iter)
+      elif s.swap:
+        s.ctrl_count_per_iter_val <<= s.shadow_ctrl_count_per_iter_val
       elif s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_COUNT_PER_ITER):
-        s.ctrl_count_per_iter_val <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PCType)
+        if s.config_bank == s.active_bank:
+          s.ctrl_count_per_iter_val <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PCType)
+        else:
+          s.shadow_ctrl_count_per_iter_val <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PCType)
 
     @update_ff
     def update_lower_bound():
       if s.reset:
         s.ctrl_count_lower_bound <<= CtrlAddrType(0)
+        s.shadow_ctrl_count_lower_bound <<= CtrlAddrType(0)
+      elif s.swap:
+        s.ctrl_count_lower_bound <<= s.shadow_ctrl_count_lower_bound
       elif s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_CTRL_LOWER_BOUND):
-        s.ctrl_count_lower_bound <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, CtrlAddrType)
+        if s.config_bank == s.active_bank:
+          s.ctrl_count_lower_bound <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, CtrlAddrType)
+        else:
+          s.shadow_ctrl_count_lower_bound <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, CtrlAddrType)
 
     @update
     def update_upper_bound():
@@ -339,10 +483,16 @@ class CtrlMemDynamicRTL(Component):
     def update_total_ctrl_steps():
       if s.reset:
         s.total_ctrl_steps_val <<= TimeType(total_ctrl_steps)
+        s.shadow_total_ctrl_steps_val <<= TimeType(total_ctrl_steps)
+      elif s.swap:
+        s.total_ctrl_steps_val <<= s.shadow_total_ctrl_steps_val
       elif s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_TOTAL_CTRL_COUNT):
-        s.total_ctrl_steps_val <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, TimeType)
+        if s.config_bank == s.active_bank:
+          s.total_ctrl_steps_val <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, TimeType)
+        else:
+          s.shadow_total_ctrl_steps_val <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, TimeType)
 
   def line_trace(s):
     config_mem_str  = "|".join([str(data) for data in s.reg_file.regs])
-    return f'reg_file.raddr[0]: {s.reg_file.raddr[0]} || sent_complete: {s.sent_complete} || times: {s.times} || total_ctrl_steps_val: {s.total_ctrl_steps_val} || start_iterate_ctrl: {s.start_iterate_ctrl}|| recv_pkt: {s.recv_pkt_from_controller.msg}.recv_rdy:{s.recv_pkt_from_controller.rdy} || control signal content: [{config_mem_str}] || ctrl_out: {s.send_ctrl.msg}, send_ctrl.val: {s.send_ctrl.val}, send_ctrl.rdy: {s.send_ctrl.rdy}, send_pkt.msg.payload.cmd: {s.send_pkt_to_controller.msg.payload.cmd}, send_pkt.val: {s.send_pkt_to_controller.val}, ctrl_count_per_iter_val: {s.ctrl_count_per_iter_val}, ctrl_count_lower_bound: {s.ctrl_count_lower_bound}'
+    return f'reg_file.raddr[0]: {s.reg_file.raddr[0]} || active_bank: {s.active_bank} || sent_complete: {s.sent_complete} || times: {s.times} || total_ctrl_steps_val: {s.total_ctrl_steps_val} || start_iterate_ctrl: {s.start_iterate_ctrl}|| recv_pkt: {s.recv_pkt_from_controller.msg}.recv_rdy:{s.recv_pkt_from_controller.rdy} || control signal content: [{config_mem_str}] || ctrl_out: {s.send_ctrl.msg}, send_ctrl.val: {s.send_ctrl.val}, send_ctrl.rdy: {s.send_ctrl.rdy}, send_pkt.msg.payload.cmd: {s.send_pkt_to_controller.msg.payload.cmd}, send_pkt.val: {s.send_pkt_to_controller.val}, ctrl_count_per_iter_val: {s.ctrl_count_per_iter_val}, ctrl_count_lower_bound: {s.ctrl_count_lower_bound}'
 
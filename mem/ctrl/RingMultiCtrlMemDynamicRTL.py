@@ -14,6 +14,7 @@ from .CtrlMemDynamicRTL import CtrlMemDynamicRTL
 from ...lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ...lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ...lib.opt_type import *
+from ...noc.CtrlPktMulticastRTL import CtrlPktMulticastRTL
 from ...noc.PyOCN.pymtl3_net.ocnlib.ifcs.positions import mk_ring_pos
 from ...noc.PyOCN.pymtl3_net.ringnet.RingNetworkRTL import RingNetworkRTL
 from ...lib.util.data_struct_attr import *
@@ -41,21 +42,26 @@ class RingMultiCtrlMemDynamicRTL(Component):
                           num_fu_outports, num_tile_inports,
                           num_tile_outports, 1, num_tiles, ctrl_count_per_iter,
                           total_ctrl_steps) for terminal_id in range(s.num_tiles)]
+    s.ctrl_pkt_multicasts = [CtrlPktMulticastRTL(CtrlPktType, num_tiles)
+                             for _ in range(s.num_tiles)]
     s.ctrl_ring = RingNetworkRTL(CtrlPktType, CtrlRingPos, num_tiles + 1, 1)
 
     # Connections
     for i in range(s.num_tiles):
       s.ctrl_memories[i].cgra_id //= 0
       s.ctrl_memories[i].tile_id //= i
+      s.ctrl_pkt_multicasts[i].tile_id //= i
       s.ctrl_memories[i].recv_from_element.val //= 1
       s.ctrl_memories[i].recv_from_element.msg //= CgraPayloadType()
 
     for i in range(s.num_tiles):
-      s.ctrl_ring.send[i] //= s.ctrl_memories[i].recv_pkt_from_controller
+      s.ctrl_ring.send[i] //= s.ctrl_pkt_multicasts[i].recv_from_ring
+      s.ctrl_pkt_multicasts[i].send_to_tile //= s.ctrl_memories[i].recv_pkt_from_controller
     s.ctrl_ring.send[s.num_tiles] //= s.send_to_controller_pkt
 
     for i in range(s.num_tiles):
-      s.ctrl_ring.recv[i] //= s.ctrl_memories[i].send_pkt_to_controller
+      s.ctrl_memories[i].send_pkt_to_controller //= s.ctrl_pkt_multicasts[i].recv_from_tile
+      s.ctrl_ring.recv[i] //= s.ctrl_pkt_multicasts[i].send_to_ring
     s.ctrl_ring.recv[s.num_tiles] //= s.recv_pkt_from_controller
 
     for i in range(s.num_tiles):
@@ -26,7 +26,7 @@ class TestHarness(Component):
                 num_tile_inports, num_tile_outports, src0_msgs,
                 src1_msgs, ctrl_pkts, sink_msgs, num_tiles,
                 complete_signal_sink_out, ctrl_count_per_iter,
-                total_ctrl_steps_val, FuType):
+                total_ctrl_steps_val, FuType, num_ctrl_banks = 1):
 
     CgraPayloadType = CtrlPktType.get_field_type(kAttrPayload)
     CtrlSignalType = CgraPayloadType.get_field_type(kAttrCtrl)
@@ -41,7 +41,8 @@ class TestHarness(Component):
     s.ctrl_mem = MemUnit(CtrlPktType,
                          ctrl_mem_size, num_fu_inports, num_fu_outports,
                          num_tile_inports, num_tile_outports, 1, num_tiles,
-                         ctrl_count_per_iter, total_ctrl_steps_val)
+                         ctrl_count_per_iter, total_ctrl_steps_val,
+                         num_ctrl_banks)
 
     # Connections.
     s.fu.send_to_ctrl_mem //= s.ctrl_mem.recv_from_element
@@ -332,3 +333,245 @@ def test_return():
                    total_ctrl_steps_val,
                    RetRTL)
   run_sim(th)
+
+def test_burst_ctrl():
+  MemUnit = CtrlMemDynamicRTL
+  data_nbits = 16
+  DataType = mk_data(data_nbits, 1)
+  PredicateType = mk_predicate(1, 1)
+  ctrl_mem_size = 16
+  num_fu_inports = 2
+  num_fu_outports = 2
+  num_tile_inports = 4
+  num_tile_outports = 4
+  num_tiles = 4
+
+  cgra_id_nbits = 4
+  data_mem_size_global = 16
+  addr_nbits = clog2(data_mem_size_global)
+  DataAddrType = mk_bits(addr_nbits)
+  predicate_nbits = 1
+  num_registers_per_reg_bank = 16
+  num_cgra_columns = 1
+  num_cgra_rows = 1
+
+  CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+
+  CtrlType = mk_ctrl(num_fu_inports,
+                     num_fu_outports,
+                     num_tile_inports,
+                     num_tile_outports,
+                     num_registers_per_reg_bank)
+
+  CgraPayloadType = mk_cgra_payload(DataType,
+                                    DataAddrType,
+                                    CtrlType,
+                                    CtrlAddrType)
+
+  IntraCgraPktType = mk_intra_cgra_pkt(num_cgra_columns,
+                                       num_cgra_rows,
+                                       num_tiles,
+                                       CgraPayloadType)
+
+  FuInType = mk_bits(clog2(num_fu_inports + 1))
+  pick_register = [FuInType(x + 1) for x in range(num_fu_inports)]
+  src_data0 = [DataType(1, 1), DataType(5, 1), DataType(7, 1), DataType(6, 1)]
+  src_data1 = [DataType(6, 1), DataType(1, 1), DataType(2, 1), DataType(3, 1)]
+  # The header writes ctrl_addr 0 and announces 3 beats, which are written
+  # into ctrl_addr 1, 2, 3 without being addressed.
+                                 # src dst src/dst x/y       opq vc ctrl_action ctrl_addr ctrl_operation ctrl_predicate ctrl_fu_in...
+  src_ctrl_pkt = [IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG_BURST, data = DataType(3, 1), ctrl = CtrlType(OPT_ADD, pick_register), ctrl_addr = 0)),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG_BURST_DATA, ctrl = CtrlType(OPT_SUB, pick_register))),
+                  # The predicated data carries the FU prologue count of the entry.
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG_BURST_DATA, data = DataType(0, 1), ctrl = CtrlType(OPT_SUB, pick_register))),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG_BURST_DATA, ctrl = CtrlType(OPT_ADD, pick_register))),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_LAUNCH, ctrl = CtrlType(OPT_NAH, pick_register), ctrl_addr = 0))]
+
+  sink_out = [DataType(7, 1), DataType(4, 1), DataType(5, 1), DataType(9, 1)]
+  complete_signal_sink_out = [
+      IntraCgraPktType(0,  num_tiles,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_COMPLETE))]
+  
+  ctrl_count_per_iter = len(src_ctrl_pkt) - 1
+  total_ctrl_steps_val = len(src_ctrl_pkt) - 1
+
+  th = TestHarness(MemUnit,
+                   IntraCgraPktType,
+                   ctrl_mem_size,
+                   data_mem_size_global,
+                   num_fu_inports,
+                   num_fu_outports,
+                   num_tile_inports,
+                   num_tile_outports,
+                   src_data0,
+                   src_data1,
+                   src_ctrl_pkt,
+                   sink_out,
+                   num_tiles,
+                   complete_signal_sink_out,
+                   ctrl_count_per_iter,
+                   total_ctrl_steps_val,
+                   AdderRTL)
+  run_sim(th)
+
+def test_burst_ctrl_wrap():
+  MemUnit = CtrlMemDynamicRTL
+  data_nbits = 16
+  DataType = mk_data(data_nbits, 1)
+  PredicateType = mk_predicate(1, 1)
+  # Not a power of two, so that the ctrl_addr does not wrap by itself.
+  ctrl_mem_size = 6
+  num_fu_inports = 2
+  num_fu_outports = 2
+  num_tile_inports = 4
+  num_tile_outports = 4
+  num_tiles = 4
+
+  cgra_id_nbits = 4
+  data_mem_size_global = 16
+  addr_nbits = clog2(data_mem_size_global)
+  DataAddrType = mk_bits(addr_nbits)
+  predicate_nbits = 1
+  num_registers_per_reg_bank = 16
+  num_cgra_columns = 1
+  num_cgra_rows = 1
+
+  CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+
+  CtrlType = mk_ctrl(num_fu_inports,
+                     num_fu_outports,
+                     num_tile_inports,
+                     num_tile_outports,
+                     num_registers_per_reg_bank)
+
+  CgraPayloadType = mk_cgra_payload(DataType,
+                                    DataAddrType,
+                                    CtrlType,
+                                    CtrlAddrType)
+
+  IntraCgraPktType = mk_intra_cgra_pkt(num_cgra_columns,
+                                       num_cgra_rows,
+                                       num_tiles,
+                                       CgraPayloadType)
+
+  FuInType = mk_bits(clog2(num_fu_inports + 1))
+  pick_register = [FuInType(x + 1) for x in range(num_fu_inports)]
+  src_data0 = [DataType(1, 1), DataType(5, 1), DataType(7, 1)]
+  src_data1 = [DataType(6, 1), DataType(1, 1), DataType(2, 1)]
+  # The header writes the last ctrl_addr, the 3 beats wrap around into
+  # ctrl_addr 0, 1, 2, which are the ones iterated.
+                                 # src dst src/dst x/y       opq vc ctrl_action ctrl_addr ctrl_operation ctrl_predicate ctrl_fu_in...
+  src_ctrl_pkt = [IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG_BURST, data = DataType(3, 1), ctrl = CtrlType(OPT_SUB, pick_register), ctrl_addr = ctrl_mem_size - 1)),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG_BURST_DATA, ctrl = CtrlType(OPT_ADD, pick_register))),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG_BURST_DATA, ctrl = CtrlType(OPT_SUB, pick_register))),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG_BURST_DATA, ctrl = CtrlType(OPT_ADD, pick_register))),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_LAUNCH, ctrl = CtrlType(OPT_NAH, pick_register), ctrl_addr = 0))]
+
+  sink_out = [DataType(7, 1), DataType(4, 1), DataType(9, 1)]
+  complete_signal_sink_out = [
+      IntraCgraPktType(0,  num_tiles,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_COMPLETE))]
+  
+  ctrl_count_per_iter = len(src_ctrl_pkt) - 2
+  total_ctrl_steps_val = len(src_ctrl_pkt) - 2
+
+  th = TestHarness(MemUnit,
+                   IntraCgraPktType,
+                   ctrl_mem_size,
+                   data_mem_size_global,
+                   num_fu_inports,
+                   num_fu_outports,
+                   num_tile_inports,
+                   num_tile_outports,
+                   src_data0,
+                   src_data1,
+                   src_ctrl_pkt,
+                   sink_out,
+                   num_tiles,
+                   complete_signal_sink_out,
+                   ctrl_count_per_iter,
+                   total_ctrl_steps_val,
+                   AdderRTL)
+  run_sim(th)
+
+def test_double_buffered_ctrl():
+  MemUnit = CtrlMemDynamicRTL
+  data_nbits = 16
+  DataType = mk_data(data_nbits, 1)
+  ctrl_mem_size = 4
+  num_fu_inports = 2
+  num_fu_outports = 2
+  num_tile_inports = 4
+  num_tile_outports = 4
+  num_tiles = 4
+  num_ctrl_banks = 2
+
+  data_mem_size_global = 16
+  addr_nbits = clog2(data_mem_size_global)
+  DataAddrType = mk_bits(addr_nbits)
+  num_registers_per_reg_bank = 16
+  num_cgra_columns = 1
+  num_cgra_rows = 1
+
+  CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+
+  CtrlType = mk_ctrl(num_fu_inports,
+                     num_fu_outports,
+                     num_tile_inports,
+                     num_tile_outports,
+                     num_registers_per_reg_bank)
+
+  CgraPayloadType = mk_cgra_payload(DataType,
+                                    DataAddrType,
+                                    CtrlType,
+                                    CtrlAddrType)
+
+  IntraCgraPktType = mk_intra_cgra_pkt(num_cgra_columns,
+                                       num_cgra_rows,
+                                       num_tiles,
+                                       CgraPayloadType)
+
+  FuInType = mk_bits(clog2(num_fu_inports + 1))
+  pick_register = [FuInType(x + 1) for x in range(num_fu_inports)]
+  src_data0 = [DataType(x + 10, 1) for x in range(7)]
+  src_data1 = [DataType(x, 1) for x in range(7)]
+  # Kernel A adds for 4 steps while kernel B, which subtracts for 3
+  # steps, is written into the same ctrl_addr of the shadow bank. The
+  # swap waits for A to complete and starts B without another CMD_LAUNCH.
+                                 # src dst src/dst x/y       opq vc ctrl_action ctrl_addr ctrl_operation ctrl_predicate ctrl_fu_in...
+  src_ctrl_pkt = [IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG, ctrl = CtrlType(OPT_ADD, pick_register), ctrl_addr = 0)),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG_COUNT_PER_ITER, data = DataType(1, 1))),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG_TOTAL_CTRL_COUNT, data = DataType(4, 1))),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_LAUNCH, ctrl = CtrlType(OPT_NAH, pick_register), ctrl_addr = 0)),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG, ctrl = CtrlType(OPT_SUB, pick_register), ctrl_addr = 0)),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG_COUNT_PER_ITER, data = DataType(1, 1))),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_CONFIG_TOTAL_CTRL_COUNT, data = DataType(3, 1))),
+                  IntraCgraPktType(0,  1,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_SWAP_CTRL_BANK))]
+
+  # A runs to its completion before being swapped out.
+  #                10+0             11+1             12+2             13+3
+  sink_out = [DataType(10, 1), DataType(12, 1), DataType(14, 1), DataType(16, 1),
+  #                14-4             15-5             16-6
+              DataType(10, 1), DataType(10, 1), DataType(10, 1)]
+  # Both A and B complete.
+  complete_signal_sink_out = [
+      IntraCgraPktType(0,  num_tiles,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_COMPLETE)),
+      IntraCgraPktType(0,  num_tiles,  0, 0, 0, 0, 0, 0, 0,  0, CgraPayloadType(CMD_COMPLETE))]
+
+  th = TestHarness(MemUnit,
+                   IntraCgraPktType,
+                   ctrl_mem_size,
+                   data_mem_size_global,
+                   num_fu_inports,
+                   num_fu_outports,
+                   num_tile_inports,
+                   num_tile_outports,
+                   src_data0,
+                   src_data1,
+                   src_ctrl_pkt,
+                   sink_out,
+                   num_tiles,
+                   complete_signal_sink_out,
+                   1,
+                   1,
+                   AdderRTL,
+                   num_ctrl_banks)
+  run_sim(th)
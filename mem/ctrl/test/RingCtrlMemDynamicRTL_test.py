@@ -27,13 +27,14 @@ class TestHarness(Component):
                 ctrl_mem_size,
                 width, height, num_fu_inports,
                 num_fu_outports, num_tile_inports, num_tile_outports,
-                ctrl_pkts, sink_msgs):
+                ctrl_pkts, sink_msgs, src_interval_delay = 0):
 
     CgraPayloadType = CtrlPktType.get_field_type(kAttrPayload)
     CtrlSignalType = CgraPayloadType.get_field_type(kAttrCtrl)
     s.width = width
     s.height = height
-    s.src_pkt = TestSrcRTL(CtrlPktType, ctrl_pkts)
+    s.src_pkt = TestSrcRTL(CtrlPktType, ctrl_pkts,
+                           interval_delay = src_interval_delay)
     s.sink_out = [TestSinkRTL(CtrlSignalType, sink_msgs[i])
                   for i in range(width * height)]
 
@@ -81,6 +82,7 @@ def run_sim(test_harness, max_cycles = 40):
   test_harness.sim_tick()
   test_harness.sim_tick()
   test_harness.sim_tick()
+  return ncycles
 
 def test_Ctrl():
   MemUnit = RingMultiCtrlMemDynamicRTL
@@ -171,3 +173,59 @@ def test_Ctrl():
                    sink_out)
   run_sim(th)
 
+def test_multicast_ctrl():
+  DataType = mk_data(16, 1)
+  ctrl_mem_size = 16
+  num_fu_inports = 2
+  num_fu_outports = 2
+  num_tile_inports = 4
+  num_tile_outports = 4
+  width = 2
+  height = 2
+  num_tiles = width * height
+  num_registers_per_reg_bank = 16
+  CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+  DataAddrType = mk_bits(clog2(16))
+  CtrlType = mk_ctrl(num_fu_inports, num_fu_outports, num_tile_inports,
+                     num_tile_outports, num_registers_per_reg_bank)
+  CgraPayloadType = mk_cgra_payload(DataType, DataAddrType, CtrlType,
+                                    CtrlAddrType)
+  IntraCgraPktType = mk_intra_cgra_pkt(1, 1, num_tiles, CgraPayloadType)
+  FuInType = mk_bits(clog2(num_fu_inports + 1))
+  pickRegister = [FuInType(x + 1) for x in range(num_fu_inports)]
+
+  def mk_pkt(dst, cmd, opt, ctrl_addr, multicast_mask = 0):
+    return IntraCgraPktType(0, dst, payload = CgraPayloadType(cmd, ctrl = CtrlType(opt, pickRegister), ctrl_addr = ctrl_addr),
+                            multicast_mask = multicast_mask)
+
+  # Tile 0 and 2 run ADD then SUB, tile 1 and 3 run SUB then ADD.
+  unicast_pkts = []
+  for tile_id in range(num_tiles):
+    first, second = (OPT_ADD, OPT_SUB) if tile_id % 2 == 0 else (OPT_SUB, OPT_ADD)
+    unicast_pkts += [mk_pkt(tile_id, CMD_CONFIG, first, 0),
+                     mk_pkt(tile_id, CMD_CONFIG, second, 1),
+                     mk_pkt(tile_id, CMD_LAUNCH, OPT_ADD, 0)]
+
+  # Each multicast packet is sent to the lowest tile in the mask.
+  multicast_pkts = [mk_pkt(0, CMD_CONFIG, OPT_ADD, 0, 0b0101),
+                    mk_pkt(1, CMD_CONFIG, OPT_SUB, 0, 0b1010),
+                    mk_pkt(0, CMD_CONFIG, OPT_SUB, 1, 0b0101),
+                    mk_pkt(1, CMD_CONFIG, OPT_ADD, 1, 0b1010),
+                    mk_pkt(0, CMD_LAUNCH, OPT_ADD, 0, 0b1111)]
+
+  sink_out = [[CtrlType(OPT_ADD, pickRegister), CtrlType(OPT_SUB, pickRegister)],
+              [CtrlType(OPT_SUB, pickRegister), CtrlType(OPT_ADD, pickRegister)],
+              [CtrlType(OPT_ADD, pickRegister), CtrlType(OPT_SUB, pickRegister)],
+              [CtrlType(OPT_SUB, pickRegister), CtrlType(OPT_ADD, pickRegister)]]
+
+  # The interval models the packets being serialized through the CPU and
+  # the controller before reaching the ring.
+  ncycles = []
+  for pkts in [unicast_pkts, multicast_pkts]:
+    th = TestHarness(RingMultiCtrlMemDynamicRTL, IntraCgraPktType,
+                     ctrl_mem_size, width, height, num_fu_inports,
+                     num_fu_outports, num_tile_inports, num_tile_outports,
+                     pkts, sink_out, src_interval_delay = 2)
+    ncycles.append(run_sim(th, max_cycles = 80))
+  print("unicast vs. multicast cycles:", ncycles)
+  assert ncycles[1] < ncycles[0]
@@ -22,15 +22,37 @@ In addition, it contains a crossbar to handle multi-bank conflicts.
        - Remote accessed data.
    - Blocking and non-blocking might be configurabled in a dynamic way.
 
+The bank of a local address is selected by `bank_mapping` (see
+BANK_MAPPING_* in lib/util/common.py), i.e., block (consecutive
+per-bank-size chunks), cyclic (word-interleaved), or xor (word-interleaved
+with the bank index hashed by the in-bank row). The memory wrappers
+derive the matching in-bank offset, which requires the lower bound of the
+local address space to be aligned to the local memory size.
+
+With `num_dma_lanes` > 0, a DmaEngineRTL is attached, whose lanes access
+the memory via additional xbar ports (between the tile ports and the NoC
+port). It moves a whole block described by the packets on
+`recv_from_cpu_dma_pkt` between the host memory and the global address
+space, i.e., the local banks in parallel, and the remote CGRAs over the
+NoC. The NocPktType needs to be built with `num_rd_tiles + num_dma_lanes`
+read ports to identify the DMA lanes of the remote load requests.
+
+The opaque of a tile load request (`recv_raddr_opaque`) is returned along
+with its data (`send_rdata_opaque`), also for the remote loads whose
+responses could arrive out of order, so the tile can match them (e.g.,
+NonBlockingMemUnitRTL).
+
 Author : Cheng Tan
   Date : Aug 28, 2025
 """
 
 from .DataMemWrapperRTL import DataMemWrapperRTL
+from .DmaEngineRTL import DmaEngineRTL
 from ...lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ...lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ...lib.messages import *
 from ...noc.PyOCN.pymtl3_net.xbar.XbarBypassQueueRTL import XbarBypassQueueRTL
+from ...lib.util.common import *
 from ...lib.util.data_struct_attr import *
 
 class DataMemControllerRTL(Component):
@@ -45,7 +67,10 @@ class DataMemControllerRTL(Component):
                 multi_cgra_columns = 2,
                 num_tiles = 16,
                 mem_access_is_combinational = True,
-                idTo2d_map = {0: [0, 0]}):
+                idTo2d_map = {0: [0, 0]},
+                bank_mapping = BANK_MAPPING_BLOCK,
+                num_dma_lanes = 0,
+                host_mem_size = 64):
 
     CgraPayloadType = NocPktType.get_field_type(kAttrPayload)
     DataType = CgraPayloadType.get_field_type(kAttrData)
@@ -60,12 +85,21 @@ class DataMemControllerRTL(Component):
     PerBankAddrType = mk_bits(per_bank_addr_nbits)
     s.num_banks_per_cgra = num_banks_per_cgra
     LocalBankIndexType = mk_bits(clog2(num_banks_per_cgra))
+    bank_index_nbits = clog2(num_banks_per_cgra)
+    assert(bank_mapping in BANK_MAPPINGS.values())
+    # Interleaved mappings take the bank index from the low address bits.
+    assert(bank_mapping == BANK_MAPPING_BLOCK or \
+           2 ** bank_index_nbits == num_banks_per_cgra)
     s.num_rd_tiles = num_rd_tiles
     s.num_wr_tiles = num_wr_tiles
     RdTileIdType = mk_bits(clog2(num_rd_tiles))
-    # The additional port is for the request from inter-cgra NoC via controller.
-    num_xbar_in_rd_ports = num_rd_tiles + 1
-    num_xbar_in_wr_ports = num_wr_tiles + 1
+    # The DMA lanes follow the tiles, and the additional port is for the
+    # request from inter-cgra NoC via controller.
+    s.num_dma_lanes = num_dma_lanes
+    noc_rd_port = num_rd_tiles + num_dma_lanes
+    noc_wr_port = num_wr_tiles + num_dma_lanes
+    num_xbar_in_rd_ports = noc_rd_port + 1
+    num_xbar_in_wr_ports = noc_wr_port + 1
     num_xbar_out_rd_ports = num_banks_per_cgra + 1
     num_xbar_out_wr_ports = num_banks_per_cgra + 1
     num_cgras = multi_cgra_rows * multi_cgra_columns
@@ -78,7 +112,7 @@ class DataMemControllerRTL(Component):
                           data_mem_size_global,
                           num_cgras,
                           num_tiles,
-                          num_rd_tiles)
+                          noc_rd_port)
     MemWritePktType = \
         mk_mem_access_pkt(DataType,
                           num_xbar_in_wr_ports,
@@ -86,7 +120,7 @@ class DataMemControllerRTL(Component):
                           data_mem_size_global,
                           num_cgras,
                           num_tiles,
-                          num_rd_tiles)
+                          noc_rd_port)
 
     # Reverses the source and destination for response packet.
     MemResponsePktType = \
@@ -96,7 +130,7 @@ class DataMemControllerRTL(Component):
                           data_mem_size_global,
                           num_cgras,
                           num_tiles,
-                          num_rd_tiles)
+                          noc_rd_port)
 
     # Interfaces.
     # [num_rd_tiles] indicates the request from the NoC. ---> Add separate recv port for NoC.
@@ -110,6 +144,9 @@ class DataMemControllerRTL(Component):
 
 
     s.send_rdata = [SendIfcRTL(DataType) for _ in range(num_rd_tiles)]
+    # Opaque of the load requests, echoed along with the responses.
+    s.recv_raddr_opaque = [InPort(OpaqueType) for _ in range(num_rd_tiles)]
+    s.send_rdata_opaque = [OutPort(OpaqueType) for _ in range(num_rd_tiles)]
 
     s.send_to_noc_load_response_pkt = SendIfcRTL(NocPktType)
 
@@ -120,9 +157,55 @@ class DataMemControllerRTL(Component):
     s.send_to_noc_load_request_pkt = SendIfcRTL(NocPktType)
     s.send_to_noc_store_pkt = SendIfcRTL(NocPktType)
 
+    if num_dma_lanes > 0:
+      assert(NocPktType.get_field_type(kAttrRemoteSrcPort).nbits >= clog2(noc_rd_port + 1))
+      # Descriptor from and completion towards the CPU.
+      s.recv_from_cpu_dma_pkt = RecvIfcRTL(NocPktType)
+      s.send_to_cpu_dma_pkt = SendIfcRTL(NocPktType)
+      s.dma = DmaEngineRTL(NocPktType, data_mem_size_global, host_mem_size,
+                           num_dma_lanes)
+      s.recv_from_cpu_dma_pkt //= s.dma.recv_from_cpu_pkt
+      s.dma.send_to_cpu_pkt //= s.send_to_cpu_dma_pkt
+      # Host memory ports of the DMA lanes.
+      HostAddrType = mk_bits(clog2(host_mem_size))
+      s.to_host_raddr = [SendIfcRTL(HostAddrType) for _ in range(num_dma_lanes)]
+      s.from_host_rdata = [RecvIfcRTL(DataType) for _ in range(num_dma_lanes)]
+      s.to_host_waddr = [SendIfcRTL(HostAddrType) for _ in range(num_dma_lanes)]
+      s.to_host_wdata = [SendIfcRTL(DataType) for _ in range(num_dma_lanes)]
+      for k in range(num_dma_lanes):
+        s.dma.to_host_raddr[k] //= s.to_host_raddr[k]
+        s.from_host_rdata[k] //= s.dma.from_host_rdata[k]
+        s.dma.to_host_waddr[k] //= s.to_host_waddr[k]
+        s.dma.to_host_wdata[k] //= s.to_host_wdata[k]
+
+    # Handshakes of the DMA lanes towards the xbars. At least one set of
+    # wires is kept (and left unused) without DMA, as the update blocks
+    # below refer to them and could not be translated otherwise.
+    num_dma_wires = max(1, num_dma_lanes)
+    s.dma_rd_val = [Wire(1) for _ in range(num_dma_wires)]
+    s.dma_rd_rdy = [Wire(1) for _ in range(num_dma_wires)]
+    s.dma_rdata = [Wire(DataType) for _ in range(num_dma_wires)]
+    s.dma_rdata_val = [Wire(1) for _ in range(num_dma_wires)]
+    s.dma_rdata_rdy = [Wire(1) for _ in range(num_dma_wires)]
+    s.dma_wr_val = [Wire(1) for _ in range(num_dma_wires)]
+    s.dma_wr_rdy = [Wire(1) for _ in range(num_dma_wires)]
+    s.dma_wdata = [Wire(DataType) for _ in range(num_dma_wires)]
+    for k in range(num_dma_lanes):
+      s.dma_rd_val[k] //= s.dma.to_mem_raddr[k].val
+      s.dma.to_mem_raddr[k].rdy //= s.dma_rd_rdy[k]
+      s.dma.from_mem_rdata[k].msg //= s.dma_rdata[k]
+      s.dma.from_mem_rdata[k].val //= s.dma_rdata_val[k]
+      s.dma_rdata_rdy[k] //= s.dma.from_mem_rdata[k].rdy
+      # The DMA lane provides the write address and data together.
+      s.dma_wr_val[k] //= s.dma.to_mem_waddr[k].val
+      s.dma.to_mem_waddr[k].rdy //= s.dma_wr_rdy[k]
+      s.dma.to_mem_wdata[k].rdy //= s.dma_wr_rdy[k]
+      s.dma_wdata[k] //= s.dma.to_mem_wdata[k].msg
+
     # Components.
     s.memory_wrapper = [DataMemWrapperRTL(DataType, MemReadPktType, MemWritePktType, MemResponsePktType,
-                                          data_mem_size_global, data_mem_size_per_bank, mem_access_is_combinational)
+                                          data_mem_size_global, data_mem_size_per_bank, mem_access_is_combinational,
+                                          num_banks_per_cgra, bank_mapping)
                   for _ in range(num_banks_per_cgra)]
     # The additional 1 on inports indicates the read/write from NoC.
     # The additional 1 on outports indicates the request out of bound of
@@ -137,6 +220,13 @@ class DataMemControllerRTL(Component):
     s.rd_pkt = [Wire(MemReadPktType) for _ in range(num_xbar_in_rd_ports)]
     s.wr_pkt = [Wire(MemWritePktType) for _ in range(num_xbar_in_wr_ports)]
 
+    # Request addresses and their target banks (num_banks_per_cgra
+    # indicates the NoC).
+    s.rd_addr = [Wire(AddrType) for _ in range(num_xbar_in_rd_ports)]
+    s.wr_addr = [Wire(AddrType) for _ in range(num_xbar_in_wr_ports)]
+    s.rd_bank_index = [Wire(XbarOutRdType) for _ in range(num_xbar_in_rd_ports)]
+    s.wr_bank_index = [Wire(XbarOutWrType) for _ in range(num_xbar_in_wr_ports)]
+
     s.cgra_id = InPort(mk_bits(max(1, clog2(num_cgras))))
 
     s.address_lower = InPort(AddrType)
@@ -151,11 +241,51 @@ class DataMemControllerRTL(Component):
       s.idTo2d_y_lut[cgra_id] //= YType(xy[1])
 
     # Connections.
+    for i in range(num_rd_tiles):
+      s.rd_addr[i] //= s.recv_raddr[i].msg
+    for k in range(num_dma_lanes):
+      s.rd_addr[num_rd_tiles + k] //= s.dma.to_mem_raddr[k].msg
+    s.rd_addr[noc_rd_port] //= s.recv_from_noc_load_request.msg.payload.data_addr
+    for i in range(num_wr_tiles):
+      s.wr_addr[i] //= s.recv_waddr[i].msg
+    for k in range(num_dma_lanes):
+      s.wr_addr[num_wr_tiles + k] //= s.dma.to_mem_waddr[k].msg
+    s.wr_addr[noc_wr_port] //= s.recv_from_noc_store_request.msg.payload.data_addr
+
     for i in range(num_banks_per_cgra):
       s.read_crossbar.send[i] //= s.memory_wrapper[i].recv_rd
       s.write_crossbar.send[i] //= s.memory_wrapper[i].recv_wr
       s.memory_wrapper[i].send //= s.response_crossbar.recv[i]
 
+    # Maps the addresses to the banks.
+    @update
+    def calculate_bank_index():
+      for i in range(num_xbar_in_rd_ports):
+        if (s.rd_addr[i] >= s.address_lower) & (s.rd_addr[i] <= s.address_upper):
+          if bank_mapping == BANK_MAPPING_CYCLIC:
+            s.rd_bank_index[i] @= zext(trunc(s.rd_addr[i] - s.address_lower, LocalBankIndexType), XbarOutRdType)
+          elif bank_mapping == BANK_MAPPING_XOR:
+            s.rd_bank_index[i] @= zext(trunc(s.rd_addr[i] - s.address_lower, LocalBankIndexType) ^
+                                       trunc((s.rd_addr[i] - s.address_lower) >> bank_index_nbits, LocalBankIndexType),
+                                       XbarOutRdType)
+          else:
+            s.rd_bank_index[i] @= trunc((s.rd_addr[i] - s.address_lower) >> per_bank_addr_nbits, XbarOutRdType)
+        else:
+          s.rd_bank_index[i] @= XbarOutRdType(num_banks_per_cgra)
+
+      for i in range(num_xbar_in_wr_ports):
+        if (s.wr_addr[i] >= s.address_lower) & (s.wr_addr[i] <= s.address_upper):
+          if bank_mapping == BANK_MAPPING_CYCLIC:
+            s.wr_bank_index[i] @= zext(trunc(s.wr_addr[i] - s.address_lower, LocalBankIndexType), XbarOutWrType)
+          elif bank_mapping == BANK_MAPPING_XOR:
+            s.wr_bank_index[i] @= zext(trunc(s.wr_addr[i] - s.address_lower, LocalBankIndexType) ^
+                                       trunc((s.wr_addr[i] - s.address_lower) >> bank_index_nbits, LocalBankIndexType),
+                                       XbarOutWrType)
+          else:
+            s.wr_bank_index[i] @= trunc((s.wr_addr[i] - s.address_lower) >> per_bank_addr_nbits, XbarOutWrType)
+        else:
+          s.wr_bank_index[i] @= XbarOutWrType(num_banks_per_cgra)
+
     @update
     def assemble_xbar_pkt():
       for i in range(num_xbar_in_rd_ports):
@@ -165,63 +295,60 @@ class DataMemControllerRTL(Component):
         s.wr_pkt[i] @= MemWritePktType(i, 0, 0, DataType(0, 0, 0, 0), 0, 0, i)
 
       for i in range(num_rd_tiles):
-        recv_raddr = s.recv_raddr[i].msg
-        # Calculates the target bank index for load.
-        if (recv_raddr >= s.address_lower) & (recv_raddr <= s.address_upper):
-          bank_index_load_local = trunc((recv_raddr - s.address_lower) >> per_bank_addr_nbits, XbarOutRdType)
-        else:
-          bank_index_load_local = XbarOutRdType(num_banks_per_cgra)
         # FIXME: change to exact tile id.
         s.rd_pkt[i] @= MemReadPktType(i,                       # src
-                                      bank_index_load_local,   # dst
-                                      recv_raddr,              # addr
+                                      s.rd_bank_index[i],      # dst
+                                      s.rd_addr[i],            # addr
                                       DataType(0, 0, 0, 0),    # data
                                       s.cgra_id,               # src_cgra
                                       0,                       # src_tile
-                                      i)                       # remote_src_port
-
-      recv_raddr_from_noc = s.recv_from_noc_load_request.msg.payload.data_addr
-      # Calculates the target bank index.
-      if (recv_raddr_from_noc >= s.address_lower) & (recv_raddr_from_noc <= s.address_upper):
-        bank_index_load_from_noc = trunc((recv_raddr_from_noc - s.address_lower) >> per_bank_addr_nbits, XbarOutRdType)
-      else:
-        bank_index_load_from_noc = XbarOutRdType(num_banks_per_cgra)
-      s.rd_pkt[num_rd_tiles] @= MemReadPktType(num_rd_tiles,                                     # src
-                                               bank_index_load_from_noc,                         # dst
-                                               recv_raddr_from_noc,                              # addr
+                                      i,                       # remote_src_port
+                                      s.recv_raddr_opaque[i])  # opaque
+
+      for k in range(num_dma_lanes):
+        s.rd_pkt[num_rd_tiles + k] @= MemReadPktType(num_rd_tiles + k,                   # src
+                                                     s.rd_bank_index[num_rd_tiles + k],  # dst
+                                                     s.rd_addr[num_rd_tiles + k],        # addr
+                                                     DataType(0, 0, 0, 0),               # data
+                                                     s.cgra_id,                          # src_cgra
+                                                     0,                                  # src_tile
+                                                     num_rd_tiles + k)                   # remote_src_port
+
+      s.rd_pkt[noc_rd_port] @= MemReadPktType(noc_rd_port,                                      # src
+                                               s.rd_bank_index[noc_rd_port],                     # dst
+                                               s.rd_addr[noc_rd_port],                           # addr
                                                DataType(0, 0, 0, 0),                             # data
                                                s.recv_from_noc_load_request.msg.src,             # src_cgra
                                                s.recv_from_noc_load_request.msg.src_tile_id,     # src_tile
-                                               s.recv_from_noc_load_request.msg.remote_src_port) # remote_src_port   
+                                               s.recv_from_noc_load_request.msg.remote_src_port, # remote_src_port
+                                               s.recv_from_noc_load_request.msg.opaque)          # opaque
 
       for i in range(num_wr_tiles):
-        recv_waddr = s.recv_waddr[i].msg
-        # Calculates the target bank index for store.
-        if (recv_waddr >= s.address_lower) & (recv_waddr <= s.address_upper):
-          bank_index_store_local = trunc((recv_waddr - s.address_lower) >> per_bank_addr_nbits, XbarOutWrType)
-        else:
-          bank_index_store_local = XbarOutWrType(num_banks_per_cgra)
         s.wr_pkt[i] @= MemWritePktType(i,                       # src
-                                       bank_index_store_local,  # dst
-                                       recv_waddr,              # addr
+                                       s.wr_bank_index[i],      # dst
+                                       s.wr_addr[i],            # addr
                                        s.recv_wdata[i].msg,     # data
                                        0,                       # src_cgra
                                        0,                       # src_tile
                                        i)                       # remote_src_port
 
-      recv_waddr_from_noc = s.recv_from_noc_store_request.msg.payload.data_addr
+      for k in range(num_dma_lanes):
+        s.wr_pkt[num_wr_tiles + k] @= MemWritePktType(num_wr_tiles + k,                   # src
+                                                      s.wr_bank_index[num_wr_tiles + k],  # dst
+                                                      s.wr_addr[num_wr_tiles + k],        # addr
+                                                      s.dma_wdata[k],                     # data
+                                                      0,                                  # src_cgra
+                                                      0,                                  # src_tile
+                                                      num_wr_tiles + k)                   # remote_src_port
+
       recv_wdata_from_noc = s.recv_from_noc_store_request.msg.payload.data
-      if (recv_waddr_from_noc >= s.address_lower) & (recv_waddr_from_noc <= s.address_upper):
-        bank_index_store_from_noc = trunc((recv_waddr_from_noc - s.address_lower) >> per_bank_addr_nbits, XbarOutWrType)
-      else:
-        bank_index_store_from_noc = XbarOutWrType(num_banks_per_cgra)
-      s.wr_pkt[num_wr_tiles] @= MemWritePktType(num_wr_tiles,               # src
-                                                bank_index_store_from_noc,  # dst
-                                                recv_waddr_from_noc,        # addr
-                                                recv_wdata_from_noc,        # data
-                                                0,                          # src_cgra
-                                                0,                          # src_tile
-                                                num_wr_tiles)               # remote_src_port
+      s.wr_pkt[noc_wr_port] @= MemWritePktType(noc_wr_port,                   # src
+                                               s.wr_bank_index[noc_wr_port],  # dst
+                                               s.wr_addr[noc_wr_port],        # addr
+                                               recv_wdata_from_noc,           # data
+                                               0,                             # src_cgra
+                                               0,                             # src_tile
+                                               noc_wr_port)                   # remote_src_port
 
     # Connects xbar with the memory wrapper.
     @update
@@ -240,6 +367,7 @@ class DataMemControllerRTL(Component):
       for i in range(num_rd_tiles):
         s.send_rdata[i].val @= 0
         s.send_rdata[i].msg @= DataType()
+        s.send_rdata_opaque[i] @= OpaqueType(0)
       s.send_to_noc_load_response_pkt.val @= 0
 
       s.send_to_noc_load_response_pkt.msg @= \
@@ -254,7 +382,8 @@ class DataMemControllerRTL(Component):
                      0, # remote_src_port
                      0, # opaque
                      0, # vc_id
-                     CgraPayloadType(0, 0, 0, 0, 0))
+                     CgraPayloadType(0, 0, 0, 0, 0),
+                     0) # multicast_mask
 
 
       for i in range(num_wr_tiles):
@@ -272,7 +401,8 @@ class DataMemControllerRTL(Component):
                      0, # remote_src_port
                      0, # opaque
                      0, # vc_id
-                     CgraPayloadType(0, 0, 0, 0, 0))
+                     CgraPayloadType(0, 0, 0, 0, 0),
+                     0) # multicast_mask
 
       s.send_to_noc_store_pkt.val @= 0
 
@@ -298,7 +428,8 @@ class DataMemControllerRTL(Component):
                      0, # remote_src_port
                      0, # opaque
                      0, # vc_id
-                     CgraPayloadType(0, 0, 0, 0, 0))
+                     CgraPayloadType(0, 0, 0, 0, 0),
+                     0) # multicast_mask
 
       s.send_to_noc_load_request_pkt.val @= 0
 
@@ -307,9 +438,13 @@ class DataMemControllerRTL(Component):
           s.read_crossbar.recv[i].val @= s.recv_raddr[i].val
           s.read_crossbar.recv[i].msg @= s.rd_pkt[i]
           s.recv_raddr[i].rdy @= s.read_crossbar.recv[i].rdy
-      s.read_crossbar.recv[num_rd_tiles].val @= s.recv_from_noc_load_request.val
-      s.read_crossbar.recv[num_rd_tiles].msg @= s.rd_pkt[num_rd_tiles]
-      s.recv_from_noc_load_request.rdy @= s.read_crossbar.recv[num_rd_tiles].rdy
+      for k in range(num_dma_lanes):
+        s.read_crossbar.recv[num_rd_tiles + k].val @= s.dma_rd_val[k]
+        s.read_crossbar.recv[num_rd_tiles + k].msg @= s.rd_pkt[num_rd_tiles + k]
+        s.dma_rd_rdy[k] @= s.read_crossbar.recv[num_rd_tiles + k].rdy
+      s.read_crossbar.recv[noc_rd_port].val @= s.recv_from_noc_load_request.val
+      s.read_crossbar.recv[noc_rd_port].msg @= s.rd_pkt[noc_rd_port]
+      s.recv_from_noc_load_request.rdy @= s.read_crossbar.recv[noc_rd_port].rdy
       
       # Connects the store request ports (from tiles and NoC) to the xbar targetting memory and NoC.
       for i in range(num_wr_tiles):
@@ -317,18 +452,27 @@ class DataMemControllerRTL(Component):
         s.write_crossbar.recv[i].msg @= s.wr_pkt[i]
         s.recv_waddr[i].rdy @= s.write_crossbar.recv[i].rdy
         s.recv_wdata[i].rdy @= s.write_crossbar.recv[i].rdy
-      s.write_crossbar.recv[num_wr_tiles].val @= s.recv_from_noc_store_request.val
-      s.write_crossbar.recv[num_wr_tiles].msg @= s.wr_pkt[num_wr_tiles]
-      s.recv_from_noc_store_request.rdy @= s.write_crossbar.recv[num_wr_tiles].rdy
-
-      # Connects the response ports to tiles and NoC from the xbar.
+      for k in range(num_dma_lanes):
+        s.write_crossbar.recv[num_wr_tiles + k].val @= s.dma_wr_val[k]
+        s.write_crossbar.recv[num_wr_tiles + k].msg @= s.wr_pkt[num_wr_tiles + k]
+        s.dma_wr_rdy[k] @= s.write_crossbar.recv[num_wr_tiles + k].rdy
+      s.write_crossbar.recv[noc_wr_port].val @= s.recv_from_noc_store_request.val
+      s.write_crossbar.recv[noc_wr_port].msg @= s.wr_pkt[noc_wr_port]
+      s.recv_from_noc_store_request.rdy @= s.write_crossbar.recv[noc_wr_port].rdy
+
+      # Connects the response ports to tiles, DMA lanes and NoC from the xbar.
       # Number of load responses is expected to be the same as the number of load requests.
+      for k in range(num_dma_lanes):
+        s.dma_rdata[k] @= s.response_crossbar.send[num_rd_tiles + k].msg.data
+        s.dma_rdata_val[k] @= s.response_crossbar.send[num_rd_tiles + k].val
+        s.response_crossbar.send[num_rd_tiles + k].rdy @= s.dma_rdata_rdy[k]
       for i in range(num_xbar_in_rd_ports):
         if i < num_rd_tiles:
           s.send_rdata[RdTileIdType(i)].msg @= s.response_crossbar.send[i].msg.data
           s.send_rdata[RdTileIdType(i)].val @= s.response_crossbar.send[i].val
+          s.send_rdata_opaque[RdTileIdType(i)] @= s.response_crossbar.send[i].msg.opaque
           s.response_crossbar.send[i].rdy @= s.send_rdata[RdTileIdType(i)].rdy
-        else:
+        elif i == noc_rd_port:
           from_cgra_id = s.response_crossbar.send[i].msg.src_cgra
           from_tile_id = s.response_crossbar.send[i].msg.src_tile
           s.send_to_noc_load_response_pkt.msg @= \
@@ -342,12 +486,13 @@ class DataMemControllerRTL(Component):
                     0, # src_tile_id set as 0 as it is from memory rather than a specific tile.
                     from_tile_id, # dst_tile_id
                     s.response_crossbar.send[i].msg.remote_src_port, # remote_src_port, carries the original source port id towards the src.
-                    0, # opaque
+                    s.response_crossbar.send[i].msg.opaque, # opaque, carries the original opaque towards the src.
                     0, # vc_id
                     CgraPayloadType(
                         CMD_LOAD_RESPONSE,
                         s.response_crossbar.send[i].msg.data,
-                        s.response_crossbar.send[i].msg.addr, 0, 0))
+                        s.response_crossbar.send[i].msg.addr, 0, 0),
+                    0) # multicast_mask
 
           s.send_to_noc_load_response_pkt.val @= s.response_crossbar.send[i].val
           s.response_crossbar.send[i].rdy @= s.send_to_noc_load_response_pkt.rdy
@@ -364,12 +509,13 @@ class DataMemControllerRTL(Component):
                       0, # src_tile_id
                       0, # dst_tile_id
                       s.read_crossbar.send[num_banks_per_cgra].msg.src, # remote_src_port
-                      0, # opaque
+                      s.read_crossbar.send[num_banks_per_cgra].msg.opaque, # opaque
                       0, # vc_id
                       CgraPayloadType(
                           CMD_LOAD_REQUEST,
                           0,
-                          s.read_crossbar.send[num_banks_per_cgra].msg.addr, 0, 0))
+                          s.read_crossbar.send[num_banks_per_cgra].msg.addr, 0, 0),
+                      0) # multicast_mask
 
       s.send_to_noc_load_request_pkt.val @= s.read_crossbar.send[num_banks_per_cgra].val 
       # TODO: https://github.com/tancheng/VectorCGRA/issues/26 -- Modify this part for non-blocking access.
@@ -383,7 +529,8 @@ class DataMemControllerRTL(Component):
                              s.recv_from_noc_load_response_pkt.msg.payload.data,
                              s.recv_from_noc_load_response_pkt.msg.src,
                              s.recv_from_noc_load_response_pkt.msg.src_tile_id,
-                             0)
+                             0,
+                             s.recv_from_noc_load_response_pkt.msg.opaque)
 
       # Allows other load request towards NoC when the previous one is not responded. There
       # could be out-of-order load response, i.e., potential consistency issue.
@@ -405,7 +552,8 @@ class DataMemControllerRTL(Component):
                       CgraPayloadType(
                           CMD_STORE_REQUEST,
                           s.write_crossbar.send[num_banks_per_cgra].msg.data,
-                          s.write_crossbar.send[num_banks_per_cgra].msg.addr, 0, 0))
+                          s.write_crossbar.send[num_banks_per_cgra].msg.addr, 0, 0),
+                      0) # multicast_mask
 
       s.send_to_noc_store_pkt.val @= s.write_crossbar.send[num_banks_per_cgra].val
       s.write_crossbar.send[num_banks_per_cgra].rdy @= s.send_to_noc_store_pkt.rdy
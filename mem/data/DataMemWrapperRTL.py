@@ -2,7 +2,10 @@
 ==========================================================================
 DataMemWrapperRTL.py
 ==========================================================================
-Data memory for CGRA.
+Data memory for CGRA. The in-bank offset of an address is derived
+according to the bank mapping of DataMemControllerRTL, i.e., the low
+address bits for the block mapping, and the address bits above the bank
+index for the interleaved (cyclic/xor) ones.
 
 Author : Cheng Tan
   Date : Aug 27, 2025
@@ -14,6 +17,7 @@ from ...lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ...lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ...lib.messages import *
 from ...lib.opt_type import *
+from ...lib.util.common import *
 from ...noc.PyOCN.pymtl3_net.channel.ChannelRTL import ChannelRTL
 
 class DataMemWrapperRTL(Component):
@@ -25,11 +29,14 @@ class DataMemWrapperRTL(Component):
                 MemResponseType,
                 global_data_mem_size,
                 per_bank_data_mem_size,
-                is_combinational = True):
+                is_combinational = True,
+                num_banks = 1,
+                bank_mapping = BANK_MAPPING_BLOCK):
 
     # Constant.
     GlobalAddrType = mk_bits(clog2(global_data_mem_size))
     PerBankAddrType = mk_bits(clog2(per_bank_data_mem_size))
+    bank_index_nbits = clog2(num_banks)
 
     # Interface.
     s.recv_rd = RecvIfcRTL(MemReadType)
@@ -67,6 +74,7 @@ class DataMemWrapperRTL(Component):
         s.send.msg.src_cgra           @= s.channel_rd.send.msg.src_cgra
         s.send.msg.src_tile           @= s.channel_rd.send.msg.src_tile
         s.send.msg.remote_src_port    @= s.channel_rd.send.msg.remote_src_port
+        s.send.msg.opaque             @= s.channel_rd.send.msg.opaque
 
     @update
     def request_memory():
@@ -77,11 +85,19 @@ class DataMemWrapperRTL(Component):
       s.memory.wdata[0] @= DataType(0, 0, 0, 0)
 
       if s.channel_rd.send.val:
-        s.memory.raddr[0] @= \
-          trunc(s.channel_rd.send.msg.addr % per_bank_data_mem_size, PerBankAddrType)
+        if bank_mapping == BANK_MAPPING_BLOCK:
+          s.memory.raddr[0] @= \
+            trunc(s.channel_rd.send.msg.addr % per_bank_data_mem_size, PerBankAddrType)
+        else:
+          s.memory.raddr[0] @= \
+            trunc(s.channel_rd.send.msg.addr >> bank_index_nbits, PerBankAddrType)
       if s.channel_wr.send.val:
-        s.memory.waddr[0] @= \
-          trunc(s.channel_wr.send.msg.addr % per_bank_data_mem_size, PerBankAddrType)
+        if bank_mapping == BANK_MAPPING_BLOCK:
+          s.memory.waddr[0] @= \
+            trunc(s.channel_wr.send.msg.addr % per_bank_data_mem_size, PerBankAddrType)
+        else:
+          s.memory.waddr[0] @= \
+            trunc(s.channel_wr.send.msg.addr >> bank_index_nbits, PerBankAddrType)
         s.memory.wdata[0] @= s.channel_wr.send.msg.data
         s.memory.wen[0]   @= 1
 
@@ -0,0 +1,257 @@
+"""
+==========================================================================
+DmaEngineRTL.py
+==========================================================================
+Bulk DMA engine that moves a whole block between the host memory and the
+scratchpad memory (SPM), so that preloading (or reading back) a block
+costs a single descriptor instead of one packet per word.
+
+A descriptor is given by the packets received from the CPU:
+ - CMD_CONFIG_DMA_STRIDE: stride between the SPM words of the block.
+ - CMD_CONFIG_DMA_LENGTH: number of words of the block.
+ - CMD_DMA_PRELOAD/CMD_DMA_READBACK: direction (host -> SPM, or
+   SPM -> host), which launches the transfer with the SPM base address
+   in `data_addr` and the host base address in `data`.
+The stride and length are kept across the transfers, so back-to-back
+blocks of the same shape only need the launching packet.
+
+The block is moved by `num_lanes` lanes in parallel, i.e., lane k moves
+the words k, k + num_lanes, k + 2 * num_lanes, ... Each lane reads a word
+from its source port and writes it to its destination port, bursting one
+word per cycle when both memories respond combinationally. The SPM ports
+target the global address space, so the words out of the local SPM are
+moved across CGRAs over the mesh by DataMemControllerRTL. Once all the
+words are written, a single CMD_DMA_COMPLETE packet is sent back to the
+sender of the launching packet.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+from ...lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
+from ...lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
+from ...lib.cmd_type import *
+from ...lib.messages import *
+from ...lib.util.data_struct_attr import *
+
+class DmaEngineRTL(Component):
+
+  def construct(s, NocPktType, data_mem_size_global, host_mem_size,
+                num_lanes = 4):
+
+    # Constant.
+    CgraPayloadType = NocPktType.get_field_type(kAttrPayload)
+    DataType = CgraPayloadType.get_field_type(kAttrData)
+    AddrType = mk_bits(clog2(data_mem_size_global))
+    HostAddrType = mk_bits(clog2(host_mem_size))
+    # The length counts up to the whole host memory.
+    LengthType = mk_bits(clog2(host_mem_size + 1))
+    LaneCountType = mk_bits(clog2(num_lanes + 1))
+    s.num_lanes = num_lanes
+
+    # Interfaces.
+    s.recv_from_cpu_pkt = RecvIfcRTL(NocPktType)
+    s.send_to_cpu_pkt = SendIfcRTL(NocPktType)
+
+    # Ports towards the SPM (global address space).
+    s.to_mem_raddr = [SendIfcRTL(AddrType) for _ in range(num_lanes)]
+    s.from_mem_rdata = [RecvIfcRTL(DataType) for _ in range(num_lanes)]
+    s.to_mem_waddr = [SendIfcRTL(AddrType) for _ in range(num_lanes)]
+    s.to_mem_wdata = [SendIfcRTL(DataType) for _ in range(num_lanes)]
+
+    # Ports towards the host memory.
+    s.to_host_raddr = [SendIfcRTL(HostAddrType) for _ in range(num_lanes)]
+    s.from_host_rdata = [RecvIfcRTL(DataType) for _ in range(num_lanes)]
+    s.to_host_waddr = [SendIfcRTL(HostAddrType) for _ in range(num_lanes)]
+    s.to_host_wdata = [SendIfcRTL(DataType) for _ in range(num_lanes)]
+
+    # Descriptor registers.
+    s.stride = Wire(AddrType)
+    s.length = Wire(LengthType)
+    s.spm_base = Wire(AddrType)
+    s.is_preload = Wire(1)
+    # The launching packet, whose sender is notified on completion.
+    s.launch_pkt = Wire(NocPktType)
+    s.busy = Wire(1)
+    s.num_written = Wire(LengthType)
+    s.complete = Wire(1)
+
+    # Per-lane states. Each lane has at most one word in flight.
+    s.lane_word_idx = [Wire(LengthType) for _ in range(num_lanes)]
+    s.lane_spm_addr = [Wire(AddrType) for _ in range(num_lanes)]
+    s.lane_host_addr = [Wire(HostAddrType) for _ in range(num_lanes)]
+    s.lane_outstanding = [Wire(1) for _ in range(num_lanes)]
+    s.lane_buf_val = [Wire(1) for _ in range(num_lanes)]
+    s.lane_buf_data = [Wire(DataType) for _ in range(num_lanes)]
+    s.lane_buf_spm_addr = [Wire(AddrType) for _ in range(num_lanes)]
+    s.lane_buf_host_addr = [Wire(HostAddrType) for _ in range(num_lanes)]
+
+    s.lane_read_fire = [Wire(1) for _ in range(num_lanes)]
+    s.lane_rdata_fire = [Wire(1) for _ in range(num_lanes)]
+    s.lane_rdata = [Wire(DataType) for _ in range(num_lanes)]
+    s.lane_write_fire = [Wire(1) for _ in range(num_lanes)]
+    s.num_write_fires = Wire(LaneCountType)
+    s.launch = Wire(1)
+
+    @update
+    def decode_cpu_pkt():
+      # The descriptor can only be updated while no block is in flight.
+      s.recv_from_cpu_pkt.rdy @= ~s.busy
+      s.launch @= s.recv_from_cpu_pkt.val & ~s.busy & \
+                  ((s.recv_from_cpu_pkt.msg.payload.cmd == CMD_DMA_PRELOAD) | \
+                   (s.recv_from_cpu_pkt.msg.payload.cmd == CMD_DMA_READBACK))
+
+    @update
+    def move_words():
+      s.num_write_fires @= LaneCountType(0)
+      for k in range(num_lanes):
+        s.to_mem_raddr[k].val @= 0
+        s.to_mem_raddr[k].msg @= s.lane_spm_addr[k]
+        s.from_mem_rdata[k].rdy @= 0
+        s.to_mem_waddr[k].val @= 0
+        s.to_mem_waddr[k].msg @= s.lane_buf_spm_addr[k]
+        s.to_mem_wdata[k].val @= 0
+        s.to_mem_wdata[k].msg @= s.lane_buf_data[k]
+        s.to_host_raddr[k].val @= 0
+        s.to_host_raddr[k].msg @= s.lane_host_addr[k]
+        s.from_host_rdata[k].rdy @= 0
+        s.to_host_waddr[k].val @= 0
+        s.to_host_waddr[k].msg @= s.lane_buf_host_addr[k]
+        s.to_host_wdata[k].val @= 0
+        s.to_host_wdata[k].msg @= s.lane_buf_data[k]
+
+        s.lane_write_fire[k] @= 0
+        s.lane_read_fire[k] @= 0
+        s.lane_rdata_fire[k] @= 0
+        s.lane_rdata[k] @= DataType()
+
+        if s.busy:
+          # Writes the buffered word to the destination.
+          if s.is_preload:
+            s.to_mem_waddr[k].val @= s.lane_buf_val[k]
+            s.to_mem_wdata[k].val @= s.lane_buf_val[k]
+            s.lane_write_fire[k] @= s.lane_buf_val[k] & \
+                                    s.to_mem_waddr[k].rdy & s.to_mem_wdata[k].rdy
+          else:
+            s.to_host_waddr[k].val @= s.lane_buf_val[k]
+            s.to_host_wdata[k].val @= s.lane_buf_val[k]
+            s.lane_write_fire[k] @= s.lane_buf_val[k] & \
+                                    s.to_host_waddr[k].rdy & s.to_host_wdata[k].rdy
+
+          # Reads the next word from the source, as long as the buffer is
+          # (being) freed, so that the lane keeps bursting.
+          if s.is_preload:
+            s.to_host_raddr[k].val @= (s.lane_word_idx[k] < s.length) & \
+                                      ~s.lane_outstanding[k] & \
+                                      (~s.lane_buf_val[k] | s.lane_write_fire[k])
+            s.lane_read_fire[k] @= s.to_host_raddr[k].val & s.to_host_raddr[k].rdy
+            s.from_host_rdata[k].rdy @= ~s.lane_buf_val[k] | s.lane_write_fire[k]
+            s.lane_rdata_fire[k] @= s.from_host_rdata[k].val & s.from_host_rdata[k].rdy
+            s.lane_rdata[k] @= s.from_host_rdata[k].msg
+          else:
+            s.to_mem_raddr[k].val @= (s.lane_word_idx[k] < s.length) & \
+                                     ~s.lane_outstanding[k] & \
+                                     (~s.lane_buf_val[k] | s.lane_write_fire[k])
+            s.lane_read_fire[k] @= s.to_mem_raddr[k].val & s.to_mem_raddr[k].rdy
+            s.from_mem_rdata[k].rdy @= ~s.lane_buf_val[k] | s.lane_write_fire[k]
+            s.lane_rdata_fire[k] @= s.from_mem_rdata[k].val & s.from_mem_rdata[k].rdy
+            s.lane_rdata[k] @= s.from_mem_rdata[k].msg
+
+        s.num_write_fires @= s.num_write_fires + zext(s.lane_write_fire[k], LaneCountType)
+
+    @update
+    def notify_cpu():
+      s.complete @= s.busy & (s.num_written == s.length)
+      s.send_to_cpu_pkt.val @= s.complete
+      # Swaps the source and destination of the launching packet.
+      s.send_to_cpu_pkt.msg @= \
+          NocPktType(s.launch_pkt.dst,         # src
+                     s.launch_pkt.src,         # dst
+                     s.launch_pkt.dst_x,       # src_x
+                     s.launch_pkt.dst_y,       # src_y
+                     s.launch_pkt.src_x,       # dst_x
+                     s.launch_pkt.src_y,       # dst_y
+                     s.launch_pkt.dst_tile_id, # src_tile_id
+                     s.launch_pkt.src_tile_id, # dst_tile_id
+                     0,                        # remote_src_port
+                     s.launch_pkt.opaque,      # opaque
+                     s.launch_pkt.vc_id,       # vc_id
+                     CgraPayloadType(CMD_DMA_COMPLETE,
+                                     DataType(zext(s.length, DataType.get_field_type(kAttrPayload)), 1),
+                                     s.spm_base, 0, 0),
+                     0) # multicast_mask
+
+    @update_ff
+    def update_descriptor():
+      if s.reset:
+        s.stride <<= AddrType(1)
+        s.length <<= LengthType(0)
+        s.spm_base <<= AddrType(0)
+        s.is_preload <<= 0
+        s.launch_pkt <<= NocPktType()
+        s.busy <<= 0
+        s.num_written <<= LengthType(0)
+      else:
+        if s.recv_from_cpu_pkt.val & ~s.busy:
+          if s.recv_from_cpu_pkt.msg.payload.cmd == CMD_CONFIG_DMA_STRIDE:
+            s.stride <<= trunc(s.recv_from_cpu_pkt.msg.payload.data.payload, AddrType)
+          elif s.recv_from_cpu_pkt.msg.payload.cmd == CMD_CONFIG_DMA_LENGTH:
+            s.length <<= trunc(s.recv_from_cpu_pkt.msg.payload.data.payload, LengthType)
+
+        if s.launch:
+          s.spm_base <<= s.recv_from_cpu_pkt.msg.payload.data_addr
+          s.is_preload <<= s.recv_from_cpu_pkt.msg.payload.cmd == CMD_DMA_PRELOAD
+          s.launch_pkt <<= s.recv_from_cpu_pkt.msg
+          s.busy <<= 1
+          s.num_written <<= LengthType(0)
+        elif s.complete & s.send_to_cpu_pkt.rdy:
+          s.busy <<= 0
+        else:
+          s.num_written <<= s.num_written + zext(s.num_write_fires, LengthType)
+
+    @update_ff
+    def update_lanes():
+      for k in range(num_lanes):
+        if s.reset:
+          s.lane_word_idx[k] <<= LengthType(0)
+          s.lane_spm_addr[k] <<= AddrType(0)
+          s.lane_host_addr[k] <<= HostAddrType(0)
+          s.lane_outstanding[k] <<= 0
+          s.lane_buf_val[k] <<= 0
+        elif s.launch:
+          s.lane_word_idx[k] <<= LengthType(k)
+          s.lane_spm_addr[k] <<= s.recv_from_cpu_pkt.msg.payload.data_addr + \
+                                 s.stride * AddrType(k)
+          s.lane_host_addr[k] <<= trunc(s.recv_from_cpu_pkt.msg.payload.data.payload, HostAddrType) + \
+                                  HostAddrType(k)
+          s.lane_outstanding[k] <<= 0
+          s.lane_buf_val[k] <<= 0
+        else:
+          if s.lane_read_fire[k]:
+            s.lane_word_idx[k] <<= s.lane_word_idx[k] + LengthType(num_lanes)
+            s.lane_spm_addr[k] <<= s.lane_spm_addr[k] + s.stride * AddrType(num_lanes)
+            s.lane_host_addr[k] <<= s.lane_host_addr[k] + HostAddrType(num_lanes)
+            # Records where the word goes.
+            s.lane_buf_spm_addr[k] <<= s.lane_spm_addr[k]
+            s.lane_buf_host_addr[k] <<= s.lane_host_addr[k]
+
+          # The response may come back in the same cycle as the request.
+          if s.lane_read_fire[k] & ~s.lane_rdata_fire[k]:
+            s.lane_outstanding[k] <<= 1
+          elif s.lane_rdata_fire[k]:
+            s.lane_outstanding[k] <<= 0
+
+          if s.lane_rdata_fire[k]:
+            s.lane_buf_data[k] <<= s.lane_rdata[k]
+            s.lane_buf_val[k] <<= 1
+          elif s.lane_write_fire[k]:
+            s.lane_buf_val[k] <<= 0
+
+  def line_trace(s):
+    direction = "preload" if s.is_preload else "readback"
+    lanes = "|".join([f"{s.lane_word_idx[k]}:{s.lane_buf_data[k] if s.lane_buf_val[k] else '-'}"
+                      for k in range(s.num_lanes)])
+    recv_str = CMD_SYMBOL_DICT[int(s.recv_from_cpu_pkt.msg.payload.cmd)] if s.recv_from_cpu_pkt.val else "-"
+    send_str = CMD_SYMBOL_DICT[int(s.send_to_cpu_pkt.msg.payload.cmd)] if s.send_to_cpu_pkt.val else "-"
+    return f'{recv_str}>[{direction}:{s.num_written}/{s.length}:{lanes}]>{send_str}'
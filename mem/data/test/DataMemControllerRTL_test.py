@@ -8,14 +8,19 @@ Author : Cheng Tan
   Date : Aug 28, 2025
 """
 
+import pytest
+from copy import deepcopy
 from pymtl3.passes.backends.verilog import (VerilogTranslationPass)
 from pymtl3.stdlib.test_utils import config_model_with_cmdline_opts
 
+from ..DataMemCL import DataMemCL
 from ..DataMemControllerRTL import DataMemControllerRTL
 from ....lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
 from ....lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
+from ....lib.cmd_type import *
 from ....lib.messages import *
 from ....lib.opt_type import *
+from ....lib.util.common import *
 
 #-------------------------------------------------------------------------
 # Test harness
@@ -29,7 +34,8 @@ class TestHarness(Component):
                 num_tiles,
                 read_addr, read_data, write_addr,
                 write_data, noc_recv_load,
-                send_to_noc_load_request_pkt, send_to_noc_store_pkt):
+                send_to_noc_load_request_pkt, send_to_noc_store_pkt,
+                bank_mapping = BANK_MAPPING_BLOCK, read_initial_delay = 0):
 
     CgraPayloadType = NocPktType.get_field_type(kAttrPayload)
     DataType = CgraPayloadType.get_field_type(kAttrData)
@@ -37,7 +43,7 @@ class TestHarness(Component):
     s.num_banks = num_banks
     s.rd_tiles = rd_tiles
     s.wr_tiles = wr_tiles
-    s.recv_raddr = [TestSrcRTL(DataAddrType, read_addr[i])
+    s.recv_raddr = [TestSrcRTL(DataAddrType, read_addr[i], read_initial_delay)
                     for i in range(rd_tiles)]
     s.send_rdata = [TestSinkRTL(DataType, read_data[i])
                     for i in range(rd_tiles)]
@@ -61,11 +67,13 @@ class TestHarness(Component):
                                         num_cgra_rows,
                                         num_cgra_columns,
                                         num_tiles,
-                                        mem_access_is_combinational = True)
+                                        mem_access_is_combinational = True,
+                                        bank_mapping = bank_mapping)
 
     for i in range(rd_tiles):
       s.mem_controller.recv_raddr[i] //= s.recv_raddr[i].send
       s.mem_controller.send_rdata[i] //= s.send_rdata[i].recv
+      s.mem_controller.recv_raddr_opaque[i] //= 0
 
     for i in range(wr_tiles):
       s.mem_controller.recv_waddr[i] //= s.recv_waddr[i].send
@@ -235,3 +243,248 @@ def test_mem_controller(cmdline_opts):
 
   run_sim(th)
 
+
+#-------------------------------------------------------------------------
+# Bank mappings
+#-------------------------------------------------------------------------
+
+kBankMappingDataMemSizeGlobal = 64
+kBankMappingDataMemSizePerBank = 8
+kBankMappingNumBanks = 4
+kBankMappingNumTiles = 4
+
+def mk_bank_mapping_types():
+  DataType = mk_data(32, 1)
+  DataAddrType = mk_bits(clog2(kBankMappingDataMemSizeGlobal))
+  CtrlType = mk_ctrl(4, 2, 4, 4, 16)
+  CgraPayloadType = mk_cgra_payload(DataType,
+                                    DataAddrType,
+                                    CtrlType,
+                                    mk_bits(clog2(6)))
+  InterCgraPktType = mk_inter_cgra_pkt(1, 1,
+                                       kBankMappingNumTiles,
+                                       kBankMappingNumTiles,
+                                       CgraPayloadType)
+  return DataType, DataAddrType, InterCgraPktType
+
+def get_bank_and_offset(addr, bank_mapping):
+  # Reference mapping of the local addresses [0, 31] onto 4 banks of 8.
+  row = addr // kBankMappingNumBanks
+  if bank_mapping == BANK_MAPPING_CYCLIC:
+    return addr % kBankMappingNumBanks, row
+  if bank_mapping == BANK_MAPPING_XOR:
+    return (addr % kBankMappingNumBanks) ^ (row % kBankMappingNumBanks), row
+  return addr // kBankMappingDataMemSizePerBank, addr % kBankMappingDataMemSizePerBank
+
+def mk_bank_mapping_harness(bank_mapping, read_addr, read_data,
+                            write_addr = None, write_data = None,
+                            read_initial_delay = 0):
+  DataType, DataAddrType, InterCgraPktType = mk_bank_mapping_types()
+  num_tiles = kBankMappingNumTiles
+  return TestHarness(InterCgraPktType,
+                     kBankMappingDataMemSizeGlobal,
+                     kBankMappingDataMemSizePerBank,
+                     kBankMappingNumBanks,
+                     num_tiles, num_tiles, 1, 1, num_tiles,
+                     read_addr, read_data,
+                     write_addr or [[] for _ in range(num_tiles)],
+                     write_data or [[] for _ in range(num_tiles)],
+                     [], [], [],
+                     bank_mapping, read_initial_delay)
+
+@pytest.mark.parametrize('bank_mapping', [BANK_MAPPING_BLOCK,
+                                          BANK_MAPPING_CYCLIC,
+                                          BANK_MAPPING_XOR])
+def test_mem_controller_bank_mapping(bank_mapping):
+  DataType, DataAddrType, _ = mk_bank_mapping_types()
+  num_tiles = kBankMappingNumTiles
+  # Each tile stores a quarter of the local words, which are then loaded
+  # back by the neighbouring tile.
+  write_addr = [[DataAddrType(k * num_tiles + i) for k in range(8)]
+                for i in range(num_tiles)]
+  write_data = [[DataType(0x100 + int(addr), 1) for addr in write_addr[i]]
+                for i in range(num_tiles)]
+  read_addr = [write_addr[(i + 1) % num_tiles] for i in range(num_tiles)]
+  read_data = [write_data[(i + 1) % num_tiles] for i in range(num_tiles)]
+
+  th = mk_bank_mapping_harness(bank_mapping, read_addr, read_data,
+                               write_addr, write_data, read_initial_delay = 40)
+  th.elaborate()
+  run_sim(th, max_cycles = 100)
+
+  # Checks the banks and offsets the words are stored at.
+  for addr in range(32):
+    bank, offset = get_bank_and_offset(addr, bank_mapping)
+    assert th.mem_controller.memory_wrapper[bank].memory.regs[offset] == \
+           DataType(0x100 + addr, 1)
+
+def sim_strided_loads(bank_mapping, stride, num_loads_per_tile = 8):
+  """Returns the cycles the tiles are stalled by bank conflicts, while
+  tile i loads the (k * num_tiles + i)-th elements of a strided array."""
+  DataType, DataAddrType, _ = mk_bank_mapping_types()
+  num_tiles = kBankMappingNumTiles
+  read_addr = [[DataAddrType(((k * num_tiles + i) * stride) % 32)
+                for k in range(num_loads_per_tile)]
+               for i in range(num_tiles)]
+  read_data = [[DataType() for _ in range(num_loads_per_tile)]
+               for _ in range(num_tiles)]
+  th = mk_bank_mapping_harness(bank_mapping, read_addr, read_data)
+  th.elaborate()
+  th.apply(DefaultPassGroup(linetrace = False))
+  th.sim_reset()
+  stall_cycles = 0
+  while not th.done() and th.sim_cycle_count() < 200:
+    for recv in th.mem_controller.recv_raddr:
+      if recv.val & ~recv.rdy:
+        stall_cycles += 1
+    th.sim_tick()
+  assert th.done()
+  return stall_cycles
+
+def test_bank_mapping_strided_loads():
+  strides = [1, 2, 4, 8]
+  names = {BANK_MAPPING_BLOCK : "block",
+           BANK_MAPPING_CYCLIC : "cyclic",
+           BANK_MAPPING_XOR : "xor"}
+  stalls = {mapping : [sim_strided_loads(mapping, stride) for stride in strides]
+            for mapping in names}
+  print()
+  print(f"{'stride':>8}" + "".join(f"{stride:>8}" for stride in strides))
+  for mapping, name in names.items():
+    print(f"{name:>8}" + "".join(f"{stall:>8}" for stall in stalls[mapping]))
+
+  # Unit-stride streams land in the same bank with the block mapping,
+  # while the interleaved mappings spread them over all the banks.
+  assert stalls[BANK_MAPPING_CYCLIC][0] == 0
+  assert stalls[BANK_MAPPING_XOR][0] == 0
+  assert stalls[BANK_MAPPING_BLOCK][0] > 0
+  # Strides of the number of banks only conflict with the cyclic one.
+  assert stalls[BANK_MAPPING_XOR][2] < stalls[BANK_MAPPING_CYCLIC][2]
+
+#-------------------------------------------------------------------------
+# DMA
+#-------------------------------------------------------------------------
+
+class DmaTestHarness(Component):
+
+  def construct(s, NocPktType, data_mem_size_global, data_mem_size_per_bank,
+                num_banks, num_tiles, num_dma_lanes, host_mem_size,
+                host_preload_data, src_cpu_pkts, sink_cpu_pkts):
+
+    CgraPayloadType = NocPktType.get_field_type(kAttrPayload)
+    DataType = CgraPayloadType.get_field_type(kAttrData)
+    DataAddrType = CgraPayloadType.get_field_type(kAttrDataAddr)
+
+    s.src_cpu_pkt = TestSrcRTL(NocPktType, src_cpu_pkts)
+    s.sink_cpu_pkt = TestSinkRTL(NocPktType, sink_cpu_pkts)
+    s.host = DataMemCL(DataType, host_mem_size, num_dma_lanes, num_dma_lanes,
+                       host_preload_data)
+
+    s.mem_controller = DataMemControllerRTL(NocPktType,
+                                            data_mem_size_global,
+                                            data_mem_size_per_bank,
+                                            num_banks,
+                                            num_tiles,
+                                            num_tiles,
+                                            1,
+                                            1,
+                                            num_tiles,
+                                            mem_access_is_combinational = True,
+                                            num_dma_lanes = num_dma_lanes,
+                                            host_mem_size = host_mem_size)
+
+    # The tiles and the NoC stay idle, except for the stores towards
+    # the remote CGRAs, which are recorded.
+    for i in range(num_tiles):
+      s.mem_controller.recv_raddr[i].val //= 0
+      s.mem_controller.recv_raddr[i].msg //= DataAddrType()
+      s.mem_controller.recv_raddr_opaque[i] //= 0
+      s.mem_controller.send_rdata[i].rdy //= 0
+      s.mem_controller.recv_waddr[i].val //= 0
+      s.mem_controller.recv_waddr[i].msg //= DataAddrType()
+      s.mem_controller.recv_wdata[i].val //= 0
+      s.mem_controller.recv_wdata[i].msg //= DataType()
+    s.mem_controller.recv_from_noc_load_request.val //= 0
+    s.mem_controller.recv_from_noc_load_request.msg //= NocPktType()
+    s.mem_controller.recv_from_noc_store_request.val //= 0
+    s.mem_controller.recv_from_noc_store_request.msg //= NocPktType()
+    s.mem_controller.recv_from_noc_load_response_pkt.val //= 0
+    s.mem_controller.recv_from_noc_load_response_pkt.msg //= NocPktType()
+    s.mem_controller.send_to_noc_load_response_pkt.rdy //= 0
+    s.mem_controller.send_to_noc_load_request_pkt.rdy //= 0
+    s.mem_controller.send_to_noc_store_pkt.rdy //= 1
+
+    s.mem_controller.cgra_id //= 0
+    s.mem_controller.address_lower //= 0
+    s.mem_controller.address_upper //= 31
+
+    s.src_cpu_pkt.send //= s.mem_controller.recv_from_cpu_dma_pkt
+    s.mem_controller.send_to_cpu_dma_pkt //= s.sink_cpu_pkt.recv
+    for k in range(num_dma_lanes):
+      s.mem_controller.to_host_raddr[k] //= s.host.recv_raddr[k]
+      s.mem_controller.from_host_rdata[k] //= s.host.send_rdata[k]
+      s.mem_controller.to_host_waddr[k] //= s.host.recv_waddr[k]
+      s.mem_controller.to_host_wdata[k] //= s.host.recv_wdata[k]
+
+    s.remote_stores = {}
+
+    @update_once
+    def record_remote_stores():
+      if s.mem_controller.send_to_noc_store_pkt.val:
+        pkt = s.mem_controller.send_to_noc_store_pkt.msg
+        s.remote_stores[int(pkt.payload.data_addr)] = deepcopy(pkt.payload.data)
+
+  def done(s):
+    return s.src_cpu_pkt.done() and s.sink_cpu_pkt.done()
+
+  def line_trace(s):
+    return s.mem_controller.dma.line_trace()
+
+def test_mem_controller_dma():
+  num_tiles = 4
+  num_dma_lanes = 4
+  host_mem_size = 32
+  DataType = mk_data(32, 1)
+  DataAddrType = mk_bits(clog2(kBankMappingDataMemSizeGlobal))
+  CgraPayloadType = mk_cgra_payload(DataType,
+                                    DataAddrType,
+                                    mk_ctrl(4, 2, 4, 4, 16),
+                                    mk_bits(clog2(6)))
+  # The remote load requests need to identify the DMA lanes as well.
+  InterCgraPktType = mk_inter_cgra_pkt(1, 1, num_tiles,
+                                       num_tiles + num_dma_lanes,
+                                       CgraPayloadType)
+
+  def mk_cpu_pkt(cmd, data = 0, data_addr = 0):
+    return InterCgraPktType(0, 0, 0, 0, 0, 0, num_tiles, 0, 0, 0, 0,
+                            CgraPayloadType(cmd, DataType(data, 1), data_addr))
+
+  def mk_complete_pkt(length, spm_base):
+    return InterCgraPktType(0, 0, 0, 0, 0, 0, 0, num_tiles, 0, 0, 0,
+                            CgraPayloadType(CMD_DMA_COMPLETE, DataType(length, 1), spm_base))
+
+  host_data = [DataType(0x400 + i, 1) for i in range(8)]
+  # Preloads 8 words into [28, 35], where [32, 35] is out of the local
+  # memory, i.e., stored to the remote CGRA. Then reads the local half
+  # back into the host memory.
+  src_cpu_pkts = [mk_cpu_pkt(CMD_CONFIG_DMA_LENGTH, 8),
+                  mk_cpu_pkt(CMD_DMA_PRELOAD, 0, 28),
+                  mk_cpu_pkt(CMD_CONFIG_DMA_LENGTH, 4),
+                  mk_cpu_pkt(CMD_DMA_READBACK, 16, 28)]
+  sink_cpu_pkts = [mk_complete_pkt(8, 28), mk_complete_pkt(4, 28)]
+
+  th = DmaTestHarness(InterCgraPktType,
+                      kBankMappingDataMemSizeGlobal,
+                      kBankMappingDataMemSizePerBank,
+                      kBankMappingNumBanks,
+                      num_tiles, num_dma_lanes, host_mem_size,
+                      host_data, src_cpu_pkts, sink_cpu_pkts)
+  th.elaborate()
+  run_sim(th)
+
+  for addr in range(28, 32):
+    bank, offset = get_bank_and_offset(addr, BANK_MAPPING_BLOCK)
+    assert th.mem_controller.memory_wrapper[bank].memory.regs[offset] == \
+           host_data[addr - 28]
+  assert th.remote_stores == {addr : host_data[addr - 28] for addr in range(32, 36)}
+  assert th.host.sram[16 : 20] == host_data[:4]
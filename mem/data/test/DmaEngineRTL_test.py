@@ -0,0 +1,149 @@
+"""
+==========================================================================
+DmaEngineRTL_test.py
+==========================================================================
+Test cases for DmaEngineRTL.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+
+from ..DataMemCL import DataMemCL
+from ..DmaEngineRTL import DmaEngineRTL
+from ....lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
+from ....lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
+from ....lib.cmd_type import *
+from ....lib.messages import *
+
+#-------------------------------------------------------------------------
+# Test harness
+#-------------------------------------------------------------------------
+
+class TestHarness(Component):
+
+  def construct(s, NocPktType, data_mem_size_global, host_mem_size,
+                num_lanes, src_pkts, sink_pkts, host_preload_data = [],
+                spm_preload_data = []):
+
+    CgraPayloadType = NocPktType.get_field_type(kAttrPayload)
+    DataType = CgraPayloadType.get_field_type(kAttrData)
+
+    s.src_pkt = TestSrcRTL(NocPktType, src_pkts)
+    s.sink_pkt = TestSinkRTL(NocPktType, sink_pkts)
+
+    s.dma = DmaEngineRTL(NocPktType, data_mem_size_global, host_mem_size,
+                         num_lanes)
+    # One port per lane on both sides.
+    s.spm = DataMemCL(DataType, data_mem_size_global, num_lanes, num_lanes,
+                      spm_preload_data)
+    s.host = DataMemCL(DataType, host_mem_size, num_lanes, num_lanes,
+                       host_preload_data)
+
+    s.src_pkt.send //= s.dma.recv_from_cpu_pkt
+    s.dma.send_to_cpu_pkt //= s.sink_pkt.recv
+    for k in range(num_lanes):
+      s.dma.to_mem_raddr[k] //= s.spm.recv_raddr[k]
+      s.dma.from_mem_rdata[k] //= s.spm.send_rdata[k]
+      s.dma.to_mem_waddr[k] //= s.spm.recv_waddr[k]
+      s.dma.to_mem_wdata[k] //= s.spm.recv_wdata[k]
+      s.dma.to_host_raddr[k] //= s.host.recv_raddr[k]
+      s.dma.from_host_rdata[k] //= s.host.send_rdata[k]
+      s.dma.to_host_waddr[k] //= s.host.recv_waddr[k]
+      s.dma.to_host_wdata[k] //= s.host.recv_wdata[k]
+
+  def done(s):
+    return s.src_pkt.done() and s.sink_pkt.done()
+
+  def line_trace(s):
+    return s.dma.line_trace()
+
+def run_sim(test_harness, max_cycles = 40):
+  test_harness.elaborate()
+  test_harness.apply(DefaultPassGroup())
+  test_harness.sim_reset()
+
+  # Run simulation
+  ncycles = 0
+  print()
+  print("{}:{}".format(ncycles, test_harness.line_trace()))
+  while not test_harness.done() and ncycles < max_cycles:
+    test_harness.sim_tick()
+    ncycles += 1
+    print("{}:{}".format(ncycles, test_harness.line_trace()))
+
+  # Check timeout
+  assert ncycles < max_cycles
+
+  test_harness.sim_tick()
+  test_harness.sim_tick()
+  test_harness.sim_tick()
+  return ncycles
+
+data_mem_size_global = 64
+host_mem_size = 32
+num_tiles = 4
+DataType = mk_data(32, 1)
+DataAddrType = mk_bits(clog2(data_mem_size_global))
+CtrlType = mk_ctrl(4, 2, 4, 4, 16)
+CgraPayloadType = mk_cgra_payload(DataType, DataAddrType, CtrlType,
+                                  mk_bits(clog2(6)))
+InterCgraPktType = mk_inter_cgra_pkt(1, 1, num_tiles, num_tiles,
+                                     CgraPayloadType)
+
+def mk_cpu_pkt(cmd, data = 0, data_addr = 0):
+  # The CPU is indicated by the tile id `num_tiles`.
+  return InterCgraPktType(0, 0, 0, 0, 0, 0, num_tiles, 0, 0, 0, 0,
+                          CgraPayloadType(cmd, DataType(data, 1), data_addr))
+
+def mk_complete_pkt(length, spm_base):
+  return InterCgraPktType(0, 0, 0, 0, 0, 0, 0, num_tiles, 0, 0, 0,
+                          CgraPayloadType(CMD_DMA_COMPLETE, DataType(length, 1), spm_base))
+
+def test_dma_preload():
+  num_words = 16
+  host_data = [DataType(0x100 + i, 1) for i in range(num_words)]
+  src_pkts = [mk_cpu_pkt(CMD_CONFIG_DMA_LENGTH, num_words),
+              mk_cpu_pkt(CMD_DMA_PRELOAD, 0, 8)]
+  th = TestHarness(InterCgraPktType, data_mem_size_global, host_mem_size,
+                   4, src_pkts, [mk_complete_pkt(num_words, 8)], host_data)
+  ncycles = run_sim(th)
+  assert th.spm.sram[8 : 8 + num_words] == host_data
+  # A handful of packets and cycles instead of one store request (and at
+  # least one cycle) per word.
+  assert len(src_pkts) < num_words
+  assert ncycles < num_words
+
+def test_dma_strided_preload_and_readback():
+  num_words = 6
+  host_data = [DataType(0x200 + i, 1) for i in range(num_words)]
+  # Scatters the block into every third word, then gathers it back to
+  # another host buffer, with the same stride and length.
+  src_pkts = [mk_cpu_pkt(CMD_CONFIG_DMA_STRIDE, 3),
+              mk_cpu_pkt(CMD_CONFIG_DMA_LENGTH, num_words),
+              mk_cpu_pkt(CMD_DMA_PRELOAD, 0, 1),
+              mk_cpu_pkt(CMD_DMA_READBACK, 16, 1)]
+  sink_pkts = [mk_complete_pkt(num_words, 1), mk_complete_pkt(num_words, 1)]
+  th = TestHarness(InterCgraPktType, data_mem_size_global, host_mem_size,
+                   4, src_pkts, sink_pkts, host_data)
+  run_sim(th)
+  for i in range(num_words):
+    assert th.spm.sram[1 + 3 * i] == host_data[i]
+    assert th.spm.sram[2 + 3 * i] == DataType(0, 0)
+  assert th.host.sram[16 : 16 + num_words] == host_data
+
+def test_dma_preload_time_per_lane():
+  num_words = 16
+  host_data = [DataType(0x300 + i, 1) for i in range(num_words)]
+  ncycles = []
+  for num_lanes in [1, 4]:
+    src_pkts = [mk_cpu_pkt(CMD_CONFIG_DMA_LENGTH, num_words),
+                mk_cpu_pkt(CMD_DMA_PRELOAD, 0, 0)]
+    th = TestHarness(InterCgraPktType, data_mem_size_global, host_mem_size,
+                     num_lanes, src_pkts, [mk_complete_pkt(num_words, 0)],
+                     host_data)
+    ncycles.append(run_sim(th))
+    assert th.spm.sram[:num_words] == host_data
+  # The lanes move the block in parallel.
+  assert ncycles[1] < ncycles[0]
@@ -20,7 +20,7 @@ class MeshMultiCgraTemplateRTL(Component):
                 controller2addr_map, id2ctrlMemSize_map, id2cgraSize_map, 
                 id2validTiles, id2validLinks, id2dataSPM,
                 mem_access_is_combinational,
-                is_multi_cgra = True):
+                is_multi_cgra = True, CgraType = CgraTemplateRTL):
 
         # Derives all types from CgraPayloadType.
         CgraDataType = CgraPayloadType.get_field_type(kAttrData)
@@ -63,22 +63,22 @@ class MeshMultiCgraTemplateRTL(Component):
           for cgra_col in range(cgra_columns):
             idTo2d_map[cgra_row * cgra_columns + cgra_col] = (cgra_col, cgra_row)
 
-        s.cgra = [CgraTemplateRTL(CgraPayloadType,
-                                  cgra_rows, cgra_columns, 
-                                  # per_cgra_rows, per_cgra_columns,
-                                  id2cgraSize_map[cgra_id][0], id2cgraSize_map[cgra_id][1],    
-                                  # ctrl_mem_size, 
-                                  id2ctrlMemSize_map[cgra_id],
-                                  data_mem_size_global,
-                                  data_mem_size_per_bank, 
-                                  num_banks_per_cgra,
-                                  num_registers_per_reg_bank,
-                                  num_ctrl, total_steps,
-                                  mem_access_is_combinational,
-                                  FunctionUnit, FuList,
-                                  id2validTiles[cgra_id], id2validLinks[cgra_id], id2dataSPM[cgra_id],
-                                  controller2addr_map, idTo2d_map,
-                                  is_multi_cgra, cgra_id, max_per_cgra_rows, max_per_cgra_cols, max_num_rd_tiles, max_num_wr_tiles)
+        s.cgra = [CgraType(CgraPayloadType,
+                           cgra_rows, cgra_columns, 
+                           # per_cgra_rows, per_cgra_columns,
+                           id2cgraSize_map[cgra_id][0], id2cgraSize_map[cgra_id][1],    
+                           # ctrl_mem_size, 
+                           id2ctrlMemSize_map[cgra_id],
+                           data_mem_size_global,
+                           data_mem_size_per_bank, 
+                           num_banks_per_cgra,
+                           num_registers_per_reg_bank,
+                           num_ctrl, total_steps,
+                           mem_access_is_combinational,
+                           FunctionUnit, FuList,
+                           id2validTiles[cgra_id], id2validLinks[cgra_id], id2dataSPM[cgra_id],
+                           controller2addr_map, idTo2d_map,
+                           is_multi_cgra, cgra_id, max_per_cgra_rows, max_per_cgra_cols, max_num_rd_tiles, max_num_wr_tiles)
                   for cgra_id in range(s.num_cgras)]
         # Latency is 1.
         s.mesh = MeshNetworkRTL(NocPktType, MeshPos, cgra_columns, cgra_rows, 1)
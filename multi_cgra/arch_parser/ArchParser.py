@@ -4,6 +4,7 @@ from ...lib.util.cgra.DataSPM import DataSPM
 from ...lib.util.cgra.Tile import Tile
 from .ParamCGRA import ParamCGRA
 from ...lib.util.cgra.cgra_helper import *
+from ...lib.util.common import BANK_MAPPINGS
 import copy
 
 
@@ -25,14 +26,36 @@ class ArchParser:
     def parse_dataSPM(self) -> dict[int, DataSPM]:
         if self.id2shape_map is None:
             raise ValueError("id2shape_map is not parsed yet.")
+        id2bankMapping = self.parse_bank_mapping()
         id2dataSPM = {}
         for id in range(self.num_cgras):
             per_cgra_rows, per_cgra_columns = self.id2shape_map[id]
             data_mem_num_rd_tiles = per_cgra_rows + per_cgra_columns - 1
             data_mem_num_wr_tiles = per_cgra_rows + per_cgra_columns - 1
-            id2dataSPM[id] = DataSPM(data_mem_num_rd_tiles, data_mem_num_wr_tiles)
+            id2dataSPM[id] = DataSPM(data_mem_num_rd_tiles, data_mem_num_wr_tiles,
+                                     id2bankMapping[id])
         return id2dataSPM
 
+    def parse_bank_mapping(self) -> dict[int, int]:
+        """
+        Parses the bank mapping ("block", "cyclic", or "xor") of the data SPM
+        of each CGRA, from `cgra_defaults.bankMapping` ("block" if absent) and
+        the `bankMapping` of the `cgra_overrides`.
+        """
+        def to_bank_mapping(name):
+            if name not in BANK_MAPPINGS:
+                raise ValueError(f"Unknown bankMapping {name}, expected one of "
+                                 f"{list(BANK_MAPPINGS)}.")
+            return BANK_MAPPINGS[name]
+
+        default = to_bank_mapping(self.yaml_data["cgra_defaults"].get("bankMapping", "block"))
+        id2bankMapping = {id: default for id in range(self.num_cgras)}
+        for override in self.yaml_data.get("cgra_overrides", []):
+            if "bankMapping" in override:
+                cgra_id = override["cgra_y"] * self.cgra_columns + override["cgra_x"]
+                id2bankMapping[cgra_id] = to_bank_mapping(override["bankMapping"])
+        return id2bankMapping
+
     def parse_tiles(self):
         """
         Parse the tiles in one CGRA.
@@ -68,6 +91,10 @@ class ArchParser:
 
         if "cgra_overrides" in self.yaml_data:
             for override in self.yaml_data["cgra_overrides"]:
+                # Overrides without shape only override the other fields,
+                # e.g., bankMapping.
+                if "rows" not in override:
+                    continue
                 cgra_id = (
                     override["cgra_y"] * self.cgra_columns + override["cgra_x"]
                 )
@@ -0,0 +1,271 @@
+import argparse
+import copy
+import csv
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from collections import deque
+from contextlib import redirect_stderr, redirect_stdout
+
+import yaml
+
+
+# Columns of the results table besides the swept fields.
+RESULT_FIELDS = [
+    "job_id",
+    "status",
+    "cycles",
+    "num_modules",
+    "verilog_lines",
+    "elaborate_time",
+    "translate_time",
+    "sim_time",
+    "wall_time",
+    "error",
+]
+
+
+def evaluate_arch(yaml_file: str, cmdline_opts: dict) -> dict:
+    """
+    Default evaluation of one configuration: elaborates the multi-CGRA
+    described by `yaml_file` (with the kernel of
+    `MeshMultiCgraTemplateRTL_test::test_mesh_multi_cgra_universal`),
+    translates it into Verilog, and simulates it (the Verilator-imported
+    translation with `test_verilog`, the PyMTL model otherwise).
+    Must be run inside the job directory as the translated Verilog is
+    written into the current directory.
+    """
+    from pymtl3.passes.backends.verilog import (
+        VerilogPlaceholderPass,
+        VerilogTranslationImportPass,
+        VerilogTranslationPass,
+        VerilogVerilatorImportPass,
+    )
+    from ..test.MeshMultiCgraTemplateRTL_test import (
+        mk_mesh_multi_cgra_universal_th,
+        run_sim,
+    )
+
+    result = {}
+    start = time.time()
+    th = mk_mesh_multi_cgra_universal_th(yaml_file)
+    result["elaborate_time"] = time.time() - start
+
+    # Same steps as VerilogTranslationImportPass, split so that the
+    # translation is measured and then imported as is rather than
+    # translated again.
+    test_verilog = cmdline_opts.get("test_verilog", False)
+    start = time.time()
+    th.dut.set_metadata(VerilogTranslationPass.enable, True)
+    th.apply(VerilogPlaceholderPass())
+    import_pass = VerilogTranslationImportPass()
+    if test_verilog:
+        th.dut.set_metadata(VerilogTranslationImportPass.enable, True)
+        th.dut.set_metadata(VerilogVerilatorImportPass.vl_xinit, test_verilog)
+        import_pass.traverse_hierarchy(th)
+    th.apply(VerilogTranslationPass())
+    with open(th.dut.get_metadata(VerilogTranslationPass.translated_filename)) as f:
+        lines = f.readlines()
+    result["translate_time"] = time.time() - start
+    result["verilog_lines"] = len(lines)
+    result["num_modules"] = sum(1 for line in lines if line.startswith("module "))
+
+    start = time.time()
+    if test_verilog:
+        import_pass.add_placeholder_marks(th)
+        th = VerilogVerilatorImportPass()(th)
+    result["cycles"] = run_sim(th, print_line_trace=False)
+    result["sim_time"] = time.time() - start
+    return result
+
+
+def run_job(evaluate, yaml_file: str, job_dir: str, cmdline_opts: dict):
+    """
+    Entry of a worker process. The outputs of the evaluation are logged
+    into `job_dir/log.txt` and its result is dumped into
+    `job_dir/result.json`.
+    """
+    os.chdir(job_dir)
+    with open("log.txt", "w") as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            result = evaluate(yaml_file, cmdline_opts)
+            result["status"] = "ok"
+        except Exception:
+            traceback.print_exc()
+            result = {"status": "error", "error": traceback.format_exc().splitlines()[-1]}
+    with open("result.json", "w") as f:
+        json.dump(result, f)
+
+
+class DseDriver:
+    """
+    Design-space exploration over the fields of the architecture YAML
+    parsed by ArchParser.
+
+    The sweep file looks like:
+
+        base: arch.yaml                # relative to the sweep file
+        timeout: 600                   # per-job timeout in seconds
+        sweep:
+          cgra_defaults.rows: [2, 4]
+          tile_defaults.num_registers: [8, 16]
+          tile_defaults.fu_types: [["add", "mem"], ["add", "mul", "mem"]]
+
+    Every combination (cartesian product) of the swept values becomes a
+    job, identified by a hash of the base architecture and its overrides. Jobs are run in separate
+    processes, at most `num_workers` at a time, and are killed once they
+    exceed the timeout. Each finished job is appended to
+    `out_dir/results.csv` right away, so that a killed sweep resumes from
+    the jobs that are not in the table yet.
+    """
+
+    def __init__(self, sweep_file: str, out_dir: str, num_workers: int = None,
+                 timeout: float = None, evaluate=evaluate_arch,
+                 cmdline_opts: dict = None):
+        with open(sweep_file, "r") as f:
+            self.sweep_data = yaml.safe_load(f)
+
+        base = self.sweep_data["base"]
+        if isinstance(base, str):
+            base_file = os.path.join(os.path.dirname(os.path.abspath(sweep_file)), base)
+            with open(base_file, "r") as f:
+                base = yaml.safe_load(f)
+        self.base_yaml_data = base
+        self.sweep = self.sweep_data.get("sweep", {})
+        self.out_dir = os.path.abspath(out_dir)
+        self.num_workers = num_workers or os.cpu_count()
+        self.timeout = timeout or self.sweep_data.get("timeout", 600)
+        self.evaluate = evaluate
+        self.cmdline_opts = cmdline_opts or {}
+        self.results_file = os.path.join(self.out_dir, "results.csv")
+        self.fieldnames = RESULT_FIELDS[:2] + list(self.sweep.keys()) + RESULT_FIELDS[2:]
+
+    @staticmethod
+    def apply_override(yaml_data: dict, field: str, value):
+        """Sets the dotted `field` (e.g., `cgra_defaults.rows`) of yaml_data."""
+        keys = field.split(".")
+        node = yaml_data
+        for key in keys[:-1]:
+            if key not in node:
+                raise KeyError(f"Unknown field {field} in the architecture file.")
+            node = node[key]
+        node[keys[-1]] = value
+
+    @staticmethod
+    def get_job_id(base_yaml_data: dict, overrides: dict) -> str:
+        """
+        Hashes the overrides together with the base architecture, so that
+        the results of a modified base file are not taken as finished.
+        """
+        key = json.dumps({"base": base_yaml_data, "overrides": overrides},
+                         sort_keys=True, default=str)
+        return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+    def expand_sweep(self) -> list:
+        """Returns the list of (job_id, overrides, yaml_data) of the sweep."""
+        fields = list(self.sweep.keys())
+        jobs = []
+        for values in itertools.product(*[self.sweep[field] for field in fields]):
+            overrides = dict(zip(fields, values))
+            yaml_data = copy.deepcopy(self.base_yaml_data)
+            for field, value in overrides.items():
+                self.apply_override(yaml_data, field, value)
+            jobs.append((self.get_job_id(self.base_yaml_data, overrides),
+                         overrides, yaml_data))
+        return jobs
+
+    def load_finished(self) -> dict:
+        """Returns the rows of the results table from previous runs."""
+        if not os.path.exists(self.results_file):
+            return {}
+        with open(self.results_file, "r", newline="") as f:
+            return {row["job_id"]: row for row in csv.DictReader(f)}
+
+    def append_result(self, row: dict):
+        is_new = not os.path.exists(self.results_file)
+        with open(self.results_file, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames, extrasaction="ignore")
+            if is_new:
+                writer.writeheader()
+            writer.writerow(row)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def collect_result(self, job_id: str, overrides: dict, job_dir: str,
+                       wall_time: float, status: str = None) -> dict:
+        row = {"job_id": job_id}
+        row.update({field: json.dumps(value) for field, value in overrides.items()})
+        result_file = os.path.join(job_dir, "result.json")
+        if status is None and os.path.exists(result_file):
+            with open(result_file, "r") as f:
+                row.update(json.load(f))
+        elif status is None:
+            row.update({"status": "error", "error": "worker exited without a result"})
+        else:
+            row["status"] = status
+        row["wall_time"] = wall_time
+        self.append_result(row)
+        return row
+
+    def run(self) -> list:
+        """Runs the pending jobs and returns all the rows of the results table."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        finished = self.load_finished()
+        jobs = deque([job for job in self.expand_sweep() if job[0] not in finished])
+        rows = list(finished.values())
+
+        # Maps job_id to (process, start time, overrides, job_dir).
+        running = {}
+        while jobs or running:
+            while jobs and len(running) < self.num_workers:
+                job_id, overrides, yaml_data = jobs.popleft()
+                job_dir = os.path.join(self.out_dir, job_id)
+                os.makedirs(job_dir, exist_ok=True)
+                yaml_file = os.path.join(job_dir, "arch.yaml")
+                with open(yaml_file, "w") as f:
+                    yaml.safe_dump(yaml_data, f, sort_keys=False)
+                result_file = os.path.join(job_dir, "result.json")
+                if os.path.exists(result_file):
+                    os.remove(result_file)
+                process = multiprocessing.Process(
+                    target=run_job,
+                    args=(self.evaluate, yaml_file, job_dir, self.cmdline_opts),
+                )
+                process.start()
+                running[job_id] = (process, time.time(), overrides, job_dir)
+
+            time.sleep(0.05)
+            for job_id in list(running.keys()):
+                process, start, overrides, job_dir = running[job_id]
+                wall_time = time.time() - start
+                if not process.is_alive():
+                    process.join()
+                    rows.append(self.collect_result(job_id, overrides, job_dir, wall_time))
+                    del running[job_id]
+                elif wall_time > self.timeout:
+                    process.terminate()
+                    process.join()
+                    rows.append(self.collect_result(job_id, overrides, job_dir,
+                                                    wall_time, "timeout"))
+                    del running[job_id]
+
+        return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Design-space exploration over ArchParser fields.")
+    parser.add_argument("sweep_file", help="Path to the sweep specification YAML file.")
+    parser.add_argument("--out", default="dse_out", help="Output directory of the jobs and results.csv.")
+    parser.add_argument("--jobs", type=int, default=None, help="Number of worker processes (all cores by default).")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-job timeout in seconds.")
+    parser.add_argument("--test-verilog", action="store_true", help="Simulates the Verilator-imported model.")
+    args = parser.parse_args()
+
+    driver = DseDriver(args.sweep_file, args.out, args.jobs, args.timeout,
+                       cmdline_opts={"test_verilog": "zeros" if args.test_verilog else False})
+    rows = driver.run()
+    print(f"{len(rows)} jobs finished, results are in {driver.results_file}")
@@ -1,4 +1,6 @@
+from ..ArchParser import ArchParser
 from ...test import MeshMultiCgraTemplateRTL_test
+from ....lib.util.common import BANK_MAPPING_CYCLIC, BANK_MAPPING_XOR
 import os
 
 
@@ -9,3 +11,17 @@ def test_arch_parser(cmdline_opts, pytestconfig):
                     Check if the path is relative to your current terminal location.")
 
     MeshMultiCgraTemplateRTL_test.test_mesh_multi_cgra_universal(cmdline_opts, arch_yaml_path=arch_yaml_path)
+
+def test_parse_bank_mapping(tmp_path):
+    arch_yaml_path = tmp_path / "arch_bank_mapping.yaml"
+    arch_yaml_path.write_text(
+        "multi_cgra_defaults: {rows: 1, columns: 2}\n"
+        "cgra_defaults: {rows: 2, columns: 2, configMemSize: 16, bankMapping: cyclic}\n"
+        "tile_defaults: {num_registers: 16, fu_types: [add, mem]}\n"
+        "cgra_overrides:\n"
+        "- {cgra_x: 1, cgra_y: 0, bankMapping: xor}\n")
+    multiCgraParam = ArchParser(str(arch_yaml_path)).parse_multi_cgra_param()
+    assert [cgra.dataSPM.getBankMapping() for cgra in multiCgraParam.cgras[0]] == \
+           [BANK_MAPPING_CYCLIC, BANK_MAPPING_XOR]
+    # Overriding the bank mapping keeps the default shape.
+    assert [(cgra.rows, cgra.columns) for cgra in multiCgraParam.cgras[0]] == [(2, 2), (2, 2)]
@@ -0,0 +1,97 @@
+import os
+import time
+
+import yaml
+
+from ..ArchParser import ArchParser
+from ..DseDriver import DseDriver
+
+
+def evaluate_tile_count(yaml_file, cmdline_opts):
+    """Cheap evaluation reporting the number of tiles as the cycle count."""
+    multi_cgra_param = ArchParser(yaml_file).parse_multi_cgra_param()
+    cycles = sum(cgra.getTileNum() for row in multi_cgra_param.cgras for cgra in row)
+    return {"cycles": cycles}
+
+
+def evaluate_hang(yaml_file, cmdline_opts):
+    with open(yaml_file) as f:
+        if yaml.safe_load(f)["tile_defaults"]["num_registers"] == 8:
+            time.sleep(60)
+    return {"cycles": 1}
+
+
+def write_sweep(tmp_path, timeout=60):
+    sweep_file = tmp_path / "sweep.yaml"
+    sweep = {
+        "base": os.path.join(os.path.dirname(__file__), "arch.yaml"),
+        "timeout": timeout,
+        "sweep": {
+            "cgra_defaults.rows": [2, 4],
+            "tile_defaults.num_registers": [8, 16],
+        },
+    }
+    with open(sweep_file, "w") as f:
+        yaml.safe_dump(sweep, f)
+    return str(sweep_file)
+
+
+def test_sweep_and_resume(tmp_path):
+    sweep_file = write_sweep(tmp_path)
+    out_dir = str(tmp_path / "out")
+    driver = DseDriver(sweep_file, out_dir, num_workers=2, evaluate=evaluate_tile_count)
+    rows = driver.run()
+    assert len(rows) == 4
+    assert all(row["status"] == "ok" for row in rows)
+    # 2x2 CGRAs, each has rows x 2 tiles.
+    assert sorted(int(row["cycles"]) for row in driver.load_finished().values()) == [16, 16, 32, 32]
+
+    # Removes one finished job, only that job is rerun.
+    with open(driver.results_file) as f:
+        lines = f.readlines()
+    with open(driver.results_file, "w") as f:
+        f.writelines(lines[:-1])
+    driver = DseDriver(sweep_file, out_dir, num_workers=2, evaluate=evaluate_tile_count)
+    rows = driver.run()
+    assert len(rows) == 4
+    with open(driver.results_file) as f:
+        assert len(f.readlines()) == 5
+
+
+def test_base_change_reruns(tmp_path):
+    sweep_file = write_sweep(tmp_path)
+    base_file = tmp_path / "arch.yaml"
+    with open(os.path.join(os.path.dirname(__file__), "arch.yaml")) as f:
+        base = yaml.safe_load(f)
+    with open(base_file, "w") as f:
+        yaml.safe_dump(base, f)
+    with open(sweep_file) as f:
+        sweep = yaml.safe_load(f)
+    sweep["base"] = "arch.yaml"
+    with open(sweep_file, "w") as f:
+        yaml.safe_dump(sweep, f)
+
+    out_dir = str(tmp_path / "out")
+    driver = DseDriver(sweep_file, out_dir, num_workers=2, evaluate=evaluate_tile_count)
+    driver.run()
+    job_ids = set(driver.load_finished().keys())
+
+    # The same overrides on a different base are new jobs.
+    base["multi_cgra_defaults"]["rows"] = 1
+    with open(base_file, "w") as f:
+        yaml.safe_dump(base, f)
+    driver = DseDriver(sweep_file, out_dir, num_workers=2, evaluate=evaluate_tile_count)
+    driver.run()
+    finished = driver.load_finished()
+    new_job_ids = set(finished.keys()) - job_ids
+    assert len(new_job_ids) == 4
+    # 1x2 CGRAs, each has rows x 2 tiles.
+    assert sorted(int(finished[job_id]["cycles"]) for job_id in new_job_ids) == [8, 8, 16, 16]
+
+
+def test_timeout(tmp_path):
+    sweep_file = write_sweep(tmp_path, timeout=2)
+    driver = DseDriver(sweep_file, str(tmp_path / "out"), num_workers=4, evaluate=evaluate_hang)
+    rows = driver.run()
+    statuses = sorted(row["status"] for row in rows)
+    assert statuses == ["ok", "ok", "timeout", "timeout"]
@@ -13,8 +13,7 @@ from pymtl3.passes.backends.verilog import (
     VerilogPlaceholderPass,
 )
 from pymtl3.passes.backends.verilog.translation.VerilogTranslationPass import VerilogTranslationPass
-from pymtl3.stdlib.test_utils import (run_sim,
-                                      config_model_with_cmdline_opts)
+from pymtl3.stdlib.test_utils import run_sim
 
 from ..MeshMultiCgraRTL import MeshMultiCgraRTL
 from ...fu.double.SeqMulAdderRTL import SeqMulAdderRTL
@@ -39,6 +38,7 @@ from ...lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
 from ...lib.messages import *
 from ...lib.opt_type import *
 from ...lib.util.common import *
+from ...lib.util.translation_cache import config_model_with_translation_cache
 
 #-------------------------------------------------------------------------
 # Test harness
@@ -4177,7 +4177,7 @@ def test_sim_homo_2x2_2x2(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_translation_cache(th, cmdline_opts, duts = ['dut'])
   run_sim(th)
 
 def _enable_translate_recursively(m):
@@ -4234,7 +4234,7 @@ def test_multi_CGRA_systolic_2x2_2x2(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_translation_cache(th, cmdline_opts, duts = ['dut'])
   run_sim(th)
 
 def test_multi_CGRA_systolic_2x2_2x2_translation(cmdline_opts):
@@ -4268,7 +4268,7 @@ def test_multi_CGRA_systolic_2x2_2x2_non_combinational_mem_access(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_translation_cache(th, cmdline_opts, duts = ['dut'])
   run_sim(th)
 
 def test_multi_CGRA_systolic_4x4_2x2(cmdline_opts):
@@ -4286,7 +4286,7 @@ def test_multi_CGRA_systolic_4x4_2x2(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_translation_cache(th, cmdline_opts, duts = ['dut'])
   run_sim(th, 500)
 
 def test_multi_CGRA_fir_scalar(cmdline_opts):
@@ -4304,7 +4304,7 @@ def test_multi_CGRA_fir_scalar(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_translation_cache(th, cmdline_opts, duts = ['dut'])
   run_sim(th)
 
 def test_multi_CGRA_fir_scalar_translation(cmdline_opts):
@@ -4338,7 +4338,7 @@ def test_multi_CGRA_fir_scalar_2x2_2x2(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_translation_cache(th, cmdline_opts, duts = ['dut'])
   run_sim(th, 250)
 
 def test_multi_CGRA_fir_vector(cmdline_opts):
@@ -4356,7 +4356,7 @@ def test_multi_CGRA_fir_vector(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_translation_cache(th, cmdline_opts, duts = ['dut'])
   run_sim(th)
 
 def test_multi_CGRA_fir_vector_global_reduce(cmdline_opts):
@@ -4374,7 +4374,7 @@ def test_multi_CGRA_fir_vector_global_reduce(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_translation_cache(th, cmdline_opts, duts = ['dut'])
   run_sim(th)
 
 def test_multi_CGRA_fir_vector_global_reduce_translation(cmdline_opts):
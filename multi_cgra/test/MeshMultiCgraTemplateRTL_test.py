@@ -127,17 +127,19 @@ class TestHarness(Component):
   def line_trace(s):
     return s.dut.line_trace()
 
-def run_sim(test_harness, max_cycles = 200):
+def run_sim(test_harness, max_cycles = 200, print_line_trace = True):
   test_harness.apply(DefaultPassGroup())
   test_harness.sim_reset()
 
   # Runs simulation.
   ncycles = 0
-  print("cycle {}:{}".format(ncycles, test_harness.line_trace()))
+  if print_line_trace:
+    print("cycle {}:{}".format(ncycles, test_harness.line_trace()))
   while not test_harness.done() and ncycles < max_cycles:
     test_harness.sim_tick()
     ncycles += 1
-    print("cycle {}:{}".format(ncycles, test_harness.line_trace()))
+    if print_line_trace:
+      print("cycle {}:{}".format(ncycles, test_harness.line_trace()))
 
   # Checks timeout.
   assert ncycles < max_cycles
@@ -146,10 +148,13 @@ def run_sim(test_harness, max_cycles = 200):
   test_harness.sim_tick()
   test_harness.sim_tick()
 
+  return ncycles
 
-def test_mesh_multi_cgra_universal(cmdline_opts, arch_yaml_path = "arch.yaml"):
+
+def mk_mesh_multi_cgra_universal_th(arch_yaml_path = "arch.yaml"):
   """
-  Test the multi-CGRA CGRA configurations.
+  Builds and elaborates the test harness of the multi-CGRA described by the
+  architecture file.
   NOTE This test only considers CGRAs with the same shape, meaning all CGRAs have the same number of tile rows and columns.
   """
   arch_file = os.path.join(os.path.dirname(__file__), arch_yaml_path)
@@ -373,6 +378,13 @@ def test_mesh_multi_cgra_universal(cmdline_opts, arch_yaml_path = "arch.yaml"):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
+  return th
+
+def test_mesh_multi_cgra_universal(cmdline_opts, arch_yaml_path = "arch.yaml"):
+  """
+  Test the multi-CGRA CGRA configurations.
+  """
+  th = mk_mesh_multi_cgra_universal_th(arch_yaml_path)
   th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
   run_sim(th)
 
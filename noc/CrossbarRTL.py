@@ -92,15 +92,11 @@ class CrossbarRTL(Component):
     s.during_prologue_allowing_vector = Wire(num_outports)
     s.recv_valid_or_during_prologue_allowing_vector = Wire(num_outports)
     s.prologue_counter = [[Wire(PrologueCountType) for _ in range(num_inports)] for _ in range(ctrl_mem_size)]
-    s.prologue_counter_next = [[Wire(PrologueCountType) for _ in range(num_inports)] for _ in range(ctrl_mem_size)]
-    s.prologue_count_inport = [[InPort(PrologueCountType) for _ in range(num_inports)] for _ in range(ctrl_mem_size)]
-    # Wiki of "Workaround for sv2v Flattening Multi-dimensional Arrays into One-dimensional Vectors"
-    # https://github.com/tancheng/VectorCGRA/wiki/Workaround-for-sv2v-Flattening-Multi%E2%80%90dimensional-Arrays-into-One%E2%80%90dimensional-Vectors
-    s.prologue_count_wire = [[Wire(PrologueCountType) for _ in range(num_inports)] for _ in range(ctrl_mem_size)]
-
-    for addr in range(ctrl_mem_size):
-      for i in range(num_inports):
-        s.prologue_count_inport[addr][i] //= s.prologue_count_wire[addr][i]
+    # The prologue counts of the current ctrl address (i.e., the
+    # ctrl_addr_inport), which are looked up by the ctrl memory.
+    s.prologue_count_inport = [InPort(PrologueCountType) for _ in range(num_inports)]
+    # The inports consumed by the crossbar in the current cycle.
+    s.prologue_fire_vector = Wire(num_inports)
 
     # Routing logic
     @update
@@ -154,25 +150,22 @@ class CrossbarRTL(Component):
             s.prologue_counter[addr][i] <<= 0
         s.send_accepted <<= 0
       else:
+        # Nested-loop to update the prologue counter, to avoid dynamic indexing to
+        # work-around Yosys issue: https://github.com/tancheng/VectorCGRA/issues/148
         for addr in range(ctrl_mem_size):
           for i in range(num_inports):
-            s.prologue_counter[addr][i] <<= s.prologue_counter_next[addr][i]
+            if s.prologue_fire_vector[i] & \
+              (addr == s.ctrl_addr_inport) & \
+              (s.prologue_counter[addr][i] < s.prologue_count_inport[i]):
+              s.prologue_counter[addr][i] <<= s.prologue_counter[addr][i] + 1
         s.send_accepted <<= s.send_accepted_next
 
     @update
-    def update_prologue_counter_next():
-      # Nested-loop to update the prologue counter, to avoid dynamic indexing to
-      # work-around Yosys issue: https://github.com/tancheng/VectorCGRA/issues/148
-      for addr in range(ctrl_mem_size):
-        for i in range(num_inports):
-          s.prologue_counter_next[addr][i] @= s.prologue_counter[addr][i]
-          for j in range(num_outports):
-            if s.recv_opt.rdy & \
-              (s.in_dir[j] > 0) & \
-              (s.in_dir_local[j] == i) & \
-              (addr == s.ctrl_addr_inport) & \
-              (s.prologue_counter[addr][i] < s.prologue_count_wire[addr][i]):
-              s.prologue_counter_next[addr][i] @= s.prologue_counter[addr][i] + 1
+    def update_prologue_fire_vector():
+      s.prologue_fire_vector @= 0
+      for j in range(num_outports):
+        if s.recv_opt.rdy & (s.in_dir[j] > 0):
+          s.prologue_fire_vector[s.in_dir_local[j]] @= 1
 
     @update
     def update_send_accepted_next():
@@ -205,7 +198,7 @@ class CrossbarRTL(Component):
           # Records whether the prologue steps have already been satisfied.
           s.during_prologue_allowing_vector[i] @= \
             (s.prologue_counter[s.ctrl_addr_inport][s.in_dir_local[i]] < \
-             s.prologue_count_wire[s.ctrl_addr_inport][s.in_dir_local[i]])
+             s.prologue_count_inport[s.in_dir_local[i]])
         else:
           s.during_prologue_allowing_vector[i] @= 0
 
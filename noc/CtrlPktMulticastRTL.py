@@ -0,0 +1,89 @@
+"""
+=========================================================================
+CtrlPktMulticastRTL.py
+=========================================================================
+Sits between a tile (or a standalone ctrl memory) and its router on the
+ctrl ring. A packet received from the ring is always consumed by the tile.
+If it is a multicast packet (i.e., non-zero multicast_mask), a copy is
+buffered and forwarded back into the ring towards the next tile in the
+mask, i.e., the lowest tile id in the mask above the current one. The
+packet is accepted only when both the tile and the forwarding buffer can
+take it.
+
+The packets originated from the tile (e.g., CMD_COMPLETE) share the same
+ring inport and have higher priority than the forwarded ones.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+from ..lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
+from ..lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
+from ..lib.basic.val_rdy.queues import NormalQueueRTL
+from ..lib.util.data_struct_attr import *
+
+class CtrlPktMulticastRTL(Component):
+
+  def construct(s, CtrlPktType, num_tiles):
+
+    # Constants.
+    TileIdType = CtrlPktType.get_field_type(kAttrDst)
+    TileMaskType = CtrlPktType.get_field_type(kAttrMulticastMask)
+
+    # Interfaces.
+    s.tile_id = InPort(TileIdType)
+    s.recv_from_ring = RecvIfcRTL(CtrlPktType)
+    s.send_to_tile = SendIfcRTL(CtrlPktType)
+    s.recv_from_tile = RecvIfcRTL(CtrlPktType)
+    s.send_to_ring = SendIfcRTL(CtrlPktType)
+
+    # Components.
+    s.forward_queue = NormalQueueRTL(CtrlPktType, 2)
+    s.remaining_mask = Wire(TileMaskType)
+    s.next_dst = Wire(TileIdType)
+    s.need_forward = Wire(1)
+
+    @update
+    def update_next_dst():
+      # Tiles in the mask that have not received the packet yet.
+      for i in range(num_tiles):
+        s.remaining_mask[i] @= s.recv_from_ring.msg.multicast_mask[i] & \
+                               (s.tile_id < TileIdType(i))
+      s.next_dst @= 0
+      # Scans downwards so the lowest one wins (the translatable loops are
+      # ascending only).
+      for i in range(num_tiles):
+        if s.remaining_mask[num_tiles - 1 - i]:
+          s.next_dst @= TileIdType(num_tiles - 1 - i)
+      s.need_forward @= s.remaining_mask != TileMaskType(0)
+
+    @update
+    def update_send_to_tile():
+      s.send_to_tile.msg @= s.recv_from_ring.msg
+      s.send_to_tile.val @= s.recv_from_ring.val & \
+                            (~s.need_forward | s.forward_queue.recv.rdy)
+
+    @update
+    def update_forward_queue():
+      s.recv_from_ring.rdy @= s.send_to_tile.rdy & \
+                              (~s.need_forward | s.forward_queue.recv.rdy)
+      s.forward_queue.recv.val @= s.send_to_tile.val & s.send_to_tile.rdy & \
+                                  s.need_forward
+      s.forward_queue.recv.msg @= s.recv_from_ring.msg
+      s.forward_queue.recv.msg.dst @= s.next_dst
+
+    @update
+    def update_send_to_ring():
+      s.recv_from_tile.rdy @= s.send_to_ring.rdy
+      s.forward_queue.send.rdy @= s.send_to_ring.rdy & ~s.recv_from_tile.val
+      s.send_to_ring.val @= s.recv_from_tile.val | s.forward_queue.send.val
+      if s.recv_from_tile.val:
+        s.send_to_ring.msg @= s.recv_from_tile.msg
+      else:
+        s.send_to_ring.msg @= s.forward_queue.send.msg
+
+  def line_trace(s):
+    return f"{s.recv_from_ring}(mask:{s.remaining_mask}->{s.next_dst}) => " \
+           f"tile:{s.send_to_tile} forward:{s.forward_queue.send} ring:{s.send_to_ring}"
+
@@ -45,8 +45,7 @@ class TestHarness(Component):
 
     for i in range(num_inports):
       s.src_data[i].send //= s.dut.recv_data[i]
-      for addr in range(ctrl_mem_size):
-        s.dut.prologue_count_inport[addr][i] //= 0
+      s.dut.prologue_count_inport[i] //= 0
     s.src_opt.send //= s.dut.recv_opt
 
     # routing_xbar_outport in CtrlType may be wider than the crossbar's InType
@@ -0,0 +1,103 @@
+"""
+==========================================================================
+CtrlPktMulticastRTL_test.py
+==========================================================================
+Simple test for CtrlPktMulticastRTL.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+from ..CtrlPktMulticastRTL import CtrlPktMulticastRTL
+from ...lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
+from ...lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
+from ...lib.cmd_type import *
+from ...lib.messages import *
+from ...lib.opt_type import *
+
+#-------------------------------------------------------------------------
+# TestHarness
+#-------------------------------------------------------------------------
+
+class TestHarness(Component):
+
+  def construct(s, CtrlPktType, num_tiles, tile_id,
+                ring_pkts, tile_pkts, sink_tile_pkts, sink_ring_pkts):
+
+    s.src_ring = TestSrcRTL(CtrlPktType, ring_pkts)
+    s.src_tile = TestSrcRTL(CtrlPktType, tile_pkts)
+    s.sink_tile = TestSinkRTL(CtrlPktType, sink_tile_pkts)
+    s.sink_ring = TestSinkRTL(CtrlPktType, sink_ring_pkts)
+    s.dut = CtrlPktMulticastRTL(CtrlPktType, num_tiles)
+
+    # Connections
+    s.dut.tile_id //= tile_id
+    s.src_ring.send //= s.dut.recv_from_ring
+    s.src_tile.send //= s.dut.recv_from_tile
+    s.dut.send_to_tile //= s.sink_tile.recv
+    s.dut.send_to_ring //= s.sink_ring.recv
+
+  def done(s):
+    return s.src_ring.done() and s.src_tile.done() and \
+           s.sink_tile.done() and s.sink_ring.done()
+
+  def line_trace(s):
+    return s.dut.line_trace()
+
+#-------------------------------------------------------------------------
+# run_sim
+#-------------------------------------------------------------------------
+
+def run_sim(test_harness, max_cycles = 20):
+  test_harness.elaborate()
+  test_harness.apply(DefaultPassGroup())
+  test_harness.sim_reset()
+
+  # Run simulation
+  ncycles = 0
+  print()
+  print("{}:{}".format(ncycles, test_harness.line_trace()))
+  while not test_harness.done() and ncycles < max_cycles:
+    test_harness.sim_tick()
+    ncycles += 1
+    print("{}:{}".format(ncycles, test_harness.line_trace()))
+
+  # Check timeout
+  assert ncycles < max_cycles
+
+  test_harness.sim_tick()
+  test_harness.sim_tick()
+  test_harness.sim_tick()
+
+#-------------------------------------------------------------------------
+# Test cases
+#-------------------------------------------------------------------------
+
+num_tiles = 8
+DataType = mk_data(16, 1)
+CtrlType = mk_ctrl(2, 2)
+CgraPayloadType = mk_cgra_payload(DataType, mk_bits(4), CtrlType, mk_bits(2))
+CtrlPktType = mk_intra_cgra_pkt(1, 1, num_tiles, CgraPayloadType)
+
+def mk_pkt(src, dst, cmd, data, multicast_mask = 0):
+  return CtrlPktType(src, dst,
+                     payload = CgraPayloadType(cmd, data = DataType(data, 1)),
+                     multicast_mask = multicast_mask)
+
+def test_multicast_forward():
+  tile_id = 2
+  ring_pkts = [mk_pkt(num_tiles, 2, CMD_CONST, 1),
+               # Tile 2 is the last one in the mask.
+               mk_pkt(num_tiles, 2, CMD_CONST, 2, 0b00000110),
+               mk_pkt(num_tiles, 2, CMD_CONST, 3, 0b10100100),
+               mk_pkt(num_tiles, 2, CMD_CONST, 4, 0b00010100)]
+  # The packet from the tile itself goes first.
+  tile_pkts = [mk_pkt(2, num_tiles, CMD_COMPLETE, 5)]
+  sink_ring_pkts = [mk_pkt(2, num_tiles, CMD_COMPLETE, 5),
+                    mk_pkt(num_tiles, 5, CMD_CONST, 3, 0b10100100),
+                    mk_pkt(num_tiles, 4, CMD_CONST, 4, 0b00010100)]
+  th = TestHarness(CtrlPktType, num_tiles, tile_id, ring_pkts, tile_pkts,
+                   ring_pkts, sink_ring_pkts)
+  run_sim(th)
+
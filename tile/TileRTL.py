@@ -19,16 +19,19 @@ from ..fu.single.AdderRTL import AdderRTL
 from ..fu.single.GrantRTL import GrantRTL
 from ..fu.single.CompRTL import CompRTL
 from ..fu.single.MemUnitRTL import MemUnitRTL
+from ..fu.single.NonBlockingMemUnitRTL import NonBlockingMemUnitRTL
 from ..fu.single.MulRTL import MulRTL
 from ..fu.single.PhiRTL import PhiRTL
 from ..lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ..lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ..lib.cmd_type import *
+from ..lib.messages import *
 from ..lib.util.common import *
 from ..mem.const.ConstQueueDynamicRTL import ConstQueueDynamicRTL
 from ..mem.ctrl.CtrlMemDynamicRTL import CtrlMemDynamicRTL
 from ..mem.register_cluster.RegisterClusterRTL import RegisterClusterRTL
 from ..noc.CrossbarRTL import CrossbarRTL
+from ..noc.CtrlPktMulticastRTL import CtrlPktMulticastRTL
 from ..noc.LinkOrRTL import LinkOrRTL
 from ..noc.PyOCN.pymtl3_net.channel.ChannelRTL import ChannelRTL
 from ..rf.RegisterRTL import RegisterRTL
@@ -43,7 +46,8 @@ class TileRTL(Component):
                 num_tile_inports, num_tile_outports, num_cgras, num_tiles,
                 num_registers_per_reg_bank = 16,
                 Fu = FlexibleFuRTL,
-                FuList = [PhiRTL, AdderRTL, CompRTL, MulRTL, GrantRTL, MemUnitRTL]):
+                FuList = [PhiRTL, AdderRTL, CompRTL, MulRTL, GrantRTL, MemUnitRTL],
+                num_ctrl_banks = 1):
 
     # Derives types from IntraCgraPktType.
     CgraPayloadType = IntraCgraPktType.get_field_type(kAttrPayload)
@@ -79,6 +83,9 @@ class TileRTL(Component):
     s.from_mem_rdata = RecvIfcRTL(DataType)
     s.to_mem_waddr = SendIfcRTL(DataAddrType)
     s.to_mem_wdata = SendIfcRTL(DataType)
+    # Tags of the non-blocking loads.
+    s.to_mem_raddr_opaque = OutPort(OpaqueType)
+    s.from_mem_rdata_opaque = InPort(OpaqueType)
 
     # Components.
     s.element = FlexibleFuRTL(CtrlPktType, num_fu_inports, 
@@ -112,7 +119,10 @@ class TileRTL(Component):
                                    num_cgras,
                                    num_tiles,
                                    num_ctrl,
-                                   total_steps)
+                                   total_steps,
+                                   num_ctrl_banks = num_ctrl_banks)
+    # Consumes and forwards the multicast packets on the ctrl ring.
+    s.ctrl_pkt_multicast = CtrlPktMulticastRTL(CtrlPktType, num_tiles)
 
     # The `tile_in_channel` indicates the outport channels that are
     # connected to the next tiles.
@@ -136,6 +146,7 @@ class TileRTL(Component):
     s.element.tile_id //= s.tile_id
     s.ctrl_mem.cgra_id //= s.cgra_id
     s.ctrl_mem.tile_id //= s.tile_id
+    s.ctrl_pkt_multicast.tile_id //= s.tile_id
     s.fu_crossbar.cgra_id //= s.cgra_id
     s.fu_crossbar.tile_id //= s.tile_id
     s.routing_crossbar.cgra_id //= s.cgra_id
@@ -159,24 +170,26 @@ class TileRTL(Component):
 
     # Prologue port.
     s.element.prologue_count_inport //= s.ctrl_mem.prologue_count_outport_fu
-    for addr in range(ctrl_mem_size):
-      for i in range(num_routing_xbar_inports):
-        s.routing_crossbar.prologue_count_inport[addr][i] //= \
-            s.ctrl_mem.prologue_count_outport_routing_crossbar[addr][i]
-      for i in range(num_fu_xbar_inports):
-        s.fu_crossbar.prologue_count_inport[addr][i] //= \
-            s.ctrl_mem.prologue_count_outport_fu_crossbar[addr][i]
+    for i in range(num_routing_xbar_inports):
+      s.routing_crossbar.prologue_count_inport[i] //= \
+          s.ctrl_mem.prologue_count_outport_routing_crossbar[i]
+    for i in range(num_fu_xbar_inports):
+      s.fu_crossbar.prologue_count_inport[i] //= \
+          s.ctrl_mem.prologue_count_outport_fu_crossbar[i]
 
     for i in range(len(FuList)):
-      if FuList[i] == MemUnitRTL:
+      if FuList[i] in [MemUnitRTL, NonBlockingMemUnitRTL]:
         s.to_mem_raddr //= s.element.to_mem_raddr[i]
         s.from_mem_rdata //= s.element.from_mem_rdata[i]
         s.to_mem_waddr //= s.element.to_mem_waddr[i]
         s.to_mem_wdata //= s.element.to_mem_wdata[i]
+        s.to_mem_raddr_opaque //= s.element.to_mem_raddr_opaque[i]
+        s.element.from_mem_rdata_opaque[i] //= s.from_mem_rdata_opaque
       else:
         s.element.to_mem_raddr[i].rdy //= 0
         s.element.from_mem_rdata[i].val //= 0
         s.element.from_mem_rdata[i].msg //= DataType()
+        s.element.from_mem_rdata_opaque[i] //= 0
         s.element.to_mem_waddr[i].rdy //= 0
         s.element.to_mem_wdata[i].rdy //= 0
 
@@ -231,50 +244,50 @@ class TileRTL(Component):
           s.element.recv_in[i]
       s.register_cluster.inport_opt //= s.ctrl_mem.send_ctrl.msg
 
-    # Clear ports are only useful during context switching.
-    # We connect to 0 to make sure they have drivers.
+    # Clear ports reset the per-kernel state (crossbar prologue counters,
+    # FU states) once the ctrl memory banks are swapped, i.e., before the
+    # next kernel starts. The swap never happens with a single bank.
     for i in range(len(FuList)):
-      s.element.clear[i] //= 0
-    s.fu_crossbar.clear //= 0
-    s.routing_crossbar.clear //= 0
+      s.element.clear[i] //= s.ctrl_mem.swap_outport
+    s.fu_crossbar.clear //= s.ctrl_mem.swap_outport
+    s.routing_crossbar.clear //= s.ctrl_mem.swap_outport
 
     @update
     def feed_pkt():
-        s.ctrl_mem.recv_pkt_from_controller.msg @= CtrlPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0) # , 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        s.ctrl_mem.recv_pkt_from_controller.msg @= CtrlPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
         s.const_mem.recv_const.msg @= DataType(0, 0, 0, 0)
         s.ctrl_mem.recv_pkt_from_controller.val @= 0
         s.const_mem.recv_const.val @= 0
-        s.recv_from_controller_pkt.rdy @= 0
-
-        if s.recv_from_controller_pkt.val & \
-           ((s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG) | \
-            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU) | \
-            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU_CROSSBAR) | \
-            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR) | \
-            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_TOTAL_CTRL_COUNT) | \
-            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_COUNT_PER_ITER) | \
-            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_GLOBAL_REDUCE_ADD_RESPONSE) | \
-            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_GLOBAL_REDUCE_MUL_RESPONSE) | \
-            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_LAUNCH) | \
-            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_LOOP_LOWER) | \
-            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_LOOP_UPPER) | \
-            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_LOOP_STEP)):
+        s.ctrl_pkt_multicast.send_to_tile.rdy @= 0
+
+        if s.ctrl_pkt_multicast.send_to_tile.val & \
+           ((s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_CONFIG) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_CONFIG_BURST) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_CONFIG_BURST_DATA) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_SWAP_CTRL_BANK) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU_CROSSBAR) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_CONFIG_TOTAL_CTRL_COUNT) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_CONFIG_COUNT_PER_ITER) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_GLOBAL_REDUCE_ADD_RESPONSE) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_GLOBAL_REDUCE_MUL_RESPONSE) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_LAUNCH) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_CONFIG_LOOP_LOWER) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_CONFIG_LOOP_UPPER) | \
+            (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_CONFIG_LOOP_STEP)):
             s.ctrl_mem.recv_pkt_from_controller.val @= 1
-            s.ctrl_mem.recv_pkt_from_controller.msg @= s.recv_from_controller_pkt.msg
-            s.recv_from_controller_pkt.rdy @= s.ctrl_mem.recv_pkt_from_controller.rdy
-        elif s.recv_from_controller_pkt.val & (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONST):
+            s.ctrl_mem.recv_pkt_from_controller.msg @= s.ctrl_pkt_multicast.send_to_tile.msg
+            s.ctrl_pkt_multicast.send_to_tile.rdy @= s.ctrl_mem.recv_pkt_from_controller.rdy
+        elif s.ctrl_pkt_multicast.send_to_tile.val & (s.ctrl_pkt_multicast.send_to_tile.msg.payload.cmd == CMD_CONST):
             s.const_mem.recv_const.val @= 1
-            s.const_mem.recv_const.msg @= s.recv_from_controller_pkt.msg.payload.data
-            s.recv_from_controller_pkt.rdy @= s.const_mem.recv_const.rdy
+            s.const_mem.recv_const.msg @= s.ctrl_pkt_multicast.send_to_tile.msg.payload.data
+            s.ctrl_pkt_multicast.send_to_tile.rdy @= s.const_mem.recv_const.rdy
 
-    @update
-    def update_send_out_signal():
-        s.send_to_controller_pkt.val @= 0
-        s.send_to_controller_pkt.msg @= CtrlPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0) # , 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        if s.ctrl_mem.send_pkt_to_controller.val:
-            s.send_to_controller_pkt.val @= 1
-            s.send_to_controller_pkt.msg @= s.ctrl_mem.send_pkt_to_controller.msg
-        s.ctrl_mem.send_pkt_to_controller.rdy @= s.send_to_controller_pkt.rdy
+    # The packets from/towards the ctrl ring go through the multicast unit.
+    s.recv_from_controller_pkt //= s.ctrl_pkt_multicast.recv_from_ring
+    s.ctrl_mem.send_pkt_to_controller //= s.ctrl_pkt_multicast.recv_from_tile
+    s.ctrl_pkt_multicast.send_to_ring //= s.send_to_controller_pkt
 
     # Updates the configuration memory related signals.
     @update
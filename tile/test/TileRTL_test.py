@@ -48,7 +48,8 @@ class TestHarness(Component):
                 ctrl_mem_size, data_mem_size, num_fu_inports,
                 num_fu_outports, num_tile_inports,
                 num_tile_outports, num_registers_per_reg_bank, src_data,
-                src_ctrl_pkt, sink_out, num_tiles, complete_signal_sink_out, num_ctrl, total_steps):
+                src_ctrl_pkt, sink_out, num_tiles, complete_signal_sink_out, num_ctrl, total_steps,
+                num_ctrl_banks = 1):
 
     CgraPayloadType = IntraCgraPktType.get_field_type(kAttrPayload)
     DataType = CgraPayloadType.get_field_type(kAttrData)
@@ -66,7 +67,7 @@ class TestHarness(Component):
                 num_fu_inports, num_fu_outports, num_tile_inports,
                 num_tile_outports, 1, num_tiles,
                 num_registers_per_reg_bank,
-                FunctionUnit, FuList)
+                FunctionUnit, FuList, num_ctrl_banks)
 
     # Connects tile id.
     s.dut.cgra_id //= 0
@@ -84,6 +85,7 @@ class TestHarness(Component):
       s.dut.to_mem_raddr.rdy //= 0
       s.dut.from_mem_rdata.val //= 0
       s.dut.from_mem_rdata.msg //= DataType(0, 0)
+      s.dut.from_mem_rdata_opaque //= 0
       s.dut.to_mem_waddr.rdy //= 0
       s.dut.to_mem_wdata.rdy //= 0
 
@@ -733,3 +735,105 @@ def test_prologue_nah(cmdline_opts):
   th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
   run_sim(th)
 
+def test_swap_ctrl_bank_prologue(cmdline_opts):
+  num_tile_inports = 4
+  num_tile_outports = 4
+  num_fu_inports = 4
+  num_fu_outports = 2
+  ctrl_mem_size = 4
+  data_mem_size_global = 16
+  num_cgra_rows = 1
+  num_cgra_columns = 1
+  num_tiles = 4
+  num_registers_per_reg_bank = 16
+  num_ctrl_banks = 2
+  TileInType = mk_bits(clog2(num_tile_inports + num_fu_inports + 1))
+  FuInType = mk_bits(clog2(num_fu_inports + 1))
+  FuOutType = mk_bits(clog2(num_fu_outports + 1))
+  pick_register = [FuInType(x + 1) for x in range(num_fu_inports)]
+  DUT = TileRTL
+  FunctionUnit = FlexibleFuRTL
+  FuList = [AdderRTL, PhiRTL, GrantRTL]
+  data_nbits = 32
+  DataType = mk_data(data_nbits, 1)
+  addr_nbits = clog2(data_mem_size_global)
+
+  CtrlType = mk_ctrl(num_fu_inports,
+                     num_fu_outports,
+                     num_tile_inports,
+                     num_tile_outports,
+                     num_registers_per_reg_bank)
+
+  CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+  DataAddrType = mk_bits(addr_nbits)
+
+  CgraPayloadType = mk_cgra_payload(DataType,
+                                    DataAddrType,
+                                    CtrlType,
+                                    CtrlAddrType)
+
+  IntraCgraPktType = mk_intra_cgra_pkt(num_cgra_columns,
+                                       num_cgra_rows,
+                                       num_tiles,
+                                       CgraPayloadType)
+
+  # Routes the north input towards the given (north or south) outport,
+  # with the first iteration as the prologue, which forwards the input
+  # without consuming it.
+  def mk_kernel(outport):
+    routing_xbar_outport = [TileInType(0) for _ in range(num_tile_outports + num_fu_inports)]
+    routing_xbar_outport[outport] = TileInType(PORT_NORTH)
+    return [
+        IntraCgraPktType(0, 0,
+                         payload = CgraPayloadType(CMD_CONFIG, ctrl_addr = 0,
+                                                   ctrl = CtrlType(OPT_NAH,
+                                                                   pick_register,
+                                                                   routing_xbar_outport,
+                                                                   [FuOutType(0) for _ in range(num_tile_outports + num_fu_inports)]))),
+        IntraCgraPktType(0, 0,
+                         payload = CgraPayloadType(CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR, ctrl_addr = 0,
+                                                   ctrl = CtrlType(routing_xbar_outport = [
+                                                      TileInType(PORT_NORTH), TileInType(0), TileInType(0), TileInType(0),
+                                                      TileInType(0), TileInType(0), TileInType(0), TileInType(0)]),
+                                                   data = DataType(1, 1))),
+        IntraCgraPktType(0, 0,
+                         payload = CgraPayloadType(CMD_CONFIG_COUNT_PER_ITER, data = DataType(1, 1))),
+        IntraCgraPktType(0, 0,
+                         payload = CgraPayloadType(CMD_CONFIG_TOTAL_CTRL_COUNT, data = DataType(2, 1)))]
+
+  # Kernel B is written into the shadow bank while kernel A is running,
+  # and reuses ctrl_addr 0 with the same routing prologue. B's prologue
+  # must be counted again from scratch after the swap, otherwise B would
+  # consume its input in the first iteration and starve in the second.
+  src_ctrl_pkt = mk_kernel(PORT_INDEX_NORTH) + \
+                 [IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_LAUNCH))] + \
+                 mk_kernel(PORT_INDEX_SOUTH) + \
+                 [IntraCgraPktType(0, 0, payload = CgraPayloadType(CMD_SWAP_CTRL_BANK))]
+
+  src_data = [[DataType(3, 1), DataType(4, 1)],
+              [],
+              [],
+              []]
+
+  sink_out = [[DataType(3, 1), DataType(3, 1)],
+              [DataType(4, 1), DataType(4, 1)],
+              [],
+              []]
+
+  complete_signal_sink_out = [IntraCgraPktType(0, num_tiles, payload = CgraPayloadType(CMD_COMPLETE)),
+                              IntraCgraPktType(0, num_tiles, payload = CgraPayloadType(CMD_COMPLETE))]
+
+  th = TestHarness(DUT, FunctionUnit, FuList,
+                   IntraCgraPktType,
+                   ctrl_mem_size,
+                   data_mem_size_global, num_fu_inports, num_fu_outports,
+                   num_tile_inports, num_tile_outports,
+                   num_registers_per_reg_bank, src_data,
+                   src_ctrl_pkt, sink_out, num_tiles, complete_signal_sink_out,
+                   num_ctrl = 1, total_steps = 2, num_ctrl_banks = num_ctrl_banks)
+  th.elaborate()
+  th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
+                      ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
+                       'ALWCOMBORDER'])
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  run_sim(th)
@@ -83,6 +83,7 @@ class TestHarness(Component):
       s.dut.to_mem_raddr.rdy //= 0
       s.dut.from_mem_rdata.val //= 0
       s.dut.from_mem_rdata.msg //= DataType(0, 0)
+      s.dut.from_mem_rdata_opaque //= 0
       s.dut.to_mem_waddr.rdy //= 0
       s.dut.to_mem_wdata.rdy //= 0
 
@@ -41,7 +41,31 @@ Author : Bohan Cui
 # ```
 # 2. make the packets
 # pkts = script_factory.makeVectorCGRAPkts()
+#
+# or stream them, so that the packets of a tile can be consumed before the
+# rest of the program is parsed:
+# for (x, y), tile_pkts in script_factory.iterVectorCGRAPkts():
+#     ...
+# for pkt in script_factory.iterVectorCGRAPktStream():
+#     ...
+#
+# or merge the identical per-tile packets into multicast ones by creating
+# the factory with `multicast = True`, which only affects the packet stream:
+# for pkt in script_factory.iterVectorCGRAPktStream():
+#     ...
+#
+# or pack the per-entry config packets of each tile into burst ones by
+# creating the factory with `burst = True`.
+#
+# or build the packets of the cores in `jobs` worker processes (None for
+# one per CPU) by creating the factory with e.g. `jobs = 4`, the ctrl
+# words of identical instructions are built once either way.
+#
+# or write them into a binary packet program file:
+# script_factory.writePktProgram(path, num_cgra_columns, num_cgra_rows, num_tiles)
 
+import concurrent.futures
+import multiprocessing
 import sys
 import os
 import yaml
@@ -58,6 +82,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from lib.opt_type import *
+from pymtl3.datatypes.bitstructs import is_bitstruct_class, is_bitstruct_inst
 
 # Global configuration for register cluster size (number of registers per cluster).
 # This can be overridden by ScriptFactory initialization.
@@ -113,6 +138,73 @@ yaml_to_VectorCGRA_map_const = {
 
 
 
+# libyaml-backed parser if available, falls back to the pure Python one.
+_YamlEventSource = yaml.CSafeLoader if yaml.__with_libyaml__ else yaml.SafeLoader
+
+class _StreamingYamlLoader(yaml.composer.Composer,
+                           yaml.constructor.SafeConstructor,
+                           yaml.resolver.Resolver):
+    """Composes and constructs one node at a time out of the event stream
+    of the (C) parser, so that a large document can be consumed
+    incrementally instead of being materialized as a whole."""
+
+    def __init__(self, stream):
+        self.source = _YamlEventSource(stream)
+        yaml.composer.Composer.__init__(self)
+        yaml.constructor.SafeConstructor.__init__(self)
+        yaml.resolver.Resolver.__init__(self)
+
+    def check_event(self, *choices):
+        return self.source.check_event(*choices)
+
+    def peek_event(self):
+        return self.source.peek_event()
+
+    def get_event(self):
+        return self.source.get_event()
+
+    def load_node(self):
+        return self.construct_document(self.compose_node(None, None))
+
+    def expect(self, event_type):
+        event = self.get_event()
+        if not isinstance(event, event_type):
+            raise yaml.YAMLError(f"expected {event_type.__name__}, but found {event}")
+
+    def iter_mapping(self):
+        """Yields the keys of the mapping starting at the current event,
+        the caller must consume the value of each key."""
+        self.expect(yaml.MappingStartEvent)
+        while not self.check_event(yaml.MappingEndEvent):
+            yield self.load_node()
+        self.expect(yaml.MappingEndEvent)
+
+    def iter_cores(self):
+        self.expect(yaml.StreamStartEvent)
+        self.expect(yaml.DocumentStartEvent)
+        for key in self.iter_mapping():
+            if key != 'array_config':
+                self.load_node()
+                continue
+            for array_key in self.iter_mapping():
+                if array_key != 'cores':
+                    self.load_node()
+                    continue
+                self.expect(yaml.SequenceStartEvent)
+                while not self.check_event(yaml.SequenceEndEvent):
+                    yield self.load_node()
+                self.expect(yaml.SequenceEndEvent)
+
+def iterCores(path):
+    """Yields the cores in `array_config` of the compiler YAML one by one
+    while parsing the file incrementally."""
+    with open(path, 'r') as f:
+        loader = _StreamingYamlLoader(f)
+        try:
+            yield from loader.iter_cores()
+        finally:
+            loader.source.dispose()
+
 def _type(Operand):
     impl = Operand['operand']
     if impl[0] == "$":
@@ -346,7 +438,7 @@ class InstructionSignals:
             return None
         return const_operands
         
-    def makeCtrlPkt(self):
+    def makeCtrl(self):
         # make fu_in_code
         for idx, fu_in_code in enumerate(self.shuffle_fu_operand_input_index):
             if fu_in_code == -1:
@@ -392,18 +484,21 @@ class InstructionSignals:
         #                    vector_factor_power, is_last_ctrl, write_reg_from, write_reg_idx,
         #                    read_reg_towards, read_reg_idx
         # Use keyword arguments for optional fields to avoid parameter order issues
+        return self.CtrlType(self.opCode,
+                             fu_in_code_made,
+                             TileIn_made,
+                             FuOut_made,
+                             write_reg_from = write_reg_from_made,
+                             write_reg_idx = write_reg_idx_made,
+                             read_reg_towards = read_reg_towards_made,
+                             read_reg_idx = read_reg_idx_made,
+                             )
+
+    def makeCtrlPkt(self):
         pkt = self.IntraCgraPktType(0, self.id_,
                                     payload = self.CgraPayloadType(self.CMD_CONFIG_,
                                                                     ctrl_addr = self.CtrlAddrType(self.ctrl_addr),
-                                                                    ctrl = self.CtrlType(self.opCode,
-                                                                                        fu_in_code_made,
-                                                                                        TileIn_made,
-                                                                                        FuOut_made,
-                                                                                        write_reg_from = write_reg_from_made,
-                                                                                        write_reg_idx = write_reg_idx_made,
-                                                                                        read_reg_towards = read_reg_towards_made,
-                                                                                        read_reg_idx = read_reg_idx_made,
-                                                                                        )))
+                                                                    ctrl = self.makeCtrl()))
         return pkt
 
 class TileSignals:
@@ -431,7 +526,8 @@ class TileSignals:
                 B2Type,
                 RegIdxType,
                 CtrlAddrType,
-                DataAddrType):
+                DataAddrType,
+                ctrl_cache=None):
         self.CtrlType = CtrlType
         self.IntraCgraPktType = IntraCgraPktType
         self.CgraPayloadType = CgraPayloadType
@@ -449,6 +545,9 @@ class TileSignals:
         self.DataType = DataType
         self.CtrlAddrType = CtrlAddrType
         self.DataAddrType = DataAddrType
+        # (ctrl, consts) of the instructions keyed by their operations,
+        # shared by the tiles of the same factory.
+        self.ctrl_cache = ctrl_cache
         # constants
         self.CMD_CONST_ = CMD_CONST_input
         self.CMD_CONFIG_COUNT_PER_ITER_ = CMD_CONFIG_COUNT_PER_ITER_input
@@ -549,6 +648,37 @@ class TileSignals:
                                      payload = self.CgraPayloadType(self.CMD_CONFIG_PROLOGUE_FU_CROSSBAR_, ctrl_addr = self.CtrlAddrType(instruction['timestep'] % self.ii),
                                                                      ctrl = self.CtrlType(fu_xbar_outport = [self.FuOutType(0)] * 8),
                                                                      data = self.DataType(1, 1)))
+    def buildInstructionCtrl(self, instruction):
+        """Returns the ctrl and the consts of the instruction, which are
+        built once per (opcode, operand pattern) and reused afterwards."""
+        key = (REG_CLUSTER_SIZE, repr(instruction['operations']))
+        if self.ctrl_cache is not None and key in self.ctrl_cache:
+            ctrl, consts = self.ctrl_cache[key]
+            return ctrl.clone(), consts and list(consts)
+        # Note that buildCtrlPkt() consumes the consts of the operations,
+        # so the key is taken beforehand.
+        instruction_signals = InstructionSignals(
+            id_ = self.id_,
+            operations = instruction['operations'],
+            opcode_in_EIR = instruction['operations'][0]['opcode'], # transient TODO: make it general
+            ctrl_addr = instruction['timestep'] % self.ii,
+            IntraCgraPktType = self.IntraCgraPktType,
+            CgraPayloadType = self.CgraPayloadType,
+            TileInType = self.TileInType,
+            FuOutType = self.FuOutType,
+            CMD_CONFIG_input = self.CMD_CONFIG_,
+            CtrlType = self.CtrlType,
+            FuInType = self.FuInType,
+            B1Type = self.B1Type,
+            B2Type = self.B2Type,
+            RegIdxType = self.RegIdxType,
+            CtrlAddrType = self.CtrlAddrType)
+        consts = instruction_signals.buildCtrlPkt()
+        ctrl = instruction_signals.makeCtrl()
+        if self.ctrl_cache is not None:
+            self.ctrl_cache[key] = (ctrl.clone(), consts and list(consts))
+        return ctrl, consts
+
     def makeTileSignals(self):
         consts = []
         all_signals = []
@@ -571,25 +701,9 @@ class TileSignals:
                 
             has_addrs.append(instruction['timestep'] % self.ii)
             
-            instruction_signals = InstructionSignals(
-                id_ = self.id_,
-                operations = instruction['operations'],
-                opcode_in_EIR = instruction['operations'][0]['opcode'], # transient TODO: make it general
-                ctrl_addr = instruction['timestep'] % self.ii,
-                IntraCgraPktType = self.IntraCgraPktType,
-                CgraPayloadType = self.CgraPayloadType,
-                TileInType = self.TileInType,
-                FuOutType = self.FuOutType,
-                CMD_CONFIG_input = self.CMD_CONFIG_,
-                CtrlType = self.CtrlType,
-                FuInType = self.FuInType,
-                B1Type = self.B1Type,
-                B2Type = self.B2Type,
-                RegIdxType = self.RegIdxType,
-                CtrlAddrType = self.CtrlAddrType)
-            all_instruction_signals.append(instruction_signals)
+            ctrl, const = self.buildInstructionCtrl(instruction)
+            all_instruction_signals.append((instruction['timestep'] % self.ii, ctrl))
             
-            const = instruction_signals.buildCtrlPkt()
             if const is not None:
                 consts.extend(const)
         
@@ -613,8 +727,11 @@ class TileSignals:
         
         main_signals = []
         # make the main packets
-        for instruction_signals in all_instruction_signals:
-            pkt = instruction_signals.makeCtrlPkt()
+        for ctrl_addr, ctrl in all_instruction_signals:
+            pkt = self.IntraCgraPktType(0, self.id_,
+                                        payload = self.CgraPayloadType(self.CMD_CONFIG_,
+                                                                        ctrl_addr = self.CtrlAddrType(ctrl_addr),
+                                                                        ctrl = ctrl))
             main_signals.append(pkt)
         
           
@@ -661,6 +778,33 @@ class TileSignals:
         all_signals.append(launch_pkt)
         
         return all_signals
+# The factory seen by the forked workers of ScriptFactory(jobs = ...).
+_worker_factory = None
+
+def _can_fork():
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+def _pack(value):
+    # Bitstructs become tuples of their fields, Bits become ints.
+    if is_bitstruct_inst(value):
+        return tuple(_pack(getattr(value, name))
+                     for name in type(value).__bitstruct_fields__)
+    if isinstance(value, list):
+        return [_pack(item) for item in value]
+    return int(value)
+
+def _unpack(Type, data):
+    if is_bitstruct_class(Type):
+        return Type(*[_unpack(FieldType, item) for FieldType, item
+                      in zip(Type.__bitstruct_fields__.values(), data)])
+    if isinstance(Type, list):
+        return [_unpack(ItemType, item) for ItemType, item in zip(Type, data)]
+    return Type(data)
+
+def _makeCorePktsInWorker(core):
+    pkts = _worker_factory.makeCorePkts(core)
+    return (core['column'], core['row']), [_pack(pkt) for pkt in pkts]
+
 class ScriptFactory:
     FromFu = 0
     FromRouting = 1
@@ -689,12 +833,15 @@ class ScriptFactory:
                  RegIdxType,
                  CtrlAddrType,
                  DataAddrType,
-                 num_registers_per_reg_bank=None):
+                 num_registers_per_reg_bank=None,
+                 multicast=False,
+                 burst=False,
+                 jobs=1):
         # Allow overriding the default register cluster size.
         global REG_CLUSTER_SIZE
         if num_registers_per_reg_bank is not None:
             REG_CLUSTER_SIZE = int(num_registers_per_reg_bank)
-        self.yaml_struct = yaml.load(open(path, 'r'), Loader=yaml.FullLoader)
+        self._yaml_struct = None
         self.path = path
         self.CtrlType = CtrlType
         self.IntraCgraPktType = IntraCgraPktType
@@ -718,49 +865,112 @@ class ScriptFactory:
         self.RegIdxType = RegIdxType
         self.CtrlAddrType = CtrlAddrType
         self.DataAddrType = DataAddrType
+        # Merges the identical per-tile packets into multicast ones.
+        self.multicast = multicast
+        # Packs the per-entry config packets of each tile into bursts.
+        self.burst = burst
+        # Number of worker processes building the packets of the cores,
+        # None for one per CPU.
+        self.jobs = jobs
+        # Ctrl words already built, shared by all the cores.
+        self._ctrl_cache = {}
     
-    def makeVectorCGRAPkts(self):
-        
-        pkts = {}
-        cores = self.yaml_struct['array_config']['cores']
-        
-        
-        for core in cores:
+    @property
+    def yaml_struct(self):
+        # Only loaded on demand, the packets are generated from the
+        # incrementally parsed cores.
+        if self._yaml_struct is None:
+            with open(self.path, 'r') as f:
+                self._yaml_struct = yaml.load(f, Loader=_YamlEventSource)
+        return self._yaml_struct
+
+    def makeCorePkts(self, core):
+        entry = core['entries'][0]
+        instructions = entry['instructions']
+        id_ = core['core_id']
+
+        tile_signals = TileSignals(
+            CtrlType = self.CtrlType,
+            IntraCgraPktType = self.IntraCgraPktType,
+            CgraPayloadType = self.CgraPayloadType,
+            TileInType = self.TileInType,
+            FuOutType = self.FuOutType,
+            CMD_CONFIG_input = self.CMD_CONFIG_,
+            FuInType = self.FuInType,
+            id_ = id_,
+            loop_times = self.loop_times, 
+            ii = self.ii, 
+            instructions = instructions,
+            CMD_CONST_input = self.CMD_CONST_,
+            CMD_CONFIG_COUNT_PER_ITER_input = self.CMD_CONFIG_COUNT_PER_ITER_,
+            CMD_CONFIG_TOTAL_CTRL_COUNT_input = self.CMD_CONFIG_TOTAL_CTRL_COUNT_,
+            CMD_CONFIG_PROLOGUE_FU_input = self.CMD_CONFIG_PROLOGUE_FU_,
+            CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR_input = self.CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR_,
+            CMD_CONFIG_PROLOGUE_FU_CROSSBAR_input = self.CMD_CONFIG_PROLOGUE_FU_CROSSBAR_,
+            CMD_LAUNCH_input = self.CMD_LAUNCH_,
+            DataType = self.DataType,
+            B1Type = self.B1Type,
+            B2Type = self.B2Type,
+            RegIdxType = self.RegIdxType,
+            CtrlAddrType = self.CtrlAddrType,
+            DataAddrType = self.DataAddrType,
+            ctrl_cache = self._ctrl_cache,
+            )
+        if self.burst:
+            from lib.util.burst import pack_burst_config_pkts
+            return pack_burst_config_pkts(tile_signals.makeTileSignals())
+        return tile_signals.makeTileSignals()
+
+    def iterVectorCGRAPkts(self):
+        """Yields ((x, y), pkts) tile by tile in the order of the cores in
+        the YAML, the next core is only parsed once the packets of the
+        current tile are consumed."""
+        if self.jobs != 1 and _can_fork():
+            yield from self._iterParallelPkts()
+            return
+        for core in iterCores(self.path):
             x, y = core['column'], core['row']
-            entry = core['entries'][0]
-            instructions = entry['instructions']
-            id_ = core['core_id']
-            
-            tile_signals = TileSignals(
-                CtrlType = self.CtrlType,
-                IntraCgraPktType = self.IntraCgraPktType,
-                CgraPayloadType = self.CgraPayloadType,
-                TileInType = self.TileInType,
-                FuOutType = self.FuOutType,
-                CMD_CONFIG_input = self.CMD_CONFIG_,
-                FuInType = self.FuInType,
-                id_ = id_,
-                loop_times = self.loop_times, 
-                ii = self.ii, 
-                instructions = instructions,
-                CMD_CONST_input = self.CMD_CONST_,
-                CMD_CONFIG_COUNT_PER_ITER_input = self.CMD_CONFIG_COUNT_PER_ITER_,
-                CMD_CONFIG_TOTAL_CTRL_COUNT_input = self.CMD_CONFIG_TOTAL_CTRL_COUNT_,
-                CMD_CONFIG_PROLOGUE_FU_input = self.CMD_CONFIG_PROLOGUE_FU_,
-                CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR_input = self.CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR_,
-                CMD_CONFIG_PROLOGUE_FU_CROSSBAR_input = self.CMD_CONFIG_PROLOGUE_FU_CROSSBAR_,
-                CMD_LAUNCH_input = self.CMD_LAUNCH_,
-                DataType = self.DataType,
-                B1Type = self.B1Type,
-                B2Type = self.B2Type,
-                RegIdxType = self.RegIdxType,
-                CtrlAddrType = self.CtrlAddrType,
-                DataAddrType = self.DataAddrType,
-                )
-            tile_signals = tile_signals.makeTileSignals()
-            pkts[(x, y)] = tile_signals
-            
-        return pkts
+            yield (x, y), self.makeCorePkts(core)
+
+    def _iterParallelPkts(self):
+        # The cores are handed out to forked workers as they are parsed,
+        # and the packets are yielded in the order of the cores. The
+        # workers inherit the factory and send back the packets as ints,
+        # as the packet types are created on the fly and cannot be pickled.
+        global _worker_factory
+        _worker_factory = self
+        context = multiprocessing.get_context('fork')
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers = self.jobs, mp_context = context) as executor:
+            for (x, y), data in executor.map(_makeCorePktsInWorker,
+                                             iterCores(self.path)):
+                yield (x, y), [_unpack(self.IntraCgraPktType, pkt)
+                               for pkt in data]
+
+    def iterVectorCGRAPktStream(self):
+        """Yields the packets of all the tiles in issue order. With
+        multicast, the packets of all the tiles are collected first, as
+        identical tiles can only be merged once all of them are known."""
+        if self.multicast:
+            from lib.util.multicast import merge_multicast_pkts
+            yield from merge_multicast_pkts(self._iterTilePktStream())
+        else:
+            yield from self._iterTilePktStream()
+
+    def _iterTilePktStream(self):
+        for _, tile_pkts in self.iterVectorCGRAPkts():
+            yield from tile_pkts
+
+    def makeVectorCGRAPkts(self):
+        return dict(self.iterVectorCGRAPkts())
+
+    def writePktProgram(self, path, num_cgra_columns, num_cgra_rows, num_tiles):
+        """Streams the packets in issue order into a binary packet program
+        (see lib/util/pkt_program.py), returns the number of packets."""
+        from lib.util.pkt_program import write_pkt_program
+        return write_pkt_program(path, self.IntraCgraPktType,
+                                 self.iterVectorCGRAPktStream(),
+                                 num_cgra_columns, num_cgra_rows, num_tiles)
     
 from validation.test.dummy import *
     
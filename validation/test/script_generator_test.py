@@ -0,0 +1,194 @@
+"""
+==========================================================================
+script_generator_test.py
+==========================================================================
+Test cases for the streaming packet generation of ScriptFactory.
+
+Author : Cheng Tan
+  Date : Oct 18, 2026
+"""
+
+import os
+
+import yaml
+
+from pymtl3 import *
+from ..script_generator import ScriptFactory, iterCores
+from ...lib.cmd_type import *
+from ...lib.messages import *
+
+kYamlPath = os.path.join(os.path.dirname(__file__), "fir_acceptance_test.yaml")
+
+num_tile_ports = 4
+num_fu_inports = 4
+num_fu_outports = 2
+num_registers_per_reg_bank = 8
+ctrl_mem_size = 6
+TileInType = mk_bits(clog2(num_tile_ports + num_fu_inports + 1))
+FuInType = mk_bits(clog2(num_fu_inports + 1))
+FuOutType = mk_bits(clog2(num_fu_outports + 1))
+RegIdxType = mk_bits(clog2(num_registers_per_reg_bank))
+DataAddrType = mk_bits(clog2(128))
+CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+DataType = mk_data(32, 1)
+CtrlType = mk_ctrl(num_fu_inports, num_fu_outports, num_tile_ports,
+                   num_tile_ports, num_registers_per_reg_bank)
+CgraPayloadType = mk_cgra_payload(DataType, DataAddrType, CtrlType, CtrlAddrType)
+IntraCgraPktType = mk_intra_cgra_pkt(4, 1, 16, CgraPayloadType)
+
+def mk_script_factory(path, **kwargs):
+  return ScriptFactory(path = path,
+                       CtrlType = CtrlType,
+                       IntraCgraPktType = IntraCgraPktType,
+                       CgraPayloadType = CgraPayloadType,
+                       TileInType = TileInType,
+                       FuOutType = FuOutType,
+                       CMD_CONFIG_input = CMD_CONFIG,
+                       FuInType = FuInType,
+                       ii = 4,
+                       loop_times = 10,
+                       CMD_CONST_input = CMD_CONST,
+                       CMD_CONFIG_COUNT_PER_ITER_input = CMD_CONFIG_COUNT_PER_ITER,
+                       CMD_CONFIG_TOTAL_CTRL_COUNT_input = CMD_CONFIG_TOTAL_CTRL_COUNT,
+                       CMD_CONFIG_PROLOGUE_FU_input = CMD_CONFIG_PROLOGUE_FU,
+                       CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR_input = CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR,
+                       CMD_CONFIG_PROLOGUE_FU_CROSSBAR_input = CMD_CONFIG_PROLOGUE_FU_CROSSBAR,
+                       CMD_LAUNCH_input = CMD_LAUNCH,
+                       DataType = DataType,
+                       B1Type = b1,
+                       B2Type = b2,
+                       RegIdxType = RegIdxType,
+                       CtrlAddrType = CtrlAddrType,
+                       DataAddrType = DataAddrType,
+                       num_registers_per_reg_bank = num_registers_per_reg_bank,
+                       **kwargs)
+
+def test_iter_cores():
+  with open(kYamlPath) as f:
+    expected = yaml.load(f, Loader = yaml.FullLoader)['array_config']['cores']
+  assert list(iterCores(kYamlPath)) == expected
+
+def test_streamed_pkts():
+  script_factory = mk_script_factory(kYamlPath)
+  pkts = script_factory.makeVectorCGRAPkts()
+  # Same as generating the packets from the fully loaded YAML.
+  cores = script_factory.yaml_struct['array_config']['cores']
+  assert list(pkts.keys()) == [(core['column'], core['row']) for core in cores]
+  for core in cores:
+    assert pkts[(core['column'], core['row'])] == script_factory.makeCorePkts(core)
+  assert list(script_factory.iterVectorCGRAPktStream()) == \
+         [pkt for tile_pkts in pkts.values() for pkt in tile_pkts]
+
+def test_first_tile_before_parsing_rest(tmp_path):
+  # The packets of the first tile are available even though the rest of
+  # the file is broken.
+  with open(kYamlPath) as f:
+    lines = f.readlines()
+  second_core = [i for i, line in enumerate(lines) if line.startswith("    - column:")][1]
+  path = tmp_path / "truncated.yaml"
+  with open(path, "w") as f:
+    f.writelines(lines[:second_core])
+    f.write("    - column: [\n")
+
+  tiles = mk_script_factory(str(path)).iterVectorCGRAPkts()
+  (x, y), tile_pkts = next(tiles)
+  assert (x, y) == (0, 0)
+  assert tile_pkts[-1].payload.cmd == CMD_LAUNCH
+  try:
+    next(tiles)
+    assert False
+  except yaml.YAMLError:
+    pass
+
+def test_write_pkt_program(tmp_path):
+  from ...lib.util.pkt_program import PktProgramReader
+  script_factory = mk_script_factory(kYamlPath)
+  path = str(tmp_path / "fir.bin")
+  num_pkts = script_factory.writePktProgram(path, 4, 1, 16)
+  with PktProgramReader(path, IntraCgraPktType) as reader:
+    assert len(reader) == num_pkts
+    assert [pkt.to_bits() for pkt in reader] == \
+           [pkt.to_bits() for pkt in script_factory.iterVectorCGRAPktStream()]
+
+def mk_replicated_yaml(tmp_path):
+  # Replicates the first core onto the unused tiles 2 and 7.
+  with open(kYamlPath) as f:
+    yaml_struct = yaml.load(f, Loader = yaml.FullLoader)
+  cores = yaml_struct['array_config']['cores']
+  for core_id in [2, 7]:
+    core = dict(cores[0], core_id = str(core_id), column = core_id % 4, row = core_id // 4)
+    cores.append(core)
+  path = tmp_path / "replicated.yaml"
+  with open(path, "w") as f:
+    yaml.dump(yaml_struct, f)
+  return path, cores
+
+def test_multicast_pkt_stream(tmp_path):
+  path, cores = mk_replicated_yaml(tmp_path)
+  unicast_pkts = list(mk_script_factory(str(path)).iterVectorCGRAPktStream())
+  multicast_pkts = list(mk_script_factory(str(path), multicast = True).iterVectorCGRAPktStream())
+  first_tile_id = int(cores[0]['core_id'])
+  first_tile_pkts = [pkt for pkt in unicast_pkts if pkt.dst == first_tile_id]
+  assert len(multicast_pkts) == len(unicast_pkts) - 2 * len(first_tile_pkts)
+  mask = (1 << first_tile_id) | (1 << 2) | (1 << 7)
+  assert [pkt for pkt in multicast_pkts if pkt.multicast_mask != 0] == \
+         [IntraCgraPktType(pkt.src, pkt.dst, payload = pkt.payload, multicast_mask = mask)
+          for pkt in first_tile_pkts]
+
+def _replay_ctrl_mem(pkts, ctrl_mem_size):
+  # Final ctrl signals and FU prologue counts of each tile.
+  ctrls, prologues, bursts = {}, {}, {}
+  for pkt in pkts:
+    tile = int(pkt.dst)
+    ctrl = ctrls.setdefault(tile, [None] * ctrl_mem_size)
+    prologue = prologues.setdefault(tile, [0] * ctrl_mem_size)
+    cmd, addr = int(pkt.payload.cmd), int(pkt.payload.ctrl_addr)
+    if cmd == CMD_CONFIG:
+      ctrl[addr] = pkt.payload.ctrl
+    elif cmd == CMD_CONFIG_PROLOGUE_FU:
+      prologue[addr] = int(pkt.payload.data.payload)
+    elif cmd == CMD_CONFIG_BURST:
+      ctrl[addr] = pkt.payload.ctrl
+      bursts[tile] = [addr + 1, int(pkt.payload.data.payload)]
+    elif cmd == CMD_CONFIG_BURST_DATA:
+      addr, remaining = bursts[tile]
+      assert remaining > 0
+      ctrl[addr] = pkt.payload.ctrl
+      if int(pkt.payload.data.predicate):
+        prologue[addr] = int(pkt.payload.data.payload)
+      bursts[tile] = [addr + 1, remaining - 1]
+  return ctrls, prologues
+
+def test_burst_pkt_stream():
+  unicast_pkts = list(mk_script_factory(kYamlPath).iterVectorCGRAPktStream())
+  burst_pkts = list(mk_script_factory(kYamlPath, burst = True).iterVectorCGRAPktStream())
+  # The FU prologue counts of the beats (i.e., not the first entry) are
+  # folded into the beats.
+  num_folded = len([pkt for pkt in unicast_pkts
+                    if (pkt.payload.cmd == CMD_CONFIG_PROLOGUE_FU) & \
+                       (pkt.payload.ctrl_addr != 0)])
+  assert num_folded > 0
+  assert len(burst_pkts) == len(unicast_pkts) - num_folded
+  assert not any(pkt.payload.cmd == CMD_CONFIG for pkt in burst_pkts)
+  assert _replay_ctrl_mem(burst_pkts, ctrl_mem_size) == \
+         _replay_ctrl_mem(unicast_pkts, ctrl_mem_size)
+
+def test_memoized_ctrls(tmp_path):
+  path, cores = mk_replicated_yaml(tmp_path)
+  script_factory = mk_script_factory(str(path))
+  pkts = list(script_factory.iterVectorCGRAPktStream())
+  num_instructions = sum(len(core['entries'][0]['instructions']) for core in cores)
+  # The instructions of the replicated tiles are only built once.
+  assert len(script_factory._ctrl_cache) == \
+         num_instructions - 2 * len(cores[0]['entries'][0]['instructions'])
+  # Same as building each ctrl from scratch.
+  script_factory = mk_script_factory(str(path))
+  script_factory._ctrl_cache = None
+  assert list(script_factory.iterVectorCGRAPktStream()) == pkts
+
+def test_parallel_pkts():
+  expected = mk_script_factory(kYamlPath).makeVectorCGRAPkts()
+  for multicast in [False, True]:
+    assert list(mk_script_factory(kYamlPath, jobs = 2, multicast = multicast).iterVectorCGRAPktStream()) == \
+           list(mk_script_factory(kYamlPath, multicast = multicast).iterVectorCGRAPktStream())
+  assert mk_script_factory(kYamlPath, jobs = 2).makeVectorCGRAPkts() == expected